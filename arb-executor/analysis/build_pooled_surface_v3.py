@@ -143,17 +143,14 @@ def build():
     # absolute-basis numbers. Reach is the neighbor's RELATIVE move (pk - ownc)
     # mapped onto this cell; PnL is priced at THIS cell's own entry cost (carry
     # preserved: +Xc at 94 settles 99/-94, not the same as +Xc at 86).
-    cprof = ec._cent_profiles(df)
-    cents_arr, peaks, wins, _own_n, ownc = cprof
+    EVc, HRc, _ = ec.pooled_surface(df, sigma_c, relative=True)
     cells = []
     for c in cents:
-        w = ec._gauss_weights(c, sigma_c[c], cents_arr)
         for R in range(1, ec.R_MAX + 1):
             T = c + R
             if T > 99:
                 break
-            ev, hr, _ = ec._pooled_ev_hr_at(int(c), int(T), cents_arr, peaks,
-                                            wins, w, ownc=ownc, relative=True)
+            ev, hr = EVc[c - C_MIN, R - 1], HRc[c - C_MIN, R - 1]
             if ev is None or np.isnan(ev):
                 continue
             cells.append({
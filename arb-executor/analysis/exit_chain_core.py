@@ -38,6 +38,11 @@ NOTHING is hardcoded as a subjective constant:
   - aggression: exposed as 3 named chains (conservative/aggressive/hybrid),
                 each sitting at a different, data-defined edge of the band.
 
+Estimation runs on a precomputed hit-matrix backend (HitTable): per-cent sorted
+peaks + cumulative win counts turn every (c,R) reach count and PnL sum into a
+searchsorted lookup, and Gaussian pooling is one ordered product over the cent
+axis. The scalar _pooled_ev_hr_at is kept as the reference it reproduces.
+
 Money note: settlement winners pay 99 (not 100) per Kalshi-style 1c fee; entry
 cost is c. PnL for a winning settle = 99 - c; losing settle = -c; exit-on-reach
 = T - c = R. EV is the corpus-pooled mean of these per-N PnLs in cents.
@@ -159,16 +164,157 @@ def _pooled_ev_hr_at(entry_c, T, cents, peaks, wins, weights, exclude_c=None,
     return ev, hr, np.sqrt(var)
 
 
-def _gauss_weights(center_c, sigma, cents):
+def _gauss_row(center_c, sigma, cents):
     # sigma -> 0 means OWN-CENT ONLY (the tightest, most basis-faithful pool):
     # the cent uses only the N that actually traded at it, no neighbor borrow.
     if sigma <= 0:
-        return {int(c): (1.0 if int(c) == int(center_c) else 0.0) for c in cents}
+        return (np.asarray(cents) == int(center_c)).astype(float)
     d = (cents - center_c).astype(float)
-    w = np.exp(-(d * d) / (2 * sigma * sigma))
+    return np.exp(-(d * d) / (2 * sigma * sigma))
+
+
+def _gauss_weights(center_c, sigma, cents):
+    w = _gauss_row(center_c, sigma, cents)
     return {int(c): float(wi) for c, wi in zip(cents, w)}
 
 
+# ---------------------------------------------------------------------------
+# Precomputed hit matrices (vectorized pooling backend)
+# ---------------------------------------------------------------------------
+class HitTable:
+    """
+    Per-cent reach / settle counts at every threshold, built once per corpus.
+
+    Every per-N PnL in _pooled_ev_hr_at is R on reach, else 99-c (win) or -c
+    (loss). So one neighbor cent's contribution at any (c, R) is fixed by three
+    counts: N that reached, winners that did not, losers that did not. Per
+    neighbor cent the peaks are sorted once -- absolute peak for the absolute
+    basis, relative move pk - ownc for the relative one -- with cumulative win
+    counts over that order, and each threshold is one searchsorted lookup.
+
+    The PnL and squared-PnL sums built from those counts are exact integers,
+    and pool() accumulates weight * sum neighbor by neighbor in cent order
+    (the product W @ sums along the cent axis, done as ordered rank-1 updates
+    rather than BLAS so the float summation order is the scalar loop's). The
+    EV/HR/dispersion surfaces therefore match _pooled_ev_hr_at bit for bit.
+    """
+
+    THRESHOLDS = np.arange(0, 101)  # X (relative) or T (absolute), 0..100
+
+    def __init__(self, cents, peaks, wins, ownc):
+        self.cents = np.asarray(cents)
+        nN = len(self.cents)
+        self.n = np.array([len(peaks[c]) for c in self.cents], dtype=float)
+        self._hit = {b: np.zeros((nN, len(self.THRESHOLDS))) for b in ("abs", "rel")}
+        self._nr_win = {b: np.zeros((nN, len(self.THRESHOLDS))) for b in ("abs", "rel")}
+        for j, c in enumerate(self.cents):
+            pk, won = peaks[c], wins[c] == 1
+            for basis, vals in (("abs", pk), ("rel", pk - ownc[c])):
+                order = np.argsort(vals, kind="stable")
+                cum_win = np.concatenate(([0], np.cumsum(won[order])))
+                below = np.searchsorted(vals[order], self.THRESHOLDS, side="left")
+                self._hit[basis][j] = len(pk) - below
+                self._nr_win[basis][j] = cum_win[below]
+        self._sums = {}
+
+    @classmethod
+    def from_df(cls, df):
+        cents, peaks, wins, _own_n, ownc = _cent_profiles(df)
+        return cls(cents, peaks, wins, ownc)
+
+    def neighbor_sums(self, relative):
+        """(hits, pnl_sum, pnl_sq_sum) per neighbor, each [neighbor, ci, Ri].
+
+        ci indexes the borrowing (entry) cent, Ri = R - 1; cells with T > 99
+        are zero and masked by pool().
+        """
+        key = "rel" if relative else "abs"
+        if key not in self._sums:
+            c = self.cents[:, None].astype(float)
+            R = np.arange(1, R_MAX + 1)[None, :]
+            thr = R if relative else np.minimum(self.cents[:, None] + R, 100)
+            thr = np.broadcast_to(thr, (len(self.cents), R_MAX))
+            H = self._hit[key][:, thr]
+            Wn = self._nr_win[key][:, thr]
+            L = self.n[:, None, None] - H - Wn
+            Rf = R.astype(float)
+            win_pnl, loss_pnl = SETTLE_WIN - c, -c
+            P = H * Rf + Wn * win_pnl + L * loss_pnl
+            Q = H * (Rf * Rf) + Wn * (win_pnl * win_pnl) + L * (loss_pnl * loss_pnl)
+            self._sums[key] = (H, P, Q)
+        return self._sums[key]
+
+    def pool(self, weights, relative=True):
+        """
+        Pooled EV, HR and dispersion [ci, Ri] for every entry cent and R at once.
+
+        weights[ci, j] is the weight entry cent ci gives neighbor cent j (zero
+        the diagonal for leave-one-cent-out). NaN where T > 99 or nothing pooled.
+        """
+        H, P, Q = self.neighbor_sums(relative)
+        nC = len(self.cents)
+        num_ev = np.zeros((nC, R_MAX))
+        num_hit = np.zeros((nC, R_MAX))
+        sq = np.zeros((nC, R_MAX))
+        den = np.zeros(nC)
+        for j in range(len(self.cents)):
+            if self.n[j] == 0:
+                continue
+            w = np.where(weights[:, j] > 0, weights[:, j], 0.0)
+            num_ev += w[:, None] * P[j]
+            num_hit += w[:, None] * H[j]
+            den += w * self.n[j]
+            sq += w[:, None] * Q[j]
+        valid = (self.cents[:, None] + np.arange(1, R_MAX + 1)[None, :] <= 99) \
+            & (den[:, None] > 0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            d = den[:, None]
+            ev = np.where(valid, num_ev / d, np.nan)
+            hr = np.where(valid, num_hit / d, np.nan)
+            var = np.maximum(sq / d - ev * ev, 0.0)
+            dp = np.where(valid, np.sqrt(var), np.nan)
+        return ev, hr, dp
+
+    def own_ev(self):
+        """Own-sample absolute-basis EV [ci, Ri] (the CV target); NaN if no N."""
+        _, P, _ = self.neighbor_sums(relative=False)
+        idx = np.arange(len(self.cents))
+        own = P[idx, idx]
+        valid = (self.cents[:, None] + np.arange(1, R_MAX + 1)[None, :] <= 99) \
+            & (self.n[:, None] > 0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(valid, own / self.n[:, None], np.nan)
+
+    def weight_matrix(self, sigmas, exclude_self=False):
+        """weights[ci, j] from one sigma per entry cent (as _gauss_weights)."""
+        W = np.array([_gauss_row(c, s, self.cents) for c, s in zip(self.cents, sigmas)])
+        if exclude_self:
+            np.fill_diagonal(W, 0.0)
+        return W
+
+    def cv_errors(self, sigma):
+        """Leave-one-cent-out squared error of the relative pooled EV against
+        each cent's own EV curve: (sum_se[ci], count[ci]), summed in R order."""
+        W = self.weight_matrix([sigma] * len(self.cents), exclude_self=True)
+        pred, _, _ = self.pool(W, relative=True)
+        obs = self.own_ev()
+        ok = ~np.isnan(pred) & ~np.isnan(obs)
+        se = np.where(ok, (pred - obs) ** 2, 0.0)
+        return se, ok
+
+
+def pooled_surface(df, sigma_c, relative=True, table=None):
+    """
+    EV, HR, dispersion arrays [ci, Ri] pooled with each cent's own sigma_c[c];
+    the vectorized equivalent of calling _pooled_ev_hr_at at every (c, T).
+    relative=True is the converted (relative-trajectory) basis.
+    """
+    if table is None:
+        table = HitTable.from_df(df)
+    W = table.weight_matrix([sigma_c[c] for c in table.cents])
+    return table.pool(W, relative=relative)
+
+
 def select_bandwidth_cv(df, sigma_grid=None):
     """
     Leave-one-cent-out CV on the cent axis. For each candidate global sigma,
@@ -182,34 +328,16 @@ def select_bandwidth_cv(df, sigma_grid=None):
     """
     if sigma_grid is None:
         sigma_grid = [0.5, 1, 1.5, 2, 2.5, 3, 3.5, 4, 5, 6, 8]
-    cents, peaks, wins, own_n, ownc = _cent_profiles(df)
-
-    # empirical (own-sample) EV per (c,R) as the CV target
-    def own_ev(c, T):
-        pk, wn = peaks[c], wins[c]
-        if len(pk) == 0:
-            return np.nan
-        reached = pk >= T
-        pnl = np.where(reached, T - c, np.where(wn == 1, SETTLE_WIN - c, -c)).astype(float)
-        return pnl.mean()
+    table = HitTable.from_df(df)
 
+    # the CV target is the own-sample EV per (c,R) (HitTable.own_ev); errors
+    # are summed over cents then R, in the same order as the scalar loop
     scores = {}
     for sigma in sigma_grid:
-        se = 0.0
-        cnt = 0
-        for c in cents:
-            w = _gauss_weights(c, sigma, cents)
-            # sample R offsets across this cent's valid exit range
-            Ts = range(c + 1, min(99, c + R_MAX) + 1)
-            for T in Ts:
-                pred, _, _ = _pooled_ev_hr_at(c, T, cents, peaks, wins, w,
-                                              exclude_c=c, ownc=ownc, relative=True)
-                obs = own_ev(c, T)
-                if np.isnan(pred) or np.isnan(obs):
-                    continue
-                se += (pred - obs) ** 2
-                cnt += 1
-        scores[sigma] = se / max(cnt, 1)
+        se, ok = table.cv_errors(sigma)
+        cnt = int(ok.sum())
+        total = float(np.cumsum(se.ravel())[-1])
+        scores[sigma] = total / max(cnt, 1)
     best = min(scores, key=scores.get)
     return best, scores
 
@@ -240,38 +368,20 @@ def select_per_cent_sigma(df, sigma_grid=None):
     # positive, the neighbors were contaminating it and we trust its own tape.
     if sigma_grid is None:
         sigma_grid = [0.5, 0.75, 1, 1.5, 2, 2.5, 3, 4, 5, 6]
-    cents, peaks, wins, own_n, ownc = _cent_profiles(df)
+    table = HitTable.from_df(df)
 
-    def own_ev(c, T):
-        pk, wn = peaks[c], wins[c]
-        if len(pk) == 0:
-            return np.nan
-        reached = pk >= T
-        pnl = np.where(reached, T - c, np.where(wn == 1, SETTLE_WIN - c, -c)).astype(float)
-        return pnl.mean()
+    # err[si, ci]: per-cent CV error of every candidate sigma
+    err = np.empty((len(sigma_grid), len(table.cents)))
+    for si, sigma in enumerate(sigma_grid):
+        se, ok = table.cv_errors(sigma)
+        err[si] = np.cumsum(se, axis=1)[:, -1] / np.maximum(ok.sum(axis=1), 1)
+    best = np.argmin(err, axis=0)  # first minimum, as the strict-< scan
 
     sigma_c = {}
     err_c = {}
-    for c in cents:
-        Ts = range(c + 1, min(99, c + R_MAX) + 1)
-        best_s, best_e = None, None
-        for sigma in sigma_grid:
-            w = _gauss_weights(c, sigma, cents)
-            se = 0.0
-            cnt = 0
-            for T in Ts:
-                pred, _, _ = _pooled_ev_hr_at(c, T, cents, peaks, wins, w,
-                                              exclude_c=c, ownc=ownc, relative=True)
-                obs = own_ev(c, T)
-                if np.isnan(pred) or np.isnan(obs):
-                    continue
-                se += (pred - obs) ** 2
-                cnt += 1
-            e = se / max(cnt, 1)
-            if best_e is None or e < best_e:
-                best_e, best_s = e, sigma
-        sigma_c[int(c)] = float(best_s)
-        err_c[int(c)] = float(best_e)
+    for ci, c in enumerate(table.cents):
+        sigma_c[int(c)] = float(sigma_grid[best[ci]])
+        err_c[int(c)] = float(err[best[ci], ci])
     return sigma_c, err_c
 
 
@@ -291,6 +401,8 @@ def pooled_best_x(df, sigma_c):
     holdEv is the pooled hold-to-settle EV (the no-exit baseline).
     """
     cents, peaks, wins, own_n, ownc = _cent_profiles(df)
+    EVp, HRp, _ = pooled_surface(df, sigma_c, relative=True,
+                                 table=HitTable(cents, peaks, wins, ownc))
     out = {}
     for c in cents:
         w = _gauss_weights(c, sigma_c[int(c)], cents)
@@ -314,8 +426,7 @@ def pooled_best_x(df, sigma_c):
             # CONVERTED basis: translate each neighbor's RELATIVE trajectory onto
             # this cell (oranges -> apples) before measuring reach, instead of
             # pricing a cheap-anchor neighbor's absolute peak at this cell's cost.
-            ev, hr, _ = _pooled_ev_hr_at(c, T, cents, peaks, wins, w,
-                                         ownc=ownc, relative=True)
+            ev, hr = EVp[c - C_MIN, T - c - 1], HRp[c - C_MIN, T - c - 1]
             if ev is None or np.isnan(ev):
                 continue
             if best is None or ev > best[1]:
@@ -422,6 +533,8 @@ def finest_config(df, sigma_c):
     Returns {c: {...both layers..., confidence}}.
     """
     cents, peaks, wins, own_n, ownc = _cent_profiles(df)
+    EVp, HRp, DPp = pooled_surface(df, sigma_c, relative=True,
+                                   table=HitTable(cents, peaks, wins, ownc))
     EPS = 1.0  # cents; dispersion floor so a zero-noise crumb can't divide to inf
     K = 6.0
     out = {}
@@ -430,7 +543,6 @@ def finest_config(df, sigma_c):
     # delete a cell that the deep pool supports.
     for c in cents:
         c = int(c)
-        w = _gauss_weights(c, sigma_c[c], cents)
         pk_o, wn_o = peaks[c], wins[c]
 
         def own_at(T):
@@ -446,8 +558,8 @@ def finest_config(df, sigma_c):
 
         best = None  # (score, X, T, evB, hrB, dispB, evA, hrA, dispA)
         for T in range(c + 1, 100):
-            evB, hrB, dispB = _pooled_ev_hr_at(c, T, cents, peaks, wins, w,
-                                               ownc=ownc, relative=True)
+            ci, Ri = c - C_MIN, T - c - 1
+            evB, hrB, dispB = EVp[ci, Ri], HRp[ci, Ri], DPp[ci, Ri]
             if evB is None or np.isnan(evB) or evB <= 0:
                 continue
             score = (evB / (dispB + EPS)) * (1.0 - hrB ** K)
@@ -534,21 +646,9 @@ def build_surface(df, sigma_c):
       eff_n : neighborhood-weighted effective sample count per cent (confidence)
     """
     cents, peaks, wins, own_n, ownc = _cent_profiles(df)
-    nC = C_MAX - C_MIN + 1
-    EV = np.full((nC, R_MAX), np.nan)
-    HR = np.full((nC, R_MAX), np.nan)
-    DP = np.full((nC, R_MAX), np.nan)
-    for c in cents:
-        ci = c - C_MIN
-        w = _gauss_weights(c, sigma_c[c], cents)
-        for R in range(1, R_MAX + 1):
-            T = c + R
-            if T > 99:
-                break
-            ev, hr, dp = _pooled_ev_hr_at(c, T, cents, peaks, wins, w)
-            EV[ci, R - 1] = ev
-            HR[ci, R - 1] = hr
-            DP[ci, R - 1] = dp
+    # absolute basis (the EV/ROI exploration lens), every (c,R) in one pass
+    EV, HR, DP = pooled_surface(df, sigma_c, relative=False,
+                                table=HitTable(cents, peaks, wins, ownc))
     ROI = EV / np.arange(C_MIN, C_MAX + 1)[:, None].astype(float)
     # Un-paid-certainty penalty: as HR -> 1 you are paid nothing for risk, which
     # is the old '100% is suspicious' trap. Multiply ROI by a factor that fades
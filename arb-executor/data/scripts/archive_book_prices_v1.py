@@ -5,10 +5,17 @@ Archive book_prices from tennis.db to durable parquet under data/durable/fv_hist
 Modes:
   --mode initial:     full snapshot of current book_prices content (run once)
   --mode incremental: append rows newer than the latest polled_at already archived (daily cron)
+  --mode compact:     fold a month's per-day parts into its month file (off-peak; default
+                      every month before the current high-water-mark month, or --month)
+  --create-index:     build idx_book_prices_polled_at on tennis.db (one-time migration step;
+                      the only read-write access this script makes to the DB)
 
 Output layout:
-  data/durable/fv_history/by_month/YYYY-MM.parquet  (partitioned monthly, append-only)
+  data/durable/fv_history/by_month/YYYY-MM.parquet  (compacted month; written by initial/compact)
+  data/durable/fv_history/by_month/YYYY-MM.parts/YYYY-MM-DD.<run>.parquet
+                                                     (per-day parts appended by incremental runs)
   data/durable/fv_history/state.json  (archive state: last_archived_ts, total_rows, runs)
+A month's rows are its month file plus its parts; pyarrow.dataset.dataset(by_month) reads both.
 
 Single concern: archive, no transformation. Columns preserved exactly as in book_prices
 (TEXT -> string, REAL -> float64; values byte-faithful).
@@ -18,9 +25,18 @@ run_summary_initial.json and MANIFEST): the source has a ~10M-row month (2026-05
 a whole month in a Python list before flushing — or read-concat-rewrite appends — would exceed
 the VPS RAM (~1.47 GB free) and OOM. Instead we stream the SQLite cursor in bounded batches and
 write straight through a per-month pyarrow ParquetWriter (C28 incremental-writer discipline).
-For incremental appends to an existing month file, we stream-merge: copy the existing file's
-row groups one at a time into a temp writer, append the new delta, then atomically rename.
 Peak memory is bounded by one batch + one row group, not by month size.
+
+INCREMENTAL COST: incremental runs used to stream-merge the whole current month file into a
+temp writer to append the delta, rewriting the ~10M-row month every night. They now write only
+the delta, as per-day part files (one per polled_at day per run; never rewritten), and read only
+the delta: the `polled_at > ?` high-water-mark query is served by idx_book_prices_polled_at,
+built once with --create-index (the composite PK leads with event_ticker, so without it every
+run scans the table). Archive runs open tennis.db mode=ro only and never build the index; they
+warn if it is missing. The stream-merge moved to --mode compact, which folds parts into the month file
+once per month. The parts a month file absorbed are recorded in its parquet metadata
+(ARCHIVE_PARTS_KEY), so a compaction interrupted between the rename and the part deletes is
+finished - not double-counted - by the next compact run.
 """
 
 import argparse
@@ -70,6 +86,9 @@ SCHEMA = pa.schema([
 POLLED_IDX = SCHEMA_COLS.index("polled_at")
 BATCH_SIZE = 100_000
 
+POLLED_AT_INDEX = "idx_book_prices_polled_at"
+ARCHIVE_PARTS_KEY = b"archive_parts"  # month-file metadata: JSON list of part names merged
+
 
 def _rss_mb():
     return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0
@@ -112,58 +131,210 @@ def rows_to_table(rows):
     return pa.Table.from_arrays(arrays, schema=SCHEMA)
 
 
-def archive_stream(conn, since_ts, by_month_dir):
-    """Stream rows to per-month parquet via incremental ParquetWriter. Memory-safe.
+def create_polled_at_index(db_path):
+    """Create the polled_at index the high-water-mark query needs, if missing.
 
-    For a month whose file already exists (incremental append), the existing row groups are
-    streamed into the temp writer first (one group at a time), then the new delta appended,
-    then atomic-rename. Peak RAM bounded by one batch + one row group.
+    One-time migration step (--create-index; a full-table build on the live DB);
+    afterwards `polled_at > ? ORDER BY polled_at` is an index range scan over the
+    delta only. Returns False if the DB stayed locked past the timeout.
     """
-    by_month_dir.mkdir(parents=True, exist_ok=True)
-    writers, temps, finals, rows_per_month = {}, {}, {}, {}
+    conn = sqlite3.connect(db_path, timeout=30)
+    try:
+        conn.execute(f"CREATE INDEX IF NOT EXISTS {POLLED_AT_INDEX} ON book_prices(polled_at)")
+        conn.commit()
+        return True
+    except sqlite3.OperationalError as e:
+        print(f"WARNING: could not create {POLLED_AT_INDEX}: {e}", file=sys.stderr)
+        return False
+    finally:
+        conn.close()
+
+
+def has_polled_at_index(conn):
+    row = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = ?", (POLLED_AT_INDEX,)
+    ).fetchone()
+    return row is not None
+
+
+def _stream_partitioned(conn, since_ts, key_len, get_writer):
+    """Route streamed rows to get_writer(polled_at[:key_len]). Returns (rows_per_key, max_written)."""
+    rows_per_key = {}
     max_written = None  # high-water-mark = max polled_at actually archived
-
-    def get_writer(month):
-        if month in writers:
-            return writers[month]
-        final = by_month_dir / f"{month}.parquet"
-        tmp = by_month_dir / f"{month}.parquet.building"
-        w = pq.ParquetWriter(tmp, SCHEMA, compression="snappy")
-        if final.exists():
-            pf = pq.ParquetFile(final)
-            for i in range(pf.metadata.num_row_groups):
-                w.write_table(pf.read_row_group(i).cast(SCHEMA))
-        writers[month] = w
-        temps[month] = tmp
-        finals[month] = final
-        rows_per_month[month] = 0
-        return w
-
     for batch in fetch_rows(conn, since_ts):
-        bym = {}
+        byk = {}
         for row in batch:
-            bym.setdefault(row[POLLED_IDX][:7], []).append(row)
-        for month, rws in bym.items():
-            get_writer(month).write_table(rows_to_table(rws))
-            rows_per_month[month] += len(rws)
+            byk.setdefault(row[POLLED_IDX][:key_len], []).append(row)
+        for key, rws in byk.items():
+            get_writer(key).write_table(rows_to_table(rws))
+            rows_per_key[key] = rows_per_key.get(key, 0) + len(rws)
         # query is ORDER BY polled_at ascending -> last row of the batch is the running max
         bmax = batch[-1][POLLED_IDX]
         if max_written is None or bmax > max_written:
             max_written = bmax
+    return rows_per_key, max_written
+
+
+def parts_dir(by_month_dir, month):
+    return by_month_dir / f"{month}.parts"
+
 
+def archive_stream(conn, since_ts, by_month_dir):
+    """Initial snapshot: stream rows to one parquet per month via incremental ParquetWriter.
+
+    Peak RAM bounded by one batch.
+    """
+    by_month_dir.mkdir(parents=True, exist_ok=True)
+    writers, temps = {}, {}
+
+    def get_writer(month):
+        if month not in writers:
+            temps[month] = by_month_dir / f"{month}.parquet.building"
+            writers[month] = pq.ParquetWriter(temps[month], SCHEMA, compression="snappy")
+        return writers[month]
+
+    rows_per_month, max_written = _stream_partitioned(conn, since_ts, 7, get_writer)
     for month, w in writers.items():
         w.close()
-        os.replace(temps[month], finals[month])
+        os.replace(temps[month], by_month_dir / f"{month}.parquet")
 
     total = sum(rows_per_month.values())
     return total, rows_per_month, max_written
 
 
+def archive_parts(conn, since_ts, by_month_dir):
+    """Incremental: stream the delta to new per-day part files; existing files are not touched.
+
+    Part name YYYY-MM-DD.after-<since_ts>.parquet: a day split across two runs gets two parts,
+    names are unique per run (since_ts advances whenever rows are written) and sort in
+    polled_at order within a day.
+    """
+    run_tag = "after-" + since_ts.replace("-", "").replace(":", "").replace(" ", "T")
+    writers, temps, finals = {}, {}, {}
+
+    def get_writer(day):
+        if day not in writers:
+            pdir = parts_dir(by_month_dir, day[:7])
+            pdir.mkdir(parents=True, exist_ok=True)
+            finals[day] = pdir / f"{day}.{run_tag}.parquet"
+            temps[day] = pdir / f"{day}.{run_tag}.parquet.building"
+            writers[day] = pq.ParquetWriter(temps[day], SCHEMA, compression="snappy")
+        return writers[day]
+
+    rows_per_day, max_written = _stream_partitioned(conn, since_ts, 10, get_writer)
+    for day, w in writers.items():
+        w.close()
+        os.replace(temps[day], finals[day])
+
+    rows_per_month = {}
+    for day, n in rows_per_day.items():
+        rows_per_month[day[:7]] = rows_per_month.get(day[:7], 0) + n
+    total = sum(rows_per_day.values())
+    return total, rows_per_month, max_written, sorted(p.name for p in finals.values())
+
+
+def _merged_parts(month_file):
+    if not month_file.exists():
+        return set()
+    meta = pq.read_schema(month_file).metadata or {}
+    return set(json.loads(meta.get(ARCHIVE_PARTS_KEY, b"[]")))
+
+
+def compact_month(by_month_dir, month):
+    """Stream-merge YYYY-MM.parquet + its parts (name order) into a new month file, atomically
+    renamed over the old one, then delete the parts. Peak RAM bounded by one row group.
+
+    Returns (parts_merged, rows_in_month_file).
+    """
+    final = by_month_dir / f"{month}.parquet"
+    pdir = parts_dir(by_month_dir, month)
+    already = _merged_parts(final)
+    parts = sorted(pdir.glob("*.parquet")) if pdir.exists() else []
+    # Parts absorbed by a compaction that died before deleting them: drop, don't re-merge.
+    for p in parts:
+        if p.name in already:
+            p.unlink()
+    parts = [p for p in parts if p.name not in already]
+    if not parts:
+        if pdir.exists() and not any(pdir.iterdir()):
+            pdir.rmdir()
+        return [], (pq.ParquetFile(final).metadata.num_rows if final.exists() else 0)
+
+    merged = sorted(already | {p.name for p in parts})
+    schema = SCHEMA.with_metadata({ARCHIVE_PARTS_KEY: json.dumps(merged).encode()})
+    tmp = by_month_dir / f"{month}.parquet.building"
+    n_rows = 0
+    with pq.ParquetWriter(tmp, schema, compression="snappy") as w:
+        for src in ([final] if final.exists() else []) + parts:
+            pf = pq.ParquetFile(src)
+            for i in range(pf.metadata.num_row_groups):
+                rg = pf.read_row_group(i).cast(SCHEMA)
+                w.write_table(rg)
+                n_rows += rg.num_rows
+    os.replace(tmp, final)
+    for p in parts:
+        p.unlink()
+    pdir.rmdir()
+    return [p.name for p in parts], n_rows
+
+
+def months_to_compact(by_month_dir, last_archived_ts, month=None):
+    """--month, else every month with parts strictly before the high-water-mark month (still
+    being appended to; compacting it would rewrite it again the next day)."""
+    if month is not None:
+        return [month]
+    current = last_archived_ts[:7] if last_archived_ts else None
+    months = sorted(p.name[:-len(".parts")] for p in by_month_dir.glob("*.parts") if p.is_dir())
+    return [m for m in months if current is None or m < current]
+
+
+def run_compact(state, month=None):
+    t0 = time.time()
+    run_start = datetime.now(timezone.utc).isoformat()
+    compacted = {}
+    for m in months_to_compact(BY_MONTH_DIR, state["last_archived_ts"], month):
+        parts, n_rows = compact_month(BY_MONTH_DIR, m)
+        compacted[m] = {"parts_merged": len(parts), "month_rows": n_rows}
+    state["runs"].append({
+        "ts": run_start,
+        "mode": "compact",
+        "months": compacted,
+        "wall_clock_seconds": round(time.time() - t0, 1),
+        "peak_rss_mb": round(_rss_mb(), 1),
+    })
+    save_state(state)
+    print(f"OK: mode=compact, months={compacted}, "
+          f"wall_clock_s={time.time()-t0:.1f}, peak_rss_mb={_rss_mb():.0f}")
+
+
 def main():
     parser = argparse.ArgumentParser()
-    parser.add_argument("--mode", choices=["initial", "incremental"], required=True)
+    parser.add_argument("--mode", choices=["initial", "incremental", "compact"])
+    parser.add_argument("--month", default=None,
+                        help="compact only this YYYY-MM (default: every month before the current one)")
+    parser.add_argument("--create-index", action="store_true",
+                        help=f"build {POLLED_AT_INDEX} on tennis.db and exit (one-time, read-write)")
     args = parser.parse_args()
 
+    if args.create_index:
+        if not DB_PATH.exists():
+            print(f"ERROR: {DB_PATH} not found", file=sys.stderr)
+            sys.exit(1)
+        if not create_polled_at_index(DB_PATH):
+            sys.exit(1)
+        print(f"OK: {POLLED_AT_INDEX} present")
+        return
+    if args.mode is None:
+        parser.error("--mode is required unless --create-index is given")
+
+    if args.mode == "compact":
+        state = load_state()
+        if state["last_archived_ts"] is None:
+            print("ERROR: --mode compact but no prior archive exists.", file=sys.stderr)
+            sys.exit(1)
+        run_compact(state, args.month)
+        return
+
     if not DB_PATH.exists():
         print(f"ERROR: {DB_PATH} not found", file=sys.stderr)
         sys.exit(1)
@@ -178,10 +349,18 @@ def main():
 
     t0 = time.time()
     conn = sqlite3.connect(f"file:{DB_PATH}?mode=ro", uri=True)
+    if args.mode == "incremental" and not has_polled_at_index(conn):
+        print(f"WARNING: {POLLED_AT_INDEX} missing; the delta query scans book_prices. "
+              f"Run --create-index once to build it.", file=sys.stderr)
     since_ts = state["last_archived_ts"] if args.mode == "incremental" else None
 
     run_start = datetime.now(timezone.utc).isoformat()
-    rows_written, rows_per_month, archived_max = archive_stream(conn, since_ts, BY_MONTH_DIR)
+    parts_written = None
+    if args.mode == "incremental":
+        rows_written, rows_per_month, archived_max, parts_written = archive_parts(
+            conn, since_ts, BY_MONTH_DIR)
+    else:
+        rows_written, rows_per_month, archived_max = archive_stream(conn, since_ts, BY_MONTH_DIR)
 
     # db_max is for reporting only. The high-water-mark MUST be the max polled_at actually
     # archived (archived_max), NOT a separate SELECT MAX(): on a live DB the streamed SELECT
@@ -199,6 +378,7 @@ def main():
         "mode": args.mode,
         "rows_written": rows_written,
         "rows_per_month": rows_per_month,
+        "parts_written": parts_written,
         "new_last_archived_ts": new_max,
         "db_max_polled_at_at_close": db_max,
         "wall_clock_seconds": round(time.time() - t0, 1),
@@ -0,0 +1,106 @@
+"""Reader for the columnar BBO archive written by build_bbo_archive_v1.py.
+
+The archive replaces streaming bbo_log_v4.csv.gz end to end: each ticker's
+ticks are one record batch in an uncompressed Arrow IPC part file, located
+through index.parquet. A ticker load memory-maps its part file and hands back
+zero-copy numpy views, so a study over a few hundred tickers reads only those
+tickers' pages.
+
+    store = BboStore()
+    t = store.load("KXATPMATCH-26APR01...", t0=..., t1=...)
+    t.ts, t.bid, t.ask          # uint32 unix seconds UTC, uint8 cents
+
+The arrays are read-only views into the map; widen (astype) before arithmetic
+that can go negative or past 255.
+
+Classes / functions:
+- BboStore(archive_dir) -> .tickers(), .load(ticker, t0, t1), .iter_load(tickers)
+- BboTicks(ts, bid, ask)
+- index_path(dir), part_path(dir, part)
+"""
+
+import os
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+
+ARCHIVE_DIR = "/root/Omi-Workspace/arb-executor/data/durable/bbo_v4_archive"
+
+TICK_SCHEMA = pa.schema([
+    ("ts", pa.uint32()),
+    ("bid", pa.uint8()),
+    ("ask", pa.uint8()),
+])
+
+
+def index_path(archive_dir):
+    return os.path.join(archive_dir, "index.parquet")
+
+
+def part_path(archive_dir, part):
+    return os.path.join(archive_dir, f"part-{part:03d}.arrow")
+
+
+class BboTicks:
+    """One ticker's BBO ticks as parallel arrays, time-sorted."""
+    __slots__ = ("ts", "bid", "ask")
+
+    def __init__(self, ts, bid, ask):
+        self.ts = ts
+        self.bid = bid
+        self.ask = ask
+
+    def __len__(self):
+        return len(self.ts)
+
+
+class BboStore:
+    """Ticker -> ticks over a build_bbo_archive_v1 archive.
+
+    Part files are memory-mapped on first use and kept open; loads are
+    zero-copy slices of the mapped batch.
+    """
+
+    def __init__(self, archive_dir=ARCHIVE_DIR):
+        self.archive_dir = archive_dir
+        index = pq.read_table(index_path(archive_dir)).to_pandas()
+        self.index = index.set_index(index["ticker"].astype(str)).drop(columns="ticker")
+        self._readers = {}
+
+    def tickers(self):
+        return list(self.index.index)
+
+    def __contains__(self, ticker):
+        return ticker in self.index.index
+
+    def _reader(self, part):
+        reader = self._readers.get(part)
+        if reader is None:
+            source = pa.memory_map(part_path(self.archive_dir, part), "r")
+            reader = self._readers[part] = pa.ipc.open_file(source)
+        return reader
+
+    def load(self, ticker, t0=None, t1=None):
+        """BboTicks of ticker with t0 <= ts < t1 (either end optional), or None
+        if the ticker isn't in the archive."""
+        if ticker not in self.index.index:
+            return None
+        row = self.index.loc[ticker]
+        batch = self._reader(int(row["part"])).get_batch(int(row["batch"]))
+        ts, bid, ask = (batch.column(i).to_numpy() for i in range(3))
+        lo = 0 if t0 is None else int(np.searchsorted(ts, t0, side="left"))
+        hi = len(ts) if t1 is None else int(np.searchsorted(ts, t1, side="left"))
+        return BboTicks(ts[lo:hi], bid[lo:hi], ask[lo:hi])
+
+    def iter_load(self, tickers, t0=None, t1=None):
+        """(ticker, BboTicks) for each archived ticker, in part / batch order so
+        the map is walked sequentially."""
+        present = [tk for tk in tickers if tk in self.index.index]
+        order = self.index.loc[present].sort_values(["part", "batch"]).index
+        for tk in order:
+            yield tk, self.load(tk, t0, t1)
+
+    def close(self):
+        self._readers.clear()
@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""build_bbo_archive_v1.py — one-time columnar conversion of bbo_log_v4.csv.gz.
+
+The 839 MB / 515M-row BBO append log (MANIFEST.md "bbo_log_v4.csv.gz": 5 columns
+timestamp, ticker, bid, ask, spread; ET wall-clock timestamps; single-writer,
+timestamp-monotonic) can otherwise only be read by streaming gunzip + CSV parse
+of the whole file, whatever the study needs (Phase 3 Stage 1: ~7.4 h). This
+converts it once into a ticker-partitioned archive that bbo_store.py reads one
+ticker at a time through a memory map.
+
+Output layout (ARCHIVE_DIR):
+- part-NNN.arrow  Arrow IPC files, one record batch per ticker, columns
+                  ts uint32 (unix seconds UTC), bid uint8, ask uint8 (cents),
+                  rows in log order (time-sorted). Uncompressed so batches
+                  memory-map zero-copy.
+- index.parquet   ticker (dictionary-encoded) -> part, batch, n_rows, ts_min,
+                  ts_max
+spread is dropped (it is ask - bid).
+
+Two streaming passes, memory bounded by one CSV block + one bucket:
+1. pyarrow's streaming CSV reader decodes the gzip in BLOCK_MB blocks; each
+   block is vectorized (strptime, ET -> UTC, cents -> uint8, ticker -> global
+   id) and appended as fixed 10-byte records to one of N_BUCKETS spill files
+   (bucket = ticker id mod N_BUCKETS).
+2. Each spill file (~515M / N_BUCKETS rows) is loaded, stably sorted by
+   (ticker id, ts), and written as one part file.
+
+Rows are dropped (and counted) when the timestamp doesn't parse or bid / ask
+aren't integers in 0..255. Timestamps are localized with SOURCE_TZ (DST-aware;
+the Mar 20 - Apr 17 window is all EDT, i.e. +4h like extract_ticks.py).
+
+Usage:
+  python3 build_bbo_archive_v1.py [--src PATH] [--out DIR] [--buckets N] [--block-mb MB]
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
+
+sys.path.insert(0, str(Path(__file__).parent))
+from bbo_store import ARCHIVE_DIR, TICK_SCHEMA, index_path, part_path
+
+
+# ============================================================
+# Config
+# ============================================================
+
+SRC_PATH = "/root/Omi-Workspace/arb-executor/data/durable/bbo_log_v4.csv.gz"
+SOURCE_TZ = "America/New_York"
+SOURCE_COLUMNS = ["timestamp", "ticker", "bid", "ask", "spread"]
+TS_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+N_BUCKETS = 64
+BLOCK_MB = 64
+
+SPILL_DTYPE = np.dtype([("tid", "<u4"), ("ts", "<u4"), ("bid", "u1"), ("ask", "u1")])
+
+
+def log(msg, log_path=None):
+    ts = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    line = f"[{ts}] {msg}"
+    print(line, flush=True)
+    if log_path:
+        with open(log_path, "a") as f:
+            f.write(line + "\n")
+
+
+# ============================================================
+# Pass 1: stream CSV -> bucketed spill records
+# ============================================================
+
+def _to_float(col):
+    """string column -> float64 numpy, NaN where null or unparseable."""
+    try:
+        return col.cast(pa.float64()).to_numpy(zero_copy_only=False).astype(np.float64)
+    except pa.ArrowInvalid:  # a stray non-numeric cell: per-value fallback for this block
+        out = np.full(len(col), np.nan)
+        for i, s in enumerate(col.to_pylist()):
+            try:
+                out[i] = float(s)
+            except (TypeError, ValueError):
+                pass
+        return out
+
+
+def _cents_u8(col):
+    """bid / ask column -> (uint8 values, valid mask); valid = integer in 0..255."""
+    v = _to_float(col)
+    ok = ~np.isnan(v) & (v >= 0) & (v <= 255) & (v == np.floor(v))
+    return np.where(ok, v, 0).astype(np.uint8), ok
+
+
+def batch_records(batch, ticker_ids, tickers):
+    """One CSV record batch -> (SPILL_DTYPE records, rows dropped).
+
+    ticker_ids / tickers are the global ticker dictionary, extended in place.
+    """
+    ts = pc.strptime(batch.column("timestamp"), format=TS_FORMAT, unit="s", error_is_null=True)
+    ts = pc.assume_timezone(ts, SOURCE_TZ, ambiguous="earliest", nonexistent="earliest")
+    ts = ts.cast(pa.int64())
+    ts_ok = ts.is_valid().to_numpy(zero_copy_only=False)
+    ts = ts.fill_null(0).to_numpy()
+
+    bid, bid_ok = _cents_u8(batch.column("bid"))
+    ask, ask_ok = _cents_u8(batch.column("ask"))
+
+    enc = pc.dictionary_encode(batch.column("ticker"))
+    local = enc.dictionary.to_pylist()
+    gids = np.empty(len(local), dtype=np.uint32)
+    for k, tk in enumerate(local):
+        gid = ticker_ids.get(tk)
+        if gid is None:
+            gid = ticker_ids[tk] = len(tickers)
+            tickers.append(tk)
+        gids[k] = gid
+    tk_ok = enc.indices.is_valid().to_numpy(zero_copy_only=False)
+    idx = enc.indices.fill_null(0).to_numpy()
+
+    keep = ts_ok & bid_ok & ask_ok & tk_ok
+    rec = np.empty(int(keep.sum()), dtype=SPILL_DTYPE)
+    rec["tid"] = gids[idx[keep]]
+    rec["ts"] = ts[keep].astype(np.uint32)
+    rec["bid"] = bid[keep]
+    rec["ask"] = ask[keep]
+    return rec, len(keep) - len(rec)
+
+
+def spill(src, spill_dir, n_buckets, block_mb, log_path):
+    """Pass 1. Returns (tickers list indexed by id, rows kept, rows dropped)."""
+    reader = pacsv.open_csv(
+        src,
+        read_options=pacsv.ReadOptions(column_names=SOURCE_COLUMNS, skip_rows=1,
+                                       block_size=block_mb << 20),
+        parse_options=pacsv.ParseOptions(invalid_row_handler=lambda row: "skip"),
+        convert_options=pacsv.ConvertOptions(
+            include_columns=SOURCE_COLUMNS[:4],
+            column_types={"timestamp": pa.string(), "ticker": pa.string(),
+                          "bid": pa.string(), "ask": pa.string()},
+            strings_can_be_null=True,
+        ),
+    )
+    files = [open(os.path.join(spill_dir, f"bucket-{b:03d}.bin"), "wb") for b in range(n_buckets)]
+    ticker_ids, tickers = {}, []
+    kept = dropped = 0
+    start = time.time()
+    next_report = 20_000_000
+    try:
+        for batch in reader:
+            rec, n_drop = batch_records(batch, ticker_ids, tickers)
+            kept += len(rec)
+            dropped += n_drop
+            bucket = rec["tid"] % n_buckets
+            order = np.argsort(bucket, kind="stable")
+            rec, bucket = rec[order], bucket[order]
+            bounds = np.searchsorted(bucket, np.arange(n_buckets + 1))
+            for b in range(n_buckets):
+                if bounds[b + 1] > bounds[b]:
+                    rec[bounds[b]:bounds[b + 1]].tofile(files[b])
+            if kept + dropped >= next_report:
+                elapsed = time.time() - start
+                log(f"Pass 1: {kept + dropped:,} rows ({(kept + dropped) / elapsed:,.0f}/s), "
+                    f"kept={kept:,} dropped={dropped:,} tickers={len(tickers):,}", log_path)
+                next_report += 20_000_000
+    finally:
+        for f in files:
+            f.close()
+    return tickers, kept, dropped
+
+
+# ============================================================
+# Pass 2: bucket spill -> part file (one record batch per ticker)
+# ============================================================
+
+def write_part(spill_file, out_path, tickers, part):
+    """Sort one bucket by (ticker id, ts) and write it; returns index rows."""
+    rec = np.fromfile(spill_file, dtype=SPILL_DTYPE)
+    order = np.lexsort((rec["ts"], rec["tid"]))  # stable: equal ts keep log order
+    rec = rec[order]
+    starts = np.flatnonzero(np.r_[True, rec["tid"][1:] != rec["tid"][:-1]]) if len(rec) else []
+    ends = list(starts[1:]) + [len(rec)]
+    rows = []
+    with pa.OSFile(out_path, "wb") as sink, pa.ipc.new_file(sink, TICK_SCHEMA) as writer:
+        for batch_no, (s, e) in enumerate(zip(starts, ends)):
+            seg = rec[s:e]
+            writer.write_batch(pa.record_batch(
+                [pa.array(np.ascontiguousarray(seg["ts"])),
+                 pa.array(np.ascontiguousarray(seg["bid"])),
+                 pa.array(np.ascontiguousarray(seg["ask"]))],
+                schema=TICK_SCHEMA))
+            rows.append((tickers[int(seg["tid"][0])], part, batch_no, int(e - s),
+                         int(seg["ts"].min()), int(seg["ts"].max())))
+    return rows
+
+
+def build(src, out_dir, n_buckets, block_mb):
+    os.makedirs(out_dir, exist_ok=True)
+    log_path = os.path.join(out_dir, "build_log.txt")
+    spill_dir = os.path.join(out_dir, "_spill")
+    shutil.rmtree(spill_dir, ignore_errors=True)
+    os.makedirs(spill_dir)
+    t_start = time.time()
+
+    log("=" * 60, log_path)
+    log(f"build_bbo_archive_v1: {src} -> {out_dir} ({n_buckets} buckets)", log_path)
+    tickers, kept, dropped = spill(src, spill_dir, n_buckets, block_mb, log_path)
+    log(f"Pass 1 done: kept={kept:,} dropped={dropped:,} tickers={len(tickers):,} "
+        f"({time.time() - t_start:.0f}s)", log_path)
+
+    index_rows = []
+    for b in range(n_buckets):
+        spill_file = os.path.join(spill_dir, f"bucket-{b:03d}.bin")
+        index_rows += write_part(spill_file, part_path(out_dir, b), tickers, b)
+        os.remove(spill_file)
+    os.rmdir(spill_dir)
+
+    index_rows.sort()
+    cols = list(zip(*index_rows)) if index_rows else [[]] * 6
+    index = pa.table({
+        "ticker": pa.array(cols[0], pa.string()).dictionary_encode(),
+        "part": pa.array(cols[1], pa.uint16()),
+        "batch": pa.array(cols[2], pa.uint32()),
+        "n_rows": pa.array(cols[3], pa.int64()),
+        "ts_min": pa.array(cols[4], pa.uint32()),
+        "ts_max": pa.array(cols[5], pa.uint32()),
+    })
+    pq.write_table(index, index_path(out_dir), compression="snappy")
+
+    size_mb = sum(os.path.getsize(part_path(out_dir, b)) for b in range(n_buckets)) / 2**20
+    log(f"Pass 2 done: {len(index_rows):,} tickers in {n_buckets} parts, {size_mb:,.0f} MB", log_path)
+    log(f"Total: {time.time() - t_start:.0f}s", log_path)
+    log("=" * 60, log_path)
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    ap.add_argument("--src", default=SRC_PATH)
+    ap.add_argument("--out", default=ARCHIVE_DIR)
+    ap.add_argument("--buckets", type=int, default=N_BUCKETS)
+    ap.add_argument("--block-mb", type=int, default=BLOCK_MB)
+    args = ap.parse_args()
+    build(args.src, args.out, args.buckets, args.block_mb)
+
+
+if __name__ == "__main__":
+    main()
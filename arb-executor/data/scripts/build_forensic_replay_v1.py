@@ -37,6 +37,8 @@ from cell_key_helpers import (
     categorize, entry_band_idx, spread_band_name,
     detect_match_start, regime_for_moment, volume_intensity_for_market,
 )
+import g9_store
+from replay_kernel import TradeTape, PostFill, entry_fill
 
 
 # ============================================================
@@ -142,46 +144,23 @@ def candidate_id(c):
 # ============================================================
 
 def load_ticker_candles(ticker):
-    """Read g9_candles for one ticker via predicate pushdown. Return sorted DataFrame.
-    Returns None if the ticker has no candles (skipped marker)."""
-    table = pq.read_table(
-        CANDLES_PARQUET,
-        columns=["ticker", "end_period_ts", "yes_bid_close", "yes_ask_close", "volume_fp"],
-        filters=[("ticker", "=", ticker)],
-    )
-    if table.num_rows == 0:
-        return None
-    df = table.to_pandas().sort_values("end_period_ts").reset_index(drop=True)
-    return df
+    """Read g9_candles for one ticker via predicate pushdown (g9_store).
+    Returns sorted DataFrame or None if the ticker has no candles (skipped marker)."""
+    return g9_store.load_ticker_candles(ticker, path=CANDLES_PARQUET)
 
 
 def load_ticker_trades(ticker, start_ts_unix=None):
-    """Read g9_trades for one ticker via predicate pushdown.
-    If start_ts_unix is provided, filter to created_time >= that timestamp.
-    Returns sorted DataFrame or None if no trades."""
-    filters = [("ticker", "=", ticker)]
-    table = pq.read_table(
-        TRADES_PARQUET,
-        columns=["ticker", "created_time", "taker_side", "yes_price_dollars", "no_price_dollars", "count_fp"],
-        filters=filters,
-    )
-    if table.num_rows == 0:
-        return None
-    df = table.to_pandas()
-
-    # created_time is microsecond-precision timestamp (per Session 9 schema probe).
-    # Convert to unix seconds for arithmetic with end_period_ts.
-    # Per-row .timestamp() is precision-agnostic — avoids the microsecond-vs-nanosecond
-    # footgun where pd.to_datetime() of microsecond-precision ISO strings produces datetime64[us]
-    # arrays whose .astype("int64") returns microseconds (not nanoseconds), making // 10**9 yield
-    # values 1000x too small. The bug surfaced in Phase 1 as fill_rate=0% (every trade timestamp
-    # ~1.77e6 vs candle timestamp ~1.77e9, no overlap, so the forward-walk never matched).
-    df["created_time_ts"] = pd.to_datetime(df["created_time"]).map(lambda x: int(x.timestamp()))
-    df = df.sort_values("created_time_ts").reset_index(drop=True)
-
-    if start_ts_unix is not None:
-        df = df[df["created_time_ts"] >= start_ts_unix].reset_index(drop=True)
+    """Read g9_trades for one ticker via predicate pushdown (g9_store), sorted by
+    created_time_ts (unix seconds). Returns None if the ticker has no trades; a
+    start_ts_unix past its last trade gives an empty DataFrame.
 
+    created_time_ts comes from the build-time column when the parquet has it,
+    else from g9_store.iso_to_unix (ISO8601 parse; see its note on the
+    microsecond-vs-nanosecond bug that once produced fill_rate=0%).
+    """
+    df = g9_store.load_ticker_trades(ticker, path=TRADES_PARQUET)
+    if df is not None and start_ts_unix is not None:
+        df = df[df["created_time_ts"] >= start_ts_unix].reset_index(drop=True)
     return df
 
 
@@ -268,13 +247,15 @@ def matches_target(cell_state, target_key):
 # Per-moment 9-step replay
 # ============================================================
 
-def replay_one_moment(ticker, candles_df, trades_df, T0_unix, T0_cell,
+def replay_one_moment(ticker, candles_df, tape, T0_unix, T0_cell,
                       policy_type, policy_params,
                       settlement_ts_unix, settlement_value,
                       match_start_ts, log_path, log_warnings):
     """Execute spec Section 3.1 steps 2-7 for one (ticker, T0) entry moment.
 
     Per Phase 1 scope: limit policy with limit_c=10. Scenarios A and B both apply.
+    tape is the ticker's TradeTape (replay_kernel), built once per ticker; trades
+    before T0_unix are skipped by index.
 
     Returns a row dict suitable for Output 1 (replay_tape.parquet) schema.
     """
@@ -287,20 +268,17 @@ def replay_one_moment(ticker, candles_df, trades_df, T0_unix, T0_cell,
         horizon_cap_ts = T0_unix + int(horizon_min * 60)
     entry_timeout_ts = T0_unix + 240 * 60  # 240 min default per spec
 
-    # Step 3: walk trades forward looking for fill
+    # Step 3: first trade at/after T0 (up to the entry timeout / settlement) that fills us.
+    # Convention: taker_side names the side the taker BOUGHT (Session 9 empirical, 5,878-pair probe).
+    # Maker BID for yes is filled by a taker who BUYS no (= SELLS yes, hitting the bid).
+    # Therefore entry fill condition is taker_side == "no", not "yes" (replay_kernel.entry_fill).
     fill_time_unix = None
     fill_price = None
-    for _, trade in trades_df.iterrows():
-        t_unix = int(trade["created_time_ts"])
-        if t_unix > entry_timeout_ts or t_unix > settlement_ts_unix:
-            break
-        # Convention: taker_side names the side the taker BOUGHT (Session 9 empirical, 5,878-pair probe).
-        # Maker BID for yes is filled by a taker who BUYS no (= SELLS yes, hitting the bid).
-        # Therefore entry fill condition is taker_side == "no", not "yes".
-        if trade["taker_side"] == "no" and float(trade["yes_price_dollars"]) <= our_bid_price:
-            fill_time_unix = t_unix
-            fill_price = our_bid_price
-            break
+    fill_idx = entry_fill(tape, T0_unix, our_bid_price,
+                          min(entry_timeout_ts, settlement_ts_unix))
+    if fill_idx >= 0:
+        fill_time_unix = int(tape.ts[fill_idx])
+        fill_price = our_bid_price
 
     row = {
         "candidate_id": None,  # filled by caller
@@ -349,7 +327,7 @@ def replay_one_moment(ticker, candles_df, trades_df, T0_unix, T0_cell,
         # Fall back to A if no fill_time cell — A and B converge
         scenario_B_target = scenario_A_target
 
-    # Step 6: walk forward from fill_time looking for kiss
+    # Step 6: first kiss (taker="yes" at/above target) in [fill_time, horizon]
     horizon_for_exit_ts = min(horizon_cap_ts, settlement_ts_unix)
 
     exit_A_time = None
@@ -357,22 +335,16 @@ def replay_one_moment(ticker, candles_df, trades_df, T0_unix, T0_cell,
     exit_B_time = None
     exit_B_price = None
 
-    post_fill_trades = trades_df[trades_df["created_time_ts"] >= fill_time_unix].reset_index(drop=True)
-    for _, trade in post_fill_trades.iterrows():
-        t_unix = int(trade["created_time_ts"])
-        if t_unix > horizon_for_exit_ts:
-            break
-        if trade["taker_side"] != "yes":
-            continue  # Convention: maker SELL for yes is filled by taker who BUYS yes (taker_side == "yes"), paying ask.
-        yes_price = float(trade["yes_price_dollars"])
-        if exit_A_time is None and yes_price >= scenario_A_target:
-            exit_A_time = t_unix
-            exit_A_price = yes_price
-        if exit_B_time is None and yes_price >= scenario_B_target:
-            exit_B_time = t_unix
-            exit_B_price = yes_price
-        if exit_A_time is not None and exit_B_time is not None:
-            break
+    # Convention: maker SELL for yes is filled by taker who BUYS yes (taker_side == "yes"), paying ask.
+    post = PostFill(tape, fill_time_unix, fill_price, horizon_for_exit_ts)
+    j = post.first_yes_at_or_above(scenario_A_target)
+    if j >= 0:
+        exit_A_time = int(tape.ts[j])
+        exit_A_price = float(tape.price[j])
+    j = post.first_yes_at_or_above(scenario_B_target)
+    if j >= 0:
+        exit_B_time = int(tape.ts[j])
+        exit_B_price = float(tape.price[j])
 
     # Resolve scenario A outcome
     if exit_A_time is not None:
@@ -517,6 +489,7 @@ def phase1():
         if trades_df is None:
             skipped_no_trades += 1
             continue
+        tape = TradeTape.from_df(trades_df)
 
         # Process moments chronologically until budget hit or ticker exhausted
         for (i, t, bid_f, ask_f, regime, eb, sb, vi, cat) in matching_moments:
@@ -529,11 +502,10 @@ def phase1():
                 "yes_bid_close": bid_f, "yes_ask_close": ask_f,
             }
             # Trades from T0 forward only
-            forward_trades = trades_df[trades_df["created_time_ts"] >= t].reset_index(drop=True)
             row = replay_one_moment(
                 ticker=ticker,
                 candles_df=candles_df,
-                trades_df=forward_trades,
+                tape=tape,
                 T0_unix=t,
                 T0_cell=T0_cell,
                 policy_type=policy_type,
@@ -717,6 +689,7 @@ def phase2():
         if trades_df is None:
             skipped_no_trades += 1
             continue
+        tape = TradeTape.from_df(trades_df)
 
         for (i, t, bid_f, ask_f, regime, eb, sb, vi, cat) in matching_moments:
             T0_cell = {
@@ -724,11 +697,10 @@ def phase2():
                 "spread_band": sb, "volume_intensity": vi, "category": cat,
                 "yes_bid_close": bid_f, "yes_ask_close": ask_f,
             }
-            forward_trades = trades_df[trades_df["created_time_ts"] >= t].reset_index(drop=True)
             row = replay_one_moment(
                 ticker=ticker,
                 candles_df=candles_df,
-                trades_df=forward_trades,
+                tape=tape,
                 T0_unix=t,
                 T0_cell=T0_cell,
                 policy_type=policy_type,
@@ -987,6 +959,7 @@ def phase3(n_per_cat=20):
             if trades_df is None:
                 skipped_no_trades += 1
                 continue
+            tape = TradeTape.from_df(trades_df)
 
             for (i, t, bid_f, ask_f, regime, eb, sb, vi, cat_ck) in matching_moments:
                 T0_cell = {
@@ -994,9 +967,8 @@ def phase3(n_per_cat=20):
                     "volume_intensity": vi, "category": cat_ck,
                     "yes_bid_close": bid_f, "yes_ask_close": ask_f,
                 }
-                forward_trades = trades_df[trades_df["created_time_ts"] >= t].reset_index(drop=True)
                 row = replay_one_moment(
-                    ticker=ticker, candles_df=candles_df, trades_df=forward_trades,
+                    ticker=ticker, candles_df=candles_df, tape=tape,
                     T0_unix=t, T0_cell=T0_cell,
                     policy_type=policy_type, policy_params=policy_params,
                     settlement_ts_unix=settlement_ts_unix, settlement_value=settlement_value,
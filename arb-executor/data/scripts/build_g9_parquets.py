@@ -19,8 +19,20 @@ Schema normalization (per LESSONS F29):
 - 2026-era markets use _dollars-suffixed names (price_close_dollars, yes_bid_close_dollars, etc.)
 - Normalized to bare names as canonical.
 
-Memory strategy: streaming append in chunks of N markets to avoid OOM on 1.9GB VPS.
-Writes parquet incrementally via pyarrow ParquetWriter.
+Memory strategy: streaming append to avoid OOM on 1.9GB VPS. Writes parquet
+incrementally via pyarrow ParquetWriter, one row group at a time.
+
+Layout (for per-ticker predicate pushdown, see g9_store.py):
+- markets are written grouped by category (cell_key_helpers.CATEGORIES order),
+  then by ticker; each market's rows sorted by time (end_period_ts / created_time)
+- row groups hold whole tickers of one category, ~ROW_GROUP_ROWS rows each, so
+  a ("ticker", "=", T) filter skips every row group but one or two on the
+  ticker min/max statistics
+- ticker / taker_side dictionary-encoded; statistics written for every column
+- trades carry created_time_ts (int64 unix seconds, parsed from the ISO8601
+  created_time) so time-window filters prune on its min/max too
+The files stay single flat parquets at the same paths, so existing
+pq.read_table(..., filters=[("ticker", "=", T)]) readers need no change.
 
 Per ROADMAP T17, gated by T18 (candles-semantics confirmed G18: candles ARE BBO snapshots).
 """
@@ -32,14 +44,20 @@ import json
 import glob
 import time
 from datetime import datetime, timezone
+from pathlib import Path
 import pyarrow as pa
 import pyarrow.parquet as pq
 
+sys.path.insert(0, str(Path(__file__).parent))
+from cell_key_helpers import CATEGORIES, categorize
+
 HP_DIR = "/root/Omi-Workspace/arb-executor/data/historical_pull"
 OUT_DIR = "/root/Omi-Workspace/arb-executor/data/durable"
 LOG_PATH = "/root/Omi-Workspace/arb-executor/data/durable/g9_parquet_build.log"
 
-CHUNK_SIZE_MARKETS = 500  # markets per chunk for streaming write
+CHUNK_SIZE_MARKETS = 500  # markets between progress log lines
+ROW_GROUP_ROWS = 65536  # target rows per row group; groups close on ticker boundaries
+DICTIONARY_COLS = ["ticker", "taker_side"]
 
 CANDLE_COLS_CANONICAL = [
     "ticker",
@@ -51,7 +69,7 @@ CANDLE_COLS_CANONICAL = [
 ]
 TRADE_COLS_CANONICAL = [
     "count_fp", "created_time", "no_price_dollars", "taker_side",
-    "ticker", "trade_id", "yes_price_dollars",
+    "ticker", "trade_id", "yes_price_dollars", "created_time_ts",
 ]
 
 
@@ -84,6 +102,21 @@ def parse_floatish(s):
         return None
 
 
+def parse_iso_ts(s):
+    """ISO8601 created_time -> int unix seconds (truncated), None if unparseable.
+
+    Same value as the producers' pd.to_datetime(format="ISO8601") + per-row
+    int(x.timestamp()); fromisoformat accepts the 'Z' / '+00:00' and
+    variable-precision fraction variants that coexist in g9 trades.
+    """
+    if s is None or s == "":
+        return None
+    try:
+        return int(datetime.fromisoformat(s).timestamp())
+    except (TypeError, ValueError):
+        return None
+
+
 def parse_intish(s):
     if s is None or s == "":
         return None
@@ -128,18 +161,66 @@ def trade_pyarrow_schema():
         ("ticker", pa.string()),
         ("trade_id", pa.string()),
         ("yes_price_dollars", pa.float64()),
+        ("created_time_ts", pa.int64()),
     ])
 
 
+def ticker_of(fpath):
+    return os.path.basename(fpath).replace(".csv", "")
+
+
+def files_by_category(paths):
+    """paths ordered by (category, ticker), categories in CATEGORIES order."""
+    return sorted(paths, key=lambda p: (CATEGORIES.index(categorize(ticker_of(p))), ticker_of(p)))
+
+
+class TickerRowGroupWriter:
+    """ParquetWriter that buffers per-ticker tables and writes them as row groups
+    of ~ROW_GROUP_ROWS rows, never splitting a ticker and never mixing categories,
+    so row-group ticker min/max stats stay tight."""
+
+    def __init__(self, out_path, schema):
+        self.writer = pq.ParquetWriter(
+            out_path, schema, compression="snappy",
+            use_dictionary=DICTIONARY_COLS, write_statistics=True,
+        )
+        self.pending = []
+        self.pending_rows = 0
+        self.category = None
+        self.row_groups = 0
+
+    def add(self, ticker, table):
+        cat = categorize(ticker)
+        if cat != self.category:
+            self.flush()
+            self.category = cat
+        self.pending.append(table)
+        self.pending_rows += table.num_rows
+        if self.pending_rows >= ROW_GROUP_ROWS:
+            self.flush()
+
+    def flush(self):
+        if self.pending_rows:
+            tbl = pa.concat_tables(self.pending)
+            self.writer.write_table(tbl, row_group_size=tbl.num_rows)
+            self.row_groups += 1
+        self.pending = []
+        self.pending_rows = 0
+
+    def close(self):
+        self.flush()
+        self.writer.close()
+
+
 def build_candles():
     log("=== Starting candles parquet build ===")
-    candle_files = sorted(glob.glob(os.path.join(HP_DIR, "candlesticks", "*.csv")))
+    candle_files = files_by_category(glob.glob(os.path.join(HP_DIR, "candlesticks", "*.csv")))
     n_files = len(candle_files)
     log(f"Found {n_files} candle files")
 
     out_path = os.path.join(OUT_DIR, "g9_candles.parquet")
     schema = candle_pyarrow_schema()
-    writer = pq.ParquetWriter(out_path, schema, compression="snappy")
+    writer = TickerRowGroupWriter(out_path, schema)
 
     era_2025_count = 0
     era_2026_count = 0
@@ -148,10 +229,9 @@ def build_candles():
     files_failed = 0
     start = time.time()
 
-    chunk_buffer = {col: [] for col in CANDLE_COLS_CANONICAL}
-
     for fi, fpath in enumerate(candle_files):
-        ticker = os.path.basename(fpath).replace(".csv", "")
+        ticker = ticker_of(fpath)
+        buf = {col: [] for col in CANDLE_COLS_CANONICAL}
         try:
             with open(fpath) as f:
                 reader = csv.DictReader(f)
@@ -161,93 +241,102 @@ def build_candles():
                     era_2025_count += 1
                 for row in reader:
                     norm = normalize_candle_row(row, ticker)
-                    chunk_buffer["ticker"].append(norm["ticker"])
-                    chunk_buffer["end_period_ts"].append(parse_intish(norm["end_period_ts"]))
-                    chunk_buffer["open_interest_fp"].append(parse_intish(norm["open_interest_fp"]))
+                    buf["ticker"].append(norm["ticker"])
+                    buf["end_period_ts"].append(parse_intish(norm["end_period_ts"]))
+                    buf["open_interest_fp"].append(parse_intish(norm["open_interest_fp"]))
                     for col in ["price_close", "price_high", "price_low", "price_mean", "price_open", "price_previous"]:
-                        chunk_buffer[col].append(parse_floatish(norm[col]))
-                    chunk_buffer["volume_fp"].append(parse_intish(norm["volume_fp"]))
+                        buf[col].append(parse_floatish(norm[col]))
+                    buf["volume_fp"].append(parse_intish(norm["volume_fp"]))
                     for col in ["yes_ask_close", "yes_ask_high", "yes_ask_low", "yes_ask_open",
                                 "yes_bid_close", "yes_bid_high", "yes_bid_low", "yes_bid_open"]:
-                        chunk_buffer[col].append(parse_floatish(norm[col]))
-                    rows_written += 1
+                        buf[col].append(parse_floatish(norm[col]))
+            tbl = pa.table(buf, schema=schema).sort_by("end_period_ts")
             files_processed += 1
         except Exception as e:
+            tbl = None
             files_failed += 1
             log(f"FAILED candle file {fpath}: {e}")
+        if tbl is not None:
+            writer.add(ticker, tbl)  # write errors propagate, as the chunked writes did
+            rows_written += tbl.num_rows
 
         if (fi + 1) % CHUNK_SIZE_MARKETS == 0 or (fi + 1) == n_files:
-            try:
-                tbl = pa.table(chunk_buffer, schema=schema)
-                writer.write_table(tbl)
-                chunk_buffer = {col: [] for col in CANDLE_COLS_CANONICAL}
-                elapsed = time.time() - start
-                rate = (fi + 1) / elapsed if elapsed > 0 else 0
-                eta_sec = (n_files - fi - 1) / rate if rate > 0 else 0
-                log(f"Candles: {fi+1}/{n_files} markets, {rows_written:,} rows, "
-                    f"era25={era_2025_count}, era26={era_2026_count}, "
-                    f"failed={files_failed}, elapsed={elapsed:.0f}s, ETA={eta_sec:.0f}s")
-            except Exception as e:
-                log(f"FAILED to write chunk at file {fi+1}: {e}")
-                raise
-
-    writer.close()
-    log(f"=== Candles done. {rows_written:,} rows, era25={era_2025_count}, era26={era_2026_count}, failed={files_failed} ===")
+            elapsed = time.time() - start
+            rate = (fi + 1) / elapsed if elapsed > 0 else 0
+            eta_sec = (n_files - fi - 1) / rate if rate > 0 else 0
+            log(f"Candles: {fi+1}/{n_files} markets, {rows_written:,} rows, "
+                f"era25={era_2025_count}, era26={era_2026_count}, "
+                f"failed={files_failed}, elapsed={elapsed:.0f}s, ETA={eta_sec:.0f}s")
+
+    try:
+        writer.close()
+    except Exception as e:
+        log(f"FAILED to write final candle row group: {e}")
+        raise
+    log(f"=== Candles done. {rows_written:,} rows in {writer.row_groups} row groups, "
+        f"era25={era_2025_count}, era26={era_2026_count}, failed={files_failed} ===")
     log(f"Output size: {os.path.getsize(out_path) / 1024 / 1024:.1f} MB")
     return rows_written
 
 
 def build_trades():
     log("=== Starting trades parquet build ===")
-    trade_files = sorted(glob.glob(os.path.join(HP_DIR, "trades", "*.csv")))
+    trade_files = files_by_category(glob.glob(os.path.join(HP_DIR, "trades", "*.csv")))
     n_files = len(trade_files)
     log(f"Found {n_files} trade files")
 
     out_path = os.path.join(OUT_DIR, "g9_trades.parquet")
     schema = trade_pyarrow_schema()
-    writer = pq.ParquetWriter(out_path, schema, compression="snappy")
+    writer = TickerRowGroupWriter(out_path, schema)
 
     rows_written = 0
     files_processed = 0
     files_failed = 0
+    unparsed_ts = 0
     start = time.time()
 
-    chunk_buffer = {col: [] for col in TRADE_COLS_CANONICAL}
-
     for fi, fpath in enumerate(trade_files):
+        buf = {col: [] for col in TRADE_COLS_CANONICAL}
         try:
             with open(fpath) as f:
                 reader = csv.DictReader(f)
                 for row in reader:
-                    chunk_buffer["count_fp"].append(parse_intish(row.get("count_fp")))
-                    chunk_buffer["created_time"].append(row.get("created_time"))
-                    chunk_buffer["no_price_dollars"].append(parse_floatish(row.get("no_price_dollars")))
-                    chunk_buffer["taker_side"].append(row.get("taker_side"))
-                    chunk_buffer["ticker"].append(row.get("ticker"))
-                    chunk_buffer["trade_id"].append(row.get("trade_id"))
-                    chunk_buffer["yes_price_dollars"].append(parse_floatish(row.get("yes_price_dollars")))
-                    rows_written += 1
+                    created_ts = parse_iso_ts(row.get("created_time"))
+                    if created_ts is None:
+                        unparsed_ts += 1
+                    buf["count_fp"].append(parse_intish(row.get("count_fp")))
+                    buf["created_time"].append(row.get("created_time"))
+                    buf["no_price_dollars"].append(parse_floatish(row.get("no_price_dollars")))
+                    buf["taker_side"].append(row.get("taker_side"))
+                    buf["ticker"].append(row.get("ticker"))
+                    buf["trade_id"].append(row.get("trade_id"))
+                    buf["yes_price_dollars"].append(parse_floatish(row.get("yes_price_dollars")))
+                    buf["created_time_ts"].append(created_ts)
+            # stable sort: trades within the same second keep file order
+            tbl = pa.table(buf, schema=schema).sort_by("created_time_ts")
             files_processed += 1
         except Exception as e:
+            tbl = None
             files_failed += 1
             log(f"FAILED trade file {fpath}: {e}")
+        if tbl is not None:
+            writer.add(ticker_of(fpath), tbl)  # write errors propagate, as the chunked writes did
+            rows_written += tbl.num_rows
 
         if (fi + 1) % CHUNK_SIZE_MARKETS == 0 or (fi + 1) == n_files:
-            try:
-                tbl = pa.table(chunk_buffer, schema=schema)
-                writer.write_table(tbl)
-                chunk_buffer = {col: [] for col in TRADE_COLS_CANONICAL}
-                elapsed = time.time() - start
-                rate = (fi + 1) / elapsed if elapsed > 0 else 0
-                eta_sec = (n_files - fi - 1) / rate if rate > 0 else 0
-                log(f"Trades: {fi+1}/{n_files} markets, {rows_written:,} rows, "
-                    f"failed={files_failed}, elapsed={elapsed:.0f}s, ETA={eta_sec:.0f}s")
-            except Exception as e:
-                log(f"FAILED to write trade chunk at file {fi+1}: {e}")
-                raise
-
-    writer.close()
-    log(f"=== Trades done. {rows_written:,} rows, failed={files_failed} ===")
+            elapsed = time.time() - start
+            rate = (fi + 1) / elapsed if elapsed > 0 else 0
+            eta_sec = (n_files - fi - 1) / rate if rate > 0 else 0
+            log(f"Trades: {fi+1}/{n_files} markets, {rows_written:,} rows, "
+                f"failed={files_failed}, elapsed={elapsed:.0f}s, ETA={eta_sec:.0f}s")
+
+    try:
+        writer.close()
+    except Exception as e:
+        log(f"FAILED to write final trade row group: {e}")
+        raise
+    log(f"=== Trades done. {rows_written:,} rows in {writer.row_groups} row groups, "
+        f"unparsed created_time={unparsed_ts}, failed={files_failed} ===")
     log(f"Output size: {os.path.getsize(out_path) / 1024 / 1024:.1f} MB")
     return rows_written
 
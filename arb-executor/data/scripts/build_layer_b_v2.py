@@ -56,6 +56,11 @@ from cell_key_helpers import (
     categorize, entry_band_idx, spread_band_name,
     detect_match_start, regime_for_moment, volume_intensity_for_market,
 )
+import g9_store
+from replay_kernel import (
+    EXIT_HORIZON, EXIT_LIMIT, EXIT_TRAIL,
+    TradeTape, PostFill, entry_fill, first_exits,
+)
 
 
 # ============================================================
@@ -162,44 +167,22 @@ def candidate_id(c):
 # ============================================================
 
 def load_ticker_candles(ticker):
-    """Read g9_candles for one ticker via predicate pushdown.
-    Returns sorted DataFrame or None if no candles."""
-    table = pq.read_table(
-        CANDLES_PARQUET,
-        columns=["ticker", "end_period_ts", "yes_bid_close", "yes_ask_close", "volume_fp"],
-        filters=[("ticker", "=", ticker)],
-    )
-    if table.num_rows == 0:
-        return None
-    return table.to_pandas().sort_values("end_period_ts").reset_index(drop=True)
+    """Read g9_candles for one ticker via predicate pushdown (g9_store).
+    Returns sorted DataFrame or None if the ticker has no candles (skipped marker)."""
+    return g9_store.load_ticker_candles(ticker, path=CANDLES_PARQUET)
 
 
 def load_ticker_trades(ticker, start_ts_unix=None):
-    """Read g9_trades for one ticker via predicate pushdown.
+    """Read g9_trades for one ticker via predicate pushdown (g9_store), sorted by
+    created_time_ts (unix seconds). Returns None if the ticker has no trades; a
+    start_ts_unix past its last trade gives an empty DataFrame.
 
-    Per Phase 1 timestamp invariant (forensic_replay_v1 commit `43ae049`):
-    `created_time` is microsecond-precision timestamp. Convert via per-row
-    `.timestamp()` to avoid the microsecond-vs-nanosecond bug where
-    `pd.to_datetime().astype('int64') // 10**9` produces values 1000× too small.
+    created_time_ts comes from the build-time column when the parquet has it,
+    else from g9_store.iso_to_unix (ISO8601 parse; see its note on the
+    microsecond-vs-nanosecond bug that once produced fill_rate=0%).
     """
-    table = pq.read_table(
-        TRADES_PARQUET,
-        columns=["ticker", "created_time", "taker_side", "yes_price_dollars",
-                 "no_price_dollars", "count_fp"],
-        filters=[("ticker", "=", ticker)],
-    )
-    if table.num_rows == 0:
-        return None
-    df = table.to_pandas()
-    # ISO8601 format='ISO8601' invokes pandas' flexible ISO8601 parser, handling mixed
-    # variants in the g9_trades created_time column: '2026-04-22T19:24:34.123456+00:00',
-    # '2026-02-05T16:30:19.13876Z', and '2026-02-16T14:48:39Z' all coexist. Default
-    # auto-inference picks one strict format from the sampled cache and crashes on rows
-    # that don't match (Session 11 Phase 3 crash at cell 20, KXATPCHALLENGERMATCH-26FEB05ROTPRI-ROT).
-    df["created_time_ts"] = pd.to_datetime(df["created_time"], format="ISO8601") \
-        .map(lambda x: int(x.timestamp()))
-    df = df.sort_values("created_time_ts").reset_index(drop=True)
-    if start_ts_unix is not None:
+    df = g9_store.load_ticker_trades(ticker, path=TRADES_PARQUET)
+    if df is not None and start_ts_unix is not None:
         df = df[df["created_time_ts"] >= start_ts_unix].reset_index(drop=True)
     return df
 
@@ -271,7 +254,7 @@ def cell_key_str(cell_state):
 # Per-moment 9-step replay (Phase 1: limit-policy semantics)
 # ============================================================
 
-def replay_one_moment(ticker, candles_df, trades_df, T0_unix, T0_cell,
+def replay_one_moment(ticker, candles_df, tape, T0_unix, T0_cell,
                      policy_type, policy_params,
                      settlement_ts_unix, settlement_value,
                      match_start_ts, log_path, log_warnings):
@@ -283,6 +266,9 @@ def replay_one_moment(ticker, candles_df, trades_df, T0_unix, T0_cell,
     Phase 2/3 extend to vectorized-policy evaluation across the ~53 non-settle
     policies on each cell.
 
+    tape is the ticker's TradeTape (replay_kernel); trades before T0_unix are
+    skipped by index, so callers build it once per ticker.
+
     Returns a row dict suitable for Output 1 (replay_tape_phase1.parquet) schema.
     """
     our_bid_price = T0_cell["yes_bid_close"]
@@ -294,17 +280,14 @@ def replay_one_moment(ticker, candles_df, trades_df, T0_unix, T0_cell,
         horizon_cap_ts = T0_unix + int(horizon_min * 60)
     entry_timeout_ts = T0_unix + 240 * 60
 
-    # Step 3: walk trades forward looking for fill (taker_side == "no" hits our bid)
+    # Step 3: first trade at/after T0 that fills us (taker_side == "no" hits our bid)
     fill_time_unix = None
     fill_price = None
-    for _, trade in trades_df.iterrows():
-        t_unix = int(trade["created_time_ts"])
-        if t_unix > entry_timeout_ts or t_unix > settlement_ts_unix:
-            break
-        if trade["taker_side"] == "no" and float(trade["yes_price_dollars"]) <= our_bid_price:
-            fill_time_unix = t_unix
-            fill_price = our_bid_price
-            break
+    fill_idx = entry_fill(tape, T0_unix, our_bid_price,
+                          min(entry_timeout_ts, settlement_ts_unix))
+    if fill_idx >= 0:
+        fill_time_unix = int(tape.ts[fill_idx])
+        fill_price = our_bid_price
 
     row = {
         "candidate_id": None,
@@ -344,29 +327,22 @@ def replay_one_moment(ticker, candles_df, trades_df, T0_unix, T0_cell,
     else:
         scenario_B_target = scenario_A_target
 
-    # Step 6: walk trades forward from fill_time looking for the kiss
+    # Step 6: first taker="yes" trade at/above each target in [fill_time, horizon]
     horizon_for_exit_ts = min(horizon_cap_ts, settlement_ts_unix)
     exit_A_time = None
     exit_A_price = None
     exit_B_time = None
     exit_B_price = None
 
-    post_fill_trades = trades_df[trades_df["created_time_ts"] >= fill_time_unix].reset_index(drop=True)
-    for _, trade in post_fill_trades.iterrows():
-        t_unix = int(trade["created_time_ts"])
-        if t_unix > horizon_for_exit_ts:
-            break
-        if trade["taker_side"] != "yes":
-            continue
-        yes_price = float(trade["yes_price_dollars"])
-        if exit_A_time is None and yes_price >= scenario_A_target:
-            exit_A_time = t_unix
-            exit_A_price = yes_price
-        if exit_B_time is None and yes_price >= scenario_B_target:
-            exit_B_time = t_unix
-            exit_B_price = yes_price
-        if exit_A_time is not None and exit_B_time is not None:
-            break
+    post = PostFill(tape, fill_time_unix, fill_price, horizon_for_exit_ts)
+    j = post.first_yes_at_or_above(scenario_A_target)
+    if j >= 0:
+        exit_A_time = int(tape.ts[j])
+        exit_A_price = float(tape.price[j])
+    j = post.first_yes_at_or_above(scenario_B_target)
+    if j >= 0:
+        exit_B_time = int(tape.ts[j])
+        exit_B_price = float(tape.price[j])
 
     # Step 7: resolve outcomes
     if exit_A_time is not None:
@@ -502,6 +478,7 @@ def phase1():
         if trades_df is None:
             skipped_no_trades += 1
             continue
+        tape = TradeTape.from_df(trades_df)
 
         for (i, t, bid_f, ask_f, regime, eb, sb, vi, cat) in matching_moments:
             if moments_collected >= PHASE1_MOMENT_BUDGET:
@@ -511,9 +488,8 @@ def phase1():
                 "spread_band": sb, "volume_intensity": vi, "category": cat,
                 "yes_bid_close": bid_f, "yes_ask_close": ask_f,
             }
-            forward_trades = trades_df[trades_df["created_time_ts"] >= t].reset_index(drop=True)
             row = replay_one_moment(
-                ticker=ticker, candles_df=candles_df, trades_df=forward_trades,
+                ticker=ticker, candles_df=candles_df, tape=tape,
                 T0_unix=t, T0_cell=T0_cell,
                 policy_type=policy_type, policy_params=policy_params,
                 settlement_ts_unix=settlement_ts_unix, settlement_value=settlement_value,
@@ -668,15 +644,15 @@ def build_cell_policy_grid(c):
     return grid, cell
 
 
-def evaluate_moment_vectorized(ticker, candles_df, trades_df, T0_unix, T0_cell,
+def evaluate_moment_vectorized(ticker, candles_df, tape, T0_unix, T0_cell,
                                policy_grid, settlement_ts_unix, settlement_value,
                                match_start_ts):
     """Evaluate ALL policies on the cell against one (ticker, T0) entry moment.
 
-    Per spec Section 3.4 v2 per-policy semantics. Single tick walk for entry fill,
-    single tick walk for exit detection — at each tick event, all policies in the
-    cell's grid are updated in vector. Per-policy state arrays track exit flag,
-    exit time/price/outcome, and trailing running_max where applicable.
+    Per spec Section 3.4 v2 per-policy semantics. Entry fill and every policy's
+    first exit are searchsorted lookups on the ticker's TradeTape (replay_kernel)
+    instead of tick walks; tape is built once per ticker and trades before
+    T0_unix are skipped by index.
 
     Returns a list of per-policy row dicts. One row per (policy_idx) for this moment.
     """
@@ -684,17 +660,14 @@ def evaluate_moment_vectorized(ticker, candles_df, trades_df, T0_unix, T0_cell,
     entry_timeout_ts = T0_unix + 240 * 60
     n = len(policy_grid)
 
-    # Step 3: entry fill walk (single pass, shared across all policies)
+    # Step 3: entry fill (shared across all policies)
     fill_time_unix = None
     fill_price = None
-    for _, trade in trades_df.iterrows():
-        t_unix = int(trade["created_time_ts"])
-        if t_unix > entry_timeout_ts or t_unix > settlement_ts_unix:
-            break
-        if trade["taker_side"] == "no" and float(trade["yes_price_dollars"]) <= our_bid_price:
-            fill_time_unix = t_unix
-            fill_price = our_bid_price
-            break
+    fill_idx = entry_fill(tape, T0_unix, our_bid_price,
+                          min(entry_timeout_ts, settlement_ts_unix))
+    if fill_idx >= 0:
+        fill_time_unix = int(tape.ts[fill_idx])
+        fill_price = our_bid_price
 
     base_row = {
         "ticker": ticker, "T0_unix": T0_unix,
@@ -760,14 +733,12 @@ def evaluate_moment_vectorized(ticker, candles_df, trades_df, T0_unix, T0_cell,
 
     max_horizon = max(horizon_cap_ts)
 
-    # Step 6: numpy-vectorized post-fill walk.
-    # Replaces the Python per-tick per-policy for-loop with array-shape ops on per-policy
-    # state. Order-of-operations preserved: horizon-fire first, then limit (taker="yes"),
-    # then trailing (taker="no"); mutual exclusion enforced via the ~exited mask. The
-    # running_max update precedes the trail trigger so a fresh-high tick doesn't fire
-    # the policy at the same tick it set the max. Byte-equivalence with the prior
-    # Python implementation verified Session 11 Phase 2 re-run (5/5 limit candidates
-    # delta $0.0000 vs v1 phase3).
+    # Step 6: first exit of every policy, searched over the post-fill trades up to
+    # max_horizon. first_exits keeps the order-of-operations of the tick walk it
+    # replaced: horizon-fire first (on the first trade past the cap), then limit
+    # (taker="yes"), then trailing (taker="no"); the running_max update precedes
+    # the trail trigger so a fresh-high tick doesn't fire the policy at the same
+    # tick it set the max.
     horizon_cap_arr = np.array(horizon_cap_ts, dtype=np.int64)
     target_A_arr = np.array([t if t is not None else np.nan for t in target_A], dtype=np.float64)
     target_B_arr = np.array([t if t is not None else np.nan for t in target_B], dtype=np.float64)
@@ -781,116 +752,27 @@ def evaluate_moment_vectorized(ticker, candles_df, trades_df, T0_unix, T0_cell,
                                                             "trailing", "limit_trailing")
                                        for p in policy_grid], dtype=bool)
 
-    exited_A = np.zeros(n, dtype=bool)
-    exited_B = np.zeros(n, dtype=bool)
-    exit_time_A = np.full(n, -1, dtype=np.int64)
-    exit_time_B = np.full(n, -1, dtype=np.int64)
-    exit_price_A = np.full(n, np.nan, dtype=np.float64)
-    exit_price_B = np.full(n, np.nan, dtype=np.float64)
-    exit_outcome_A = np.empty(n, dtype=object)
-    exit_outcome_B = np.empty(n, dtype=object)
-    running_max_A = np.full(n, fill_price, dtype=np.float64)
-    running_max_B = np.full(n, fill_price, dtype=np.float64)
-    last_observed_bid = fill_price
-
-    # Convert post-fill trades to numpy arrays for fast iteration (avoid pandas iterrows())
-    pft = trades_df[trades_df["created_time_ts"] >= fill_time_unix].reset_index(drop=True)
-    trade_times = pft["created_time_ts"].values.astype(np.int64)
-    trade_sides = pft["taker_side"].values  # object array of "yes"/"no" strings
-    trade_prices = pft["yes_price_dollars"].values.astype(np.float64)
-
-    n_ticks = len(trade_times)
-    for tick_idx in range(n_ticks):
-        t_unix = trade_times[tick_idx]
-        if t_unix > max_horizon:
-            break
-        taker = trade_sides[tick_idx]
-        yes_price = trade_prices[tick_idx]
-
-        if taker == "no":
-            last_observed_bid = yes_price
-
-        # --- Scenario A: horizon-fire first
-        horizon_now_A = (~exited_A) & (t_unix > horizon_cap_arr)
-        if horizon_now_A.any():
-            fired_mask = horizon_now_A & is_horizon_fires_type
-            expired_mask = horizon_now_A & ~is_horizon_fires_type
-            exit_time_A[horizon_now_A] = horizon_cap_arr[horizon_now_A]
-            exit_price_A[fired_mask] = last_observed_bid  # expired keeps NaN
-            exit_outcome_A[fired_mask] = "horizon_fired"
-            exit_outcome_A[expired_mask] = "horizon_expired"
-            exited_A |= horizon_now_A
-
-        # --- Scenario A: limit threshold (taker="yes" only)
-        if taker == "yes":
-            limit_fire_A = (~exited_A) & is_limit_type & (~np.isnan(target_A_arr)) \
-                           & (yes_price >= target_A_arr)
-            if limit_fire_A.any():
-                exit_time_A[limit_fire_A] = t_unix
-                exit_price_A[limit_fire_A] = yes_price
-                exit_outcome_A[limit_fire_A] = "fired_at_target"
-                exited_A |= limit_fire_A
-
-        # --- Scenario A: trailing (taker="no" only). Update running_max BEFORE trigger.
-        if taker == "no":
-            trail_active_A = (~exited_A) & is_trail_type
-            update_max_A = trail_active_A & (yes_price > running_max_A)
-            running_max_A[update_max_A] = yes_price
-            trail_fire_A = trail_active_A & (~np.isnan(trail_c_dollars)) \
-                           & (yes_price <= running_max_A - trail_c_dollars)
-            if trail_fire_A.any():
-                exit_time_A[trail_fire_A] = t_unix
-                exit_price_A[trail_fire_A] = yes_price
-                exit_outcome_A[trail_fire_A] = "trailing_fired"
-                exited_A |= trail_fire_A
-
-        # --- Scenario B (mirror A with B-side arrays)
-        horizon_now_B = (~exited_B) & (t_unix > horizon_cap_arr)
-        if horizon_now_B.any():
-            fired_mask = horizon_now_B & is_horizon_fires_type
-            expired_mask = horizon_now_B & ~is_horizon_fires_type
-            exit_time_B[horizon_now_B] = horizon_cap_arr[horizon_now_B]
-            exit_price_B[fired_mask] = last_observed_bid
-            exit_outcome_B[fired_mask] = "horizon_fired"
-            exit_outcome_B[expired_mask] = "horizon_expired"
-            exited_B |= horizon_now_B
-
-        if taker == "yes":
-            limit_fire_B = (~exited_B) & is_limit_type & (~np.isnan(target_B_arr)) \
-                           & (yes_price >= target_B_arr)
-            if limit_fire_B.any():
-                exit_time_B[limit_fire_B] = t_unix
-                exit_price_B[limit_fire_B] = yes_price
-                exit_outcome_B[limit_fire_B] = "fired_at_target"
-                exited_B |= limit_fire_B
-
-        if taker == "no":
-            trail_active_B = (~exited_B) & is_trail_type
-            update_max_B = trail_active_B & (yes_price > running_max_B)
-            running_max_B[update_max_B] = yes_price
-            trail_fire_B = trail_active_B & (~np.isnan(trail_c_dollars)) \
-                           & (yes_price <= running_max_B - trail_c_dollars)
-            if trail_fire_B.any():
-                exit_time_B[trail_fire_B] = t_unix
-                exit_price_B[trail_fire_B] = yes_price
-                exit_outcome_B[trail_fire_B] = "trailing_fired"
-                exited_B |= trail_fire_B
-
-        if exited_A.all() and exited_B.all():
-            break
+    post = PostFill(tape, fill_time_unix, fill_price, max_horizon)
+    kind_A, exit_idx_A = first_exits(post, horizon_cap_arr, target_A_arr, trail_c_dollars,
+                                     is_limit_type, is_trail_type)
+    kind_B, exit_idx_B = first_exits(post, horizon_cap_arr, target_B_arr, trail_c_dollars,
+                                     is_limit_type, is_trail_type)
+    last_observed_bid = post.last_bid()
 
-    # Step 7: resolve outcomes (reads from numpy state arrays)
-    def _resolve(exited, ex_time, ex_price, ex_outcome, cap_ts_p, ptype):
-        if exited:
-            outc = ex_outcome
-            t_e = int(ex_time)
-            if outc == "horizon_expired":
-                return outc, None, (t_e - fill_time_unix) / 60.0
-            elif outc == "horizon_fired":
-                price = ex_price if not np.isnan(ex_price) else last_observed_bid
-                return outc, float(price - fill_price), (t_e - fill_time_unix) / 60.0
-            else:  # fired_at_target / trailing_fired
-                return outc, float(ex_price - fill_price), (t_e - fill_time_unix) / 60.0
+    # Step 7: resolve outcomes
+    def _resolve(kind, ex_idx, cap_ts_p, ptype, horizon_fires):
+        if kind == EXIT_HORIZON:
+            tt = (int(cap_ts_p) - fill_time_unix) / 60.0
+            if not horizon_fires:
+                return "horizon_expired", None, tt
+            price = post.bid_at(ex_idx)
+            if np.isnan(price):
+                price = last_observed_bid
+            return "horizon_fired", float(price - fill_price), tt
+        elif kind in (EXIT_LIMIT, EXIT_TRAIL):
+            outc = "fired_at_target" if kind == EXIT_LIMIT else "trailing_fired"
+            return (outc, float(tape.price[ex_idx] - fill_price),
+                    (int(tape.ts[ex_idx]) - fill_time_unix) / 60.0)
         else:
             if cap_ts_p >= settlement_ts_unix - 60:
                 return "settled_unfired", settlement_value - fill_price, None
@@ -902,10 +784,10 @@ def evaluate_moment_vectorized(ticker, candles_df, trades_df, T0_unix, T0_cell,
 
     rows = []
     for i, p in enumerate(policy_grid):
-        outA, capA, ttA = _resolve(bool(exited_A[i]), exit_time_A[i], exit_price_A[i],
-                                    exit_outcome_A[i], horizon_cap_ts[i], p["policy_type"])
-        outB, capB, ttB = _resolve(bool(exited_B[i]), exit_time_B[i], exit_price_B[i],
-                                    exit_outcome_B[i], horizon_cap_ts[i], p["policy_type"])
+        outA, capA, ttA = _resolve(kind_A[i], exit_idx_A[i], horizon_cap_ts[i],
+                                   p["policy_type"], is_horizon_fires_type[i])
+        outB, capB, ttB = _resolve(kind_B[i], exit_idx_B[i], horizon_cap_ts[i],
+                                   p["policy_type"], is_horizon_fires_type[i])
         rows.append(dict(base_row,
             policy_idx=p["idx"], policy_type=p["policy_type"],
             policy_params=p["policy_params_str"],
@@ -1013,6 +895,7 @@ def phase2():
         if trades_df is None:
             skipped_no_trades += 1
             continue
+        tape = TradeTape.from_df(trades_df)
 
         for (t, bid_f, ask_f, regime, eb, sb, vi, cat) in matching_moments:
             T0_cell = {
@@ -1020,9 +903,8 @@ def phase2():
                 "spread_band": sb, "volume_intensity": vi, "category": cat,
                 "yes_bid_close": bid_f, "yes_ask_close": ask_f,
             }
-            forward_trades = trades_df[trades_df["created_time_ts"] >= t].reset_index(drop=True)
             rows = evaluate_moment_vectorized(
-                ticker, candles_df, forward_trades, t, T0_cell,
+                ticker, candles_df, tape, t, T0_cell,
                 policy_grid, settlement_ts_unix, settlement_value, match_start_ts,
             )
             all_rows.extend(rows)
@@ -1325,6 +1207,7 @@ def process_one_cell(c, cell_idx, manifest, out_dir, log_path):
         trades_df = load_ticker_trades(ticker, start_ts_unix=int(timestamps[0]))
         if trades_df is None:
             continue
+        tape = TradeTape.from_df(trades_df)
 
         for (t, bid_f, ask_f, regime, eb, sb, vi, cat) in matching_moments:
             T0_cell = {
@@ -1332,9 +1215,8 @@ def process_one_cell(c, cell_idx, manifest, out_dir, log_path):
                 "spread_band": sb, "volume_intensity": vi, "category": cat,
                 "yes_bid_close": bid_f, "yes_ask_close": ask_f,
             }
-            forward_trades = trades_df[trades_df["created_time_ts"] >= t].reset_index(drop=True)
             rows = evaluate_moment_vectorized(
-                ticker, candles_df, forward_trades, t, T0_cell,
+                ticker, candles_df, tape, t, T0_cell,
                 policy_grid, settlement_ts_unix, settlement_value, match_start_ts,
             )
             all_rows.extend(rows)
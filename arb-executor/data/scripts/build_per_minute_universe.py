@@ -8,7 +8,14 @@ Phase 1 (this commit): single-ticker mode.
   - Output: data/durable/per_minute_universe/probe/per_minute_universe_phase1.parquet
   - Runtime budget: <2 min
   - PASS criteria: spec Section 5 Checks 1, 2, 4 + visual inspection vs operator-uploaded chart
-Phase 2 and Phase 3 deferred to separate single-concern commits per spec Section 3.3.
+Phase 2: stratified 200-ticker sample. Phase 3: full corpus, kill-resilient
+(batched parquets + JSONL progress, resume, streaming merge).
+
+Phase 3 --workers N (N > 1): the corpus is cut into shards of PHASE3_BATCH_SIZE
+tickers that run on a process pool; each worker writes its shard as one batch
+parquet and the parent checkpoints the shard's tickers in the progress JSONL,
+so resume, batch layout and the streaming final merge are the same as the
+sequential run.
 """
 
 import argparse
@@ -19,6 +26,7 @@ import re
 import sys
 import time
 from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
 from datetime import datetime
 from pathlib import Path
 
@@ -30,7 +38,8 @@ import pandas as pd
 sys.path.insert(0, str(Path(__file__).parent))
 from cell_key_helpers import (
     ENTRY_BANDS, SPREAD_BANDS, VOLUME_BANDS, REGIMES, CATEGORIES,
-    categorize, entry_band_idx, spread_band_name,
+    categorize,
+    entry_band_idx_array, spread_band_name_array, NO_BAND,
     detect_match_start, regime_for_moment, volume_intensity_for_market,
 )
 
@@ -55,6 +64,12 @@ PHASE2_N_MATCHES_PER_STRATUM = 5  # 20 strata × 5 = 100 matches × 2 sides = 20
 PHASE2_BATCH_SIZE = 50    # tickers per per-batch parquet at Phase 2 scale
 PHASE3_BATCH_SIZE = 100   # tickers per per-batch parquet at Phase 3 scale
 
+# Phase 3 parallel mode: shards per worker kept in flight (bounds parent-side
+# queued work) and shards per worker process before it is replaced (returns
+# per-ticker pandas / pyarrow heap growth to the OS on the 1.9 GB VPS).
+PHASE3_SHARDS_IN_FLIGHT_PER_WORKER = 2
+PHASE3_SHARDS_PER_CHILD = 4
+
 # Forward-label horizons in seconds (spec Section 2.8)
 HORIZONS = {
     "5min": 300,
@@ -542,6 +557,31 @@ def compute_paired_columns(own_bid, own_ask, own_mid, own_vol, partner_obs):
 # Kill-resilient per-batch writer (mirrors Layer B v2 commit 73826c29)
 # ============================================================
 
+def progress_entry(ticker, df, runtime_seconds, status="processed", extra_fields=None):
+    """One `_progress_summary.jsonl` line for a finished ticker."""
+    entry = {
+        "ticker": ticker,
+        "status": status,
+        "n_rows": int(len(df)) if df is not None else 0,
+        "runtime_seconds": round(runtime_seconds, 2),
+        "completed_at": datetime.now().isoformat(timespec="seconds"),
+    }
+    if extra_fields:
+        entry.update(extra_fields)
+    return entry
+
+
+def write_batch_parquet(batch_path, frames):
+    """Concatenate per-ticker frames and write them as one batch parquet.
+    Returns rows written."""
+    df_batch = pd.concat(frames, ignore_index=True)
+    pq.write_table(
+        pa.Table.from_pandas(df_batch, preserve_index=False),
+        batch_path, compression="snappy",
+    )
+    return len(df_batch)
+
+
 class IncrementalTickerWriter:
     """Per-batch parquet writes + JSONL progress + resume-on-restart.
 
@@ -602,16 +642,8 @@ class IncrementalTickerWriter:
     def add_ticker(self, ticker, df, runtime_seconds, status="processed", extra_fields=None):
         if df is not None and len(df) > 0:
             self.batch_buffer.append(df)
-        entry = {
-            "ticker": ticker,
-            "status": status,
-            "n_rows": int(len(df)) if df is not None else 0,
-            "runtime_seconds": round(runtime_seconds, 2),
-            "completed_at": datetime.now().isoformat(timespec="seconds"),
-        }
-        if extra_fields:
-            entry.update(extra_fields)
-        self.batch_jsonl_entries.append(entry)
+        self.batch_jsonl_entries.append(
+            progress_entry(ticker, df, runtime_seconds, status, extra_fields))
         if len(self.batch_jsonl_entries) >= self.batch_size:
             self.flush_batch()
 
@@ -622,26 +654,35 @@ class IncrementalTickerWriter:
             return
         # Write per-batch parquet (only if any rows; some batches may be all-skipped)
         if self.batch_buffer:
-            batch_path = os.path.join(
-                self.out_dir, f"{self.batch_prefix}_{self.batch_idx:03d}.parquet"
-            )
-            df_batch = pd.concat(self.batch_buffer, ignore_index=True)
-            pq.write_table(
-                pa.Table.from_pandas(df_batch, preserve_index=False),
-                batch_path, compression="snappy",
-            )
+            batch_path = self.batch_path(self.batch_idx)
+            n_rows = write_batch_parquet(batch_path, self.batch_buffer)
             if self.log_path:
-                log(f"  wrote batch {self.batch_idx} parquet: {len(df_batch):,} rows → {batch_path}",
+                log(f"  wrote batch {self.batch_idx} parquet: {n_rows:,} rows → {batch_path}",
                     self.log_path)
-        # Append JSONL lines (atomic: open-append-close)
-        with open(self.progress_path, "a") as f:
-            for entry in self.batch_jsonl_entries:
-                f.write(json.dumps(entry, default=str) + "\n")
+        self.record_entries(self.batch_jsonl_entries)
         # Reset buffers + advance idx
         self.batch_buffer = []
         self.batch_jsonl_entries = []
         self.batch_idx += 1
 
+    def batch_path(self, batch_idx):
+        return os.path.join(self.out_dir, f"{self.batch_prefix}_{batch_idx:03d}.parquet")
+
+    def reserve_batch_path(self):
+        """Claim the next batch index for a shard written elsewhere (parallel
+        mode); the shard's entries go through record_entries once it lands."""
+        path = self.batch_path(self.batch_idx)
+        self.batch_idx += 1
+        return path
+
+    def record_entries(self, entries):
+        """Append progress lines (atomic: open-append-close) and mark the
+        tickers completed. Called only after their batch parquet is on disk."""
+        with open(self.progress_path, "a") as f:
+            for entry in entries:
+                f.write(json.dumps(entry, default=str) + "\n")
+        self.completed_tickers.update(e["ticker"] for e in entries)
+
     def merge_all(self, out_path):
         """Stream per-batch parquets into the merged output via a single
         pq.ParquetWriter; never materialize the full merged corpus in memory.
@@ -810,9 +851,10 @@ def build_ticker_rows(ticker, formation_window_min=FORMATION_WINDOW_MIN_DEFAULT)
 
     regimes = []
     premarket_phases = []
-    eb_lo_arr = np.full(n, -1, dtype=np.int64)
-    eb_hi_arr = np.full(n, -1, dtype=np.int64)
-    spread_band_arr = np.empty(n, dtype=object)
+    eb_idx_arr = entry_band_idx_array(yes_ask_close)
+    eb_lo_arr = np.where(eb_idx_arr != NO_BAND, eb_idx_arr * 10, -1)
+    eb_hi_arr = np.where(eb_idx_arr != NO_BAND, (eb_idx_arr + 1) * 10, -1)
+    spread_band_arr = spread_band_name_array(yes_bid_close, yes_ask_close)
     volume_intensity_arr = np.empty(n, dtype=object)
     time_to_match_start_min = np.full(n, np.nan, dtype=np.float64)
     time_to_close_min = np.full(n, np.nan, dtype=np.float64)
@@ -823,21 +865,11 @@ def build_ticker_rows(ticker, formation_window_min=FORMATION_WINDOW_MIN_DEFAULT)
 
     for i in range(n):
         m_ts = int(minute_ts_arr[i])
-        bid_f = float(yes_bid_close[i]) if not np.isnan(yes_bid_close[i]) else None
-        ask_f = float(yes_ask_close[i]) if not np.isnan(yes_ask_close[i]) else None
 
         rg = classify_regime(m_ts, match_start_ts, settlement_ts)
         regimes.append(rg)
         premarket_phases.append(classify_premarket_phase(m_ts, open_time_ts, rg, formation_window_min))
 
-        if ask_f is not None:
-            eb_idx = entry_band_idx(ask_f)
-            eb_lo_arr[i] = eb_idx * 10
-            eb_hi_arr[i] = (eb_idx + 1) * 10
-        if bid_f is not None and ask_f is not None:
-            spread_band_arr[i] = spread_band_name(bid_f, ask_f)
-        else:
-            spread_band_arr[i] = None
         volume_intensity_arr[i] = vi_overall
 
         if match_start_ts is not None:
@@ -1460,7 +1492,98 @@ def build_corpus_ticker_list():
     return sorted(binary["ticker"].tolist())
 
 
-def phase3(formation_window_min=FORMATION_WINDOW_MIN_DEFAULT):
+def _build_shard(args):
+    """Process-pool worker: build one shard of tickers into one batch parquet.
+
+    Writes to `staging_path` (not matched by the batch glob); the parent moves
+    it to its batch path and records the returned progress entries, so a
+    shard interrupted mid-way leaves nothing that merge_all or resume sees.
+    Returns (entries, n_rows).
+    """
+    staging_path, tickers, formation_window_min = args
+    frames, entries = [], []
+    for ticker in tickers:
+        t_ticker = time.time()
+        df = build_ticker_rows(ticker, formation_window_min=formation_window_min)
+        elapsed_ticker = time.time() - t_ticker
+        if df is None:
+            entries.append(progress_entry(ticker, None, elapsed_ticker, status="skipped"))
+            continue
+        frames.append(df)
+        entries.append(progress_entry(ticker, df, elapsed_ticker, status="processed",
+                                      extra_fields={
+                                          "category": df["category"].iloc[0],
+                                          "n_minutes": int(len(df)),
+                                          "match_start_method": df["match_start_method"].iloc[0],
+                                      }))
+    n_rows = write_batch_parquet(staging_path, frames) if frames else 0
+    return entries, n_rows
+
+
+def run_sharded(ticker_list, writer, workers, formation_window_min, log_path, t_start):
+    """Phase 3 ticker loop on a process pool.
+
+    Pending tickers (not in the progress JSONL) are cut into shards of
+    writer.batch_size, each claiming the next batch index up front. At most
+    PHASE3_SHARDS_IN_FLIGHT_PER_WORKER shards per worker are submitted at a
+    time and workers are recycled every PHASE3_SHARDS_PER_CHILD shards, so
+    neither side's memory grows with corpus size. As each shard lands its
+    parquet is moved into place and its tickers checkpointed - the same
+    write-then-record order as IncrementalTickerWriter.flush_batch - so a
+    killed run resumes from the JSONL exactly like the sequential loop.
+
+    Returns (per_ticker_runtimes, skipped_tickers, n_processed, n_skipped_resume).
+    """
+    for stale in glob.glob(os.path.join(writer.out_dir, f"{writer.batch_prefix}_*.parquet.part")):
+        os.remove(stale)
+    pending = [tk for tk in ticker_list if not writer.should_skip(tk)]
+    n_skipped_resume = len(ticker_list) - len(pending)
+    shards = [pending[i:i + writer.batch_size]
+              for i in range(0, len(pending), writer.batch_size)]
+    log(f"  parallel mode: {len(pending):,} tickers in {len(shards):,} shards "
+        f"on {workers} workers", log_path)
+
+    per_ticker_runtimes = []
+    skipped_tickers = []
+    n_processed = 0
+    n_done = 0
+    max_in_flight = workers * PHASE3_SHARDS_IN_FLIGHT_PER_WORKER
+    next_shard = 0
+    in_flight = {}
+    with ProcessPoolExecutor(max_workers=workers,
+                             max_tasks_per_child=PHASE3_SHARDS_PER_CHILD) as pool:
+        while in_flight or next_shard < len(shards):
+            while next_shard < len(shards) and len(in_flight) < max_in_flight:
+                batch_path = writer.reserve_batch_path()
+                fut = pool.submit(_build_shard, (batch_path + ".part", shards[next_shard],
+                                                 formation_window_min))
+                in_flight[fut] = batch_path
+                next_shard += 1
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for fut in done:
+                batch_path = in_flight.pop(fut)
+                entries, n_rows = fut.result()
+                if n_rows:
+                    os.replace(batch_path + ".part", batch_path)
+                    log(f"  wrote batch parquet: {n_rows:,} rows → {batch_path}", log_path)
+                writer.record_entries(entries)
+                for entry in entries:
+                    if entry["status"] == "skipped":
+                        skipped_tickers.append(entry["ticker"])
+                    else:
+                        per_ticker_runtimes.append(entry["runtime_seconds"])
+                        n_processed += 1
+                n_done += len(entries)
+                elapsed_so_far = time.time() - t_start
+                avg_per_ticker = elapsed_so_far / max(1, n_done)
+                eta_min = ((len(pending) - n_done) * avg_per_ticker) / 60.0
+                log(f"  [{n_done}/{len(pending)}] processed={n_processed} "
+                    f"elapsed={elapsed_so_far:.0f}s avg={avg_per_ticker:.2f}s/ticker (wall) "
+                    f"ETA_remaining={eta_min:.1f}min", log_path)
+    return per_ticker_runtimes, skipped_tickers, n_processed, n_skipped_resume
+
+
+def phase3(formation_window_min=FORMATION_WINDOW_MIN_DEFAULT, workers=1):
     """Phase 3: full non-settle premarket corpus, kill-resilient.
 
     Per spec Section 5.3 + Layer B v2 commit 73826c29 pattern:
@@ -1470,6 +1593,9 @@ def phase3(formation_window_min=FORMATION_WINDOW_MIN_DEFAULT):
       - Final merge concatenates all per-batch parquets into single output
       - Output: data/durable/per_minute_universe/per_minute_features.parquet
       - Runtime budget: <8 h (post numpy-vectorization)
+
+    workers > 1 runs the ticker loop through run_sharded (one batch parquet
+    per shard of PHASE3_BATCH_SIZE tickers); resume and merge are unchanged.
     """
     out_dir = OUT_DIR  # NOT probe/ — this is the canonical Phase 3 path
     os.makedirs(out_dir, exist_ok=True)
@@ -1491,38 +1617,42 @@ def phase3(formation_window_min=FORMATION_WINDOW_MIN_DEFAULT):
         log(f"  resume mode: {len(writer.completed_tickers):,} tickers already in JSONL "
             f"(will skip)", log_path)
 
-    per_ticker_runtimes = []
-    skipped_tickers = []
-    n_processed = 0
-    n_skipped_resume = 0
-    for i, ticker in enumerate(ticker_list):
-        if writer.should_skip(ticker):
-            n_skipped_resume += 1
-            continue
-        t_ticker = time.time()
-        df = build_ticker_rows(ticker, formation_window_min=formation_window_min)
-        elapsed_ticker = time.time() - t_ticker
-        if df is None:
-            writer.add_ticker(ticker, None, elapsed_ticker, status="skipped")
-            skipped_tickers.append(ticker)
-            continue
-        writer.add_ticker(ticker, df, elapsed_ticker, status="processed",
-                          extra_fields={
-                              "category": df["category"].iloc[0],
-                              "n_minutes": int(len(df)),
-                              "match_start_method": df["match_start_method"].iloc[0],
-                          })
-        per_ticker_runtimes.append(elapsed_ticker)
-        n_processed += 1
-        if n_processed % 50 == 0 or (i + 1) == len(ticker_list):
-            elapsed_so_far = time.time() - t_start
-            avg_per_ticker = elapsed_so_far / max(1, n_processed)
-            remaining = len(ticker_list) - (i + 1) - n_skipped_resume
-            eta_min = (remaining * avg_per_ticker) / 60.0
-            log(f"  [{i+1}/{len(ticker_list)}] processed={n_processed} "
-                f"elapsed={elapsed_so_far:.0f}s avg={avg_per_ticker:.2f}s/ticker "
-                f"ETA_remaining={eta_min:.1f}min", log_path)
-    writer.flush_batch()
+    if workers > 1:
+        per_ticker_runtimes, skipped_tickers, n_processed, n_skipped_resume = run_sharded(
+            ticker_list, writer, workers, formation_window_min, log_path, t_start)
+    else:
+        per_ticker_runtimes = []
+        skipped_tickers = []
+        n_processed = 0
+        n_skipped_resume = 0
+        for i, ticker in enumerate(ticker_list):
+            if writer.should_skip(ticker):
+                n_skipped_resume += 1
+                continue
+            t_ticker = time.time()
+            df = build_ticker_rows(ticker, formation_window_min=formation_window_min)
+            elapsed_ticker = time.time() - t_ticker
+            if df is None:
+                writer.add_ticker(ticker, None, elapsed_ticker, status="skipped")
+                skipped_tickers.append(ticker)
+                continue
+            writer.add_ticker(ticker, df, elapsed_ticker, status="processed",
+                              extra_fields={
+                                  "category": df["category"].iloc[0],
+                                  "n_minutes": int(len(df)),
+                                  "match_start_method": df["match_start_method"].iloc[0],
+                              })
+            per_ticker_runtimes.append(elapsed_ticker)
+            n_processed += 1
+            if n_processed % 50 == 0 or (i + 1) == len(ticker_list):
+                elapsed_so_far = time.time() - t_start
+                avg_per_ticker = elapsed_so_far / max(1, n_processed)
+                remaining = len(ticker_list) - (i + 1) - n_skipped_resume
+                eta_min = (remaining * avg_per_ticker) / 60.0
+                log(f"  [{i+1}/{len(ticker_list)}] processed={n_processed} "
+                    f"elapsed={elapsed_so_far:.0f}s avg={avg_per_ticker:.2f}s/ticker "
+                    f"ETA_remaining={eta_min:.1f}min", log_path)
+        writer.flush_batch()
 
     elapsed_total = time.time() - t_start
     log("", log_path)
@@ -1606,13 +1736,15 @@ def main():
     parser.add_argument("--ticker", type=str, default=PHASE1_TICKER,
                         help="Ticker to process in Phase 1 (default: KXATPMATCH-25JUN18RUNMCD-RUN)")
     parser.add_argument("--formation-window-min", type=int, default=FORMATION_WINDOW_MIN_DEFAULT)
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Phase 3 only: process-pool workers (default 1 = sequential)")
     args = parser.parse_args()
     if args.phase == 1:
         phase1(ticker=args.ticker, formation_window_min=args.formation_window_min)
     elif args.phase == 2:
         phase2(formation_window_min=args.formation_window_min)
     elif args.phase == 3:
-        phase3(formation_window_min=args.formation_window_min)
+        phase3(formation_window_min=args.formation_window_min, workers=args.workers)
     else:
         raise NotImplementedError(f"Phase {args.phase} not yet implemented; pending separate single-concern commit.")
 
@@ -17,6 +17,13 @@ Functions:
 - regime_for_moment(ts, match_start_ts, settlement_ts) -> 'premarket' | 'in_match' | 'settlement_zone'
 - volume_intensity_for_market(volumes) -> 'low' | 'mid' | 'high'
 
+Column versions (one call over a whole column; element-for-element identical to
+the scalar functions above, which stay the reference definitions):
+- categorize_array(tickers) -> object array of category
+- entry_band_idx_array(prices) -> int64 array, NO_BAND where entry_band_idx is None
+- spread_band_name_array(bids, asks) -> object array, None where spread_band_name is None
+- regime_for_moment_array(ts, match_start_ts, settlement_ts) -> object array of regime
+
 DO NOT modify these in isolation. Any change here affects both Layer A and Layer B.
 """
 
@@ -34,22 +41,28 @@ VOLUME_BANDS = ["low", "mid", "high"]
 REGIMES = ["premarket", "in_match", "settlement_zone"]
 CATEGORIES = ["ATP_MAIN", "ATP_CHALL", "WTA_MAIN", "WTA_CHALL", "OTHER"]
 
+# Ticker prefix -> category, first match wins; anything else is OTHER.
+CATEGORY_PREFIXES = [
+    ("KXATPMATCH", "ATP_MAIN"),
+    ("KXATPCHALLENGER", "ATP_CHALL"),
+    ("KXATPCHALL", "ATP_CHALL"),
+    ("KXWTAMATCH", "WTA_MAIN"),
+    ("KXWTACHALL", "WTA_CHALL"),
+    ("KXWTAITF", "WTA_CHALL"),
+]
+
+NO_BAND = -1  # entry_band_idx_array value where entry_band_idx returns None
+
 
 # ============================================================
 # Cell-key classifiers
 # ============================================================
 
 def categorize(ticker):
-    if ticker.startswith("KXATPMATCH"):
-        return "ATP_MAIN"
-    elif ticker.startswith("KXATPCHALLENGER") or ticker.startswith("KXATPCHALL"):
-        return "ATP_CHALL"
-    elif ticker.startswith("KXWTAMATCH"):
-        return "WTA_MAIN"
-    elif ticker.startswith("KXWTACHALL") or ticker.startswith("KXWTAITF"):
-        return "WTA_CHALL"
-    else:
-        return "OTHER"
+    for prefix, category in CATEGORY_PREFIXES:
+        if ticker.startswith(prefix):
+            return category
+    return "OTHER"
 
 
 def entry_band_idx(price):
@@ -107,3 +120,104 @@ def volume_intensity_for_market(volumes):
         return "mid"
     else:
         return "high"
+
+
+# ============================================================
+# Column versions of the cell-key classifiers
+# ============================================================
+
+_CATEGORY_NAMES = np.array(CATEGORIES, dtype=object)
+_SPREAD_NAMES = np.array([name for name, _, _ in SPREAD_BANDS] + [None], dtype=object)
+_REGIME_NAMES = np.array(REGIMES, dtype=object)
+
+# Interior band edges; np.digitize(x, edges) is the index of the [lo, hi) band
+# holding x, and the last band absorbs everything >= its lo (the scalar
+# functions' fall-through: entry >= 90 -> 9, spread >= 0.05 -> "wide").
+_ENTRY_EDGES = np.array([lo for lo, _ in ENTRY_BANDS[1:]], dtype=np.float64)
+_SPREAD_EDGES = np.array([lo for _, lo, _ in SPREAD_BANDS[1:]], dtype=np.float64)
+
+
+def _as_numeric(values):
+    """values -> (numeric array, missing mask). Missing = None only, as in the
+    scalar functions' `is None` checks; NaN stays NaN and compares as the scalar
+    code would. Numeric arrays keep their dtype so arithmetic matches the
+    scalar path element for element."""
+    if values is None:
+        return np.array(np.nan), np.array(True)
+    arr = np.asarray(values)
+    if arr.dtype.kind in "fiu":
+        return arr, np.zeros(arr.shape, dtype=bool)
+    missing = np.frompyfunc(lambda v: v is None, 1, 1)(arr).astype(bool)
+    return np.where(missing, np.nan, arr).astype(np.float64), missing
+
+
+def _factorize(tickers):
+    """(codes, uniques) of a ticker column. pyarrow dictionary columns are used
+    as-is, other pyarrow columns are dictionary-encoded, anything else goes
+    through np.unique."""
+    if hasattr(tickers, "combine_chunks"):  # pyarrow ChunkedArray
+        tickers = tickers.combine_chunks()
+    if hasattr(tickers, "dictionary_encode"):  # pyarrow Array
+        if not hasattr(tickers, "indices"):
+            tickers = tickers.dictionary_encode()
+        return (tickers.indices.to_numpy(zero_copy_only=False),
+                np.array(tickers.dictionary.to_pylist(), dtype=object))
+    uniques, codes = np.unique(np.asarray(tickers, dtype=object), return_inverse=True)
+    return codes, uniques
+
+
+def categorize_array(tickers):
+    """categorize() over a ticker column (list, numpy, pandas or pyarrow).
+
+    Prefixes are matched once per distinct ticker, then broadcast through the
+    dictionary codes.
+    """
+    codes, uniques = _factorize(tickers)
+    u = uniques.astype(str)
+    cat = np.full(len(u), CATEGORIES.index("OTHER"), dtype=np.int8)
+    unmatched = np.ones(len(u), dtype=bool)
+    for prefix, category in CATEGORY_PREFIXES:
+        hit = unmatched & np.char.startswith(u, prefix)
+        cat[hit] = CATEGORIES.index(category)
+        unmatched &= ~hit
+    return _CATEGORY_NAMES[cat[codes]]
+
+
+def entry_band_idx_array(prices):
+    """entry_band_idx() over a price column; NO_BAND where it returns None
+    (None, NaN, or below 0 cents)."""
+    prices, missing = _as_numeric(prices)
+    with np.errstate(invalid="ignore"):
+        cents = prices * 100
+        out = np.digitize(cents, _ENTRY_EDGES).astype(np.int64)
+        out[missing | np.isnan(cents) | (cents < 0)] = NO_BAND
+    return out
+
+
+def spread_band_name_array(bids, asks):
+    """spread_band_name() over bid / ask columns; None where it returns None
+    (either side None or NaN, or ask < bid)."""
+    bids, bid_missing = _as_numeric(bids)
+    asks, ask_missing = _as_numeric(asks)
+    with np.errstate(invalid="ignore"):
+        sp = asks - bids
+        # Edges in sp's float dtype: the scalar `lo <= sp` compares a float32 sp
+        # against 0.02 rounded to float32, not against the float64 0.02.
+        edges = _SPREAD_EDGES.astype(sp.dtype) if sp.dtype.kind == "f" else _SPREAD_EDGES
+        idx = np.digitize(sp, edges)
+        idx[bid_missing | ask_missing | np.isnan(bids) | np.isnan(asks) | (sp < 0)] = len(SPREAD_BANDS)
+    return _SPREAD_NAMES[idx]
+
+
+def regime_for_moment_array(ts, match_start_ts, settlement_ts):
+    """regime_for_moment() over a ts column. match_start_ts / settlement_ts are
+    scalars or per-row columns; None means unknown, as in the scalar version."""
+    ts = np.asarray(ts)
+    match_start_ts, ms_missing = _as_numeric(match_start_ts)
+    settlement_ts, st_missing = _as_numeric(settlement_ts)
+    with np.errstate(invalid="ignore"):
+        settling = ~st_missing & (ts >= (settlement_ts - 300))
+        premarket = ms_missing | (ts < match_start_ts)
+    code = np.where(settling, REGIMES.index("settlement_zone"),
+                    np.where(premarket, REGIMES.index("premarket"), REGIMES.index("in_match")))
+    return _REGIME_NAMES[np.broadcast_to(code, ts.shape)]
@@ -0,0 +1,107 @@
+"""Per-ticker readers for the G9 parquets (g9_trades / g9_candles).
+
+build_g9_parquets.py writes both files grouped by category then ticker, each
+ticker's rows time-sorted, row groups closed on ticker boundaries, and an int64
+created_time_ts (unix seconds) on trades. A ("ticker", "=", T) filter therefore
+prunes to one or two row groups on the ticker min/max statistics, and a time
+window prunes on created_time_ts / end_period_ts inside them - a per-ticker read
+decodes ~ROW_GROUP_ROWS rows instead of scanning the 1.5 GB / 33.7M-row trade
+file, and never holds more than that in memory.
+
+    trades = load_ticker_trades("KXATPMATCH-...", t0=T0, t1=T0 + 4 * 3600)
+    candles = load_ticker_candles("KXATPMATCH-...")
+
+Both return a DataFrame sorted by time (None when the ticker has no rows in the
+window). Windows are half-open: t0 <= ts < t1, either end optional.
+
+Files built before created_time_ts existed still read correctly: the column is
+derived from created_time after the ticker-pushdown read and the window applied
+in pandas.
+
+Functions:
+- load_ticker_trades(ticker, t0, t1, columns, path) -> DataFrame | None
+- load_ticker_candles(ticker, t0, t1, columns, path) -> DataFrame | None
+- iso_to_unix(created_time) -> int64 Series
+"""
+
+import functools
+
+import pandas as pd
+import pyarrow.parquet as pq
+
+
+DUR_DIR = "/root/Omi-Workspace/arb-executor/data/durable"
+TRADES_PARQUET = f"{DUR_DIR}/g9_trades.parquet"
+CANDLES_PARQUET = f"{DUR_DIR}/g9_candles.parquet"
+
+TRADE_COLS = ["ticker", "created_time", "taker_side", "yes_price_dollars",
+              "no_price_dollars", "count_fp"]
+CANDLE_COLS = ["ticker", "end_period_ts", "yes_bid_close", "yes_ask_close", "volume_fp"]
+
+
+@functools.lru_cache(maxsize=None)
+def _columns_of(path):
+    return frozenset(pq.read_schema(path).names)
+
+
+def _filters(ticker, ts_col, t0, t1):
+    filters = [("ticker", "=", ticker)]
+    if t0 is not None:
+        filters.append((ts_col, ">=", int(t0)))
+    if t1 is not None:
+        filters.append((ts_col, "<", int(t1)))
+    return filters
+
+
+def iso_to_unix(created_time):
+    """ISO8601 created_time strings -> int64 unix seconds (truncated).
+
+    created_time is microsecond-precision with mixed variants
+    ('...34.123456+00:00', '...19.13876Z', '...39Z'); format="ISO8601" parses
+    all of them. Seconds come from the Timedelta since epoch, not from
+    astype('int64') // 10**9, which is 1000x off on microsecond-unit columns.
+    """
+    ts = pd.to_datetime(created_time, format="ISO8601", utc=True)
+    return ((ts - pd.Timestamp(0, tz="UTC")) // pd.Timedelta(seconds=1)).astype("int64")
+
+
+def load_ticker_trades(ticker, t0=None, t1=None, columns=TRADE_COLS, path=TRADES_PARQUET):
+    """Trades of ticker with t0 <= created_time_ts < t1, sorted by created_time_ts.
+
+    Returns `columns` plus created_time_ts, or None if there are no rows.
+    """
+    columns = [c for c in columns if c != "created_time_ts"]
+    if "created_time_ts" in _columns_of(path):
+        table = pq.read_table(path, columns=columns + ["created_time_ts"],
+                              filters=_filters(ticker, "created_time_ts", t0, t1))
+        if table.num_rows == 0:
+            return None
+        df = table.to_pandas()
+    else:
+        read_cols = columns if "created_time" in columns else columns + ["created_time"]
+        table = pq.read_table(path, columns=read_cols, filters=[("ticker", "=", ticker)])
+        if table.num_rows == 0:
+            return None
+        df = table.to_pandas()
+        df["created_time_ts"] = iso_to_unix(df["created_time"])
+        if t0 is not None:
+            df = df[df["created_time_ts"] >= t0]
+        if t1 is not None:
+            df = df[df["created_time_ts"] < t1]
+        if len(df) == 0:
+            return None
+        df = df[columns + ["created_time_ts"]]
+    return df.sort_values("created_time_ts", kind="stable").reset_index(drop=True)
+
+
+def load_ticker_candles(ticker, t0=None, t1=None, columns=CANDLE_COLS, path=CANDLES_PARQUET):
+    """Candles of ticker with t0 <= end_period_ts < t1, sorted by end_period_ts.
+
+    Returns `columns`, or None if there are no rows.
+    """
+    columns = list(columns) if "end_period_ts" in columns else [*columns, "end_period_ts"]
+    table = pq.read_table(path, columns=columns,
+                          filters=_filters(ticker, "end_period_ts", t0, t1))
+    if table.num_rows == 0:
+        return None
+    return table.to_pandas().sort_values("end_period_ts", kind="stable").reset_index(drop=True)
@@ -0,0 +1,234 @@
+"""Columnar trade-replay kernel shared between the forensic replay and Layer B v2 producers.
+
+Both producers used to replay each (ticker, T0) moment by slicing a fresh
+`trades_df[trades_df["created_time_ts"] >= T0]` copy and walking it with
+`iterrows()` - once for the entry fill, once more for the exits. At ~950 moments
+per cell over ~235 cells that walk dominated Phase 3. Here a ticker's trades are
+held once as sorted numpy columns (TradeTape) and each first-crossing question
+becomes a searchsorted:
+
+- entry fill: first taker="no" trade at or below our bid in [T0, deadline]
+  = first element >= searchsorted(ts, T0) of the positions of such trades
+  (position array cached per bid level; a cell's bids span one entry band)
+- limit exit: first taker="yes" trade at or above target in [fill, horizon]
+  = searchsorted over the running max of yes-taker prices after the fill
+- horizon fire: searchsorted(ts, cap, "right") per policy, priced at the last
+  taker="no" trade at or before that tick (running index of the last "no")
+- trailing exit: first taker="no" trade at or below running_max - trail. The
+  only true scan left; one pass per distinct trail value over the post-fill
+  window (numpy), or a single compiled pass for all of them when numba is
+  installed.
+
+Semantics are those of the loops they replace (build_layer_b_v2.py
+evaluate_moment_vectorized): entry fills on taker_side == "no", exits on
+taker_side == "yes"; at a tick, horizon-fire wins over limit over trailing; the
+trailing running_max (seeded with the fill price) updates before the trigger.
+
+Classes / functions:
+- TradeTape(ts, price, taker_side) / TradeTape.from_df(trades_df)
+- entry_fill(tape, T0_unix, bid, deadline_ts) -> trade index or -1
+- PostFill(tape, fill_time_unix, fill_price, end_ts) -> post-fill searches
+- first_exits(post, caps, targets, trails, is_limit, is_trail) -> (kind, index)
+"""
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # optional: the numpy path gives identical results
+    njit = None
+
+
+EXIT_NONE = 0
+EXIT_HORIZON = 1
+EXIT_LIMIT = 2
+EXIT_TRAIL = 3
+
+NEVER = np.iinfo(np.int64).max
+
+
+# ============================================================
+# Trade tape
+# ============================================================
+
+class TradeTape:
+    """One ticker's trades as parallel arrays, sorted by created_time_ts.
+
+    no_px holds the price on taker="no" trades and +inf elsewhere, so
+    `no_px <= level` selects bid hits; yes_max / no_max hold the price on
+    yes / no taker trades and -inf elsewhere (NaN prices included), for
+    running maxima.
+    """
+    __slots__ = ("ts", "price", "no_px", "yes_max", "no_max", "last_no", "_bid_hits")
+
+    def __init__(self, ts, price, taker_side):
+        self.ts = np.asarray(ts, dtype=np.int64)
+        self.price = np.asarray(price, dtype=np.float64)
+        side = np.asarray(taker_side, dtype=object)
+        taker_no = side == "no"
+        taker_yes = side == "yes"
+        valid = ~np.isnan(self.price)
+        self.no_px = np.where(taker_no, self.price, np.inf)
+        self.yes_max = np.where(taker_yes & valid, self.price, -np.inf)
+        self.no_max = np.where(taker_no & valid, self.price, -np.inf)
+        pos = np.where(taker_no, np.arange(len(self.ts)), -1)
+        self.last_no = np.maximum.accumulate(pos) if len(pos) else pos
+        self._bid_hits = {}
+
+    @classmethod
+    def from_df(cls, trades_df):
+        """Tape over a load_ticker_trades() frame."""
+        return cls(trades_df["created_time_ts"].values,
+                   trades_df["yes_price_dollars"].values,
+                   trades_df["taker_side"].values)
+
+    def __len__(self):
+        return len(self.ts)
+
+    def index_from(self, ts_unix):
+        """First trade index with ts >= ts_unix."""
+        return int(np.searchsorted(self.ts, ts_unix, side="left"))
+
+    def index_past(self, ts_unix):
+        """First trade index with ts > ts_unix."""
+        return int(np.searchsorted(self.ts, ts_unix, side="right"))
+
+    def bid_hits(self, bid):
+        """Sorted positions of taker="no" trades priced at or below bid (cached)."""
+        hits = self._bid_hits.get(bid)
+        if hits is None:
+            hits = self._bid_hits[bid] = np.flatnonzero(self.no_px <= bid)
+        return hits
+
+
+def entry_fill(tape, T0_unix, bid, deadline_ts):
+    """Index of the trade filling a resting yes bid posted at T0_unix, or -1.
+
+    The fill is the first taker="no" trade priced <= bid with
+    T0_unix <= ts <= deadline_ts.
+    """
+    hits = tape.bid_hits(bid)
+    k = int(np.searchsorted(hits, tape.index_from(T0_unix), side="left"))
+    if k < len(hits) and hits[k] < tape.index_past(deadline_ts):
+        return int(hits[k])
+    return -1
+
+
+# ============================================================
+# Post-fill searches
+# ============================================================
+
+def _trail_fires_loop(no_px, no_max, fill_price, trails):
+    out = np.full(len(trails), -1, dtype=np.int64)
+    remaining = len(trails)
+    running_max = fill_price
+    for j in range(len(no_px)):
+        if no_max[j] > running_max:
+            running_max = no_max[j]
+        for k in range(len(trails)):
+            if out[k] < 0 and no_px[j] <= running_max - trails[k]:
+                out[k] = j
+                remaining -= 1
+        if remaining == 0:
+            break
+    return out
+
+
+def _trail_fires_numpy(no_px, no_max, fill_price, trails):
+    out = np.full(len(trails), -1, dtype=np.int64)
+    if len(no_px) == 0:
+        return out
+    running_max = np.maximum(fill_price, np.maximum.accumulate(no_max))
+    for k, trail in enumerate(trails):
+        hit = no_px <= running_max - trail
+        if hit.any():
+            out[k] = int(np.argmax(hit))
+    return out
+
+
+_trail_fires = njit(cache=True)(_trail_fires_loop) if njit is not None else _trail_fires_numpy
+
+
+class PostFill:
+    """First-crossing searches over the trades in [fill_time_unix, end_ts].
+
+    Indices returned are tape indices; -1 means no crossing inside the window.
+    """
+
+    def __init__(self, tape, fill_time_unix, fill_price, end_ts):
+        self.tape = tape
+        self.fill_price = fill_price
+        self.start = tape.index_from(fill_time_unix)
+        self.end = max(self.start, tape.index_past(end_ts))
+        self._yes_cummax = None
+
+    def first_yes_at_or_above(self, target):
+        """First taker="yes" trade priced >= target."""
+        if target is None or np.isnan(target):
+            return -1
+        if self._yes_cummax is None:
+            self._yes_cummax = np.maximum.accumulate(
+                self.tape.yes_max[self.start:self.end]) if self.end > self.start \
+                else np.zeros(0)
+        k = int(np.searchsorted(self._yes_cummax, target, side="left"))
+        return self.start + k if k < len(self._yes_cummax) else -1
+
+    def horizon_indices(self, caps):
+        """Per cap, the first trade with ts > cap (the tick a time cap fires on),
+        NEVER when the window ends first."""
+        h = np.maximum(np.searchsorted(self.tape.ts, caps, side="right"), self.start)
+        return np.where(h < self.end, h, NEVER)
+
+    def bid_at(self, idx):
+        """Price of the last taker="no" trade in [start, idx], else the fill price."""
+        if idx >= self.start:
+            j = self.tape.last_no[idx]
+            if j >= self.start:
+                return self.tape.price[j]
+        return self.fill_price
+
+    def last_bid(self):
+        """bid_at() the last trade of the window."""
+        return self.bid_at(self.end - 1)
+
+    def first_trail_fires(self, trails):
+        """Per trail (dollars), the first taker="no" trade at or below the running
+        max of (fill price, no-taker prices so far) minus trail."""
+        fires = _trail_fires(self.tape.no_px[self.start:self.end],
+                             self.tape.no_max[self.start:self.end],
+                             float(self.fill_price), np.asarray(trails, dtype=np.float64))
+        return np.where(fires >= 0, fires + self.start, -1)
+
+
+def first_exits(post, caps, targets, trails, is_limit, is_trail):
+    """(kind, index) of every policy's first exit after one fill.
+
+    caps: per-policy horizon cap ts; targets: limit price (NaN = none);
+    trails: trail in dollars (NaN = none); is_limit / is_trail: whether the
+    policy type carries a limit / trailing leg. kind is EXIT_NONE (index
+    NEVER), EXIT_HORIZON, EXIT_LIMIT or EXIT_TRAIL. A limit or trail crossing
+    on the horizon tick itself loses to the horizon, as in the tick walk.
+    """
+    n = len(caps)
+    horizon = post.horizon_indices(np.asarray(caps, dtype=np.int64))
+
+    limit = np.full(n, NEVER, dtype=np.int64)
+    for target in np.unique(targets[is_limit & ~np.isnan(targets)]):
+        j = post.first_yes_at_or_above(target)
+        if j >= 0:
+            limit[is_limit & (targets == target)] = j
+
+    trail = np.full(n, NEVER, dtype=np.int64)
+    active = is_trail & ~np.isnan(trails)
+    if active.any():
+        levels, inverse = np.unique(trails[active], return_inverse=True)
+        fires = post.first_trail_fires(levels)
+        trail[active] = np.where(fires >= 0, fires, NEVER)[inverse]
+
+    index = np.minimum(horizon, np.minimum(limit, trail))
+    kind = np.full(n, EXIT_NONE, dtype=np.int8)
+    kind[index == trail] = EXIT_TRAIL
+    kind[index == limit] = EXIT_LIMIT
+    kind[index == horizon] = EXIT_HORIZON
+    kind[index == NEVER] = EXIT_NONE
+    return kind, index
@@ -0,0 +1,351 @@
+#!/usr/bin/env python3
+"""
+Batched Monte Carlo Arb Strategy Simulator
+==========================================
+The strategies of monte_carlo_sim.py re-expressed over whole
+(sessions x trades) arrays: every random draw for a chunk of sessions is made
+at once and P&L is resolved with masked NumPy operations instead of one
+rng.random() call per decision.
+
+Each batch_* function takes the same Params and returns a P&L array of the
+requested shape with the same per-trade distribution as its scalar twin
+(strategy_A_k_first .. strategy_E_hybrid, make_velocity_strategy). Params
+fields may also hold arrays broadcastable to that shape, which is how the
+regime variant varies spreads and fill rates per trade.
+
+Variant sweeps run through run_variant(): sessions are split into chunks,
+each chunk gets its own spawned seed (results don't depend on worker count),
+chunks run on a process pool and are reduced to a Partial summary, so
+millions of sessions never have to sit in memory as one trade matrix.
+
+Usage:  python monte_carlo_batch.py [n_sessions] [workers]
+"""
+
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from copy import deepcopy
+from dataclasses import dataclass, field, replace
+from typing import Callable, List, Optional, Tuple
+
+import numpy as np
+
+from monte_carlo_sim import (
+    D_RATES, N_TRADES, SPREAD_MINS, Params, SessionStats, max_drawdowns,
+    print_recommendation, print_table, variant_fill_gate, variant_kelly,
+)
+
+N_SESSIONS = 1_000_000
+CHUNK_SESSIONS = 20_000
+
+
+# ============================================================================
+# BATCHED STRATEGIES
+# Each returns cents P&L for every trade of a (sessions, trades) array.
+# ============================================================================
+
+def _spread(rng: np.random.Generator, p: Params, shape) -> np.ndarray:
+    return rng.integers(p.spread_min, np.add(p.spread_max, 1), size=shape)
+
+
+def batch_A_k_first(rng: np.random.Generator, p: Params, shape) -> np.ndarray:
+    """A -- K-FIRST: K fills -> PM; PM no-fill -> HOLD_TO_SETTLE."""
+    spread = _spread(rng, p, shape)
+    entry_price = rng.integers(20, 81, size=shape)
+    k_filled = rng.random(shape) <= p.k_fill_rate
+    pm_filled = rng.random(shape) < p.pm_fill_rate
+    settle_win = rng.random(shape) < p.settle_win_prob
+
+    held = np.where(settle_win, 100 - entry_price, -entry_price)
+    pnl = np.where(pm_filled, spread, held) * p.contracts
+    return np.where(k_filled, pnl, 0).astype(float)
+
+
+def batch_B_pm_first(rng: np.random.Generator, p: Params, shape) -> np.ndarray:
+    """B -- PM-FIRST: PM no-fill = clean abort; K no-fill -> unwind 0..spread."""
+    spread = _spread(rng, p, shape)
+    pm_filled = rng.random(shape) <= p.pm_fill_rate
+    k_filled = rng.random(shape) < p.k_fill_rate_after_pm
+    unwind = rng.integers(0, spread + 1)
+
+    pnl = np.where(k_filled, spread, -unwind) * p.contracts
+    return np.where(pm_filled, pnl, 0).astype(float)
+
+
+def batch_C_parallel(rng: np.random.Generator, p: Params, shape) -> np.ndarray:
+    """C -- PARALLEL: fire both; unwind the filled leg (capped at spread)."""
+    spread = _spread(rng, p, shape)
+    k_filled = rng.random(shape) < p.k_fill_rate
+    pm_filled = rng.random(shape) < p.pm_fill_rate
+    raw_unwind = rng.integers(p.unwind_cost_min, p.unwind_cost_max + 1, size=shape)
+
+    pnl = np.where(k_filled & pm_filled, spread, -np.minimum(raw_unwind, spread))
+    pnl = np.where(k_filled | pm_filled, pnl, 0)
+    return (pnl * p.contracts).astype(float)
+
+
+def batch_D_same_exchange(rng: np.random.Generator, p: Params, shape) -> np.ndarray:
+    """D -- SAME-EXCHANGE KALSHI: both legs on K, one-leg unwind 0-2c."""
+    spread = _spread(rng, p, shape)
+    leg1 = rng.random(shape) < p.k_same_exchange_fill
+    leg2 = rng.random(shape) < p.k_same_exchange_fill
+    unwind = rng.integers(0, 3, size=shape)
+
+    pnl = np.where(leg1 & leg2, spread, -unwind)
+    pnl = np.where(leg1 | leg2, pnl, 0)
+    return (pnl * p.contracts).astype(float)
+
+
+def batch_E_hybrid(rng: np.random.Generator, p: Params, shape) -> np.ndarray:
+    """E -- HYBRID: D when a same-exchange opportunity exists, else B."""
+    same = rng.random(shape) < p.same_exchange_rate
+    return np.where(same, batch_D_same_exchange(rng, p, shape),
+                    batch_B_pm_first(rng, p, shape))
+
+
+def batch_A_velocity(rng: np.random.Generator, p: Params, shape) -> np.ndarray:
+    """A with capital velocity: quick exit at market +/-2c instead of settling."""
+    spread = _spread(rng, p, shape)
+    rng.integers(20, 81, size=shape)  # entry price: drawn, unused (as the scalar wrapper)
+    k_filled = rng.random(shape) <= p.k_fill_rate
+    pm_filled = rng.random(shape) < p.pm_fill_rate
+    price_move = rng.integers(-p.quick_exit_cost, p.quick_exit_cost + 1, size=shape)
+
+    pnl = np.where(pm_filled, spread, price_move) * p.contracts
+    return np.where(k_filled, pnl, 0).astype(float)
+
+
+BATCH_STRATEGIES = {
+    'A K-FIRST':   batch_A_k_first,
+    'B PM-FIRST':  batch_B_pm_first,
+    'C PARALLEL':  batch_C_parallel,
+    'D SAME-EXCH': batch_D_same_exchange,
+    'E HYBRID':    batch_E_hybrid,
+}
+
+
+# ============================================================================
+# BATCHED SESSION MODIFIERS
+# ============================================================================
+
+def regime_params(rng: np.random.Generator, base_p: Params, shape) -> Params:
+    """Per-trade Params arrays for run_session_regime()'s 70/30 stable/volatile mix."""
+    stable = rng.random(shape) < 0.70
+    return replace(
+        base_p,
+        spread_min=np.where(stable, max(base_p.spread_min, 3), max(base_p.spread_min, 5)),
+        spread_max=np.where(stable, max(base_p.spread_min, 4),
+                            max(base_p.spread_min + 2, 7)),
+        k_fill_rate=np.where(stable, 0.65, 0.40),
+        pm_fill_rate=np.where(stable, 0.65, 0.40),
+    )
+
+
+def apply_loss_cap(pnl: np.ndarray, loss_cap: int) -> np.ndarray:
+    """Zero every trade after a session's cumulative P&L drops below -loss_cap,
+    as run_session() stops trading once the cap is hit."""
+    if loss_cap <= 0:
+        return pnl
+    before = np.cumsum(pnl, axis=1) - pnl  # cumulative P&L before each trade
+    stopped = np.logical_or.accumulate(before < -loss_cap, axis=1)
+    return np.where(stopped, 0.0, pnl)
+
+
+@dataclass
+class Variant:
+    """One row of a sweep: a batched strategy plus how its sessions are run."""
+    label: str
+    strategy: Callable
+    params: Params
+    opportunity_rate: Optional[float] = None  # trade only on this fraction of slots
+    regime: bool = False
+    loss_cap: int = 0
+
+    def simulate(self, rng: np.random.Generator, n_sessions: int,
+                 n_trades: int = N_TRADES) -> np.ndarray:
+        """(n_sessions, n_trades) P&L matrix for this variant."""
+        shape = (n_sessions, n_trades)
+        p = regime_params(rng, self.params, shape) if self.regime else self.params
+        if self.opportunity_rate is not None:
+            has_opp = rng.random(shape) < self.opportunity_rate
+            pnl = np.where(has_opp, self.strategy(rng, p, shape), 0.0)
+        else:
+            pnl = self.strategy(rng, p, shape)
+        return apply_loss_cap(pnl, self.loss_cap)
+
+
+# ============================================================================
+# CHUNKED STATISTICS
+# ============================================================================
+
+@dataclass
+class Partial:
+    """compute_stats() inputs of one chunk, reduced so chunks merge exactly
+    (trade moments via the parallel-variance update)."""
+    session_totals: np.ndarray = field(default_factory=lambda: np.zeros(0))
+    drawdown_sum: float = 0.0
+    n_active: int = 0
+    n_positive: int = 0
+    mean: float = 0.0
+    m2: float = 0.0
+
+    @classmethod
+    def from_sessions(cls, all_sessions: np.ndarray) -> 'Partial':
+        active = all_sessions[all_sessions != 0]
+        mean = float(active.mean()) if len(active) else 0.0
+        return cls(
+            session_totals=all_sessions.sum(axis=1),
+            drawdown_sum=float(max_drawdowns(all_sessions).sum()),
+            n_active=len(active),
+            n_positive=int((active > 0).sum()),
+            mean=mean,
+            m2=float(((active - mean) ** 2).sum()),
+        )
+
+    def merge(self, other: 'Partial') -> 'Partial':
+        n = self.n_active + other.n_active
+        delta = other.mean - self.mean
+        mean = self.mean + delta * other.n_active / n if n else 0.0
+        m2 = self.m2 + other.m2 + delta * delta * self.n_active * other.n_active / n if n else 0.0
+        return Partial(
+            session_totals=np.concatenate([self.session_totals, other.session_totals]),
+            drawdown_sum=self.drawdown_sum + other.drawdown_sum,
+            n_active=n,
+            n_positive=self.n_positive + other.n_positive,
+            mean=mean,
+            m2=m2,
+        )
+
+    def stats(self, label: str) -> SessionStats:
+        """SessionStats with compute_stats()'s definitions."""
+        s = SessionStats(label=label)
+        totals = self.session_totals
+        if self.n_active:
+            std = float(np.sqrt(self.m2 / self.n_active))
+            s.ev_per_trade = self.mean
+            s.sharpe = s.ev_per_trade / std if std > 0 else 0.0
+            s.win_pct = self.n_positive / self.n_active * 100
+            s.trades_per_session = self.n_active / len(totals)
+            s.ev_per_trade_se = std / np.sqrt(self.n_active)
+        s.mean_session_pnl = float(np.mean(totals))
+        s.median_pnl = float(np.median(totals))
+        s.pct_5 = float(np.percentile(totals, 5))
+        s.pct_95 = float(np.percentile(totals, 95))
+        s.loss_session_pct = float(np.mean(totals < 0) * 100)
+        s.mean_session_se = float(np.std(totals)) / np.sqrt(len(totals))
+        s.max_drawdown = self.drawdown_sum / len(totals)
+        return s
+
+
+# ============================================================================
+# CHUNKED MULTIPROCESS DRIVER
+# ============================================================================
+
+def _run_chunk(args: Tuple[Variant, np.random.SeedSequence, int, int]) -> Partial:
+    variant, seed, n_sessions, n_trades = args
+    rng = np.random.default_rng(seed)
+    return Partial.from_sessions(variant.simulate(rng, n_sessions, n_trades))
+
+
+def _chunk_sizes(n_sessions: int, chunk: int) -> List[int]:
+    return [min(chunk, n_sessions - i) for i in range(0, n_sessions, chunk)]
+
+
+def run_variant(variant: Variant, n_sessions: int = N_SESSIONS, n_trades: int = N_TRADES,
+                seed: int = 42, chunk: int = CHUNK_SESSIONS,
+                pool: Optional[ProcessPoolExecutor] = None) -> SessionStats:
+    """Simulate n_sessions of variant in chunks (on pool if given)."""
+    sizes = _chunk_sizes(n_sessions, chunk)
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    jobs = [(variant, sq, size, n_trades) for sq, size in zip(seeds, sizes)]
+    parts = pool.map(_run_chunk, jobs) if pool else map(_run_chunk, jobs)
+    total = Partial()
+    for part in parts:
+        total = total.merge(part)
+    return total.stats(variant.label)
+
+
+def run_sweep(variants: List[Variant], n_sessions: int = N_SESSIONS,
+              n_trades: int = N_TRADES, seed: int = 42, chunk: int = CHUNK_SESSIONS,
+              workers: Optional[int] = None) -> List[SessionStats]:
+    """run_variant() for each variant on one shared process pool.
+
+    Variant i is seeded from SeedSequence(seed) child i, so adding a variant
+    at the end of a sweep doesn't change the earlier rows.
+    """
+    children = np.random.SeedSequence(seed).spawn(len(variants))
+    seeds = [int(c.generate_state(1)[0]) for c in children]
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+        return [run_variant(v, n_sessions, n_trades, s, chunk, pool)
+                for v, s in zip(variants, seeds)]
+
+
+# ============================================================================
+# SWEEP DEFINITIONS (same rows as monte_carlo_sim.main)
+# ============================================================================
+
+def core_variants() -> List[Variant]:
+    """All 5 strategies x 2 spread minimums (D and E at 3 same-exchange rates)."""
+    out = []
+    for spread_min in SPREAD_MINS:
+        p = Params(spread_min=spread_min, spread_max=spread_min + 2)
+        for name, fn in BATCH_STRATEGIES.items():
+            if name == 'D SAME-EXCH':
+                for rate_pct, rate in D_RATES.items():
+                    out.append(Variant(f"D SAME({rate_pct}%) s{spread_min}", fn,
+                                       deepcopy(p), opportunity_rate=rate))
+            elif name == 'E HYBRID':
+                for rate_pct, rate in D_RATES.items():
+                    out.append(Variant(f"E HYBRID({rate_pct}%) s{spread_min}", fn,
+                                       replace(p, same_exchange_rate=rate)))
+            else:
+                out.append(Variant(f"{name} s{spread_min}", fn, deepcopy(p)))
+    return out
+
+
+def variant_modifiers() -> List[Variant]:
+    """Fill gate / Kelly / regime / loss cap / quick exit on A, B and E."""
+    base_p = Params(spread_min=4, spread_max=6)
+    out = []
+    for sname in ('A K-FIRST', 'B PM-FIRST', 'E HYBRID'):
+        fn = BATCH_STRATEGIES[sname]
+        out.append(Variant(f"{sname} +FillGate", fn, variant_fill_gate(base_p)))
+        out.append(Variant(f"{sname} +Kelly5x", fn, variant_kelly(base_p)))
+        out.append(Variant(f"{sname} +Regime", fn, deepcopy(base_p), regime=True))
+        out.append(Variant(f"{sname} +LossCap", fn, deepcopy(base_p),
+                           loss_cap=base_p.loss_cap))
+        # B and E don't hold to settle -- quick exit is their base strategy
+        vel_fn = batch_A_velocity if sname == 'A K-FIRST' else fn
+        out.append(Variant(f"{sname} +QuickExit", vel_fn, deepcopy(base_p)))
+    return out
+
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+def main():
+    n_sessions = int(sys.argv[1]) if len(sys.argv) > 1 else N_SESSIONS
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else None
+
+    print("=" * 120)
+    print("  MONTE CARLO ARB STRATEGY SIMULATOR (batched)")
+    print(f"  {n_sessions:,} sessions x {N_TRADES} trades per session")
+    print("=" * 120)
+
+    core = run_sweep(core_variants(), n_sessions, workers=workers, seed=42)
+    print_table("CORE STRATEGIES (baseline parameters)", core)
+
+    variants = run_sweep(variant_modifiers(), n_sessions, workers=workers, seed=43)
+    print_table("VARIANT MODIFIERS (spread_min=4, strategies A/B/E)", variants)
+
+    print_recommendation(core, variants)
+
+    print("  STANDARD ERRORS (EV/trade, session P&L):")
+    for r in core + variants:
+        print(f"  {r.label:<25} +/-{r.ev_per_trade_se:.3f}c  +/-{r.mean_session_se:.2f}c")
+    print()
+
+
+if __name__ == '__main__':
+    main()
@@ -199,6 +199,18 @@ class SessionStats:
     pct_95: float = 0.0
     mean_session_pnl: float = 0.0
     trades_per_session: float = 0.0
+    # Standard errors (half-width of a 95% CI is ~1.96 x these)
+    ev_per_trade_se: float = 0.0
+    mean_session_se: float = 0.0
+
+
+def max_drawdowns(all_sessions: np.ndarray) -> np.ndarray:
+    """Per-session max peak-to-trough of cumulative P&L, shape (n_sessions,)."""
+    if all_sessions.shape[1] == 0:
+        return np.zeros(len(all_sessions))
+    cumsum = np.cumsum(all_sessions, axis=1)
+    peak = np.maximum.accumulate(cumsum, axis=1)
+    return (peak - cumsum).max(axis=1)
 
 
 def compute_stats(
@@ -226,6 +238,7 @@ def compute_stats(
         s.sharpe = s.ev_per_trade / std if std > 0 else 0.0
         s.win_pct = float(np.mean(active_trades > 0) * 100)
         s.trades_per_session = len(active_trades) / len(session_totals)
+        s.ev_per_trade_se = std / np.sqrt(len(active_trades))
 
     # Session-level stats
     s.mean_session_pnl = float(np.mean(session_totals))
@@ -233,15 +246,10 @@ def compute_stats(
     s.pct_5 = float(np.percentile(session_totals, 5))
     s.pct_95 = float(np.percentile(session_totals, 95))
     s.loss_session_pct = float(np.mean(session_totals < 0) * 100)
+    s.mean_session_se = float(np.std(session_totals)) / np.sqrt(len(session_totals))
 
-    # Max drawdown (worst peak-to-trough across all sessions)
-    drawdowns = []
-    for sess in all_sessions:
-        cumsum = np.cumsum(sess)
-        peak = np.maximum.accumulate(cumsum)
-        dd = peak - cumsum
-        drawdowns.append(float(np.max(dd)) if len(dd) > 0 else 0.0)
-    s.max_drawdown = float(np.mean(drawdowns))  # average max DD
+    # Max drawdown (worst peak-to-trough within each session)
+    s.max_drawdown = float(np.mean(max_drawdowns(all_sessions)))  # average max DD
 
     return s
 
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""Parity: the column versions in data/scripts/cell_key_helpers.py (*_array) must classify every
+element exactly as the scalar functions they mirror -- the scalar functions are the reference
+definitions Layer A and Layer B were built on, so any drift silently moves rows between cells.
+
+Covered: every entry/spread band edge and one float step either side, the fall-through ends
+(entry >= 90c -> 9, spread >= 0.05 -> wide), below-range / negative values, NaN and None,
+float32 columns (compared against the scalar fed the same float32 element), object columns
+mixing None with floats, scalar vs per-row match_start_ts / settlement_ts, and ticker columns
+as list, numpy and pyarrow (plain and dictionary-encoded).
+Run: cd arb-executor && python3 tests/test_cell_key_arrays.py"""
+import sys
+from pathlib import Path
+
+import numpy as np
+
+REPO = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO / "data" / "scripts"))
+import cell_key_helpers as H
+
+fails = 0
+def check(c, m):
+    global fails
+    print(("PASS " if c else "*** FAIL ") + m); fails += (0 if c else 1)
+
+def around(x, dtype):
+    """x and its neighbouring floats in dtype."""
+    x = dtype(x)
+    return [np.nextafter(x, dtype(-np.inf)), x, np.nextafter(x, dtype(np.inf))]
+
+def same(got, want):
+    return len(got) == len(want) and all(g == w for g, w in zip(got, want))
+
+# ---- entry_band_idx_array ----
+for dtype in (np.float64, np.float32):
+    prices = [p for lo, hi in H.ENTRY_BANDS for p in around(lo / 100, dtype) + around(hi / 100, dtype)]
+    prices += [dtype(v) for v in (-0.5, -0.01, 0.0, 0.005, 0.899, 0.95, 0.999, 1.0, 1.5, np.nan)]
+    col = np.array(prices, dtype=dtype)
+    want = [H.entry_band_idx(p) for p in col]
+    got = H.entry_band_idx_array(col)
+    check(got.dtype == np.int64, f"entry_band_idx_array({dtype.__name__}) returns int64")
+    check(same(got.tolist(), [H.NO_BAND if w is None else w for w in want]),
+          f"entry_band_idx_array({dtype.__name__}) == entry_band_idx at every band edge, NaN, <0, >=90c")
+
+mixed = [None, 0.1, float("nan"), 0.9, None, 0.0999, -0.2]
+check(same(H.entry_band_idx_array(mixed).tolist(),
+           [H.NO_BAND if (w := H.entry_band_idx(p)) is None else w for p in mixed]),
+      "entry_band_idx_array(list with None) == entry_band_idx (None -> NO_BAND)")
+check(H.entry_band_idx_array([]).shape == (0,), "entry_band_idx_array([]) is empty")
+
+# ---- spread_band_name_array ----
+for dtype in (np.float64, np.float32):
+    bids, asks = [], []
+    for bid in (0.0, 0.10, 0.40, 0.73, 0.97):
+        for _, lo, hi in H.SPREAD_BANDS:
+            for sp in around(lo, dtype) + around(hi, dtype):
+                bids.append(dtype(bid)); asks.append(dtype(bid) + sp)
+    for bid, ask in ((0.5, 0.49), (0.5, 0.5), (0.3, np.nan), (np.nan, 0.3), (0.01, 0.99)):
+        bids.append(dtype(bid)); asks.append(dtype(ask))
+    b, a = np.array(bids, dtype=dtype), np.array(asks, dtype=dtype)
+    want = [H.spread_band_name(x, y) for x, y in zip(b, a)]
+    check(same(H.spread_band_name_array(b, a).tolist(), want),
+          f"spread_band_name_array({dtype.__name__}) == spread_band_name at every edge, NaN, ask<bid")
+
+b = [0.40, None, 0.20, 0.55, float("nan")]
+a = [0.42, 0.50, None, 0.60, 0.70]
+check(same(H.spread_band_name_array(b, a).tolist(), [H.spread_band_name(x, y) for x, y in zip(b, a)]),
+      "spread_band_name_array(lists with None) == spread_band_name (None either side -> None)")
+
+# ---- regime_for_moment_array ----
+ts = np.arange(900, 2101, 50, dtype=np.int64)
+for ms, st in ((1000, 2000), (None, 2000), (1000, None), (None, None), (1500, 1400)):
+    want = [H.regime_for_moment(int(t), ms, st) for t in ts]
+    check(same(H.regime_for_moment_array(ts, ms, st).tolist(), want),
+          f"regime_for_moment_array(match_start={ms}, settlement={st}) == regime_for_moment")
+ms_col = [1000, None, 1300, 1000] * 6 + [None]
+st_col = [2000, 2000, None, 1200] * 6 + [None]
+want = [H.regime_for_moment(int(t), m, s) for t, m, s in zip(ts, ms_col, st_col)]
+check(same(H.regime_for_moment_array(ts, ms_col, st_col).tolist(), want),
+      "regime_for_moment_array(per-row match_start/settlement with None) == regime_for_moment")
+
+# ---- categorize_array ----
+tickers = ["KXATPMATCH-26MAY01-A", "KXATPCHALLENGERMATCH-26MAY01-B", "KXATPCHALLMATCH-X",
+           "KXWTAMATCH-Y", "KXWTACHALLMATCH-Z", "KXWTAITF-Q", "KXNBA-1", "", "kxatpmatch-lower",
+           "KXATPMATCH-26MAY01-A", "KXWTA"]
+want = [H.categorize(t) for t in tickers]
+check(same(H.categorize_array(tickers).tolist(), want), "categorize_array(list) == categorize")
+check(same(H.categorize_array(np.array(tickers, dtype=object)).tolist(), want),
+      "categorize_array(numpy) == categorize")
+try:
+    import pyarrow as pa
+except ImportError:
+    print("SKIP categorize_array(pyarrow): pyarrow not installed")
+else:
+    check(same(H.categorize_array(pa.chunked_array([tickers[:4], tickers[4:]])).tolist(), want),
+          "categorize_array(pyarrow ChunkedArray) == categorize")
+    check(same(H.categorize_array(pa.array(tickers).dictionary_encode()).tolist(), want),
+          "categorize_array(pyarrow dictionary array) == categorize")
+
+print(f"\n{'ALL PASS' if fails == 0 else str(fails) + ' FAILED'}")
+
+def test_cell_key_array_parity():
+    assert fails == 0
+
+if __name__ == "__main__":
+    sys.exit(1 if fails else 0)
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""Parity: analysis/exit_chain_core.HitTable.pool() must reproduce the scalar reference
+_pooled_ev_hr_at() bit for bit at each (entry cent, R) cell -- EV, HR and dispersion, relative and
+absolute basis, Gaussian and leave-one-cent-out weights -- since build_surface, the CV bandwidth
+selection and the chosen chains all read their surfaces from HitTable now.
+
+Synthetic corpus (seeded): empty cents, single-N cents, peaks at/above 99, and weight rows with
+zeros and negatives (ignored by both paths). Every cent is checked at every third R plus the
+last R before the T > 99 mask (the scalar loop is slow; the full surface takes ~45s).
+Run: cd arb-executor && python3 tests/test_hit_table_pool.py"""
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+REPO = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO / "analysis"))
+import exit_chain_core as ec
+
+fails = 0
+def check(c, m):
+    global fails
+    print(("PASS " if c else "*** FAIL ") + m); fails += (0 if c else 1)
+
+def synthetic_corpus(rng):
+    rows = []
+    for c in range(ec.C_MIN, ec.C_MAX + 1):
+        n = 0 if c % 11 == 0 else (1 if c % 13 == 0 else int(rng.integers(2, 40)))
+        peak = np.minimum(c + rng.integers(0, 100 - c, n), 100)
+        win = (rng.random(n) < c / 100).astype(int)
+        rows += [(c, int(p), int(w)) for p, w in zip(peak, win)]
+    return pd.DataFrame(rows, columns=["c", "peak", "win"])
+
+def sampled_cells(cents):
+    """(ci, Ri) checked: every third R, the last R with T <= 99, and one past it (masked)."""
+    cells = []
+    for ci, c in enumerate(cents):
+        last = 99 - int(c) - 1
+        cells += [(ci, Ri) for Ri in sorted(set(range(0, ec.R_MAX, 3)) | {last, last + 1})
+                  if Ri < ec.R_MAX]
+    return cells
+
+def scalar_surface(prof, W, relative, cells):
+    """_pooled_ev_hr_at at each (ci, R) in cells with weight row W[ci]; NaN where T > 99."""
+    cents, peaks, wins, _own_n, ownc = prof
+    shape = (len(cents), ec.R_MAX)
+    ev, hr, dp = np.full(shape, np.nan), np.full(shape, np.nan), np.full(shape, np.nan)
+    for ci, Ri in cells:
+        c = int(cents[ci])
+        T = c + Ri + 1
+        if T > 99:
+            continue
+        weights = {int(cj): float(w) for cj, w in zip(cents, W[ci])}
+        ev[ci, Ri], hr[ci, Ri], dp[ci, Ri] = ec._pooled_ev_hr_at(
+            c, T, cents, peaks, wins, weights, ownc=ownc, relative=relative)
+    return ev, hr, dp
+
+def identical(a, b, cells):
+    idx = tuple(np.array(cells).T)
+    return a.shape == b.shape and np.array_equal(a[idx], b[idx], equal_nan=True)
+
+rng = np.random.default_rng(20260512)
+df = synthetic_corpus(rng)
+prof = ec._cent_profiles(df)
+table = ec.HitTable.from_df(df)
+cells = sampled_cells(table.cents)
+
+weightings = {
+    "gaussian sigma=3": table.weight_matrix([3.0] * len(table.cents)),
+    "own-cent only (sigma=0)": table.weight_matrix([0.0] * len(table.cents)),
+    "per-cent sigma, leave-one-out": table.weight_matrix(
+        rng.choice([0.0, 1.5, 4.0, 12.0], len(table.cents)), exclude_self=True),
+}
+signed = table.weight_matrix([6.0] * len(table.cents))
+signed[rng.random(signed.shape) < 0.2] *= -1
+weightings["weights with negatives"] = signed
+
+for label, W in weightings.items():
+    for relative in (True, False):
+        got = table.pool(W, relative=relative)
+        want = scalar_surface(prof, W, relative, cells)
+        basis = "relative" if relative else "absolute"
+        for name, g, w in zip(("EV", "HR", "dispersion"), got, want):
+            check(identical(g, w, cells), f"pool {name} == _pooled_ev_hr_at ({label}, {basis})")
+
+# own_ev: the CV target is the absolute-basis own-cent EV, i.e. pooled with only the diagonal
+own = table.own_ev()
+ev_own, _, _ = scalar_surface(prof, np.eye(len(table.cents)), False, cells)
+idx = tuple(np.array(cells).T)
+check(np.allclose(own[idx], ev_own[idx], equal_nan=True, rtol=0, atol=1e-12),
+      "own_ev == own-cent absolute _pooled_ev_hr_at")
+
+print(f"\n{'ALL PASS' if fails == 0 else str(fails) + ' FAILED'}")
+
+def test_hit_table_pool_parity():
+    assert fails == 0
+
+if __name__ == "__main__":
+    sys.exit(1 if fails else 0)
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""Parity: the vectorized step6 replay (tmp/validation4_step6_real/replay_engine.replay_ticks) must
+give every (offset, dca, exit, strategy) config the same entry, peak, pnl and capital -- and the
+same valid/invalid verdict -- as the scalar reference it replaced, replay_v5.maker_fill() +
+peak_bid_after() + simulate() walked tick by tick.
+
+Synthetic ticks (seeded random walks) exercise the edge cases the first-crossing searches have to
+get right: fills on the previous tick's candidate, exits and DCA triggers on the same tick,
+strategy B re-targeting after a DCA fill, no fill at all, settle bids in each settle band and
+None (unsettled -> invalid unless sold), and the >1800s bump in the maker candidate.
+Run: cd arb-executor && python3 tests/test_replay_engine_parity.py"""
+import sys
+from pathlib import Path
+
+import numpy as np
+
+REPO = Path(__file__).resolve().parent.parent
+STEP6 = REPO.parent / "tmp" / "validation4_step6_real"
+sys.path.insert(0, str(REPO))   # version_b_blueprint, imported by replay_v5
+sys.path.insert(0, str(STEP6))
+import replay_engine as E
+import replay_v5 as V
+from tick_store import Ticks
+
+fails = 0
+def check(c, m):
+    global fails
+    print(("PASS " if c else "*** FAIL ") + m); fails += (0 if c else 1)
+
+def synthetic_ticks(rng, n):
+    ts = np.cumsum(rng.integers(1, 400, n)).astype(np.int64)
+    bid = np.clip(np.cumsum(rng.integers(-3, 4, n)) + rng.integers(10, 80), 1, 97).astype(np.int16)
+    ask = np.minimum(bid + rng.integers(1, 6, n), 99).astype(np.int16)
+    return Ticks(ts, bid, ask)
+
+def scalar_grid(t, settle_bid, entry_lo, entry_hi, offsets, configs):
+    """{offset: (entry_idx, entry_px, peak, [(pnl, cap) | None per config])} via replay_v5."""
+    ticks = t.as_tuples()
+    out = {}
+    for off in offsets:
+        e_idx, e_px = V.maker_fill(ticks, entry_lo, entry_hi, off)
+        if e_idx is None:
+            out[off] = (None, None, 0, [None] * len(configs))
+            continue
+        res = [V.simulate(ticks, e_idx, e_px, dca, ext, strat, settle_bid)
+               for dca, ext, strat in configs]
+        out[off] = (e_idx, e_px, V.peak_bid_after(ticks, e_idx),
+                    [None if r is None else (r["pnl"], r["cap"]) for r in res])
+    return out
+
+configs = E.grid_configs(V.COARSE_DCA, V.COARSE_EXIT)
+fine = E.grid_configs([None, 3, 7, 12], [None, 2, 4, 9, 40])
+offsets = V.COARSE_OFFSETS
+rng = np.random.default_rng(20260415)
+
+checked = fills = dca_b = mismatches = 0
+for case in range(60):
+    t = synthetic_ticks(rng, int(rng.integers(12, 400)))
+    settle_bid = [None, 95, 80, 50, 20, 3][case % 6]
+    entry_lo = int(rng.integers(5, 50)); entry_hi = entry_lo + int(rng.integers(5, 40))
+    cfgs = configs if case % 2 == 0 else fine
+    grid = E.replay_ticks(f"T{case}", t, settle_bid, entry_lo, entry_hi, offsets, cfgs)
+    ref = scalar_grid(t, settle_bid, entry_lo, entry_hi, offsets, cfgs)
+    for i, off in enumerate(offsets):
+        e_idx, e_px, peak, res = ref[off]
+        if grid.entry(off) != (e_idx, e_px):
+            mismatches += 1
+            print(f"  case {case} off {off}: entry {grid.entry(off)} != {(e_idx, e_px)}")
+            continue
+        if e_idx is None:
+            continue
+        fills += 1
+        if int(grid.peak[i]) != peak:
+            mismatches += 1
+            print(f"  case {case} off {off}: peak {int(grid.peak[i])} != {peak}")
+        for c, r in enumerate(res):
+            checked += 1
+            got = (int(grid.pnl[i, c]), int(grid.cap[i, c])) if grid.valid[i, c] else None
+            if got != r:
+                mismatches += 1
+                print(f"  case {case} off {off} config {cfgs[c]}: {got} != {r}")
+            elif r is not None and cfgs[c][2] == "B" and r[1] > E.ES * e_px:
+                dca_b += 1
+
+check(fills > 100, f"synthetic corpus fills at many offsets ({fills} entries)")
+check(dca_b > 0, f"strategy B DCA paths exercised ({dca_b} configs)")
+check(mismatches == 0, f"replay_ticks == maker_fill/peak_bid_after/simulate over {checked} configs")
+
+# degenerate inputs: no ticks inside the entry range, and a flat tape that never fills
+t = synthetic_ticks(np.random.default_rng(7), 50)
+grid = E.replay_ticks("none", t, 95, 98, 99, offsets, configs)
+check(all(grid.entry(off) == (None, None) for off in offsets) and not grid.valid.any(),
+      "no entry in range -> no fills, no valid configs (as maker_fill)")
+flat = Ticks(np.arange(0, 5000, 100, dtype=np.int64), np.full(50, 40, dtype=np.int16),
+             np.full(50, 45, dtype=np.int16))
+grid = E.replay_ticks("flat", flat, None, 30, 60, offsets, configs)
+ref = scalar_grid(flat, None, 30, 60, offsets, configs)
+check(all(grid.entry(off) == ref[off][:2] for off in offsets),
+      "flat tape (ask never crosses the candidate) -> same entries as maker_fill")
+
+print(f"\n{'ALL PASS' if fails == 0 else str(fails) + ' FAILED'}")
+
+def test_replay_ticks_parity():
+    assert fails == 0
+
+if __name__ == "__main__":
+    sys.exit(1 if fails else 0)
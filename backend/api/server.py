@@ -30,6 +30,8 @@ from internal_grader import (
     _cap_edge_display,
     SPORT_DISPLAY, _normalize_sport, PROB_PER_POINT, PROB_PER_TOTAL_POINT,
 )
+from response_cache import cache_response, response_cache
+from async_db import db_handler, long_handler, run_db
 
 logging.basicConfig(
     level=logging.INFO,
@@ -52,6 +54,12 @@ async def lifespan(app):
     if _scheduler:
         logger.info("Shutting down scheduler...")
         _scheduler.shutdown(wait=False)
+    from recalc_queue import recalc_queue
+    recalc_queue.stop()
+    from warm_cache import warm_cache
+    warm_cache.flush()
+    import async_db
+    async_db.shutdown()
 
 app = FastAPI(
     title="OMI Edge API",
@@ -69,23 +77,6 @@ app.add_middleware(
 )
 
 
-# =============================================================================
-# RESPONSE CACHE — avoid hammering Supabase when multiple tabs fire at once
-# =============================================================================
-_cache: dict = {}  # key -> {"data": ..., "ts": float}
-
-def _cache_get(key: str, ttl: float):
-    """Return cached data if fresh, else None."""
-    entry = _cache.get(key)
-    if entry and (time.time() - entry["ts"]) < ttl:
-        return entry["data"]
-    return None
-
-def _cache_set(key: str, data):
-    """Store data in cache with current timestamp."""
-    _cache[key] = {"data": data, "ts": time.time()}
-
-
 def _with_scheduler_pause(fn, *args, **kwargs):
     """Pause scheduler, run fn, resume. Guarantees a free Supabase connection."""
     from scheduler import pause_scheduler, resume_scheduler
@@ -143,7 +134,8 @@ async def get_status():
 
 
 @app.get("/api/test-football-data")
-async def test_football_data():
+@db_handler
+def test_football_data():
     """Test Football-Data.org API connectivity for EPL."""
     import os
     result = {
@@ -197,7 +189,9 @@ async def get_sports():
 # =============================================================================
 
 @app.get("/api/edges/{sport}")
-async def get_edges_by_sport(sport: str):
+@cache_response("edges", tags=("predictions",))
+@db_handler
+def get_edges_by_sport(sport: str):
     """
     Get all edges for a sport - DATABASE ONLY.
     Returns cached predictions instantly. Run /api/refresh/pregame to populate.
@@ -235,7 +229,8 @@ async def get_edges_by_sport(sport: str):
 
 
 @app.get("/api/edges/{sport}/{game_id}")
-async def get_game_edge(sport: str, game_id: str):
+@db_handler
+def get_game_edge(sport: str, game_id: str):
     """
     Get detailed edge analysis for a single game - DATABASE ONLY.
     Returns cached prediction instantly.
@@ -305,7 +300,9 @@ async def get_game_edge(sport: str, game_id: str):
 
 
 @app.get("/api/active-edges")
-async def get_active_edges(
+@cache_response("active_edges", tags=("predictions",))
+@db_handler
+def get_active_edges(
     min_confidence: str = Query("WATCH", description="Minimum confidence: PASS, WATCH, EDGE, STRONG, RARE"),
     sport: Optional[str] = Query(None, description="Filter by sport")
 ):
@@ -333,7 +330,8 @@ async def get_active_edges(
 # =============================================================================
 
 @app.get("/api/lines/{game_id}")
-async def get_line_history(
+@db_handler
+def get_line_history(
     game_id: str,
     market: str = Query("spread", description="Market type: spread, moneyline, total"),
     book: Optional[str] = Query(None, description="Specific book to filter by"),
@@ -362,7 +360,8 @@ async def get_line_history(
 # =============================================================================
 
 @app.get("/api/consensus/{sport}/{game_id}")
-async def get_consensus_odds(sport: str, game_id: str):
+@db_handler
+def get_consensus_odds(sport: str, game_id: str):
     """
     Get consensus odds for a game - DATABASE ONLY.
     Returns data from cached prediction.
@@ -409,7 +408,9 @@ async def get_consensus_odds(sport: str, game_id: str):
 # =============================================================================
 
 @app.get("/api/odds/{sport}/{game_id}")
-async def get_per_book_odds(sport: str, game_id: str):
+@cache_response("per_book_odds", tags=("odds",))
+@db_handler
+def get_per_book_odds(sport: str, game_id: str):
     """
     Get odds for a game grouped by bookmaker.
     Allows frontend to display different lines when switching books.
@@ -550,7 +551,8 @@ async def get_per_book_odds(sport: str, game_id: str):
 # =============================================================================
 
 @app.get("/api/props/{sport}/{game_id}")
-async def get_game_props(
+@db_handler
+def get_game_props(
     sport: str,
     game_id: str,
     market: Optional[str] = Query(None, description="Filter by market type (e.g., player_pass_yds)")
@@ -578,7 +580,8 @@ async def get_game_props(
 
 
 @app.get("/api/props/{sport}/{game_id}/markets")
-async def get_available_prop_markets(sport: str, game_id: str):
+@db_handler
+def get_available_prop_markets(sport: str, game_id: str):
     """Get list of available prop markets for a game."""
     sport = sport.upper()
     
@@ -609,7 +612,8 @@ async def get_available_prop_markets(sport: str, game_id: str):
 
 
 @app.get("/api/props/{sport}/{game_id}/player/{player_name}")
-async def get_player_props(sport: str, game_id: str, player_name: str):
+@db_handler
+def get_player_props(sport: str, game_id: str, player_name: str):
     """Get all props for a specific player."""
     sport = sport.upper()
     
@@ -636,7 +640,8 @@ async def get_player_props(sport: str, game_id: str, player_name: str):
 
 
 @app.get("/api/props/history/{game_id}/{player_name}/{market_type}")
-async def get_prop_history(
+@db_handler
+def get_prop_history(
     game_id: str,
     player_name: str,
     market_type: str,
@@ -665,7 +670,8 @@ async def get_prop_history(
 # =============================================================================
 
 @app.get("/api/weather/{game_id}")
-async def get_game_weather(game_id: str):
+@db_handler
+def get_game_weather(game_id: str):
     """Get weather data for a game (outdoor sports only)."""
     try:
         weather = db.get_weather(game_id)
@@ -710,7 +716,7 @@ async def chat_about_game(
         raise HTTPException(status_code=400, detail="Message is required")
     
     try:
-        context = db.get_game_context_for_chatbot(game_id, sport)
+        context = await run_db(db.get_game_context_for_chatbot, game_id, sport)
         
         prediction = context.get("prediction")
         if not prediction:
@@ -915,7 +921,8 @@ def generate_fallback_response(user_message: str, prediction: dict) -> str:
 # =============================================================================
 
 @app.post("/api/results/snapshot/{sport}/{game_id}")
-async def snapshot_prediction(sport: str, game_id: str):
+@db_handler
+def snapshot_prediction(sport: str, game_id: str):
     """Snapshot a prediction before game starts."""
     tracker = ResultsTracker()
     result = tracker.snapshot_prediction_at_close(game_id, sport.upper())
@@ -923,7 +930,8 @@ async def snapshot_prediction(sport: str, game_id: str):
 
 
 @app.post("/api/results/grade/{game_id}")
-async def grade_game(game_id: str, home_score: int, away_score: int):
+@db_handler
+def grade_game(game_id: str, home_score: int, away_score: int):
     """Grade a completed game."""
     tracker = ResultsTracker()
     result = tracker.grade_game(game_id, home_score, away_score)
@@ -931,7 +939,8 @@ async def grade_game(game_id: str, home_score: int, away_score: int):
 
 
 @app.get("/api/results/recent")
-async def get_recent_results(limit: int = 50, sport: str = None):
+@db_handler
+def get_recent_results(limit: int = 50, sport: str = None):
     """Get recent graded games."""
     tracker = ResultsTracker()
     results = tracker.get_recent_results(limit, sport.upper() if sport else None)
@@ -939,7 +948,8 @@ async def get_recent_results(limit: int = 50, sport: str = None):
 
 
 @app.get("/api/results/summary")
-async def get_performance_summary(sport: str = None, days: int = 30):
+@db_handler
+def get_performance_summary(sport: str = None, days: int = 30):
     """Get performance summary stats."""
     tracker = ResultsTracker()
     summary = tracker.get_performance_summary(sport.upper() if sport else None, days)
@@ -947,7 +957,8 @@ async def get_performance_summary(sport: str = None, days: int = 30):
 
 
 @app.get("/api/results/price-movement/{game_id}")
-async def get_price_movement(game_id: str, market: str = "spread", book: str = "fanduel"):
+@db_handler
+def get_price_movement(game_id: str, market: str = "spread", book: str = "fanduel"):
     """Get price movement for a market."""
     tracker = ResultsTracker()
     movement = tracker.get_price_movement(game_id, market, book)
@@ -959,7 +970,8 @@ async def get_price_movement(game_id: str, market: str = "spread", book: str = "
 # =============================================================================
 
 @app.get("/api/espn/scores/{sport}")
-async def get_espn_scores(sport: str, date: str = None):
+@db_handler
+def get_espn_scores(sport: str, date: str = None):
     """Get scores from ESPN (free, no API cost)."""
     fetcher = ESPNScoreFetcher()
     scores = fetcher.get_scores(sport.upper(), date)
@@ -967,7 +979,8 @@ async def get_espn_scores(sport: str, date: str = None):
 
 
 @app.get("/api/espn/final/{sport}")
-async def get_espn_final_scores(sport: str, date: str = None):
+@db_handler
+def get_espn_final_scores(sport: str, date: str = None):
     """Get only final scores from ESPN."""
     fetcher = ESPNScoreFetcher()
     scores = fetcher.get_final_scores(sport.upper(), date)
@@ -975,7 +988,8 @@ async def get_espn_final_scores(sport: str, date: str = None):
 
 
 @app.post("/api/results/auto-grade")
-async def auto_grade_games(sport: str = None):
+@long_handler
+def auto_grade_games(sport: str = None):
     """Automatically grade completed games using ESPN scores."""
     tracker = ResultsTracker()
     grader = AutoGrader(tracker)
@@ -984,7 +998,8 @@ async def auto_grade_games(sport: str = None):
 
 
 @app.post("/api/results/snapshot-upcoming")
-async def snapshot_upcoming(sport: str = None, minutes: int = 30):
+@db_handler
+def snapshot_upcoming(sport: str = None, minutes: int = 30):
     """Snapshot predictions for games starting soon."""
     tracker = ResultsTracker()
     grader = AutoGrader(tracker)
@@ -997,7 +1012,8 @@ async def snapshot_upcoming(sport: str = None, minutes: int = 30):
 # =============================================================================
 
 @app.post("/api/refresh")
-async def refresh_all_edges():
+@long_handler
+def refresh_all_edges():
     """Manually trigger a refresh of all edges."""
     try:
         from scheduler import run_analysis_cycle
@@ -1012,7 +1028,8 @@ async def refresh_all_edges():
 
 
 @app.post("/api/refresh/pregame")
-async def refresh_pregame():
+@long_handler
+def refresh_pregame():
     """Manually trigger a pre-game refresh (all markets + props)."""
     try:
         from scheduler import run_pregame_cycle
@@ -1027,7 +1044,8 @@ async def refresh_pregame():
 
 
 @app.post("/api/refresh/live")
-async def refresh_live():
+@long_handler
+def refresh_live():
     """Manually trigger a live games refresh."""
     try:
         from scheduler import run_live_cycle
@@ -1042,7 +1060,8 @@ async def refresh_live():
 
 
 @app.post("/api/refresh/props")
-async def refresh_live_props():
+@long_handler
+def refresh_live_props():
     """Manually trigger a live props refresh."""
     try:
         from scheduler import run_live_props_cycle
@@ -1061,7 +1080,8 @@ async def refresh_live_props():
 # =============================================================================
 
 @app.get("/api/pillars/{sport}/{game_id}")
-async def calculate_pillars(
+@db_handler
+def calculate_pillars(
     sport: str,
     game_id: str,
     market_type: str = Query("spread", description="Market type: spread, totals, moneyline"),
@@ -1169,6 +1189,7 @@ async def calculate_pillars(
 # =============================================================================
 
 @app.post("/api/internal/grade-games")
+@long_handler
 def internal_grade_games(sport: str = None, regrade: bool = False):
     """Grade completed games and generate prediction_grades rows.
 
@@ -1176,9 +1197,12 @@ def internal_grade_games(sport: str = None, regrade: bool = False):
     from scratch (fixes bad edge calculations from sign-convention bug).
     """
     grader = InternalGrader()
-    if regrade:
-        return grader.regrade_all()
-    return grader.grade_games(sport.upper() if sport else None)
+    try:
+        if regrade:
+            return grader.regrade_all()
+        return grader.grade_games(sport.upper() if sport else None)
+    finally:
+        response_cache.invalidate("grades")
 
 
 _regrade_status = {
@@ -1226,6 +1250,7 @@ def regrade_all_async():
             progress["phase"] = "error"
         finally:
             _regrade_status["running"] = False
+            response_cache.invalidate("grades")
 
     threading.Thread(target=_run, daemon=True).start()
     return {"status": "started"}
@@ -1242,6 +1267,7 @@ def regrade_status():
 
 
 @app.post("/api/internal/backfill-scores")
+@long_handler
 def backfill_scores():
     """One-time backfill: fetch ESPN scores for Feb 10+ games, grade them.
 
@@ -1276,6 +1302,10 @@ def backfill_scores():
     gr_deleted = len(gr_deleted_res.data or [])
 
     logger.info(f"[Backfill] Purged {gr_deleted} game_results and {pg_deleted} prediction_grades before {cutoff}")
+    if pg_deleted:
+        # Deleted grades are still counted in performance_buckets
+        import perf_cache
+        perf_cache.rebuild_buckets(client)
 
     # --- Step 2: Fetch ESPN scores for unscored Feb 10+ games ---
     now = datetime.now(timezone.utc).isoformat()
@@ -1363,6 +1393,7 @@ def backfill_scores():
 
 
 @app.get("/api/internal/edge/performance")
+@db_handler
 def internal_edge_performance(
     sport: str = None,
     days: int = 30,
@@ -1373,43 +1404,40 @@ def internal_edge_performance(
     from_date: str = None,
     to_date: str = None,
 ):
-    """Get Edge performance metrics from prediction_grades.
+    """Get Edge performance metrics from the performance_buckets aggregates.
 
     Reads from scheduler-populated perf_cache first (zero Supabase calls).
-    Falls back to in-process cache, then direct query.
+    Falls back to in-process cache, then a direct bucket query.
     """
-    # Skip perf_cache when date filters are active (cache doesn't support them)
-    if not from_date and not to_date:
-        # 1. Check scheduler-populated cache (no Supabase call)
-        from perf_cache import lookup as perf_lookup
-        pre = perf_lookup(
-            sport=sport.upper() if sport else None,
-            days=days, market=market,
-            confidence_tier=confidence_tier,
-            signal=signal, since=since,
-        )
-        if pre is not None:
-            return pre
-
-    # 2. Fall back to in-process response cache
-    ck = f"perf:{sport}:{days}:{market}:{confidence_tier}:{signal}:{since}:{from_date}:{to_date}"
-    cached = _cache_get(ck, 300)
-    if cached is not None:
-        return cached
-
-    # 3. Last resort: pause scheduler, query Supabase directly
+    # 1. Check scheduler-populated cache (no Supabase call)
+    from perf_cache import lookup as perf_lookup
+    pre = perf_lookup(
+        sport=sport.upper() if sport else None,
+        days=days, market=market,
+        confidence_tier=confidence_tier,
+        signal=signal, since=since,
+        from_date=from_date, to_date=to_date,
+    )
+    if pre is not None:
+        return pre
+
+    # 2. Fall back to the response cache; last resort pauses the scheduler
+    #    and queries Supabase directly (single-flight across callers)
+    ck = (sport, days, market, confidence_tier, signal, since, from_date, to_date)
     def _query():
         return InternalGrader().get_performance(
             sport.upper() if sport else None,
             days, market, confidence_tier, signal, since,
             from_date=from_date, to_date=to_date,
         )
-    data = _with_scheduler_pause(_query)
-    _cache_set(ck, data)
-    return data
+    return response_cache.get_or_compute(
+        "performance", ck, lambda: _with_scheduler_pause(_query), tags=("grades",),
+    ).data
 
 
 @app.get("/api/internal/edge/graded-games")
+@cache_response("graded_games", tags=("grades",))
+@db_handler
 def internal_graded_games(
     sport: str = None,
     market: str = None,
@@ -1422,10 +1450,6 @@ def internal_graded_games(
 ):
     """Get individual graded prediction rows with game context."""
     capped_limit = min(limit, 1000)
-    ck = f"graded:{sport}:{market}:{verdict}:{days}:{since}:{capped_limit}:{from_date}:{to_date}"
-    cached = _cache_get(ck, 300)
-    if cached is not None:
-        return cached
     def _query():
         grader = InternalGrader()
         return grader.get_graded_games(
@@ -1438,25 +1462,19 @@ def internal_graded_games(
             from_date=from_date,
             to_date=to_date,
         )
-    data = _with_scheduler_pause(_query)
-    _cache_set(ck, data)
-    return data
+    return _with_scheduler_pause(_query)
 
 
 @app.get("/api/internal/edge/live-markets")
+@cache_response("live_markets", tags=("composites", "odds", "exchange"))
+@db_handler
 def internal_live_markets(sport: str = None):
     """Get upcoming games with current OMI fair lines and book edges."""
-    ck = f"live-mkts:{sport}"
-    cached = _cache_get(ck, 120)
-    if cached is not None:
-        return cached
     try:
         def _query():
             grader = InternalGrader()
             return grader.get_live_markets(sport.upper() if sport else None)
-        data = _with_scheduler_pause(_query)
-        _cache_set(ck, data)
-        return data
+        return _with_scheduler_pause(_query)
     except Exception as e:
         import traceback
         logger.error(f"[live-markets] 500 error: {e}\n{traceback.format_exc()}")
@@ -1464,6 +1482,7 @@ def internal_live_markets(sport: str = None):
 
 
 @app.get("/api/internal/edge/reflection")
+@db_handler
 def internal_edge_reflection(sport: str = None):
     """Deep reflection analysis on prediction accuracy and pillar effectiveness."""
     try:
@@ -1476,6 +1495,7 @@ def internal_edge_reflection(sport: str = None):
 
 
 @app.get("/api/internal/edge-analytics")
+@db_handler
 def internal_edge_analytics(sport: str = None, days: int = 30):
     """Deep edge analytics: calibration curves, conditional breakdowns, CLV, insights."""
     try:
@@ -1487,19 +1507,15 @@ def internal_edge_analytics(sport: str = None, days: int = 30):
 
 
 @app.get("/api/internal/exchange-accuracy")
+@cache_response("exchange_accuracy", tags=("grades", "exchange"))
+@db_handler
 def internal_exchange_accuracy(sport: str = None, days: int = 30):
     """Exchange vs sportsbook accuracy comparison from exchange_accuracy_log."""
-    ck = f"exch-acc:{sport}:{days}"
-    cached = _cache_get(ck, 300)
-    if cached is not None:
-        return cached
     try:
         from edge_analytics import EdgeAnalytics
         def _query():
             return EdgeAnalytics().analyze_exchange_accuracy(sport.upper() if sport else None, days)
-        data = _with_scheduler_pause(_query)
-        _cache_set(ck, data)
-        return data
+        return _with_scheduler_pause(_query)
     except Exception as e:
         logger.error(f"Error running exchange accuracy analysis: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -1510,6 +1526,7 @@ def internal_exchange_accuracy(sport: str = None, days: int = 30):
 # =============================================================================
 
 @app.get("/api/v1/pregame-edges")
+@db_handler
 def pregame_edges(sport: str = None):
     """Get latest pregame snapshot for all upcoming games with edges."""
     try:
@@ -1554,6 +1571,7 @@ def pregame_edges(sport: str = None):
 
 
 @app.get("/api/v1/pregame-history")
+@db_handler
 def pregame_history(game_id: str = None):
     """Get all pregame snapshots for a specific game, ordered by time."""
     if not game_id:
@@ -1579,6 +1597,7 @@ def pregame_history(game_id: str = None):
 
 
 @app.get("/api/internal/pregame-accuracy")
+@db_handler
 def internal_pregame_accuracy(sport: str = None, days: int = 30):
     """Pregame accuracy analysis: how OMI fair lines performed by hours-to-game bucket."""
     try:
@@ -1597,7 +1616,8 @@ def internal_pregame_accuracy(sport: str = None, days: int = 30):
 # =============================================================================
 
 @app.post("/api/recalculate-composites")
-async def recalculate_composites():
+@long_handler
+def recalculate_composites():
     """Recalculate composite scores and fair lines for all active games."""
     try:
         from composite_tracker import CompositeTracker
@@ -1609,7 +1629,8 @@ async def recalculate_composites():
 
 
 @app.get("/api/composite-history/{game_id}")
-async def get_composite_history(game_id: str):
+@db_handler
+def get_composite_history(game_id: str):
     """Get composite score history for a game, ordered by timestamp ascending."""
     try:
         if not db._is_connected():
@@ -1630,7 +1651,8 @@ async def get_composite_history(game_id: str):
 
 
 @app.post("/api/composite/fast-refresh")
-async def fast_refresh_live():
+@long_handler
+def fast_refresh_live():
     """Trigger a fast refresh of fair lines for live games."""
     import threading
     try:
@@ -1667,7 +1689,8 @@ async def sync_exchanges():
 
 
 @app.get("/api/exchange/markets")
-async def get_exchange_markets(
+@db_handler
+def get_exchange_markets(
     exchange: Optional[str] = Query(None, description="Filter by exchange: kalshi or polymarket"),
     search: Optional[str] = Query(None, description="Search event titles"),
     limit: int = Query(50, description="Max results (max 200)"),
@@ -1684,7 +1707,8 @@ async def get_exchange_markets(
 
 
 @app.get("/api/exchange/game/{game_id}")
-async def get_game_exchange_data(game_id: str):
+@db_handler
+def get_game_exchange_data(game_id: str):
     """Get exchange contracts matched to a specific game, grouped by market with divergence."""
     try:
         from exchange_tracker import ExchangeTracker
@@ -1836,7 +1860,8 @@ async def get_game_exchange_data(game_id: str):
 # =============================================================================
 
 @app.get("/api/internal/model-feedback")
-async def get_model_feedback(sport: str = None, days: int = 30):
+@db_handler
+def get_model_feedback(sport: str = None, days: int = 30):
     """Get latest calibration feedback rows with pillar metrics and CLV."""
     from model_feedback import ModelFeedback
     fb = ModelFeedback()
@@ -1844,7 +1869,8 @@ async def get_model_feedback(sport: str = None, days: int = 30):
 
 
 @app.post("/api/internal/run-feedback")
-async def run_model_feedback(sport: str = None, min_games: int = 50, apply_weights: bool = False):
+@long_handler
+def run_model_feedback(sport: str = None, min_games: int = 50, apply_weights: bool = False):
     """Run feedback analysis and optionally apply weight adjustments.
 
     1. Analyzes graded predictions for per-pillar metrics and CLV
@@ -1877,44 +1903,38 @@ async def run_model_feedback(sport: str = None, min_games: int = 50, apply_weigh
 
 
 @app.get("/api/internal/system-health")
+@cache_response("system_health")
+@db_handler
 def system_health():
     """Get system health report across all subsystems."""
-    cached = _cache_get("system-health", 120)
-    if cached is not None:
-        return cached
     try:
         from system_health import SystemHealth
         def _query():
             health = SystemHealth()
             return health.run_all_checks()
-        data = _with_scheduler_pause(_query)
-        _cache_set("system-health", data)
-        return data
+        return _with_scheduler_pause(_query)
     except Exception as e:
         logger.error(f"Error running system health check: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @app.get("/api/internal/accuracy-summary")
+@cache_response("accuracy_summary", tags=("grades",))
+@db_handler
 def accuracy_summary(sport: str = None, days: int = 30, from_date: str = None, to_date: str = None):
     """Prediction accuracy reflection pool — how close OMI fair lines are to reality."""
-    ck = f"acc-sum:{sport}:{days}:{from_date}:{to_date}"
-    cached = _cache_get(ck, 300)
-    if cached is not None:
-        return cached
     try:
         from accuracy_tracker import AccuracyTracker
         def _query():
             tracker = AccuracyTracker()
             return tracker.get_accuracy_summary(sport=sport, days=days, from_date=from_date, to_date=to_date)
-        data = _with_scheduler_pause(_query)
-        _cache_set(ck, data)
-        return data
+        return _with_scheduler_pause(_query)
     except Exception as e:
         return {"error": str(e)}
 
 
 @app.post("/api/internal/run-accuracy-reflection")
+@long_handler
 def run_accuracy_reflection():
     """Manually trigger accuracy reflection — process completed games."""
     try:
@@ -1964,25 +1984,24 @@ def force_composite_recalc_status():
 # =============================================================================
 
 @app.get("/api/internal/player-profile/{player_name}")
+@db_handler
 def get_player_profile(player_name: str, prop_type: str = "player_points", force: bool = False):
     """
     Get player projection, form score, and minutes/consistency for prop analytics.
     Lazy-loaded on prop expand — checks cache first, fetches from BDL if stale.
     Use force=true to skip all caches and refetch from BDL.
     """
-    cache_key = f"player_profile:{player_name}:{prop_type}"
-    if not force:
-        cached = _cache_get(cache_key, ttl=300)  # 5-min in-memory cache
-        if cached is not None:
-            return cached
-
+    cache_key = (player_name, prop_type)
     try:
         from player_analytics import get_player_profile as _get_profile
-        profile = _get_profile(player_name, prop_type, force=force)
-        if profile is None:
-            raise HTTPException(status_code=404, detail=f"Player not found: {player_name}")
-        _cache_set(cache_key, profile)
-        return profile
+        def _fetch():
+            profile = _get_profile(player_name, prop_type, force=force)
+            if profile is None:
+                raise HTTPException(status_code=404, detail=f"Player not found: {player_name}")
+            return profile
+        if force:
+            return response_cache.put("player_profile", cache_key, _fetch()).data
+        return response_cache.get_or_compute("player_profile", cache_key, _fetch).data  # 5-min in-memory cache
     except HTTPException:
         raise
     except Exception as e:
@@ -1991,6 +2010,7 @@ def get_player_profile(player_name: str, prop_type: str = "player_points", force
 
 
 @app.get("/api/internal/closing-lines")
+@db_handler
 def get_closing_lines(sport: str = None, days: int = 7):
     """Get recent closing line captures for inspection."""
     from model_feedback import ModelFeedback
@@ -2003,6 +2023,7 @@ def get_closing_lines(sport: str = None, days: int = 7):
 # =============================================================================
 
 @app.post("/api/internal/manual-refresh")
+@long_handler
 def manual_refresh(sport_key: str = None):
     """
     Trigger a single poll + recalc cycle.
@@ -2014,6 +2035,18 @@ def manual_refresh(sport_key: str = None):
     Use sparingly to conserve Odds API tokens.
     This is synchronous and may take 30-120 seconds.
     """
+    return _manual_refresh_impl(sport_key)
+
+
+@app.post("/api/internal/manual-refresh/{sport_key}")
+@long_handler
+def manual_refresh_sport(sport_key: str):
+    """Refresh odds + recalc for a single sport only."""
+    return _manual_refresh_impl(sport_key)
+
+
+def _manual_refresh_impl(sport_key: str = None) -> dict:
+    """Poll + recalc body shared by the manual-refresh endpoints."""
     start = time.time()
     results = {"steps": []}
 
@@ -2112,12 +2145,6 @@ def manual_refresh(sport_key: str = None):
     return results
 
 
-@app.post("/api/internal/manual-refresh/{sport_key}")
-def manual_refresh_sport(sport_key: str):
-    """Refresh odds + recalc for a single sport only."""
-    return manual_refresh(sport_key=sport_key)
-
-
 @app.get("/api/internal/odds-api-usage")
 def get_odds_api_usage():
     """Check how many Odds API calls have been made since last restart."""
@@ -2655,6 +2682,8 @@ def _build_game_signal(pred: dict, comp_row: dict, live_game: dict = None,
 
 
 @app.get("/api/v1/edge-signal/bulk")
+@cache_response("arb_bulk", tags=("predictions", "composites"))
+@db_handler
 def arb_bulk_edge_signals(
     sport: str = Query(..., description="Sport key: NCAAB, NBA, NFL, etc."),
     _auth: bool = Depends(verify_arb_api_key),
@@ -2667,12 +2696,6 @@ def arb_bulk_edge_signals(
     sport_upper = sport.upper()
     sport_short = _normalize_sport(sport_upper)
 
-    # 10s cache — prevents Supabase hammering from concurrent callers
-    ck = f"arb-bulk:{sport_short}"
-    cached = _cache_get(ck, 10)
-    if cached is not None:
-        return cached
-
     variants = _sport_variants(sport_short)
 
     try:
@@ -2883,7 +2906,6 @@ def arb_bulk_edge_signals(
             "live_count": live_count,
             "timestamp": now_iso,
         }
-        _cache_set(ck, result)
         return result
 
     except HTTPException:
@@ -2894,7 +2916,8 @@ def arb_bulk_edge_signals(
 
 
 @app.get("/api/v1/edge-signal")
-async def arb_single_edge_signal(
+@db_handler
+def arb_single_edge_signal(
     game_id: str = Query(..., description="Game ID"),
     _auth: bool = Depends(verify_arb_api_key),
 ):
@@ -2970,7 +2993,8 @@ async def arb_single_edge_signal(
 
 
 @app.get("/api/v1/edge-signal/by-teams")
-async def arb_edge_signal_by_teams(
+@db_handler
+def arb_edge_signal_by_teams(
     home: str = Query(..., description="Home team name (fuzzy match)"),
     away: str = Query(..., description="Away team name (fuzzy match)"),
     sport: str = Query(..., description="Sport key: NCAAB, NBA, NFL, etc."),
@@ -0,0 +1,142 @@
+"""
+Async Database Access for the FastAPI Server
+
+The Supabase client (and everything built on it: Database, InternalGrader,
+ExchangeTracker, ModelFeedback, ...) is synchronous. Calling it from an
+`async def` handler blocks the event loop for the whole round-trip, so one
+slow query stalls every other request.
+
+All handler database work goes through one bounded ThreadPoolExecutor:
+- `await run_db(fn, *args)` for an individual blocking call
+- `@db_handler` on a plain `def` endpoint to run its whole body there
+
+The pool size (config.DB_EXECUTOR_MAX_WORKERS) caps concurrent PostgREST
+calls from the API; excess requests wait in the executor queue rather than
+opening more connections. Queue wait and run time are recorded for
+system_health and load testing.
+
+Admin endpoints that run for minutes (manual refresh, grading, backfill)
+use `@long_handler` instead: the same pattern on a separate pool of
+config.LONG_TASK_EXECUTOR_MAX_WORKERS threads, so they never take a slot
+from the read endpoints.
+"""
+import asyncio
+import functools
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+
+from config import DB_EXECUTOR_MAX_WORKERS, LONG_TASK_EXECUTOR_MAX_WORKERS
+
+logger = logging.getLogger(__name__)
+
+# Rolling window of per-call timings used for percentiles
+_SAMPLE_WINDOW = 2000
+
+_executor = ThreadPoolExecutor(max_workers=DB_EXECUTOR_MAX_WORKERS, thread_name_prefix="api-db")
+_lock = threading.Lock()
+_metrics = {"submitted": 0, "completed": 0, "errors": 0, "queued": 0, "running": 0}
+_wait_ms: deque = deque(maxlen=_SAMPLE_WINDOW)
+_run_ms: deque = deque(maxlen=_SAMPLE_WINDOW)
+
+_long_executor = ThreadPoolExecutor(
+    max_workers=LONG_TASK_EXECUTOR_MAX_WORKERS, thread_name_prefix="api-long"
+)
+_long_metrics = {"submitted": 0, "running": 0}
+
+
+def _timed(fn: Callable, submitted_at: float) -> Any:
+    started = time.perf_counter()
+    with _lock:
+        _metrics["queued"] -= 1
+        _metrics["running"] += 1
+        _wait_ms.append((started - submitted_at) * 1000)
+    ok = False
+    try:
+        result = fn()
+        ok = True
+        return result
+    finally:
+        with _lock:
+            _metrics["running"] -= 1
+            _metrics["completed" if ok else "errors"] += 1
+            _run_ms.append((time.perf_counter() - started) * 1000)
+
+
+async def run_db(fn: Callable, *args, **kwargs) -> Any:
+    """Run a blocking database call on the bounded executor and await it."""
+    with _lock:
+        _metrics["submitted"] += 1
+        _metrics["queued"] += 1
+    call = functools.partial(fn, *args, **kwargs)
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_executor, _timed, call, time.perf_counter())
+
+
+def db_handler(func: Callable) -> Callable:
+    """Decorator: serve a blocking `def` endpoint from the database executor.
+
+    The wrapper is a coroutine with the same signature, so FastAPI still
+    resolves params/Depends() and it composes with @cache_response above it
+    (cache hits never reach the executor).
+    """
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        return await run_db(func, *args, **kwargs)
+    return wrapper
+
+
+def _long_timed(fn: Callable) -> Any:
+    with _lock:
+        _long_metrics["running"] += 1
+    try:
+        return fn()
+    finally:
+        with _lock:
+            _long_metrics["running"] -= 1
+
+
+def long_handler(func: Callable) -> Callable:
+    """Decorator: like @db_handler, but on the long-task pool."""
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        with _lock:
+            _long_metrics["submitted"] += 1
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            _long_executor, _long_timed, functools.partial(func, *args, **kwargs)
+        )
+    return wrapper
+
+
+def _percentile(samples: list, pct: float) -> float | None:
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    idx = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return round(ordered[idx], 1)
+
+
+def stats() -> dict:
+    """Executor depth and queue-wait / run-time percentiles (ms)."""
+    with _lock:
+        waits = list(_wait_ms)
+        runs = list(_run_ms)
+        snapshot = dict(_metrics)
+        long_tasks = dict(_long_metrics)
+    return {
+        **snapshot,
+        "max_workers": DB_EXECUTOR_MAX_WORKERS,
+        "long_tasks": {**long_tasks, "max_workers": LONG_TASK_EXECUTOR_MAX_WORKERS},
+        "wait_ms": {"p50": _percentile(waits, 50), "p99": _percentile(waits, 99)},
+        "run_ms": {"p50": _percentile(runs, 50), "p99": _percentile(runs, 99)},
+    }
+
+
+def shutdown():
+    """Called from the FastAPI lifespan on shutdown."""
+    _executor.shutdown(wait=False, cancel_futures=True)
+    _long_executor.shutdown(wait=False, cancel_futures=True)
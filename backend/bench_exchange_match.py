@@ -0,0 +1,141 @@
+"""
+Exchange Title Matching Benchmark
+
+Times ExchangeTracker._fuzzy_match_game (team-token index) against the
+previous linear scan over every active game, on a full Polymarket listing,
+and checks both return the same game for every title.
+
+Usage:
+    python bench_exchange_match.py                          # live Polymarket + cached_odds
+    python bench_exchange_match.py --save-fixture bench.json
+    python bench_exchange_match.py --fixture bench.json     # offline rerun
+"""
+import argparse
+import json
+import sys
+import time
+
+import requests
+
+from exchange_tracker import (
+    ExchangeTracker, POLYMARKET_API_BASE, _normalize_team, _extract_team_fragments,
+)
+
+
+def linear_match(games: list, title: str):
+    """The pre-index matcher: rescans and renormalizes every game per title."""
+    title_lower = title.lower()
+    title_fragments = set(_extract_team_fragments(title))
+    best_match = None
+    best_score = 0
+    for game in games:
+        game_data = game.get("game_data", {})
+        if not game_data:
+            continue
+        home = game_data.get("home_team", "")
+        away = game_data.get("away_team", "")
+        if not home or not away:
+            continue
+        home_norm = _normalize_team(home)
+        away_norm = _normalize_team(away)
+        home_words = set(home_norm.split())
+        away_words = set(away_norm.split())
+        home_matches = len(home_words & title_fragments)
+        away_matches = len(away_words & title_fragments)
+        if home_norm in title_lower:
+            home_matches = max(home_matches, len(home_words))
+        if away_norm in title_lower:
+            away_matches = max(away_matches, len(away_words))
+        score = home_matches + away_matches
+        if home_matches > 0 and away_matches > 0:
+            score += 5
+        if score > best_score and score >= 2:
+            best_score = score
+            best_match = game
+    if best_match:
+        return best_match["game_id"], best_match["sport_key"]
+    return None, None
+
+
+def fetch_polymarket_titles(max_pages: int) -> list[str]:
+    """Every active event title plus market question, as sync_polymarket sees them."""
+    titles: list[str] = []
+    offset, page_limit = 0, 200
+    for _ in range(max_pages):
+        resp = requests.get(
+            f"{POLYMARKET_API_BASE}/events",
+            params={"active": "true", "closed": "false", "limit": page_limit,
+                    "offset": offset, "order": "volume24hr", "ascending": "false"},
+            timeout=15,
+        )
+        resp.raise_for_status()
+        events = resp.json()
+        if not events:
+            break
+        for event in events:
+            titles.append(event.get("title", ""))
+            for m in event.get("markets", []) or []:
+                q = m.get("question") or m.get("groupItemTitle")
+                if q:
+                    titles.append(q)
+        offset += page_limit
+    return titles
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark exchange title → game matching")
+    parser.add_argument("--fixture", help="JSON with {games, titles} instead of live data")
+    parser.add_argument("--save-fixture", help="write the live games/titles here")
+    parser.add_argument("--max-pages", type=int, default=50, help="Polymarket pages of 200 events")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    if args.fixture:
+        with open(args.fixture) as f:
+            fixture = json.load(f)
+        games, titles = fixture["games"], fixture["titles"]
+    else:
+        games = ExchangeTracker()._load_active_games()
+        titles = fetch_polymarket_titles(args.max_pages)
+        if args.save_fixture:
+            with open(args.save_fixture, "w") as f:
+                json.dump({"games": games, "titles": titles}, f)
+
+    print(f"{len(games)} active games, {len(titles)} titles")
+    if not games or not titles:
+        print("Nothing to match", file=sys.stderr)
+        return
+
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        expected = [linear_match(games, t) for t in titles]
+    linear_s = (time.perf_counter() - start) / args.repeat
+
+    build_s = indexed_s = 0.0
+    for _ in range(args.repeat):
+        tracker = ExchangeTracker()
+        tracker._cached_games = games
+        start = time.perf_counter()
+        tracker._get_match_index()
+        build_s += time.perf_counter() - start
+        start = time.perf_counter()
+        actual = [tracker._fuzzy_match_game(t) for t in titles]
+        indexed_s += time.perf_counter() - start
+    build_s /= args.repeat
+    indexed_s /= args.repeat
+
+    mismatches = [(t, e, a) for t, e, a in zip(titles, expected, actual) if e != a]
+    matched = sum(1 for e in expected if e[0])
+    print(f"linear : {linear_s * 1000:9.1f} ms  ({linear_s / len(titles) * 1e6:.1f} us/title)")
+    print(f"indexed: {indexed_s * 1000:9.1f} ms  ({indexed_s / len(titles) * 1e6:.1f} us/title)"
+          f" + {build_s * 1000:.1f} ms index build")
+    print(f"speedup: {linear_s / max(indexed_s + build_s, 1e-9):.1f}x, "
+          f"{matched} titles matched, {len(mismatches)} mismatches")
+    for t, e, a in mismatches[:10]:
+        print(f"  MISMATCH {t!r}: linear={e} indexed={a}")
+    if mismatches:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,216 @@
+"""
+Variable Engine Batch Benchmark
+
+Runs the 63-variable engine over a synthetic slate through the scalar path
+(calculate_all_variables → aggregate_pillar_scores →
+calculate_variable_composite, one game at a time, as CompositeTracker did)
+and through evaluate_batch, checks every variable, weight, pillar score and
+composite is identical, and reports the timings.
+
+Pillar base weights come from SPORT_BASE_WEIGHTS unless --db-weights is
+given (then both paths read calibration_config like production does).
+
+Usage:
+    python bench_variable_engine.py                  # 500 games
+    python bench_variable_engine.py --games 5000 --seed 7
+"""
+import argparse
+import logging
+import random
+import sys
+import time
+
+import variable_engine as ve
+
+SPORTS = ["NBA", "NCAAB", "NFL", "NCAAF", "NHL", "EPL"]
+
+
+def _maybe(rng: random.Random, value, p_none: float = 0.15):
+    return None if rng.random() < p_none else value
+
+
+def synthetic_game(rng: random.Random, sport: str) -> dict:
+    """Pillar results shaped like analyze_game output, with gaps."""
+    def team():
+        return {
+            "win_pct": _maybe(rng, round(rng.random(), 3)),
+            # ESPN-style "W3" streak strings are rejected by both paths
+            "streak": "W3" if rng.random() < 0.01 else _maybe(rng, rng.randint(-8, 8)),
+            "pace": _maybe(rng, rng.uniform(60, 110)),
+            "offensive_rating": _maybe(rng, rng.uniform(95, 125)),
+            "defensive_rating": _maybe(rng, rng.uniform(95, 125)),
+            "points_per_game": _maybe(rng, rng.uniform(1, 120)),
+            "wins": _maybe(rng, rng.randint(0, 60)),
+            "losses": _maybe(rng, rng.randint(0, 60)),
+        }
+
+    def small(scale=0.3, p_zero=0.3):
+        return 0.0 if rng.random() < p_zero else rng.uniform(-scale, scale)
+
+    pillar_results = {
+        "execution": {
+            "score": rng.random(),
+            "home_injury_impact": rng.uniform(0, 1.2),
+            "away_injury_impact": rng.uniform(0, 1.2),
+            "breakdown": {"qb_impact": small()} if rng.random() < 0.8 else None,
+        },
+        "incentives": {
+            "home_motivation": rng.random(),
+            "away_motivation": rng.random(),
+            "is_rivalry": rng.random() < 0.2,
+            "is_championship": rng.random() < 0.05,
+            "breakdown": {
+                "playoff_bonus": small(), "tank_rest_alert": small(1.0),
+                "season_stage_boost": small(), "underdog_boost": small(),
+                "divisional_rivalry": small(1.0),
+            },
+        },
+        "shocks": {
+            "line_movement": small(6.0),
+            "shock_detected": rng.random() < 0.2,
+            "shock_direction": rng.choice(["home", "away", "neutral", "unknown"]),
+            "breakdown": {
+                "velocity": abs(small(3.0)), "time_factor": rng.random(),
+                "volatility": abs(small(4.0)),
+            },
+        },
+        "time_decay": {
+            "home_rest_days": rng.randint(0, 10),
+            "away_rest_days": rng.randint(0, 10),
+            "home_fatigue": rng.random(),
+            "away_fatigue": rng.random(),
+            "breakdown": {
+                "third_in_four": small(1.0), "travel_distance": abs(small(3500)),
+                "home_field_advantage": small(), "midweek_factor": small(1.0),
+                "momentum": small(),
+            },
+        },
+        "flow": {
+            "book_agreement": 0.0 if rng.random() < 0.2 else rng.random(),
+            "breakdown": {
+                "pinnacle_divergence": small(2.0), "retail_consensus": rng.random(),
+                "rlm_signal": small(), "line_movement": small(5.0),
+                "price_divergence": abs(small(3.0)), "velocity": abs(small(3.0)),
+                "exchange_signal": small(),
+            },
+        },
+        "game_environment": {
+            "expected_total": _maybe(rng, rng.uniform(2, 240)),
+            "breakdown": {
+                "special_teams_score": abs(small(1.0)), "weather_impact": small(),
+                "goals_per_game": abs(small(4.0)),
+            },
+        },
+    }
+    opening = _maybe(rng, round(rng.uniform(-12, 12) * 2) / 2)
+    return {
+        "pillar_results": pillar_results,
+        "team_stats": {"home": team(), "away": team()} if rng.random() < 0.85 else None,
+        "opening_line": opening,
+        "current_line": _maybe(rng, round(rng.uniform(-14, 14) * 2) / 2),
+    }
+
+
+def synthetic_context(rng: random.Random, sport: str) -> ve.GameContext:
+    return ve.GameContext(
+        sport=sport,
+        market=rng.choice(["spread", "total", "ml"]),
+        significance=rng.choice(["regular", "rivalry", "playoff", "elimination"]),
+        time_to_game_hours=rng.uniform(0, 120),
+        is_nationally_televised=False,
+        conference_tier=rng.choice(["power5", "mid_major"]),
+        has_exchange_data=rng.random() < 0.5,
+        has_weather_data=rng.random() < 0.3,
+    )
+
+
+def scalar_evaluate(game: dict, context: ve.GameContext):
+    """One game through the scalar functions, as CompositeTracker runs them."""
+    try:
+        all_variables = ve.calculate_all_variables(
+            game["pillar_results"], context.sport,
+            team_stats=game["team_stats"],
+            opening_line=game["opening_line"],
+            current_line=game["current_line"],
+        )
+    except (TypeError, ValueError, AttributeError):
+        return None
+    pillar_scores = ve.aggregate_pillar_scores(all_variables, context)
+    summary = ve.get_variable_summary(all_variables)
+    conf_sum = 0.0
+    for var_list in all_variables.values():
+        for v in var_list:
+            if v.available:
+                conf_sum += v.confidence
+    avail = summary["available_variables"]
+    return {
+        "enhanced_composite": ve.calculate_variable_composite(pillar_scores),
+        "avg_confidence": conf_sum / avail if avail > 0 else 0.0,
+        "pillar_scores": pillar_scores,
+        "all_variables": all_variables,
+        "dynamic_weights": ve.calculate_dynamic_weights(context),
+        "summary": summary,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark scalar vs batch variable engine")
+    parser.add_argument("--games", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--db-weights", action="store_true",
+                        help="load learned pillar weights from calibration_config")
+    args = parser.parse_args()
+
+    if not args.db_weights:
+        ve._load_db_weights = lambda sport: None
+    logging.disable(logging.WARNING)  # rejected-input warnings would dominate the timing
+
+    rng = random.Random(args.seed)
+    sports = [rng.choice(SPORTS) for _ in range(args.games)]
+    games = [synthetic_game(rng, s) for s in sports]
+    contexts = [synthetic_context(rng, s) for s in sports]
+
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        expected = [scalar_evaluate(g, c) for g, c in zip(games, contexts)]
+    scalar_s = (time.perf_counter() - start) / args.repeat
+
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        actual = ve.evaluate_batch(games, contexts)
+    batch_s = (time.perf_counter() - start) / args.repeat
+
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        raw = [ve.extract_raw_inputs(g["pillar_results"], c.sport, g["team_stats"],
+                                     g["opening_line"], g["current_line"])
+               for g, c, e in zip(games, contexts, expected) if e is not None]
+        slate = ve.build_slate(raw)
+    extract_s = (time.perf_counter() - start) / args.repeat
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        ve.calculate_all_variables_batch(slate, [c.sport for c, e in zip(contexts, expected) if e is not None])
+    kernel_s = (time.perf_counter() - start) / args.repeat
+
+    mismatches = [i for i, (e, a) in enumerate(zip(expected, actual)) if e != a]
+    print(f"{args.games} games ({sum(1 for e in expected if e is None)} with rejected inputs)")
+    print(f"scalar : {scalar_s * 1000:8.1f} ms  ({scalar_s / args.games * 1e6:.0f} us/game)")
+    print(f"batch  : {batch_s * 1000:8.1f} ms  ({batch_s / args.games * 1e6:.0f} us/game)")
+    print(f"  of which input extraction {extract_s * 1000:.1f} ms, variable kernel {kernel_s * 1000:.1f} ms;"
+          f" the rest builds VariableResult/PillarScore objects")
+    print(f"speedup: {scalar_s / max(batch_s, 1e-9):.1f}x, {len(mismatches)} mismatches")
+    for i in mismatches[:5]:
+        e, a = expected[i], actual[i]
+        if e is None or a is None:
+            print(f"  game {i}: scalar={'None' if e is None else 'ok'} batch={'None' if a is None else 'ok'}")
+            continue
+        for key in e:
+            if e[key] != a[key]:
+                print(f"  game {i} ({contexts[i].sport}): {key} differs")
+    if mismatches:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
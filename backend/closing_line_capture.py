@@ -16,6 +16,7 @@ import statistics
 from datetime import datetime, timezone, timedelta
 
 from database import db
+from composite_latest import get_latest_composite, get_latest_composites
 
 logger = logging.getLogger(__name__)
 
@@ -93,15 +94,8 @@ def _extract_median_lines(game_data: dict) -> dict:
 def _get_latest_fair_lines(game_id: str) -> dict:
     """Get the most recent composite_history row for a game."""
     try:
-        result = db.client.table("composite_history").select(
-            "fair_spread, fair_total, fair_ml_home, fair_ml_away, "
-            "composite_spread, composite_total, composite_ml"
-        ).eq("game_id", game_id).order(
-            "timestamp", desc=True
-        ).limit(1).execute()
-
-        if result.data:
-            row = result.data[0]
+        row = get_latest_composite(game_id)
+        if row:
             return {
                 "omi_fair_spread": row.get("fair_spread"),
                 "omi_fair_total": row.get("fair_total"),
@@ -159,6 +153,12 @@ def run_closing_line_capture() -> dict:
 
     logger.info(f"[ClosingLine] Found {len(eligible)} games in capture window")
 
+    # One batched read warms the composite_latest cache for the per-game lookups
+    try:
+        get_latest_composites([row["game_id"] for row in eligible])
+    except Exception as e:
+        logger.warning(f"[ClosingLine] Failed to prefetch fair lines: {e}")
+
     captured = 0
     errors = 0
 
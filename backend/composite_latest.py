@@ -0,0 +1,205 @@
+"""
+Latest Composite per Game
+
+Single accessor for "the newest composite_history row for these games",
+backed by the composite_latest projection table (one jsonb row per game)
+and a small in-process cache.
+
+Writers call record_composite(row) instead of inserting into
+composite_history directly: it appends the history row, upserts
+composite_latest and refreshes the cache entry, so readers in this process
+see the write immediately. Cache entries expire after
+COMPOSITE_LATEST_CACHE_TTL seconds to pick up writes from other processes.
+
+If composite_latest is unavailable (migration 024 not applied) reads fall
+back to deduplicating composite_history, as callers did before.
+
+Rows are also written to the warm cache, so a game's first read after a
+restart can use the previous process's row while it is still within the
+same TTL instead of going to the database.
+"""
+import logging
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Optional
+
+from database import db
+from response_cache import invalidate as invalidate_responses
+from warm_cache import warm_cache
+
+logger = logging.getLogger(__name__)
+
+# Seconds a cached latest row (or known absence of one) stays valid
+COMPOSITE_LATEST_CACHE_TTL = 60
+
+_CHUNK_SIZE = 200
+
+# game_id -> (row | None, cached_at monotonic)
+_cache: dict = {}
+_lock = threading.Lock()
+# game_ids already looked up in the warm cache by this process. Warm copies
+# older than the TTL are rejected, so after the first TTL since boot the
+# warm cache is skipped and this set cleared.
+_warm_tried: set = set()
+_warm_until = time.monotonic() + COMPOSITE_LATEST_CACHE_TTL
+# game_ids whose composite_latest upsert failed: the projection row is
+# behind composite_history, so they are read from history until an upsert
+# for them succeeds
+_projection_stale: set = set()
+
+
+def _now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _cached(game_ids: list) -> tuple[dict, list]:
+    """Split game_ids into (cached rows, ids needing a fetch)."""
+    found, missing = {}, []
+    cutoff = time.monotonic() - COMPOSITE_LATEST_CACHE_TTL
+    with _lock:
+        for gid in game_ids:
+            entry = _cache.get(gid)
+            if entry is None or entry[1] < cutoff:
+                missing.append(gid)
+            elif entry[0] is not None:
+                found[gid] = entry[0]
+    return found, missing
+
+
+def _load_warm(game_ids: list) -> tuple[dict, list]:
+    """Fill cache misses from the warm cache on a game's first lookup."""
+    if time.monotonic() >= _warm_until:
+        _warm_tried.clear()
+        return {}, game_ids
+    found, missing = {}, []
+    for gid in game_ids:
+        hit = None
+        if gid not in _warm_tried:
+            _warm_tried.add(gid)
+            hit = warm_cache.get("composite", gid, COMPOSITE_LATEST_CACHE_TTL)
+        if hit is None:
+            missing.append(gid)
+            continue
+        row, age = hit
+        with _lock:
+            _cache[gid] = (row, time.monotonic() - age)
+        found[gid] = row
+    return found, missing
+
+
+def _remember(rows: dict, requested: list):
+    stamp = time.monotonic()
+    with _lock:
+        for gid in requested:
+            _cache[gid] = (rows.get(gid), stamp)
+    for gid, row in rows.items():
+        warm_cache.put("composite", gid, row)
+
+
+def _fetch_from_projection(client, game_ids: list) -> dict:
+    latest = {}
+    for i in range(0, len(game_ids), _CHUNK_SIZE):
+        chunk = game_ids[i:i + _CHUNK_SIZE]
+        result = client.table("composite_latest").select(
+            "game_id, data"
+        ).in_("game_id", chunk).execute()
+        for row in (result.data or []):
+            latest[row["game_id"]] = row["data"]
+    return latest
+
+
+def _fetch_from_history(client, game_ids: list) -> dict:
+    latest = {}
+    for i in range(0, len(game_ids), _CHUNK_SIZE):
+        chunk = game_ids[i:i + _CHUNK_SIZE]
+        result = client.table("composite_history").select(
+            "*"
+        ).in_("game_id", chunk).order("timestamp", desc=True).execute()
+        for row in (result.data or []):
+            latest.setdefault(row["game_id"], row)
+    return latest
+
+
+def get_latest_composites(game_ids: list, client=None) -> dict:
+    """Return {game_id: newest composite_history row} for the given games.
+
+    Games without any composite are omitted. Rows contain every column the
+    writer supplied (fair lines, composites, book lines, edge, flow gate,
+    live CEQ fields) plus timestamp. Each row is a copy the caller may modify.
+    """
+    if not game_ids:
+        return {}
+    game_ids = list(dict.fromkeys(game_ids))
+    found, missing = _cached(game_ids)
+    if missing:
+        warm, missing = _load_warm(missing)
+        found.update(warm)
+    if missing:
+        client = client or db.client
+        with _lock:
+            from_history = [gid for gid in missing if gid in _projection_stale]
+            from_projection = [gid for gid in missing if gid not in _projection_stale]
+        fetched = _fetch_from_history(client, from_history) if from_history else {}
+        if from_projection:
+            try:
+                fetched.update(_fetch_from_projection(client, from_projection))
+            except Exception as e:
+                logger.warning(f"[CompositeLatest] composite_latest read failed, using history: {e}")
+                fetched.update(_fetch_from_history(client, from_projection))
+        _remember(fetched, missing)
+        found.update(fetched)
+    return {gid: dict(row) for gid, row in found.items()}
+
+
+def get_latest_composite(game_id: str, client=None) -> Optional[dict]:
+    """Single-game convenience wrapper around get_latest_composites."""
+    return get_latest_composites([game_id], client).get(game_id)
+
+
+def record_composite(row_data: dict, client=None):
+    """Append a composite_history row and make it the game's latest.
+
+    The history insert is the source of truth and raises on failure like a
+    direct insert would. A failed projection upsert is logged and the game
+    is read from composite_history (not the now-stale projection row) until
+    a later upsert for it succeeds.
+    """
+    client = client or db.client
+    row = dict(row_data)
+    row.setdefault("timestamp", _now_iso())
+    client.table("composite_history").insert(row).execute()
+    invalidate_responses("composites")
+
+    gid = row["game_id"]
+    try:
+        client.table("composite_latest").upsert({
+            "game_id": gid,
+            "sport_key": row.get("sport_key", ""),
+            "timestamp": row["timestamp"],
+            "data": row,
+            "updated_at": _now_iso(),
+        }, on_conflict="game_id").execute()
+    except Exception as e:
+        logger.warning(f"[CompositeLatest] Upsert failed for {gid}, reading it from history: {e}")
+        with _lock:
+            _projection_stale.add(gid)
+    else:
+        with _lock:
+            _projection_stale.discard(gid)
+    with _lock:
+        _cache[gid] = (row, time.monotonic())
+    warm_cache.put("composite", gid, row)
+
+
+def invalidate(game_id: str = None):
+    """Drop one cached game, or the whole cache when game_id is None."""
+    with _lock:
+        if game_id is None:
+            _cache.clear()
+        else:
+            _cache.pop(game_id, None)
+    if game_id is None:
+        warm_cache.delete("composite")
+    else:
+        warm_cache.delete("composite", game_id)
@@ -13,9 +13,14 @@ from typing import Optional
 import logging
 import math
 import statistics
+import threading
 import traceback
 
 from database import db
+from data_sources.cache import pillar_memo
+from composite_latest import get_latest_composites, record_composite
+from recalc_queue import recalc_queue
+from job_executor import checkpoint
 from engine.analyzer import analyze_game, implied_prob_to_american, fetch_line_context, fetch_team_environment_stats
 from espn_scores import ESPNScoreFetcher, teams_match, ESPN_SPORTS
 
@@ -384,12 +389,24 @@ def _round_to_half(value: float) -> float:
     return round(value * 2) / 2
 
 
+# game_id -> pregame composite_history row, for games already in progress
+# (fast_refresh_live). Entries leave when the game leaves the live window.
+_pregame_baseline_cache: dict[str, dict] = {}
+_pregame_baseline_lock = threading.Lock()
+
 # Movement thresholds for triggering recalculation
 SPREAD_MOVEMENT_THRESHOLD = 0.5   # points
 TOTAL_MOVEMENT_THRESHOLD = 1.0    # points
 STALE_RECALC_HOURS = 0.5          # force recalc if last composite older than 30 min
 CARRY_FORWARD_MINUTES = 0         # always carry forward — ensures every cycle writes a row
 
+# recalculate_all works through games in chunks of this size. A chunk with
+# at least VARIABLE_ENGINE_MIN_SLATE fresh games runs the variable engine as
+# one evaluate_batch slate; smaller ones use the scalar path, which is
+# faster below that size (bench_variable_engine.py)
+VARIABLE_ENGINE_SLATE_SIZE = 100
+VARIABLE_ENGINE_MIN_SLATE = 50
+
 
 def _should_recalculate(
     game_id: str,
@@ -397,12 +414,18 @@ def _should_recalculate(
     current_book_total,
     previous: dict | None,
     now_dt: datetime,
+    event_reason: str | None = None,
 ) -> tuple:
     """
     Determine if a game needs composite recalculation based on line movement.
     Returns (should_recalc: bool, reason: str).
     Reason prefixed with "carry_forward_" means: skip expensive pillar analysis,
     just re-insert the previous fair lines with fresh timestamp.
+
+    In-memory only: event_reason is a pending recalc_queue event (injury
+    report / exchange price changed), and line movement is measured against
+    the book lines the last fresh composite was computed from, falling back
+    to the previous row when this process has not computed one yet.
     """
     if previous is None:
         return True, "first_time"
@@ -419,8 +442,13 @@ def _should_recalculate(
     except (ValueError, AttributeError, TypeError):
         return True, "unparseable_timestamp"
 
+    if event_reason:
+        return True, event_reason
+
+    baseline = recalc_queue.last_inputs(game_id) or previous
+
     # Spread movement check
-    prev_spread = previous.get("book_spread")
+    prev_spread = baseline.get("book_spread")
     if current_book_spread is not None and prev_spread is not None:
         try:
             spread_delta = abs(float(current_book_spread) - float(prev_spread))
@@ -430,7 +458,7 @@ def _should_recalculate(
             pass
 
     # Total movement check
-    prev_total = previous.get("book_total")
+    prev_total = baseline.get("book_total")
     if current_book_total is not None and prev_total is not None:
         try:
             total_delta = abs(float(current_book_total) - float(prev_total))
@@ -675,34 +703,99 @@ class CompositeTracker:
         """
         Batch-fetch the most recent composite_history row per game_id.
         Returns {game_id: {full row including fair_spread, fair_total, etc.}}.
-        Single query + Python dedup avoids N per-game queries.
-        All columns are fetched so carry-forward can propagate fair lines.
+        Reads the composite_latest projection (one row per game), so
+        carry-forward still sees every column without pulling history.
         """
         if not game_ids:
             return {}
         try:
-            all_rows = []
-            chunk_size = 200
-            for i in range(0, len(game_ids), chunk_size):
-                chunk = game_ids[i:i + chunk_size]
-                result = db.client.table("composite_history").select(
-                    "*"
-                ).in_("game_id", chunk).order(
-                    "timestamp", desc=True
-                ).execute()
-                all_rows.extend(result.data or [])
-
-            # Dedup: keep only the first (newest) row per game_id
-            latest = {}
-            for row in all_rows:
-                gid = row["game_id"]
-                if gid not in latest:
-                    latest[gid] = row
-            return latest
+            return get_latest_composites(game_ids)
         except Exception as e:
             logger.error(f"[DynamicRecalc] Failed to batch-fetch latest composites: {e}")
             return {}
 
+    def _variable_engine_inputs(
+        self,
+        ve,
+        analysis: dict,
+        sport_key: str,
+        game_id: str,
+        game_data: dict,
+    ) -> tuple[dict, object]:
+        """
+        Gather the variable engine's inputs for one analyzed game.
+
+        Returns ({pillar_results, team_stats, opening_line, current_line}, GameContext).
+        """
+        sport_upper = SPORT_DISPLAY.get(sport_key, sport_key.upper())
+        pillar_results = analysis.get("pillars", {})
+
+        # Fetch team_stats for variable engine (may already be cached by analyzer)
+        home_team = game_data.get("home_team", "")
+        away_team = game_data.get("away_team", "")
+        team_stats = fetch_team_environment_stats(home_team, away_team, sport_key)
+
+        # Get opening/current line from line context
+        line_ctx = fetch_line_context(game_id, sport_key)
+
+        # Build GameContext
+        incentives = pillar_results.get("incentives", {})
+        is_rivalry = incentives.get("is_rivalry", False)
+        is_champ = incentives.get("is_championship", False)
+        if is_champ:
+            significance = "playoff"
+        elif is_rivalry:
+            significance = "rivalry"
+        else:
+            significance = "regular"
+
+        commence_time = game_data.get("commence_time")
+        ttg_hours = 24.0  # Default
+        if commence_time:
+            try:
+                game_dt = datetime.fromisoformat(
+                    commence_time.replace("Z", "+00:00")
+                )
+                ttg_hours = max(0.0, (game_dt - datetime.now(timezone.utc)).total_seconds() / 3600)
+            except (ValueError, AttributeError):
+                pass
+
+        has_exchange = False
+        try:
+            from exchange_tracker import ExchangeTracker
+            has_exchange = bool(ExchangeTracker().get_game_exchange_data(game_id))
+        except Exception:
+            pass
+
+        game_env = pillar_results.get("game_environment", {})
+        has_weather = bool((game_env.get("breakdown") or {}).get("weather_impact"))
+
+        context = ve.GameContext(
+            sport=sport_upper,
+            market="spread",
+            significance=significance,
+            time_to_game_hours=ttg_hours,
+            is_nationally_televised=False,
+            conference_tier="power5",
+            has_exchange_data=has_exchange,
+            has_weather_data=has_weather,
+        )
+
+        return {
+            "pillar_results": pillar_results,
+            "team_stats": team_stats,
+            "opening_line": line_ctx.get("opening_line"),
+            "current_line": line_ctx.get("current_line"),
+        }, context
+
+    def _log_variable_engine(self, game_id: str, result: dict) -> None:
+        logger.info(
+            f"[VarEngine] {game_id}: enhanced_composite={result['enhanced_composite']:.3f}, "
+            f"avg_confidence={result['avg_confidence']:.2f}, "
+            f"coverage={result['summary']['available_variables']}/"
+            f"{result['summary']['total_variables']}"
+        )
+
     def _run_variable_engine(
         self,
         analysis: dict,
@@ -722,68 +815,16 @@ class CompositeTracker:
             return None
 
         try:
-            sport_upper = SPORT_DISPLAY.get(sport_key, sport_key.upper())
-            pillar_results = analysis.get("pillars", {})
-
-            # Fetch team_stats for variable engine (may already be cached by analyzer)
-            home_team = game_data.get("home_team", "")
-            away_team = game_data.get("away_team", "")
-            team_stats = fetch_team_environment_stats(home_team, away_team, sport_key)
-
-            # Get opening/current line from line context
-            line_ctx = fetch_line_context(game_id, sport_key)
-            opening_line = line_ctx.get("opening_line")
-            current_line = line_ctx.get("current_line")
+            inputs, context = self._variable_engine_inputs(
+                ve, analysis, sport_key, game_id, game_data,
+            )
 
             # Calculate all 63 variables
             all_variables = ve.calculate_all_variables(
-                pillar_results, sport_upper,
-                team_stats=team_stats,
-                opening_line=opening_line,
-                current_line=current_line,
-            )
-
-            # Build GameContext
-            incentives = pillar_results.get("incentives", {})
-            is_rivalry = incentives.get("is_rivalry", False)
-            is_champ = incentives.get("is_championship", False)
-            if is_champ:
-                significance = "playoff"
-            elif is_rivalry:
-                significance = "rivalry"
-            else:
-                significance = "regular"
-
-            commence_time = game_data.get("commence_time")
-            ttg_hours = 24.0  # Default
-            if commence_time:
-                try:
-                    game_dt = datetime.fromisoformat(
-                        commence_time.replace("Z", "+00:00")
-                    )
-                    ttg_hours = max(0.0, (game_dt - datetime.now(timezone.utc)).total_seconds() / 3600)
-                except (ValueError, AttributeError):
-                    pass
-
-            has_exchange = False
-            try:
-                from exchange_tracker import ExchangeTracker
-                has_exchange = bool(ExchangeTracker().get_game_exchange_data(game_id))
-            except Exception:
-                pass
-
-            game_env = pillar_results.get("game_environment", {})
-            has_weather = bool((game_env.get("breakdown") or {}).get("weather_impact"))
-
-            context = ve.GameContext(
-                sport=sport_upper,
-                market="spread",
-                significance=significance,
-                time_to_game_hours=ttg_hours,
-                is_nationally_televised=False,
-                conference_tier="power5",
-                has_exchange_data=has_exchange,
-                has_weather_data=has_weather,
+                inputs["pillar_results"], context.sport,
+                team_stats=inputs["team_stats"],
+                opening_line=inputs["opening_line"],
+                current_line=inputs["current_line"],
             )
 
             # Aggregate and compute enhanced composite
@@ -793,7 +834,6 @@ class CompositeTracker:
             # Average confidence across available variables
             summary = ve.get_variable_summary(all_variables)
             total_avail = summary["available_variables"]
-            total_vars = summary["total_variables"]
             avg_confidence = 0.0
             if total_avail > 0:
                 conf_sum = 0.0
@@ -805,13 +845,7 @@ class CompositeTracker:
 
             dynamic_weights = ve.calculate_dynamic_weights(context)
 
-            logger.info(
-                f"[VarEngine] {game_id}: enhanced_composite={enhanced_composite:.3f}, "
-                f"avg_confidence={avg_confidence:.2f}, "
-                f"coverage={total_avail}/{total_vars}"
-            )
-
-            return {
+            result = {
                 "enhanced_composite": enhanced_composite,
                 "avg_confidence": avg_confidence,
                 "pillar_scores": pillar_scores,
@@ -820,6 +854,8 @@ class CompositeTracker:
                 "context": context,
                 "summary": summary,
             }
+            self._log_variable_engine(game_id, result)
+            return result
 
         except Exception as e:
             logger.warning(
@@ -827,6 +863,56 @@ class CompositeTracker:
             )
             return None
 
+    def _run_variable_engine_slate(self, games: list) -> list:
+        """
+        Run the variable engine over a chunk of freshly analyzed games, in
+        one vectorized evaluate_batch call when there are at least
+        VARIABLE_ENGINE_MIN_SLATE of them, else game by game.
+
+        games is a list of (analysis, sport_key, game_id, game_data). Returns
+        the _run_variable_engine result (or None) for each game, in order.
+        """
+        if len(games) < VARIABLE_ENGINE_MIN_SLATE:
+            return [
+                self._run_variable_engine(analysis, sport_key, game_id, game_data, None)
+                for analysis, sport_key, game_id, game_data in games
+            ]
+        results: list = [None] * len(games)
+        ve = _get_variable_engine()
+        if ve is None:
+            return results
+
+        idx, inputs, contexts = [], [], []
+        for i, (analysis, sport_key, game_id, game_data) in enumerate(games):
+            try:
+                game_input, context = self._variable_engine_inputs(
+                    ve, analysis, sport_key, game_id, game_data,
+                )
+            except Exception as e:
+                logger.warning(
+                    f"[VarEngine] Failed for {game_id}: {e}\n{traceback.format_exc()}"
+                )
+                continue
+            idx.append(i)
+            inputs.append(game_input)
+            contexts.append(context)
+
+        try:
+            batch = ve.evaluate_batch(inputs, contexts) if inputs else []
+        except Exception as e:
+            logger.warning(
+                f"[VarEngine] Slate of {len(inputs)} games failed: {e}\n"
+                f"{traceback.format_exc()}"
+            )
+            return results
+
+        for i, context, result in zip(idx, contexts, batch):
+            if result is None:
+                continue
+            results[i] = {**result, "context": context}
+            self._log_variable_engine(games[i][2], result)
+        return results
+
     def _store_variable_results(
         self,
         game_id: str,
@@ -899,7 +985,12 @@ class CompositeTracker:
             # Storage failure must never block composite calculation
             logger.warning(f"[VarEngine] Storage failed for {game_id}: {e}")
 
-    def recalculate_all(self, force: bool = False) -> dict:
+    def recalculate_all(
+        self,
+        force: bool = False,
+        game_ids: list | None = None,
+        reasons: dict | None = None,
+    ) -> dict:
         """
         Main entry point. For every active (not yet started) game in cached_odds:
         1. Run analyze_game for fresh pillar scores
@@ -910,21 +1001,56 @@ class CompositeTracker:
 
         force=True bypasses the movement check — forces fresh pillar analysis
         and fair line recalc for every game (use after deploying formula changes).
+
+        game_ids limits the pass to those games; reasons maps game_id to the
+        change events that queued it (the recalc_queue worker passes both).
+        Pending events for any processed game are claimed either way.
+
+        Each game is held with recalc_queue.begin() from analysis to write.
+        A game another pass holds is skipped; if this pass was queued for
+        it, its event is queued again to run after the other pass.
         """
+        held: set = set()
+        try:
+            return self._recalculate_all(force, game_ids, reasons, held)
+        finally:
+            for gid in held:
+                recalc_queue.end(gid)
+
+    def _hold(self, held: set, game_id: str, sport_key: str, reasons: dict | None) -> bool:
+        """Claim game_id for this pass (see recalculate_all)."""
+        if recalc_queue.begin(game_id):
+            held.add(game_id)
+            return True
+        if reasons and game_id in reasons:
+            recalc_queue.emit(game_id, sport_key, reasons[game_id])
+        return False
+
+    def _release(self, held: set, game_id: str):
+        if game_id in held:
+            held.discard(game_id)
+            recalc_queue.end(game_id)
+
+    def _recalculate_all(self, force: bool, game_ids: list | None, reasons: dict | None,
+                         held: set) -> dict:
         if not db._is_connected():
             return {"error": "Database not connected", "games_processed": 0, "errors": 0}
 
         now_dt = datetime.now(timezone.utc)
         now = now_dt.isoformat()
+        memo_before = pillar_memo.counters()
 
         try:
             # Fetch ALL games from cached_odds (no server-side JSONB filter).
             # The cleanup job keeps this table lean (~active games only).
             # We filter by commence_time in Python with proper datetime parsing
             # to avoid text comparison issues (Z vs +00:00 suffixes).
-            result = db.client.table("cached_odds").select(
+            query = db.client.table("cached_odds").select(
                 "sport_key, game_id, game_data"
-            ).limit(5000).execute()
+            )
+            if game_ids is not None:
+                query = query.in_("game_id", list(game_ids))
+            result = query.limit(5000).execute()
         except Exception as e:
             logger.error(f"[CompositeTracker] Failed to query cached_odds: {e}")
             return {"error": str(e), "games_processed": 0, "errors": 1}
@@ -980,291 +1106,339 @@ class CompositeTracker:
             f"for {len(game_ids)} games"
         )
 
-        for row in rows:
-            try:
-                sport_key = row["sport_key"]
-                game_id = row["game_id"]
-                game_data = row["game_data"]
+        # Analyze, evaluate and write VARIABLE_ENGINE_SLATE_SIZE games at a
+        # time: a cancelled pass keeps every chunk already written, and only
+        # one chunk of analyses is held in memory
+        for start in range(0, len(rows), VARIABLE_ENGINE_SLATE_SIZE):
+            # Games needing fresh analysis: (row, book_lines, reason, analysis)
+            fresh: list = []
 
-                if not game_data:
-                    continue
+            for row in rows[start:start + VARIABLE_ENGINE_SLATE_SIZE]:
+                checkpoint()
+                game_id = row.get("game_id")
+                try:
+                    sport_key = row["sport_key"]
+                    game_id = row["game_id"]
+                    game_data = row["game_data"]
 
-                # 1. Median book lines FIRST (cheap, no pillar calc needed)
-                book_lines = _extract_median_lines(game_data)
-                book_spread = book_lines["book_spread"]
-                book_total = book_lines["book_total"]
-                book_ml_home = book_lines["book_ml_home"]
-                book_ml_away = book_lines["book_ml_away"]
-                book_ml_draw = book_lines["book_ml_draw"]
+                    if not game_data:
+                        continue
 
-                # 2. Movement check — skip if lines haven't moved (unless force=True)
-                previous = latest_composites.get(game_id)
-                if force:
-                    should_recalc, reason = True, "forced"
-                else:
-                    should_recalc, reason = _should_recalculate(
-                        game_id, book_spread, book_total, previous, now_dt
+                    # Another pass is recalculating this game right now
+                    if not self._hold(held, game_id, sport_key, reasons):
+                        skipped += 1
+                        continue
+
+                    # 1. Median book lines FIRST (cheap, no pillar calc needed)
+                    book_lines = _extract_median_lines(game_data)
+                    book_spread = book_lines["book_spread"]
+                    book_total = book_lines["book_total"]
+                    book_ml_home = book_lines["book_ml_home"]
+                    book_ml_away = book_lines["book_ml_away"]
+                    book_ml_draw = book_lines["book_ml_draw"]
+
+                    # 2. Movement check — skip if lines haven't moved (unless force=True)
+                    previous = latest_composites.get(game_id)
+                    claimed = recalc_queue.take(game_id)
+                    event_reason = (reasons or {}).get(game_id) or (claimed.reason if claimed else None)
+                    if force:
+                        should_recalc, reason = True, "forced"
+                    else:
+                        should_recalc, reason = _should_recalculate(
+                            game_id, book_spread, book_total, previous, now_dt, event_reason
+                        )
+
+                    if not should_recalc:
+                        skipped += 1
+                        continue
+
+                    # 3. Log the trigger reason
+                    logger.info(f"[DynamicRecalc] {game_id}: {reason}")
+
+                    # 3b. Carry-forward path: no line movement, just re-insert previous
+                    #     fair lines with fresh timestamp (cheap, skip pillar analysis)
+                    if reason.startswith("carry_forward_") and previous:
+                        # Skip carry-forward if previous had no useful fair data
+                        prev_fs = previous.get("fair_spread")
+                        prev_ft = previous.get("fair_total")
+                        prev_fmh = previous.get("fair_ml_home")
+                        if prev_fs is None and prev_ft is None and prev_fmh is None:
+                            skipped += 1
+                            continue
+                        row_data = {
+                            "game_id": game_id,
+                            "sport_key": sport_key,
+                            "timestamp": now,
+                            "composite_spread": previous.get("composite_spread"),
+                            "composite_total": previous.get("composite_total"),
+                            "composite_ml": previous.get("composite_ml"),
+                            "fair_spread": previous.get("fair_spread"),
+                            "fair_total": previous.get("fair_total"),
+                            "fair_ml_home": previous.get("fair_ml_home"),
+                            "fair_ml_away": previous.get("fair_ml_away"),
+                            "book_spread": book_spread,
+                            "book_total": book_total,
+                            "book_ml_home": book_ml_home,
+                            "book_ml_away": book_ml_away,
+                        }
+                        if previous.get("fair_ml_draw") is not None:
+                            row_data["fair_ml_draw"] = previous["fair_ml_draw"]
+                        if book_ml_draw is not None:
+                            row_data["book_ml_draw"] = book_ml_draw
+                        # Edge calculation — use carried-forward fair lines vs current book lines
+                        raw_edge = _calculate_edge_pct(
+                            previous.get("fair_spread"), book_spread,
+                            previous.get("fair_total"), book_total, sport_key
+                        )
+                        capped_edge = _cap_edge(raw_edge)
+                        row_data["raw_edge_pct"] = raw_edge
+                        row_data["capped_edge_pct"] = capped_edge
+                        if raw_edge >= EDGE_CAP_THRESHOLD:
+                            logger.warning(f"[EdgeCap] {game_id}: raw={raw_edge:.1f}% -> capped={capped_edge:.1f}%")
+                        # Flow gate — carry forward from previous row
+                        cf_flow = previous.get("pillar_flow", 0.5) or 0.5
+                        row_data["pillar_flow"] = cf_flow
+                        flow_gated = (capped_edge is not None
+                                      and abs(capped_edge) >= FLOW_GATE_EDGE_MIN
+                                      and cf_flow < FLOW_GATE_THRESHOLD)
+                        row_data["flow_gated"] = flow_gated
+                        if flow_gated:
+                            logger.info(f"[FlowGate] {game_id}: CARRY-FWD gated (flow={cf_flow:.2f}, edge={capped_edge:.1f}%)")
+                        record_composite(row_data)
+                        logger.info(
+                            f"[CompositeTracker] CARRY-FORWARD {game_id}: "
+                            f"fair_spread={previous.get('fair_spread')}, "
+                            f"fair_total={previous.get('fair_total')}"
+                        )
+                        games_processed += 1
+                        recalculated += 1
+                        sport_processed[sport_key] = sport_processed.get(sport_key, 0) + 1
+                        continue
+
+                    # 4. Fresh pillar analysis (EXPENSIVE — only when movement detected)
+                    analysis = analyze_game(game_data, sport_key)
+                    fresh.append((row, book_lines, reason, analysis))
+
+                except Exception as e:
+                    logger.error(
+                        f"[CompositeTracker] Error processing {row.get('game_id', '?')} "
+                        f"(sport={row.get('sport_key', '?')}): {e}\n"
+                        f"{traceback.format_exc()}"
                     )
+                    errors += 1
+                    sk = row.get("sport_key", "unknown")
+                    sport_errors[sk] = sport_errors.get(sk, 0) + 1
+                finally:
+                    # Games awaiting their write stay held until it is done
+                    if not (fresh and fresh[-1][0] is row):
+                        self._release(held, game_id)
+
+            # 4b. Variable engine — enhanced composite (safe fallback), for
+            #     this chunk's freshly analyzed games
+            ve_results = self._run_variable_engine_slate([
+                (analysis, row["sport_key"], row["game_id"], row["game_data"])
+                for row, _, _, analysis in fresh
+            ])
+
+            for (row, book_lines, reason, analysis), ve_result in zip(fresh, ve_results):
+                checkpoint()
+                try:
+                    sport_key = row["sport_key"]
+                    game_id = row["game_id"]
+                    book_spread = book_lines["book_spread"]
+                    book_total = book_lines["book_total"]
+                    book_ml_home = book_lines["book_ml_home"]
+                    book_ml_away = book_lines["book_ml_away"]
+                    book_ml_draw = book_lines["book_ml_draw"]
+
+                    if ve_result is not None:
+                        self._store_variable_results(game_id, sport_key, ve_result)
+
+                    # 5. Per-market composites from pillars_by_market
+                    pbm = analysis.get("pillars_by_market", {})
+                    composite_spread = pbm.get("spread", {}).get("full", {}).get("composite")
+                    composite_total = pbm.get("totals", {}).get("full", {}).get("composite")
+                    composite_ml = pbm.get("moneyline", {}).get("full", {}).get("composite")
+
+                    # 5a. Use enhanced composite IF variable engine succeeded and
+                    #     confidence is above 0.5 — otherwise keep old composite.
+                    #     Enhanced composite blends into spread composite only (primary market).
+                    if (
+                        ve_result is not None
+                        and ve_result["avg_confidence"] > 0.5
+                        and composite_spread is not None
+                    ):
+                        old_cs = composite_spread
+                        # Blend: 70% old composite + 30% enhanced (conservative ramp-in)
+                        composite_spread = old_cs * 0.70 + ve_result["enhanced_composite"] * 0.30
+                        ve_enhanced += 1
+                        if games_processed < 5:
+                            logger.info(
+                                f"[VarEngine] {game_id}: blended spread composite "
+                                f"{old_cs:.3f} -> {composite_spread:.3f} "
+                                f"(enhanced={ve_result['enhanced_composite']:.3f}, "
+                                f"conf={ve_result['avg_confidence']:.2f})"
+                            )
+                    else:
+                        ve_fallback += 1
+
+                    is_soccer = "soccer" in sport_key
+
+                    # 7. Calculate fair lines
+                    fair_spread = None
+                    fair_total = None
+                    fair_ml_home = None
+                    fair_ml_away = None
+                    fair_ml_draw = None
+
+                    if book_spread is not None and composite_spread is not None:
+                        fair_spread = _calculate_fair_spread(book_spread, composite_spread)
+                        # Exchange divergence boost: shift fair spread toward exchange signal
+                        exchange_adj = _calc_exchange_divergence_boost(game_id, book_spread, sport_key)
+                        if exchange_adj != 0.0:
+                            fair_spread = _round_to_half(fair_spread + exchange_adj)
+                        fair_ml_home, fair_ml_away = _calculate_fair_ml(fair_spread, sport_key)
+
+                        # Soccer: 3-way ML derived from spread for coherence
+                        if is_soccer and book_ml_home is not None and book_ml_draw is not None and book_ml_away is not None:
+                            comp = composite_ml if composite_ml is not None else 0.5
+                            fair_ml_home, fair_ml_draw, fair_ml_away = _calculate_fair_ml_from_book_3way(
+                                book_ml_home, book_ml_draw, book_ml_away, comp, book_spread, sport_key
+                            )
 
-                if not should_recalc:
-                    skipped += 1
-                    continue
+                    elif is_soccer and book_ml_home is not None and book_ml_draw is not None and book_ml_away is not None and composite_ml is not None:
+                        # Soccer 3-way ML (no spread data — composite-only fallback)
+                        fair_ml_home, fair_ml_draw, fair_ml_away = _calculate_fair_ml_from_book_3way(
+                            book_ml_home, book_ml_draw, book_ml_away, composite_ml
+                        )
+                    elif composite_ml is not None:
+                        # No spread data — composite-only ML
+                        fair_ml_home, fair_ml_away = _calculate_fair_ml_composite_only(composite_ml)
+
+                    if book_total is not None:
+                        # Use full totals composite; fall back to game_env pillar if unavailable
+                        game_env_score = analysis.get("pillar_scores", {}).get("game_environment", 0.5)
+                        total_signal = composite_total if composite_total is not None else game_env_score
+                        fair_total = _calculate_fair_total(book_total, total_signal)
+
+                    # 5b. Bias correction — apply 30% of measured systematic bias
+                    if sport_key not in bias_cache:
+                        bias_cache[sport_key] = _get_bias_correction(sport_key)
+                    bias = bias_cache[sport_key]
+
+                    if fair_spread is not None and bias.get("spread_bias") is not None and bias.get("spread_sample", 0) >= 50:
+                        correction = bias["spread_bias"] * 0.3
+                        old_fs = fair_spread
+                        fair_spread = _round_to_half(fair_spread - correction)
+                        if games_processed < 3:  # Log first few only
+                            logger.info(
+                                f"[BiasCorr] {game_id}: spread_bias={bias['spread_bias']}, "
+                                f"correction={correction:.2f}, fair_spread {old_fs}→{fair_spread}"
+                            )
 
-                # 3. Log the trigger reason
-                logger.info(f"[DynamicRecalc] {game_id}: {reason}")
-
-                # 3b. Carry-forward path: no line movement, just re-insert previous
-                #     fair lines with fresh timestamp (cheap, skip pillar analysis)
-                if reason.startswith("carry_forward_") and previous:
-                    # Skip carry-forward if previous had no useful fair data
-                    prev_fs = previous.get("fair_spread")
-                    prev_ft = previous.get("fair_total")
-                    prev_fmh = previous.get("fair_ml_home")
-                    if prev_fs is None and prev_ft is None and prev_fmh is None:
+                    if fair_total is not None and bias.get("total_bias") is not None and bias.get("total_sample", 0) >= 50:
+                        correction = bias["total_bias"] * 0.3
+                        old_ft = fair_total
+                        fair_total = _round_to_half(fair_total - correction)
+                        if games_processed < 3:  # Log first few only
+                            logger.info(
+                                f"[BiasCorr] {game_id}: total_bias={bias['total_bias']}, "
+                                f"correction={correction:.2f}, fair_total {old_ft}→{fair_total}"
+                            )
+
+                    # 5c. Cap fair lines — sport-specific caps prevent extreme deviations
+                    s_cap = SPREAD_CAP_BY_SPORT.get(sport_key, DEFAULT_SPREAD_CAP)
+                    t_cap = TOTAL_CAP_BY_SPORT.get(sport_key, DEFAULT_TOTAL_CAP)
+
+                    if fair_spread is not None and book_spread is not None:
+                        capped = max(book_spread - s_cap,
+                                     min(book_spread + s_cap, fair_spread))
+                        if capped != fair_spread:
+                            logger.warning(
+                                f"[FairCap] {game_id}: spread capped {fair_spread}→{capped} "
+                                f"(book={book_spread}, cap=±{s_cap}, sport={sport_key})"
+                            )
+                            fair_spread = capped
+
+                    if fair_total is not None and book_total is not None:
+                        capped = max(book_total - t_cap,
+                                     min(book_total + t_cap, fair_total))
+                        if capped != fair_total:
+                            logger.warning(
+                                f"[FairCap] {game_id}: total capped {fair_total}→{capped} "
+                                f"(book={book_total}, cap=±{t_cap}, sport={sport_key})"
+                            )
+                            fair_total = capped
+
+                    # Re-derive fair ML from post-bias/cap fair_spread for coherence
+                    # (Skip soccer 3-way which uses its own internal fair_spread)
+                    if fair_spread is not None and fair_ml_draw is None:
+                        fair_ml_home, fair_ml_away = _calculate_fair_ml(fair_spread, sport_key)
+
+                    # 6. Skip write if all fair values are null (analyzer returned nothing useful)
+                    if fair_spread is None and fair_total is None and fair_ml_home is None:
+                        logger.debug(f"[CompositeTracker] SKIP {game_id}: all fair values null after analysis")
                         skipped += 1
                         continue
+
+                    # 7. Insert row
                     row_data = {
                         "game_id": game_id,
                         "sport_key": sport_key,
                         "timestamp": now,
-                        "composite_spread": previous.get("composite_spread"),
-                        "composite_total": previous.get("composite_total"),
-                        "composite_ml": previous.get("composite_ml"),
-                        "fair_spread": previous.get("fair_spread"),
-                        "fair_total": previous.get("fair_total"),
-                        "fair_ml_home": previous.get("fair_ml_home"),
-                        "fair_ml_away": previous.get("fair_ml_away"),
+                        "composite_spread": composite_spread,
+                        "composite_total": composite_total,
+                        "composite_ml": composite_ml,
+                        "fair_spread": fair_spread,
+                        "fair_total": fair_total,
+                        "fair_ml_home": fair_ml_home,
+                        "fair_ml_away": fair_ml_away,
                         "book_spread": book_spread,
                         "book_total": book_total,
                         "book_ml_home": book_ml_home,
                         "book_ml_away": book_ml_away,
                     }
-                    if previous.get("fair_ml_draw") is not None:
-                        row_data["fair_ml_draw"] = previous["fair_ml_draw"]
-                    if book_ml_draw is not None:
-                        row_data["book_ml_draw"] = book_ml_draw
-                    # Edge calculation — use carried-forward fair lines vs current book lines
-                    raw_edge = _calculate_edge_pct(
-                        previous.get("fair_spread"), book_spread,
-                        previous.get("fair_total"), book_total, sport_key
-                    )
+                    if fair_ml_draw is not None:
+                        row_data["fair_ml_draw"] = fair_ml_draw
+                    # Edge calculation and soft cap
+                    raw_edge = _calculate_edge_pct(fair_spread, book_spread, fair_total, book_total, sport_key)
                     capped_edge = _cap_edge(raw_edge)
                     row_data["raw_edge_pct"] = raw_edge
                     row_data["capped_edge_pct"] = capped_edge
                     if raw_edge >= EDGE_CAP_THRESHOLD:
                         logger.warning(f"[EdgeCap] {game_id}: raw={raw_edge:.1f}% -> capped={capped_edge:.1f}%")
-                    # Flow gate — carry forward from previous row
-                    cf_flow = previous.get("pillar_flow", 0.5) or 0.5
-                    row_data["pillar_flow"] = cf_flow
+                    # Flow gate — use fresh pillar flow from analysis
+                    flow_score = analysis.get("pillar_scores", {}).get("flow", 0.5) or 0.5
+                    row_data["pillar_flow"] = flow_score
                     flow_gated = (capped_edge is not None
                                   and abs(capped_edge) >= FLOW_GATE_EDGE_MIN
-                                  and cf_flow < FLOW_GATE_THRESHOLD)
+                                  and flow_score < FLOW_GATE_THRESHOLD)
                     row_data["flow_gated"] = flow_gated
                     if flow_gated:
-                        logger.info(f"[FlowGate] {game_id}: CARRY-FWD gated (flow={cf_flow:.2f}, edge={capped_edge:.1f}%)")
-                    db.client.table("composite_history").insert(row_data).execute()
+                        logger.info(f"[FlowGate] {game_id}: gated (flow={flow_score:.2f}, edge={capped_edge:.1f}%)")
+                    record_composite(row_data)
+                    recalc_queue.record_inputs(game_id, book_spread=book_spread, book_total=book_total)
                     logger.info(
-                        f"[CompositeTracker] CARRY-FORWARD {game_id}: "
-                        f"fair_spread={previous.get('fair_spread')}, "
-                        f"fair_total={previous.get('fair_total')}"
+                        f"[CompositeTracker] WRITE {game_id}: "
+                        f"fair_spread={fair_spread}, fair_total={fair_total}, "
+                        f"reason={reason}"
                     )
+
                     games_processed += 1
                     recalculated += 1
                     sport_processed[sport_key] = sport_processed.get(sport_key, 0) + 1
-                    continue
-
-                # 4. Fresh pillar analysis (EXPENSIVE — only when movement detected)
-                analysis = analyze_game(game_data, sport_key)
-
-                # 4b. Variable engine — enhanced composite (safe fallback)
-                ve_result = self._run_variable_engine(
-                    analysis, sport_key, game_id, game_data, book_spread,
-                )
-                if ve_result is not None:
-                    self._store_variable_results(game_id, sport_key, ve_result)
-
-                # 5. Per-market composites from pillars_by_market
-                pbm = analysis.get("pillars_by_market", {})
-                composite_spread = pbm.get("spread", {}).get("full", {}).get("composite")
-                composite_total = pbm.get("totals", {}).get("full", {}).get("composite")
-                composite_ml = pbm.get("moneyline", {}).get("full", {}).get("composite")
-
-                # 5a. Use enhanced composite IF variable engine succeeded and
-                #     confidence is above 0.5 — otherwise keep old composite.
-                #     Enhanced composite blends into spread composite only (primary market).
-                if (
-                    ve_result is not None
-                    and ve_result["avg_confidence"] > 0.5
-                    and composite_spread is not None
-                ):
-                    old_cs = composite_spread
-                    # Blend: 70% old composite + 30% enhanced (conservative ramp-in)
-                    composite_spread = old_cs * 0.70 + ve_result["enhanced_composite"] * 0.30
-                    ve_enhanced += 1
-                    if games_processed < 5:
-                        logger.info(
-                            f"[VarEngine] {game_id}: blended spread composite "
-                            f"{old_cs:.3f} -> {composite_spread:.3f} "
-                            f"(enhanced={ve_result['enhanced_composite']:.3f}, "
-                            f"conf={ve_result['avg_confidence']:.2f})"
-                        )
-                else:
-                    ve_fallback += 1
-
-                is_soccer = "soccer" in sport_key
-
-                # 7. Calculate fair lines
-                fair_spread = None
-                fair_total = None
-                fair_ml_home = None
-                fair_ml_away = None
-                fair_ml_draw = None
-
-                if book_spread is not None and composite_spread is not None:
-                    fair_spread = _calculate_fair_spread(book_spread, composite_spread)
-                    # Exchange divergence boost: shift fair spread toward exchange signal
-                    exchange_adj = _calc_exchange_divergence_boost(game_id, book_spread, sport_key)
-                    if exchange_adj != 0.0:
-                        fair_spread = _round_to_half(fair_spread + exchange_adj)
-                    fair_ml_home, fair_ml_away = _calculate_fair_ml(fair_spread, sport_key)
-
-                    # Soccer: 3-way ML derived from spread for coherence
-                    if is_soccer and book_ml_home is not None and book_ml_draw is not None and book_ml_away is not None:
-                        comp = composite_ml if composite_ml is not None else 0.5
-                        fair_ml_home, fair_ml_draw, fair_ml_away = _calculate_fair_ml_from_book_3way(
-                            book_ml_home, book_ml_draw, book_ml_away, comp, book_spread, sport_key
-                        )
 
-                elif is_soccer and book_ml_home is not None and book_ml_draw is not None and book_ml_away is not None and composite_ml is not None:
-                    # Soccer 3-way ML (no spread data — composite-only fallback)
-                    fair_ml_home, fair_ml_draw, fair_ml_away = _calculate_fair_ml_from_book_3way(
-                        book_ml_home, book_ml_draw, book_ml_away, composite_ml
+                except Exception as e:
+                    logger.error(
+                        f"[CompositeTracker] Error processing {row.get('game_id', '?')} "
+                        f"(sport={row.get('sport_key', '?')}): {e}\n"
+                        f"{traceback.format_exc()}"
                     )
-                elif composite_ml is not None:
-                    # No spread data — composite-only ML
-                    fair_ml_home, fair_ml_away = _calculate_fair_ml_composite_only(composite_ml)
-
-                if book_total is not None:
-                    # Use full totals composite; fall back to game_env pillar if unavailable
-                    game_env_score = analysis.get("pillar_scores", {}).get("game_environment", 0.5)
-                    total_signal = composite_total if composite_total is not None else game_env_score
-                    fair_total = _calculate_fair_total(book_total, total_signal)
-
-                # 5b. Bias correction — apply 30% of measured systematic bias
-                if sport_key not in bias_cache:
-                    bias_cache[sport_key] = _get_bias_correction(sport_key)
-                bias = bias_cache[sport_key]
-
-                if fair_spread is not None and bias.get("spread_bias") is not None and bias.get("spread_sample", 0) >= 50:
-                    correction = bias["spread_bias"] * 0.3
-                    old_fs = fair_spread
-                    fair_spread = _round_to_half(fair_spread - correction)
-                    if games_processed < 3:  # Log first few only
-                        logger.info(
-                            f"[BiasCorr] {game_id}: spread_bias={bias['spread_bias']}, "
-                            f"correction={correction:.2f}, fair_spread {old_fs}→{fair_spread}"
-                        )
-
-                if fair_total is not None and bias.get("total_bias") is not None and bias.get("total_sample", 0) >= 50:
-                    correction = bias["total_bias"] * 0.3
-                    old_ft = fair_total
-                    fair_total = _round_to_half(fair_total - correction)
-                    if games_processed < 3:  # Log first few only
-                        logger.info(
-                            f"[BiasCorr] {game_id}: total_bias={bias['total_bias']}, "
-                            f"correction={correction:.2f}, fair_total {old_ft}→{fair_total}"
-                        )
-
-                # 5c. Cap fair lines — sport-specific caps prevent extreme deviations
-                s_cap = SPREAD_CAP_BY_SPORT.get(sport_key, DEFAULT_SPREAD_CAP)
-                t_cap = TOTAL_CAP_BY_SPORT.get(sport_key, DEFAULT_TOTAL_CAP)
-
-                if fair_spread is not None and book_spread is not None:
-                    capped = max(book_spread - s_cap,
-                                 min(book_spread + s_cap, fair_spread))
-                    if capped != fair_spread:
-                        logger.warning(
-                            f"[FairCap] {game_id}: spread capped {fair_spread}→{capped} "
-                            f"(book={book_spread}, cap=±{s_cap}, sport={sport_key})"
-                        )
-                        fair_spread = capped
-
-                if fair_total is not None and book_total is not None:
-                    capped = max(book_total - t_cap,
-                                 min(book_total + t_cap, fair_total))
-                    if capped != fair_total:
-                        logger.warning(
-                            f"[FairCap] {game_id}: total capped {fair_total}→{capped} "
-                            f"(book={book_total}, cap=±{t_cap}, sport={sport_key})"
-                        )
-                        fair_total = capped
-
-                # Re-derive fair ML from post-bias/cap fair_spread for coherence
-                # (Skip soccer 3-way which uses its own internal fair_spread)
-                if fair_spread is not None and fair_ml_draw is None:
-                    fair_ml_home, fair_ml_away = _calculate_fair_ml(fair_spread, sport_key)
-
-                # 6. Skip write if all fair values are null (analyzer returned nothing useful)
-                if fair_spread is None and fair_total is None and fair_ml_home is None:
-                    logger.debug(f"[CompositeTracker] SKIP {game_id}: all fair values null after analysis")
-                    skipped += 1
-                    continue
-
-                # 7. Insert row
-                row_data = {
-                    "game_id": game_id,
-                    "sport_key": sport_key,
-                    "timestamp": now,
-                    "composite_spread": composite_spread,
-                    "composite_total": composite_total,
-                    "composite_ml": composite_ml,
-                    "fair_spread": fair_spread,
-                    "fair_total": fair_total,
-                    "fair_ml_home": fair_ml_home,
-                    "fair_ml_away": fair_ml_away,
-                    "book_spread": book_spread,
-                    "book_total": book_total,
-                    "book_ml_home": book_ml_home,
-                    "book_ml_away": book_ml_away,
-                }
-                if fair_ml_draw is not None:
-                    row_data["fair_ml_draw"] = fair_ml_draw
-                # Edge calculation and soft cap
-                raw_edge = _calculate_edge_pct(fair_spread, book_spread, fair_total, book_total, sport_key)
-                capped_edge = _cap_edge(raw_edge)
-                row_data["raw_edge_pct"] = raw_edge
-                row_data["capped_edge_pct"] = capped_edge
-                if raw_edge >= EDGE_CAP_THRESHOLD:
-                    logger.warning(f"[EdgeCap] {game_id}: raw={raw_edge:.1f}% -> capped={capped_edge:.1f}%")
-                # Flow gate — use fresh pillar flow from analysis
-                flow_score = analysis.get("pillar_scores", {}).get("flow", 0.5) or 0.5
-                row_data["pillar_flow"] = flow_score
-                flow_gated = (capped_edge is not None
-                              and abs(capped_edge) >= FLOW_GATE_EDGE_MIN
-                              and flow_score < FLOW_GATE_THRESHOLD)
-                row_data["flow_gated"] = flow_gated
-                if flow_gated:
-                    logger.info(f"[FlowGate] {game_id}: gated (flow={flow_score:.2f}, edge={capped_edge:.1f}%)")
-                db.client.table("composite_history").insert(row_data).execute()
-                logger.info(
-                    f"[CompositeTracker] WRITE {game_id}: "
-                    f"fair_spread={fair_spread}, fair_total={fair_total}, "
-                    f"reason={reason}"
-                )
-
-                games_processed += 1
-                recalculated += 1
-                sport_processed[sport_key] = sport_processed.get(sport_key, 0) + 1
-
-            except Exception as e:
-                logger.error(
-                    f"[CompositeTracker] Error processing {row.get('game_id', '?')} "
-                    f"(sport={row.get('sport_key', '?')}): {e}\n"
-                    f"{traceback.format_exc()}"
-                )
-                errors += 1
-                sk = row.get("sport_key", "unknown")
-                sport_errors[sk] = sport_errors.get(sk, 0) + 1
+                    errors += 1
+                    sk = row.get("sport_key", "unknown")
+                    sport_errors[sk] = sport_errors.get(sk, 0) + 1
+                finally:
+                    self._release(held, row["game_id"])
 
         logger.info(
             f"[DynamicRecalc] Recalculated {recalculated} games, "
@@ -1294,6 +1468,9 @@ class CompositeTracker:
                     )
                     seeded = 0
                     for row in missing:
+                        checkpoint()
+                        if not self._hold(held, row["game_id"], row["sport_key"], reasons):
+                            continue
                         try:
                             sport_key = row["sport_key"]
                             game_id = row["game_id"]
@@ -1390,7 +1567,10 @@ class CompositeTracker:
                                 and flow_score < FLOW_GATE_THRESHOLD
                             )
 
-                            db.client.table("composite_history").insert(row_data).execute()
+                            record_composite(row_data)
+                            recalc_queue.record_inputs(
+                                game_id, book_spread=book_spread, book_total=book_total,
+                            )
                             logger.info(
                                 f"[CompositeTracker] SEED {game_id}: "
                                 f"fair_spread={fair_spread}, fair_total={fair_total}"
@@ -1408,6 +1588,8 @@ class CompositeTracker:
                             errors += 1
                             sk = row.get("sport_key", "unknown")
                             sport_errors[sk] = sport_errors.get(sk, 0) + 1
+                        finally:
+                            self._release(held, row["game_id"])
 
                     logger.info(
                         f"[CompositeTracker] Second pass complete: "
@@ -1428,6 +1610,7 @@ class CompositeTracker:
                 "enhanced": ve_enhanced,
                 "fallback": ve_fallback,
             },
+            "pillar_memo": pillar_memo.skipped_since(memo_before),
         }
         logger.info(f"[CompositeTracker] Done: {summary}")
         return summary
@@ -1461,6 +1644,7 @@ class CompositeTracker:
 
         # Filter to LIVE or near-tipoff games: started within 8h or starting within 30min
         live_rows = []
+        started_ids = set()
         for row in all_rows:
             gd = row.get("game_data") or {}
             ct = gd.get("commence_time")
@@ -1471,6 +1655,8 @@ class CompositeTracker:
                 hours_ago = (now_dt - game_dt).total_seconds() / 3600
                 if -0.5 < hours_ago <= 8:
                     live_rows.append(row)
+                    if hours_ago > 0:
+                        started_ids.add(row["game_id"])
             except (ValueError, AttributeError):
                 continue
 
@@ -1482,24 +1668,9 @@ class CompositeTracker:
 
         # Batch-fetch latest composite_history rows (for composite scores)
         game_ids = [row["game_id"] for row in live_rows]
+        chunk_size = 200
         try:
-            all_history = []
-            chunk_size = 200
-            for i in range(0, len(game_ids), chunk_size):
-                chunk = game_ids[i:i + chunk_size]
-                res = db.client.table("composite_history").select(
-                    "game_id, composite_spread, composite_total, composite_ml, "
-                    "fair_spread, fair_total, fair_ml_home, fair_ml_away, fair_ml_draw, "
-                    "book_spread, book_total, timestamp"
-                ).in_("game_id", chunk).order("timestamp", desc=True).execute()
-                all_history.extend(res.data or [])
-
-            # Dedup: keep newest per game_id
-            latest = {}
-            for h in all_history:
-                gid = h["game_id"]
-                if gid not in latest:
-                    latest[gid] = h
+            latest = get_latest_composites(game_ids)
         except Exception as e:
             logger.error(f"[FastRefresh] Failed to fetch composite history: {e}")
             return {"error": str(e), "refreshed": 0}
@@ -1544,11 +1715,21 @@ class CompositeTracker:
                     }
                     break
 
-        # Batch-fetch pregame baselines (rows where live_ceq IS NULL = pregame)
-        pregame_baselines: dict[str, dict] = {}
+        # Batch-fetch pregame baselines (rows where live_ceq IS NULL = pregame).
+        # Once a game has started its baseline can no longer change, so those
+        # are kept in memory instead of re-queried every 30s.
+        live_ids = set(game_ids)
+        with _pregame_baseline_lock:
+            for gid in list(_pregame_baseline_cache):
+                if gid not in live_ids:
+                    del _pregame_baseline_cache[gid]
+            pregame_baselines: dict[str, dict] = {
+                gid: _pregame_baseline_cache[gid] for gid in game_ids if gid in _pregame_baseline_cache
+            }
+        baseline_ids = [gid for gid in game_ids if gid not in pregame_baselines]
         try:
-            for i in range(0, len(game_ids), chunk_size):
-                chunk = game_ids[i:i + chunk_size]
+            for i in range(0, len(baseline_ids), chunk_size):
+                chunk = baseline_ids[i:i + chunk_size]
                 pg_res = db.client.table("composite_history").select(
                     "game_id, composite_spread, fair_spread"
                 ).in_("game_id", chunk).is_("live_ceq", "null").order(
@@ -1558,6 +1739,9 @@ class CompositeTracker:
                     gid = h["game_id"]
                     if gid not in pregame_baselines:
                         pregame_baselines[gid] = h
+                        if gid in started_ids:
+                            with _pregame_baseline_lock:
+                                _pregame_baseline_cache[gid] = h
         except Exception as e:
             logger.warning(f"[FastRefresh] Pregame baseline fetch failed: {e}")
 
@@ -1570,6 +1754,7 @@ class CompositeTracker:
         errors = 0
 
         for row in live_rows:
+            checkpoint()
             try:
                 sport_key = row["sport_key"]
                 game_id = row["game_id"]
@@ -1744,7 +1929,7 @@ class CompositeTracker:
                     row_data["clock"] = clock
                     row_data["time_remaining_pct"] = round(time_remaining_pct, 4)
 
-                db.client.table("composite_history").insert(row_data).execute()
+                record_composite(row_data)
                 ceq_info = ""
                 if row_data.get("live_ceq") is not None:
                     ceq_info = f", live_ceq={row_data['live_ceq']}, {row_data.get('hold_signal', '')}"
@@ -457,6 +457,170 @@ LIVE_POLL_INTERVAL_MINUTES = 5
 # Live props polling (at quarter/period breaks)
 LIVE_PROPS_PER_QUARTER = 2  # Poll props twice per quarter/period
 
+# =============================================================================
+# DATA SOURCE CACHE (data_sources/cache.py)
+# =============================================================================
+
+# Per-source TTLs in seconds. Injuries move fastest; standings and season
+# team stats change on the order of hours.
+DATA_SOURCE_CACHE_TTLS = {
+    "espn_injuries": 600,
+    "espn_standings": 1800,
+    "espn_scoreboard": 300,
+    "bdl": 900,
+    "bdl_injuries": 600,
+    "api_football": 1800,
+    "football_data": 1800,
+    "nba_stats": 3600,
+    "nhl_stats": 3600,
+    "nfl_stats": 3600,
+    "weather": 1800,
+    "team_stats": 900,
+}
+DATA_SOURCE_CACHE_DEFAULT_TTL = 300
+
+# Expired entries are served for TTL * factor longer while one refresh runs
+DATA_SOURCE_CACHE_STALE_FACTOR = 1.0
+
+# LRU bound across all sources (team schedules alone touch ~22 scoreboards)
+DATA_SOURCE_CACHE_MAX_ENTRIES = 2000
+
+# Pillar memoization (data_sources/cache.py pillar_memo): execution,
+# incentives, time_decay and game_environment results plus the per-team
+# ESPN inputs they share are reused while every source entry they read is
+# unchanged and fresh. Max age bounds reuse across day boundaries (team
+# schedules are read relative to today).
+PILLAR_MEMO_MAX_AGE = 1800
+PILLAR_MEMO_MAX_ENTRIES = 5000
+
+# =============================================================================
+# API RESPONSE CACHE (response_cache.py)
+# =============================================================================
+
+# Per-endpoint TTLs in seconds. Entries are also dropped early when the
+# data they depend on is written (see response_cache tags).
+RESPONSE_CACHE_TTLS = {
+    "edges": 60,
+    "active_edges": 60,
+    "per_book_odds": 60,
+    "performance": 300,
+    "graded_games": 300,
+    "live_markets": 120,
+    "exchange_accuracy": 300,
+    "system_health": 120,
+    "accuracy_summary": 300,
+    "player_profile": 300,
+    "arb_bulk": 10,
+}
+RESPONSE_CACHE_DEFAULT_TTL = 60
+
+# Bounds across all endpoints: entry count and total serialized body size
+RESPONSE_CACHE_MAX_ENTRIES = 1000
+RESPONSE_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+# =============================================================================
+# API DATABASE EXECUTOR (async_db.py)
+# =============================================================================
+
+# Blocking Supabase/PostgREST work from API handlers runs on this many
+# threads. Sized below the Supabase pooler limit so a burst of dashboard
+# requests queues in-process instead of exhausting connections.
+DB_EXECUTOR_MAX_WORKERS = int(os.getenv("DB_EXECUTOR_MAX_WORKERS", "12"))
+
+# Long-running admin handlers (manual refresh, grading/regrade, score
+# backfill) run on their own small pool so a multi-minute job never holds
+# one of the DB_EXECUTOR_MAX_WORKERS slots that serve dashboard reads.
+LONG_TASK_EXECUTOR_MAX_WORKERS = int(os.getenv("LONG_TASK_EXECUTOR_MAX_WORKERS", "2"))
+
+# =============================================================================
+# WARM CACHE (warm_cache.py)
+# =============================================================================
+
+# SQLite file holding the last good copy of cached data (ESPN standings /
+# injuries / scoreboards, team stats, perf buckets, active games, latest
+# composites) so a deploy or crash restart starts warm. Empty disables it.
+WARM_CACHE_PATH = os.getenv(
+    "WARM_CACHE_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".warm_cache.sqlite3"),
+)
+WARM_CACHE_FLUSH_SECONDS = 5
+WARM_CACHE_RETENTION_HOURS = 48
+
+# Bump a namespace's version whenever the shape of what it stores changes;
+# rows written under another version are never loaded.
+WARM_CACHE_VERSIONS = {"source": 1, "perf": 1, "odds": 1, "composite": 1}
+
+# data_sources cache sources mirrored to disk (values must be plain JSON)
+WARM_CACHE_SOURCES = {"espn_injuries", "espn_standings", "espn_scoreboard", "team_stats"}
+
+# Oldest warm copy used in place of a fresh load: perf buckets (refreshed
+# every 5 min) and the active-games list exchange matching runs against
+WARM_CACHE_PERF_MAX_AGE = 900
+WARM_CACHE_ODDS_MAX_AGE = 300
+
+# =============================================================================
+# SCHEDULER JOB EXECUTOR (job_executor.py)
+# =============================================================================
+
+# Scheduled jobs run on one bounded worker pool instead of a fresh thread
+# per run. Queued runs start in lane priority order (live > pregame >
+# analytics), and each lane may hold at most its limit of workers, so
+# pregame and analytics work can never take the slots live jobs need.
+JOB_EXECUTOR_WORKERS = int(os.getenv("JOB_EXECUTOR_WORKERS", "4"))
+JOB_LANE_LIMITS = {"live": 4, "pregame": 2, "analytics": 1}
+JOB_LANES = {
+    "live_cycle": "live",
+    "fast_refresh": "live",
+    "live_props_cycle": "live",
+    "pregame_full_cycle": "pregame",
+    "pregame_cycle": "pregame",
+    "pregame_capture": "pregame",
+    "exchange_sync": "pregame",
+    "grading_cycle": "analytics",
+    "player_stats_refresh": "analytics",
+    "daily_feedback": "analytics",
+    "perf_cache_refresh": "analytics",
+    "recalc_queue": "pregame",
+    "recalc_queue_live": "live",
+}
+JOB_DEFAULT_LANE = "analytics"
+
+# =============================================================================
+# EXCHANGE PRICE INGESTION (exchange_tracker.py)
+# =============================================================================
+
+# A synced contract is only inserted into exchange_data when its yes price
+# moved at least EXCHANGE_PRICE_MIN_CHANGE cents, or its volume moved by the
+# given fraction, since its last written row. Unchanged contracts still get
+# a heartbeat row this often so "latest row" readers and cleanup see them.
+EXCHANGE_PRICE_MIN_CHANGE = 0.5
+EXCHANGE_VOLUME_MIN_CHANGE_PCT = 0.05
+EXCHANGE_HEARTBEAT_MINUTES = 60
+
+# =============================================================================
+# CHANGE-DRIVEN RECALCULATION (recalc_queue.py)
+# =============================================================================
+
+# Ingestion emits per-game change events (line moved, injury report changed,
+# exchange price moved). A game is recalculated once it has been quiet for
+# the debounce window, or once its first pending event reaches the max delay,
+# so a burst of moves costs one recalculation.
+RECALC_DEBOUNCE_SECONDS = 20
+RECALC_MAX_DELAY_SECONDS = 90
+
+# Batches run on the job executor: live-odds events as "recalc_queue_live"
+# (live lane), the rest as "recalc_queue" (pregame lane). A batch that times
+# out, is skipped or never starts is queued again
+RECALC_JOB_TIMEOUT_SECONDS = 300
+
+# A mapped exchange contract must move at least this many cents between
+# syncs to count as a change
+RECALC_EXCHANGE_MIN_MOVE = 3.0
+
+# Observed inputs / last composite inputs not refreshed for this long are
+# dropped (finished games)
+RECALC_STATE_TTL_HOURS = 12
+
 # =============================================================================
 # MARKETS TO FETCH
 # =============================================================================
@@ -1,5 +1,6 @@
 """Data source clients for OMI Edge."""
+from .cache import source_cache, SourceCache
 from .odds_api import odds_client, OddsAPIClient
 from .espn import espn_client, ESPNClient
 
-__all__ = ["odds_client", "espn_client", "OddsAPIClient", "ESPNClient"]
\ No newline at end of file
+__all__ = ["odds_client", "espn_client", "source_cache", "OddsAPIClient", "ESPNClient", "SourceCache"]
@@ -11,6 +11,8 @@ import requests
 from typing import Optional, Dict, Any, List
 from datetime import datetime
 
+from data_sources.cache import cached
+
 BASE_URL = "https://v3.football.api-sports.io"
 
 # League IDs
@@ -113,6 +115,7 @@ def get_headers() -> Dict[str, str]:
     }
 
 
+@cached("api_football")
 def get_league_standings(league_id: int = EPL_LEAGUE_ID, season: int = None) -> Optional[Dict[str, Any]]:
     """
     Fetch league standings.
@@ -180,6 +183,7 @@ def get_league_standings(league_id: int = EPL_LEAGUE_ID, season: int = None) ->
         return None
 
 
+@cached("api_football")
 def get_team_injuries(team_id: int, season: int = None) -> Optional[List[Dict[str, Any]]]:
     """
     Fetch injuries for a specific team.
@@ -239,6 +243,7 @@ def get_team_injuries(team_id: int, season: int = None) -> Optional[List[Dict[st
         return None
 
 
+@cached("api_football")
 def get_head_to_head(team1_id: int, team2_id: int, last: int = 10) -> Optional[List[Dict[str, Any]]]:
     """
     Fetch head-to-head record between two teams.
@@ -304,6 +309,7 @@ def get_head_to_head(team1_id: int, team2_id: int, last: int = 10) -> Optional[L
         return None
 
 
+@cached("api_football")
 def get_team_statistics(team_id: int, league_id: int = EPL_LEAGUE_ID, season: int = None) -> Optional[Dict[str, Any]]:
     """
     Fetch team statistics for the season.
@@ -0,0 +1,604 @@
+"""
+Shared Data Source Cache
+
+One process-wide cache for every data_sources client (ESPN, BallDontLie,
+API-Football, Football-Data, NBA/NHL/NFL stats, weather) and the team_stats
+lookup used by the game environment pillar.
+
+- Per-source TTLs from config.DATA_SOURCE_CACHE_TTLS (monotonic clock, so no
+  timedelta.seconds wrap-around at one day)
+- Bounded LRU eviction across all sources (DATA_SOURCE_CACHE_MAX_ENTRIES)
+- Request coalescing: concurrent callers for the same key share one fetch
+- Stale-while-revalidate: an expired entry is still served for
+  TTL * DATA_SOURCE_CACHE_STALE_FACTOR while one background refresh runs
+- Hit/miss metrics per source, surfaced by system_health
+- Sources in config.WARM_CACHE_SOURCES are mirrored to the disk-backed
+  warm_cache; a key's first miss after a restart loads the saved copy if it
+  is still within TTL + stale window (and revalidates it like any stale hit)
+
+Fetches that return None (the data_sources convention for "request failed")
+are never stored, so a failed call does not poison the cache.
+
+Every stored value gets a new version number. pillar_memo reuses derived
+results (per-team pillar inputs, per-game pillar outputs) for as long as the
+versions of every source entry they read are unchanged and still fresh.
+"""
+import asyncio
+import copy
+import functools
+import inspect
+import itertools
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Hashable, Optional
+
+from config import (
+    DATA_SOURCE_CACHE_TTLS,
+    DATA_SOURCE_CACHE_DEFAULT_TTL,
+    DATA_SOURCE_CACHE_STALE_FACTOR,
+    DATA_SOURCE_CACHE_MAX_ENTRIES,
+    PILLAR_MEMO_MAX_AGE,
+    PILLAR_MEMO_MAX_ENTRIES,
+    WARM_CACHE_SOURCES,
+)
+from warm_cache import warm_cache
+
+logger = logging.getLogger(__name__)
+
+# How long a coalesced follower waits on the leader's fetch before giving up
+_INFLIGHT_WAIT_SECONDS = 60.0
+
+_METRIC_FIELDS = (
+    "hits", "stale_hits", "misses", "coalesced",
+    "refreshes", "errors", "evictions", "warm_loads",
+)
+
+_versions = itertools.count(1)
+
+# Per-thread stack of {full_key: version} dicts, one per pillar_memo
+# computation in progress. The data_sources sync wrappers run their
+# coroutines with asyncio.run on the calling thread, so reads made inside
+# async clients land on the same stack.
+_reads = threading.local()
+
+
+def _record_read(full_key: tuple, version: Optional[int]):
+    """Note a source read for the innermost memoized computation.
+
+    version None means the value was not stored (failed fetch, timeout),
+    which makes the computation uncacheable.
+    """
+    stack = getattr(_reads, "stack", None)
+    if stack:
+        stack[-1][full_key] = version
+
+
+class _Entry:
+    __slots__ = ("value", "stored_at", "ttl", "version")
+
+    def __init__(self, value: Any, ttl: float, age: float = 0.0):
+        self.value = value
+        self.stored_at = time.monotonic() - age
+        self.ttl = ttl
+        self.version = next(_versions)
+
+    def age(self) -> float:
+        return time.monotonic() - self.stored_at
+
+
+class _InFlight:
+    """A fetch in progress that other callers can wait on."""
+    __slots__ = ("done", "value", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error: Optional[BaseException] = None
+
+
+class SourceCache:
+    """Thread-safe TTL + LRU cache with coalescing and stale-while-revalidate."""
+
+    def __init__(self, max_entries: int = DATA_SOURCE_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[tuple, _Entry]" = OrderedDict()
+        self._inflight: dict[tuple, _InFlight] = {}
+        self._lock = threading.Lock()
+        self._metrics: dict[str, dict[str, int]] = {}
+        # Keys already checked against the warm cache this process. Only
+        # needed until the previous run's copies have all aged past TTL +
+        # stale window; after that the warm cache is skipped and this cleared.
+        self._warm_tried: set = set()
+        self._warm_until = time.monotonic() + max(
+            (self._ttl_for(s) for s in WARM_CACHE_SOURCES), default=0.0
+        ) * (1 + DATA_SOURCE_CACHE_STALE_FACTOR)
+
+    # -----------------------------------------------------------------
+    # Internals (call with self._lock held unless noted)
+    # -----------------------------------------------------------------
+    def _ttl_for(self, source: str) -> float:
+        return DATA_SOURCE_CACHE_TTLS.get(source, DATA_SOURCE_CACHE_DEFAULT_TTL)
+
+    def _count(self, source: str, field: str, n: int = 1):
+        m = self._metrics.get(source)
+        if m is None:
+            m = self._metrics[source] = {f: 0 for f in _METRIC_FIELDS}
+        m[field] += n
+
+    def _store(self, full_key: tuple, value: Any, ttl: float, age: float = 0.0):
+        self._entries[full_key] = _Entry(value, ttl, age)
+        self._entries.move_to_end(full_key)
+        while len(self._entries) > self.max_entries:
+            evicted_key, _ = self._entries.popitem(last=False)
+            self._count(evicted_key[0], "evictions")
+
+    def _lookup(self, full_key: tuple) -> tuple[Optional[_Entry], str]:
+        """Return (entry, state) where state is 'fresh', 'stale' or 'miss'."""
+        entry = self._entries.get(full_key)
+        if entry is None:
+            return None, "miss"
+        age = entry.age()
+        if age < entry.ttl:
+            self._entries.move_to_end(full_key)
+            return entry, "fresh"
+        if age < entry.ttl * (1 + DATA_SOURCE_CACHE_STALE_FACTOR):
+            self._entries.move_to_end(full_key)
+            return entry, "stale"
+        del self._entries[full_key]
+        return None, "miss"
+
+    def _should_try_warm(self, full_key: tuple) -> bool:
+        """True on a key's first miss while warm copies can still be valid."""
+        if full_key[0] not in WARM_CACHE_SOURCES or full_key in self._warm_tried:
+            return False
+        if time.monotonic() >= self._warm_until:
+            self._warm_tried.clear()
+            return False
+        self._warm_tried.add(full_key)
+        return True
+
+    def _load_warm(self, full_key: tuple):
+        """Seed a key from the disk-backed warm cache if the saved copy is
+        still within TTL + stale window. Call WITHOUT self._lock held: the
+        SQLite read happens outside it, only the insert takes the lock."""
+        source = full_key[0]
+        ttl = self._ttl_for(source)
+        found = warm_cache.get("source", repr(full_key), ttl * (1 + DATA_SOURCE_CACHE_STALE_FACTOR))
+        if found is None:
+            return
+        value, age = found
+        with self._lock:
+            if full_key not in self._entries:
+                self._store(full_key, value, ttl, age)
+                self._count(source, "warm_loads")
+
+    def _fetch_failed(self, full_key: tuple, error: BaseException):
+        """Count and log a fetch that raised (including cancellation)."""
+        with self._lock:
+            self._count(full_key[0], "errors")
+        logger.warning(f"[SourceCache] Fetch failed for {full_key}: {error!r}")
+
+    def _finish(self, full_key: tuple, flight: _InFlight, value: Any,
+                error: Optional[BaseException], ttl: float):
+        """Record a fetch outcome and release any waiting followers.
+
+        Leaders call this from a finally block, so the in-flight entry is
+        always removed and followers always woken.
+        """
+        try:
+            with self._lock:
+                if error is None and value is not None:
+                    self._store(full_key, value, ttl)
+                self._inflight.pop(full_key, None)
+            if error is None and value is not None and full_key[0] in WARM_CACHE_SOURCES:
+                warm_cache.put("source", repr(full_key), value)
+        finally:
+            flight.value = value
+            flight.error = error
+            flight.done.set()
+
+    def _flight_result(self, full_key: tuple, flight: _InFlight) -> Any:
+        """A finished flight's outcome as seen by a caller.
+
+        Exceptions propagate; a leader that was cancelled or interrupted
+        (non-Exception BaseException) reads as a failed fetch, since that
+        signal belongs to the leader's task, not to its followers.
+        """
+        error = flight.error
+        if error is not None and not isinstance(error, Exception):
+            _record_read(full_key, None)
+            return None
+        _record_read(full_key, self.version_of(full_key))
+        if error is not None:
+            raise error
+        return flight.value
+
+    def _claim(self, full_key: tuple) -> tuple[Optional[_Entry], str, _InFlight, bool]:
+        """Look up a key and, on miss/stale, claim or join its in-flight fetch.
+
+        Returns (entry, state, flight, is_leader).
+        """
+        with self._lock:
+            entry, state = self._lookup(full_key)
+            if not (state == "miss" and self._should_try_warm(full_key)):
+                return self._join(full_key, entry, state)
+        self._load_warm(full_key)
+        with self._lock:
+            entry, state = self._lookup(full_key)
+            return self._join(full_key, entry, state)
+
+    def _join(self, full_key: tuple, entry: Optional[_Entry],
+              state: str) -> tuple[Optional[_Entry], str, _InFlight, bool]:
+        source = full_key[0]
+        if state == "fresh":
+            self._count(source, "hits")
+            return entry, state, None, False
+
+        flight = self._inflight.get(full_key)
+        is_leader = flight is None
+        if is_leader:
+            flight = _InFlight()
+            self._inflight[full_key] = flight
+
+        if state == "stale":
+            self._count(source, "stale_hits")
+            if is_leader:
+                self._count(source, "refreshes")
+        elif is_leader:
+            self._count(source, "misses")
+        else:
+            self._count(source, "coalesced")
+        return entry, state, flight, is_leader
+
+    # -----------------------------------------------------------------
+    # Public API
+    # -----------------------------------------------------------------
+    def get_or_fetch(self, source: str, key: Hashable, fetch: Callable[[], Any],
+                     ttl: Optional[float] = None) -> Any:
+        """Return the cached value for (source, key), fetching it on miss.
+
+        `fetch` is a zero-argument callable. On a stale hit the old value is
+        returned immediately and `fetch` runs in a background thread.
+        """
+        full_key = (source, key)
+        ttl = self._ttl_for(source) if ttl is None else ttl
+        entry, state, flight, is_leader = self._claim(full_key)
+
+        if state == "fresh":
+            _record_read(full_key, entry.version)
+            return entry.value
+
+        if state == "stale":
+            _record_read(full_key, entry.version)
+            if is_leader:
+                threading.Thread(
+                    target=self._run_fetch, args=(full_key, flight, fetch, ttl),
+                    name=f"cache-refresh-{source}", daemon=True,
+                ).start()
+            return entry.value
+
+        if is_leader:
+            self._run_fetch(full_key, flight, fetch, ttl)
+        elif not flight.done.wait(_INFLIGHT_WAIT_SECONDS):
+            logger.warning(f"[SourceCache] Timed out waiting on in-flight fetch for {full_key}")
+            _record_read(full_key, None)
+            return None
+
+        return self._flight_result(full_key, flight)
+
+    async def get_or_fetch_async(self, source: str, key: Hashable,
+                                 fetch: Callable[[], Awaitable[Any]],
+                                 ttl: Optional[float] = None) -> Any:
+        """Async variant of get_or_fetch for coroutine-based clients.
+
+        Coalescing works across event loops (the sync wrappers in
+        data_sources each run their own asyncio.run), so followers wait on
+        the leader's threading.Event in the default executor.
+        """
+        full_key = (source, key)
+        ttl = self._ttl_for(source) if ttl is None else ttl
+        entry, state, flight, is_leader = self._claim(full_key)
+
+        if state == "fresh":
+            _record_read(full_key, entry.version)
+            return entry.value
+
+        if state == "stale":
+            _record_read(full_key, entry.version)
+            if is_leader:
+                threading.Thread(
+                    target=self._run_fetch,
+                    args=(full_key, flight, lambda: asyncio.run(fetch()), ttl),
+                    name=f"cache-refresh-{source}", daemon=True,
+                ).start()
+            return entry.value
+
+        if is_leader:
+            value, error = None, None
+            try:
+                value = await fetch()
+            except BaseException as e:
+                error = e
+                self._fetch_failed(full_key, e)
+                if not isinstance(e, Exception):
+                    raise  # cancellation / interpreter exit stays with the leader
+            finally:
+                self._finish(full_key, flight, value, error, ttl)
+        else:
+            loop = asyncio.get_running_loop()
+            finished = await loop.run_in_executor(
+                None, flight.done.wait, _INFLIGHT_WAIT_SECONDS
+            )
+            if not finished:
+                logger.warning(f"[SourceCache] Timed out waiting on in-flight fetch for {full_key}")
+                _record_read(full_key, None)
+                return None
+
+        return self._flight_result(full_key, flight)
+
+    def _run_fetch(self, full_key: tuple, flight: _InFlight,
+                   fetch: Callable[[], Any], ttl: float):
+        """Run a leader fetch; the caller sees exceptions through the flight,
+        non-Exception BaseExceptions are re-raised after cleanup."""
+        value, error = None, None
+        try:
+            value = fetch()
+        except BaseException as e:
+            error = e
+            self._fetch_failed(full_key, e)
+            if not isinstance(e, Exception):
+                raise
+        finally:
+            self._finish(full_key, flight, value, error, ttl)
+
+    def version_of(self, full_key: tuple) -> Optional[int]:
+        """Version of the stored value for (source, key), or None if absent."""
+        with self._lock:
+            entry = self._entries.get(full_key)
+            return entry.version if entry is not None else None
+
+    def is_current(self, reads: dict) -> bool:
+        """True if every {(source, key): version} read is still the stored,
+        unexpired value (stale-while-revalidate entries do not count)."""
+        with self._lock:
+            for full_key, version in reads.items():
+                entry = self._entries.get(full_key)
+                if version is None or entry is None or entry.version != version:
+                    return False
+                if entry.age() >= entry.ttl:
+                    return False
+        return True
+
+    def invalidate(self, source: str, key: Hashable = None):
+        """Drop one key, or every key for a source when key is None."""
+        with self._lock:
+            if key is not None:
+                dropped = [(source, key)]
+            else:
+                dropped = [k for k in self._entries if k[0] == source]
+            for full_key in dropped:
+                self._entries.pop(full_key, None)
+        if source in WARM_CACHE_SOURCES:
+            for full_key in dropped:
+                warm_cache.delete("source", repr(full_key))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        """Per-source hit/miss counters plus overall size and hit rate."""
+        with self._lock:
+            sizes: dict[str, int] = {}
+            for source, _ in self._entries:
+                sizes[source] = sizes.get(source, 0) + 1
+            sources = {}
+            total_served = total_lookups = 0
+            for source, m in sorted(self._metrics.items()):
+                served = m["hits"] + m["stale_hits"] + m["coalesced"]
+                lookups = served + m["misses"]
+                total_served += served
+                total_lookups += lookups
+                sources[source] = {
+                    **m,
+                    "entries": sizes.get(source, 0),
+                    "ttl_seconds": self._ttl_for(source),
+                    "hit_rate": round(served / lookups, 3) if lookups else None,
+                }
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "inflight": len(self._inflight),
+                "hit_rate": round(total_served / total_lookups, 3) if total_lookups else None,
+                "sources": sources,
+            }
+
+
+source_cache = SourceCache()
+
+
+def _make_key(func: Callable, args: tuple, kwargs: dict) -> tuple:
+    return (func.__qualname__, args, tuple(sorted(kwargs.items())))
+
+
+def _memo_key(name: str, args: tuple, kwargs: dict) -> tuple:
+    key = (name, args, tuple(sorted(kwargs.items())))
+    try:
+        hash(key)
+        return key
+    except TypeError:
+        # Pillars take pre-fetched stats dicts; key those by content
+        return (name, json.dumps([args, kwargs], sort_keys=True, default=str))
+
+
+class _MemoEntry:
+    __slots__ = ("value", "reads", "stored_at")
+
+    def __init__(self, value: Any, reads: dict):
+        self.value = value
+        self.reads = reads
+        self.stored_at = time.monotonic()
+
+
+class PillarMemo:
+    """Results derived from source_cache data, reused while their inputs hold.
+
+    A computation is reused when every source entry it read (recorded
+    through _record_read, including reads by nested memoized calls) still
+    has the same version and is fresh, and it is younger than
+    PILLAR_MEMO_MAX_AGE. Computations that saw a failed fetch are not
+    stored. Values are deep-copied in and out so callers may mutate them.
+    """
+
+    def __init__(self, max_entries: int = PILLAR_MEMO_MAX_ENTRIES,
+                 max_age: float = PILLAR_MEMO_MAX_AGE):
+        self.max_entries = max_entries
+        self.max_age = max_age
+        self._entries: "OrderedDict[tuple, _MemoEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._metrics: dict[str, dict[str, int]] = {}
+
+    def _count(self, name: str, field: str):
+        m = self._metrics.get(name)
+        if m is None:
+            m = self._metrics[name] = {"evaluations": 0, "skipped": 0, "uncacheable": 0}
+        m[field] += 1
+
+    def _lookup(self, key: tuple) -> Optional[_MemoEntry]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if time.monotonic() - entry.stored_at >= self.max_age:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+        if not source_cache.is_current(entry.reads):
+            return None
+        return entry
+
+    def get_or_compute(self, name: str, key: tuple, compute: Callable[[], Any]) -> Any:
+        entry = self._lookup(key)
+        if entry is not None:
+            with self._lock:
+                self._count(name, "evaluations")
+                self._count(name, "skipped")
+            stack = getattr(_reads, "stack", None)
+            if stack:
+                stack[-1].update(entry.reads)
+            return copy.deepcopy(entry.value)
+
+        stack = getattr(_reads, "stack", None)
+        if stack is None:
+            stack = _reads.stack = []
+        reads: dict = {}
+        stack.append(reads)
+        try:
+            value = compute()
+        finally:
+            stack.pop()
+            if stack:
+                stack[-1].update(reads)
+
+        cacheable = None not in reads.values()
+        with self._lock:
+            self._count(name, "evaluations")
+            if not cacheable:
+                self._count(name, "uncacheable")
+                self._entries.pop(key, None)
+            else:
+                self._entries[key] = _MemoEntry(copy.deepcopy(value), reads)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return value
+
+    def counters(self) -> dict:
+        """Snapshot of per-name counters, for diffing around a cycle."""
+        with self._lock:
+            return {name: dict(m) for name, m in self._metrics.items()}
+
+    def skipped_since(self, before: dict) -> dict:
+        """{"evaluations", "skipped", "by_pillar"} accumulated since `before`."""
+        by_name = {}
+        for name, m in self.counters().items():
+            prev = before.get(name, {})
+            evals = m["evaluations"] - prev.get("evaluations", 0)
+            if evals:
+                by_name[name] = {
+                    "evaluations": evals,
+                    "skipped": m["skipped"] - prev.get("skipped", 0),
+                }
+        return {
+            "evaluations": sum(d["evaluations"] for d in by_name.values()),
+            "skipped": sum(d["skipped"] for d in by_name.values()),
+            "by_pillar": by_name,
+        }
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            names = {}
+            for name, m in sorted(self._metrics.items()):
+                names[name] = {
+                    **m,
+                    "skip_rate": round(m["skipped"] / m["evaluations"], 3) if m["evaluations"] else None,
+                }
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "max_age_seconds": self.max_age,
+                "pillars": names,
+            }
+
+
+pillar_memo = PillarMemo()
+
+
+def memoized(name: str):
+    """Decorator: reuse a function's result while its source data is unchanged.
+
+    Arguments form the key; unhashable ones (stats dicts) are keyed by
+    their JSON content.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            return pillar_memo.get_or_compute(
+                name, _memo_key(name, args, kwargs),
+                lambda: func(*args, **kwargs),
+            )
+        return wrapper
+    return decorator
+
+
+def cached(source: str, ttl: Optional[float] = None):
+    """Decorator: cache a module-level fetch function under `source`.
+
+    The key is the function name plus its arguments, which must be hashable.
+    Works for both plain and async functions.
+    """
+    def decorator(func):
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                return await source_cache.get_or_fetch_async(
+                    source, _make_key(func, args, kwargs),
+                    lambda: func(*args, **kwargs), ttl,
+                )
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            return source_cache.get_or_fetch(
+                source, _make_key(func, args, kwargs),
+                lambda: func(*args, **kwargs), ttl,
+            )
+        return wrapper
+    return decorator
@@ -9,6 +9,7 @@ from typing import Optional
 import logging
 
 from config import ESPN_API_BASE, ESPN_API_BASE_V2, ESPN_SPORTS
+from data_sources.cache import source_cache, memoized
 
 logger = logging.getLogger(__name__)
 
@@ -67,8 +68,6 @@ class ESPNClient:
     def __init__(self):
         self.base_url = ESPN_API_BASE
         self.client = httpx.Client(timeout=30.0)
-        self._cache = {}
-        self._cache_ttl = 300
     
     def _get_sport_path(self, sport: str) -> tuple[str, str]:
         """Get ESPN sport/league path for a sport key."""
@@ -76,47 +75,30 @@ class ESPNClient:
     
     def _request(self, endpoint: str, cache_key: str = None) -> Optional[dict]:
         """Make a request to ESPN API with optional caching."""
-        if cache_key and cache_key in self._cache:
-            cached_at, data = self._cache[cache_key]
-            if (datetime.now() - cached_at).seconds < self._cache_ttl:
-                return data
-
-        url = f"{self.base_url}/{endpoint}"
-        try:
-            response = self.client.get(url)
-            response.raise_for_status()
-            data = response.json()
-
-            if cache_key:
-                self._cache[cache_key] = (datetime.now(), data)
-
-            return data
-        except httpx.HTTPError as e:
-            logger.error(f"ESPN API error: {e}")
-            return None
+        return self._cached_get(f"{self.base_url}/{endpoint}", cache_key, "ESPN API")
 
     def _request_standings(self, endpoint: str, cache_key: str = None) -> Optional[dict]:
         """Make a request to ESPN v2 API (for standings) with optional caching."""
-        if cache_key and cache_key in self._cache:
-            cached_at, data = self._cache[cache_key]
-            if (datetime.now() - cached_at).seconds < self._cache_ttl:
-                return data
-
         # Use the v2 base URL for standings
-        url = f"{ESPN_API_BASE_V2}/{endpoint}"
-        try:
-            response = self.client.get(url)
-            response.raise_for_status()
-            data = response.json()
-
-            if cache_key:
-                self._cache[cache_key] = (datetime.now(), data)
-
-            return data
-        except httpx.HTTPError as e:
-            logger.error(f"ESPN v2 API error: {e}")
-            return None
-    
+        return self._cached_get(f"{ESPN_API_BASE_V2}/{endpoint}", cache_key, "ESPN v2 API")
+
+    def _cached_get(self, url: str, cache_key: Optional[str], label: str) -> Optional[dict]:
+        """GET through the shared source cache. Cache keys are '<kind>_<sport>...'
+        and the kind (injuries/standings/scoreboard) selects the TTL."""
+        def fetch():
+            try:
+                response = self.client.get(url)
+                response.raise_for_status()
+                return response.json()
+            except httpx.HTTPError as e:
+                logger.error(f"{label} error: {e}")
+                return None
+
+        if not cache_key:
+            return fetch()
+        source = f"espn_{cache_key.split('_', 1)[0]}"
+        return source_cache.get_or_fetch(source, cache_key, fetch)
+
     def get_injuries(self, sport: str) -> list[dict]:
         """Get injury report for a sport."""
         sport_type, league = self._get_sport_path(sport)
@@ -184,6 +166,7 @@ class ESPNClient:
 
         return injuries
     
+    @memoized("team_injury_impact")
     def get_team_injury_impact(self, sport: str, team_name: str) -> dict:
         """Calculate injury impact score for a team."""
         default_response = {
@@ -363,6 +346,7 @@ class ESPNClient:
 
         return standings
     
+    @memoized("team_incentive_score")
     def get_team_incentive_score(self, sport: str, team_name: str) -> dict:
         """Calculate incentive/motivation score for a team."""
         default_response = {
@@ -551,6 +535,7 @@ class ESPNClient:
         
         return sorted(games, key=lambda g: g.get("start_time", datetime.now(timezone.utc)))
     
+    @memoized("team_rest_and_travel")
     def calculate_rest_and_travel(self, sport: str, team_name: str, game_time: datetime) -> dict:
         """Calculate rest days and travel situation for a team."""
         default_response = {
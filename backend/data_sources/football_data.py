@@ -11,6 +11,8 @@ import requests
 from typing import Optional, Dict, Any, List
 from datetime import datetime, timedelta
 
+from data_sources.cache import cached
+
 BASE_URL = "https://api.football-data.org/v4"
 
 
@@ -103,6 +105,7 @@ def get_headers() -> Dict[str, str]:
     }
 
 
+@cached("football_data")
 def get_standings(competition: str = "PL") -> Optional[Dict[str, Any]]:
     """
     Fetch standings for a competition.
@@ -217,6 +220,7 @@ def get_standings_for_sport(sport_key: str) -> Optional[Dict[str, Any]]:
     return get_standings("PL")
 
 
+@cached("football_data")
 def get_epl_matches(days_ahead: int = 7) -> Optional[List[Dict[str, Any]]]:
     """
     Fetch upcoming EPL fixtures.
@@ -273,6 +277,7 @@ def get_epl_matches(days_ahead: int = 7) -> Optional[List[Dict[str, Any]]]:
         return None
 
 
+@cached("football_data")
 def get_team_info(team_id: int) -> Optional[Dict[str, Any]]:
     """
     Fetch detailed team information.
@@ -17,6 +17,8 @@ import httpx
 from typing import Optional
 import logging
 
+from data_sources.cache import cached
+
 logger = logging.getLogger(__name__)
 
 NBA_STATS_BASE = "https://stats.nba.com/stats"
@@ -32,6 +34,7 @@ HEADERS = {
 }
 
 
+@cached("nba_stats")
 async def get_team_advanced_stats(season: str = "2024-25") -> Optional[dict]:
     """
     Fetch advanced team stats including pace and ratings.
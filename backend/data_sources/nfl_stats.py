@@ -14,11 +14,14 @@ import httpx
 from typing import Optional
 import logging
 
+from data_sources.cache import cached
+
 logger = logging.getLogger(__name__)
 
 ESPN_NFL_BASE = "https://site.api.espn.com/apis/site/v2/sports/football/nfl"
 
 
+@cached("nfl_stats")
 async def get_team_stats() -> dict:
     """
     Fetch NFL team statistics from ESPN.
@@ -9,6 +9,8 @@ import httpx
 from typing import Optional
 import logging
 
+from data_sources.cache import cached
+
 logger = logging.getLogger(__name__)
 
 NHL_STATS_BASE = "https://api.nhle.com/stats/rest/en"
@@ -58,6 +60,7 @@ def _get_team_abbr(team_name: str) -> str:
     return NHL_TEAM_NAME_TO_ABBR.get(team_name, "")
 
 
+@cached("nhl_stats")
 async def get_team_stats(season_id: str = "20242025") -> Optional[dict]:
     """
     Fetch team summary stats.
@@ -118,6 +121,7 @@ async def get_team_stats(season_id: str = "20242025") -> Optional[dict]:
         return None
 
 
+@cached("nhl_stats")
 async def get_team_advanced_stats(season_id: str = "20242025") -> Optional[dict]:
     """
     Fetch advanced team stats.
@@ -159,6 +163,7 @@ async def get_team_advanced_stats(season_id: str = "20242025") -> Optional[dict]
         return None
 
 
+@cached("nhl_stats")
 async def get_schedule(date: str) -> Optional[list]:
     """
     Get NHL schedule for a specific date.
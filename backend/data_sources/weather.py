@@ -14,6 +14,8 @@ from datetime import datetime, timezone
 from typing import Optional
 import logging
 
+from data_sources.cache import cached
+
 logger = logging.getLogger(__name__)
 
 OPENWEATHERMAP_API_KEY = os.getenv("OPENWEATHERMAP_API_KEY", "")
@@ -64,6 +66,7 @@ SUPER_BOWL_VENUES = {
 }
 
 
+@cached("weather")
 async def get_weather_forecast(lat: float, lon: float, game_time: datetime) -> Optional[dict]:
     """
     Get weather forecast for a specific location and time.
@@ -15,6 +15,7 @@ import json
 
 from supabase import create_client, Client
 from config import SUPABASE_URL, SUPABASE_KEY
+from response_cache import invalidate as invalidate_responses
 
 logger = logging.getLogger(__name__)
 
@@ -105,6 +106,8 @@ class Database:
         for analysis in analyses:
             if self.save_prediction(analysis):
                 saved += 1
+        if saved:
+            invalidate_responses("predictions")
         return saved
     
     def get_prediction(self, game_id: str, sport: str) -> Optional[dict]:
@@ -424,6 +427,8 @@ class Database:
                         saved += 1
 
         logger.debug(f"Saved {saved} snapshots for game {game_id}")
+        if saved:
+            invalidate_responses("odds")
         return saved
     
     def _save_period_snapshots(self, game_id: str, sport: str, period_key: str, period_markets: dict, implied_prob_func) -> int:
@@ -15,6 +15,7 @@ import json
 from config import SPORT_WEIGHTS, DEFAULT_WEIGHTS, PILLAR_WEIGHTS, EDGE_THRESHOLDS
 from data_sources.odds_api import odds_client
 from data_sources.espn import espn_client
+from data_sources.cache import source_cache, memoized
 from pillars import (
     calculate_execution_score,
     calculate_incentives_score,
@@ -28,6 +29,14 @@ from engine.weight_calculator import calculate_all_composites
 
 logger = logging.getLogger(__name__)
 
+# Pillars driven by injuries, standings, schedules and team stats. Their
+# results are reused across pregame cycles and live recalcs until one of
+# the source_cache entries they read changes (see pillar_memo).
+_execution_score = memoized("execution")(calculate_execution_score)
+_incentives_score = memoized("incentives")(calculate_incentives_score)
+_time_decay_score = memoized("time_decay")(calculate_time_decay_score)
+_game_environment_score = memoized("game_environment")(calculate_game_environment_score)
+
 
 def fetch_line_context(game_id: str, sport_key: str) -> dict:
     """
@@ -193,16 +202,19 @@ def fetch_team_environment_stats(
         return None
 
     try:
-        # Fetch stats filtered by league
-        result = db.client.table("team_stats").select(
-            "team_name, team_abbrev, pace, offensive_rating, defensive_rating, "
-            "points_per_game, points_allowed_per_game, net_rating, wins, losses, "
-            "win_pct, streak"
-        ).eq(
-            "league", league
-        ).execute()
-
-        rows = result.data or []
+        # Fetch stats filtered by league (shared across every game in the
+        # league via the source cache, refreshed per DATA_SOURCE_CACHE_TTLS)
+        def fetch_rows():
+            result = db.client.table("team_stats").select(
+                "team_name, team_abbrev, pace, offensive_rating, defensive_rating, "
+                "points_per_game, points_allowed_per_game, net_rating, wins, losses, "
+                "win_pct, streak"
+            ).eq(
+                "league", league
+            ).execute()
+            return result.data or None
+
+        rows = source_cache.get_or_fetch("team_stats", league, fetch_rows) or []
         if not rows:
             logger.info(f"CALIBRATION_DEBUG: game_environment no team_stats rows for league={league}")
             return None
@@ -445,7 +457,7 @@ def analyze_game(
     }
 
     try:
-        execution = calculate_execution_score(
+        execution = _execution_score(
             sport=sport,
             home_team=home_team,
             away_team=away_team,
@@ -457,7 +469,7 @@ def analyze_game(
         execution = {**_NEUTRAL_PILLAR, "home_injury_impact": 0, "away_injury_impact": 0, "weather_factor": 0, "soccer_adjustment": 0}
 
     try:
-        incentives = calculate_incentives_score(
+        incentives = _incentives_score(
             sport=sport,
             home_team=home_team,
             away_team=away_team,
@@ -488,7 +500,7 @@ def analyze_game(
         shocks = {**_NEUTRAL_PILLAR, "line_movement": 0, "shock_detected": False, "shock_direction": "neutral"}
 
     try:
-        time_decay = calculate_time_decay_score(
+        time_decay = _time_decay_score(
             sport=sport,
             home_team=home_team,
             away_team=away_team,
@@ -540,7 +552,7 @@ def analyze_game(
                 except Exception as e:
                     logger.warning(f"NHL stats API failed ({e}), using Supabase fallback")
 
-            game_env = calculate_game_environment_score(
+            game_env = _game_environment_score(
                 sport="NHL",
                 home_team=home_team,
                 away_team=away_team,
@@ -551,7 +563,7 @@ def analyze_game(
 
         elif sport in NFL_KEYS or sport in NCAAF_KEYS:
             # NFL/NCAAF game environment with weather + team scoring stats
-            game_env = calculate_game_environment_score(
+            game_env = _game_environment_score(
                 sport="NFL" if sport in NFL_KEYS else "NCAAF",
                 home_team=home_team,
                 away_team=away_team,
@@ -562,7 +574,7 @@ def analyze_game(
 
         elif sport in NBA_KEYS or sport in NCAAB_KEYS:
             # NBA/NCAAB - pace, offensive/defensive ratings from Supabase
-            game_env = calculate_game_environment_score(
+            game_env = _game_environment_score(
                 sport="NBA" if sport in NBA_KEYS else "NCAAB",
                 home_team=home_team,
                 away_team=away_team,
@@ -572,7 +584,7 @@ def analyze_game(
 
         elif sport in EPL_KEYS:
             # EPL - goals per game from Football-Data.org via team_stats
-            game_env = calculate_game_environment_score(
+            game_env = _game_environment_score(
                 sport="EPL",
                 home_team=home_team,
                 away_team=away_team,
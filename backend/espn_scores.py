@@ -5,6 +5,7 @@ Fetches final scores from ESPN (FREE) and auto-grades games
 
 import httpx
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone, timedelta
 from typing import Optional
 from zoneinfo import ZoneInfo
@@ -180,6 +181,10 @@ TEAM_ALIASES = {
 }
 
 
+# Concurrent ESPN scoreboard requests during auto-grading
+ESPN_FETCH_WORKERS = 4
+
+
 def normalize_team_name(name: str) -> str:
     """Normalize team name to a standard format for matching."""
     # Remove common prefixes/suffixes
@@ -205,10 +210,7 @@ def teams_match(espn_team: str, our_team: str) -> bool:
         return True
 
     # Check aliases
-    for full_name, aliases in TEAM_ALIASES.items():
-        full_norm = normalize_team_name(full_name)
-        alias_norms = [normalize_team_name(a) for a in aliases]
-
+    for full_norm, alias_norms in _ALIAS_GROUPS:
         # If ESPN matches this team
         if espn_norm == full_norm or espn_norm in alias_norms:
             # Check if our team also matches
@@ -237,6 +239,71 @@ def teams_match(espn_team: str, our_team: str) -> bool:
     return False
 
 
+# TEAM_ALIASES normalized once: [(full name, [aliases])] and alias -> full name
+_ALIAS_GROUPS = [
+    (normalize_team_name(full), [normalize_team_name(a) for a in aliases])
+    for full, aliases in TEAM_ALIASES.items()
+]
+_CANONICAL_TEAM: dict[str, str] = {}
+_AMBIGUOUS_ALIASES: set[str] = set()  # e.g. "panthers", "arizona": left to teams_match
+for _full_norm, _alias_norms in _ALIAS_GROUPS:
+    for _name in {_full_norm, *_alias_norms}:
+        if _CANONICAL_TEAM.setdefault(_name, _full_norm) != _full_norm:
+            _AMBIGUOUS_ALIASES.add(_name)
+for _name in _AMBIGUOUS_ALIASES:
+    del _CANONICAL_TEAM[_name]
+
+
+def team_key(name: str) -> str:
+    """Hashable key for a team name: normalized, with aliases folded to the full name."""
+    norm = normalize_team_name(name or "")
+    return _CANONICAL_TEAM.get(norm, norm)
+
+
+class ScoreboardIndex:
+    """One ESPN scoreboard indexed by (home, away) team_key for O(1) matching.
+
+    match() looks the pair up in both orientations first and only falls back
+    to the linear teams_match scan (substring / alias / word overlap) for
+    names that don't normalize to the same key, e.g. "Pitt Panthers" vs
+    "Pittsburgh Panthers".
+    """
+
+    def __init__(self, games: list[dict]):
+        self.games = games
+        self._by_pair: dict[tuple, dict] = {}
+        for game in games:
+            self._by_pair.setdefault((team_key(game["home_team"]), team_key(game["away_team"])), game)
+        self.index_hits = 0
+        self.scan_hits = 0
+
+    @staticmethod
+    def _swapped(game: dict) -> dict:
+        return {**game, "home_score": game["away_score"], "away_score": game["home_score"]}
+
+    def match(self, home_team: str, away_team: str) -> Optional[dict]:
+        """ESPN game for our home/away teams, with scores from our home
+        team's perspective, or None."""
+        home_key, away_key = team_key(home_team), team_key(away_team)
+        game = self._by_pair.get((home_key, away_key))
+        if game is not None:
+            self.index_hits += 1
+            return game
+        game = self._by_pair.get((away_key, home_key))
+        if game is not None:
+            self.index_hits += 1
+            return self._swapped(game)
+
+        for eg in self.games:
+            if teams_match(eg["home_team"], home_team) and teams_match(eg["away_team"], away_team):
+                self.scan_hits += 1
+                return eg
+            if teams_match(eg["home_team"], away_team) and teams_match(eg["away_team"], home_team):
+                self.scan_hits += 1
+                return self._swapped(eg)
+        return None
+
+
 class ESPNScoreFetcher:
     def __init__(self):
         self.client = httpx.Client(timeout=30)
@@ -424,7 +491,10 @@ class AutoGrader:
     def grade_completed_games(self, sport: Optional[str] = None) -> dict:
         """
         Find and grade all completed games that haven't been graded yet.
-        Fetches ESPN scores for each unique game date (last 30 days).
+
+        Ungraded games (last 30 days) are grouped by (sport, ESPN date); each
+        scoreboard is fetched once, concurrently, and indexed by team so every
+        game matches in O(1). All grades are then written in bulk.
         """
         sports_to_check = [sport] if sport else ESPN_SPORTS
 
@@ -440,6 +510,8 @@ class AutoGrader:
             "diagnostics": {},
         }
 
+        # 1. Group ungraded games by sport and ESPN (US-Eastern) date
+        games_by_key: dict[tuple[str, str], list[dict]] = {}
         for sport_key in sports_to_check:
             ungraded = self._get_ungraded_games(sport_key)
             results["checked"] += len(ungraded)
@@ -452,8 +524,6 @@ class AutoGrader:
                 f"Sample: {[g.get('home_team','?') + ' vs ' + g.get('away_team','?') for g in ungraded[:3]]}"
             )
 
-            # Group ungraded games by their ESPN (US-Eastern) date
-            games_by_date: dict[str, list[dict]] = {}
             skipped_no_date = 0
             for game in ungraded:
                 ct = game.get("commence_time")
@@ -468,120 +538,127 @@ class AutoGrader:
                 except Exception:
                     skipped_no_date += 1
                     continue
-                games_by_date.setdefault(game_date, []).append(game)
+                games_by_key.setdefault((sport_key, game_date), []).append(game)
 
             if skipped_no_date:
                 logger.warning(f"[AutoGrader] {sport_key}: {skipped_no_date} games skipped (no commence_time)")
-
-            # Fetch ESPN scores per unique date, cache to avoid duplicate calls
-            espn_cache: dict[str, list[dict]] = {}
-            for date_str in games_by_date:
-                if date_str not in espn_cache:
-                    espn_cache[date_str] = self.espn.get_final_scores(sport_key, date_str)
-                    logger.info(
-                        f"[AutoGrader] ESPN {sport_key} {date_str}: "
-                        f"{len(espn_cache[date_str])} final games"
-                    )
-
-            # Store per-sport diagnostics
             results["diagnostics"][sport_key] = {
                 "ungraded": len(ungraded),
-                "dates": {d: len(g) for d, g in games_by_date.items()},
-                "espn_final": {d: len(g) for d, g in espn_cache.items()},
+                "dates": {},
+                "espn_final": {},
                 "skipped_no_date": skipped_no_date,
             }
 
-            # Match and grade
-            for date_str, games in games_by_date.items():
-                espn_games = espn_cache.get(date_str, [])
-
-                for game in games:
-                    game_id = game.get("game_id")
-                    home_team = game.get("home_team")
-                    away_team = game.get("away_team")
-
-                    espn_match = None
-                    for eg in espn_games:
-                        if teams_match(eg["home_team"], home_team) and teams_match(eg["away_team"], away_team):
-                            espn_match = eg
-                            break
-                        if teams_match(eg["home_team"], away_team) and teams_match(eg["away_team"], home_team):
-                            espn_match = {
-                                **eg,
-                                "home_score": eg["away_score"],
-                                "away_score": eg["home_score"],
-                            }
-                            break
-
-                    if not espn_match:
-                        results["not_found"] += 1
-                        detail = {
-                            "sport": sport_key,
-                            "date": date_str,
-                            "home": home_team,
-                            "away": away_team,
-                            "espn_games_on_date": len(espn_games),
-                        }
-                        results["not_found_details"].append(detail)
-                        if len(espn_games) > 0:
-                            logger.warning(
-                                f"[AutoGrader] NO MATCH: {away_team} @ {home_team} "
-                                f"({sport_key} {date_str}). ESPN had: "
-                                f"{[(eg['away_team'] + ' @ ' + eg['home_team']) for eg in espn_games[:5]]}"
-                            )
-                        continue
-
-                    if not espn_match["is_final"]:
-                        results["not_final"] += 1
-                        continue
-
-                    try:
-                        graded = self.tracker.grade_game(
-                            game_id,
-                            espn_match["home_score"],
-                            espn_match["away_score"]
+        # 2. Fetch each (sport, date) scoreboard once, concurrently
+        def fetch(key: tuple[str, str]) -> ScoreboardIndex:
+            sport_key, date_str = key
+            finals = self.espn.get_final_scores(sport_key, date_str)
+            logger.info(f"[AutoGrader] ESPN {sport_key} {date_str}: {len(finals)} final games")
+            return ScoreboardIndex(finals)
+
+        boards: dict[tuple[str, str], ScoreboardIndex] = {}
+        if games_by_key:
+            with ThreadPoolExecutor(max_workers=ESPN_FETCH_WORKERS,
+                                    thread_name_prefix="espn-grade") as pool:
+                boards = dict(zip(games_by_key, pool.map(fetch, games_by_key)))
+
+        # 3. Match every game against its scoreboard index
+        to_grade: list[tuple] = []
+        for (sport_key, date_str), games in games_by_key.items():
+            board = boards[(sport_key, date_str)]
+            diag = results["diagnostics"][sport_key]
+            diag["dates"][date_str] = len(games)
+            diag["espn_final"][date_str] = len(board.games)
+
+            for game in games:
+                home_team = game.get("home_team")
+                away_team = game.get("away_team")
+                espn_match = board.match(home_team, away_team)
+
+                if not espn_match:
+                    results["not_found"] += 1
+                    results["not_found_details"].append({
+                        "sport": sport_key,
+                        "date": date_str,
+                        "home": home_team,
+                        "away": away_team,
+                        "espn_games_on_date": len(board.games),
+                    })
+                    if board.games:
+                        logger.warning(
+                            f"[AutoGrader] NO MATCH: {away_team} @ {home_team} "
+                            f"({sport_key} {date_str}). ESPN had: "
+                            f"{[(eg['away_team'] + ' @ ' + eg['home_team']) for eg in board.games[:5]]}"
                         )
+                    continue
+
+                if not espn_match["is_final"]:
+                    results["not_final"] += 1
+                    continue
 
-                        if graded:
-                            results["graded"] += 1
-                            results["details"].append({
-                                "game_id": game_id,
-                                "matchup": f"{away_team} @ {home_team}",
-                                "score": f"{espn_match['away_score']}-{espn_match['home_score']}",
-                                "best_bet_result": graded.get("best_bet_result"),
-                            })
-                            logger.info(
-                                f"[AutoGrader] GRADED: {away_team} @ {home_team} "
-                                f"({espn_match['away_score']}-{espn_match['home_score']})"
-                            )
-                    except Exception as e:
-                        logger.error(f"[AutoGrader] Error grading {game_id}: {e}")
-                        results["errors"] += 1
+                to_grade.append((game, espn_match["home_score"], espn_match["away_score"]))
+
+            diag["index_matches"] = diag.get("index_matches", 0) + board.index_hits
+            diag["fuzzy_matches"] = diag.get("fuzzy_matches", 0) + board.scan_hits
+
+        # 4. Write every grade in bulk
+        if to_grade:
+            try:
+                graded_rows, failed = self.tracker.grade_games_bulk(to_grade)
+            except Exception as e:
+                logger.error(f"[AutoGrader] Bulk grading of {len(to_grade)} games failed: {e}")
+                graded_rows, failed = [], [g[0].get("game_id") for g in to_grade]
+            results["errors"] += len(failed)
+            for row in graded_rows:
+                results["graded"] += 1
+                matchup = f"{row.get('away_team')} @ {row.get('home_team')}"
+                results["details"].append({
+                    "game_id": row.get("game_id"),
+                    "matchup": matchup,
+                    "score": f"{row['away_score']}-{row['home_score']}",
+                    "best_bet_result": row.get("best_bet_result"),
+                })
+                logger.info(
+                    f"[AutoGrader] GRADED: {matchup} ({row['away_score']}-{row['home_score']})"
+                )
 
         logger.info(
             f"[AutoGrader] Complete: checked={results['checked']}, "
             f"graded={results['graded']}, not_found={results['not_found']}, "
-            f"not_final={results['not_final']}, errors={results['errors']}"
+            f"not_final={results['not_final']}, errors={results['errors']}, "
+            f"scoreboards={len(boards)}"
         )
 
         return results
 
-    def _get_ungraded_games(self, sport: str) -> list[dict]:
+    def _get_ungraded_games(self, sport: str, page_size: int = 1000) -> list[dict]:
         """Get games that need scoring — home_score is NULL, last 30 days.
 
         Queries all sport_key variants (NBA, BASKETBALL_NBA, basketball_nba)
-        so both old-format and Odds-API-format game_results are found.
+        so both old-format and Odds-API-format game_results are found, and
+        pages through the results so large slates aren't cut off at the
+        API row limit.
         """
         cutoff = (datetime.now(timezone.utc) - timedelta(days=30)).isoformat()
+        now = datetime.now(timezone.utc).isoformat()
         variants = SPORT_KEY_VARIANTS.get(sport, [sport])
 
-        result = self.tracker.client.table("game_results").select("*").in_(
-            "sport_key", variants
-        ).is_("home_score", "null").gte("commence_time", cutoff).lt(
-            "commence_time", datetime.now(timezone.utc).isoformat()
-        ).order("commence_time", desc=True).execute()
+        games: list[dict] = []
+        offset = 0
+        while True:
+            result = self.tracker.client.table("game_results").select("*").in_(
+                "sport_key", variants
+            ).is_("home_score", "null").gte("commence_time", cutoff).lt(
+                "commence_time", now
+            ).order("commence_time", desc=True).order("game_id").range(
+                offset, offset + page_size - 1
+            ).execute()
+            page = result.data or []
+            games.extend(page)
+            if len(page) < page_size:
+                break
+            offset += page_size
 
-        games = result.data or []
         if games:
             logger.info(
                 f"[AutoGrader] _get_ungraded_games({sport}): {len(games)} ungraded "
@@ -5,24 +5,49 @@ Fetches sports prediction market data from Kalshi and Polymarket,
 stores snapshots in exchange_data table, and fuzzy-matches contracts
 to our sportsbook games in cached_odds.
 
+Rows are delta-encoded per contract: a sync inserts a snapshot only when
+the contract's price or volume moved past a threshold since its last row,
+plus a periodic heartbeat, so the latest row per contract stays current
+without writing every unchanged market every sync.
+
 Called every 15 minutes by the odds sync cron via POST /api/exchange/sync.
 """
 import json
 import logging
+import queue
 import re
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from typing import Optional
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
+from config import (
+    EXCHANGE_HEARTBEAT_MINUTES, EXCHANGE_PRICE_MIN_CHANGE, EXCHANGE_VOLUME_MIN_CHANGE_PCT,
+    RECALC_EXCHANGE_MIN_MOVE, WARM_CACHE_ODDS_MAX_AGE,
+)
 from database import db
+from recalc_queue import recalc_queue
+from response_cache import invalidate as invalidate_responses
+from job_executor import checkpoint
+from warm_cache import warm_cache
 
 logger = logging.getLogger(__name__)
 
 KALSHI_API_BASE = "https://api.elections.kalshi.com/trade-api/v2"
 POLYMARKET_API_BASE = "https://gamma-api.polymarket.com"
 
+# Concurrent fetch settings for sync_kalshi / sync_polymarket.
+# Workers = series (Kalshi) or offset pages (Polymarket) in flight at once;
+# the per-venue rate caps keep the pooled session under each public API limit.
+EXCHANGE_SYNC_MAX_WORKERS = 6
+KALSHI_MAX_REQUESTS_PER_SEC = 8
+POLYMARKET_MAX_REQUESTS_PER_SEC = 10
+
 # Kalshi sports series tickers: (series_ticker, market_type)
 # Each series = one sport + one market type. Events endpoint returns single-game events.
 KALSHI_SPORTS_SERIES = [
@@ -246,22 +271,368 @@ def _extract_team_fragments(title: str) -> list[str]:
     return words
 
 
+# Length of the name prefix used to find whole-name substring hits in a title
+_NAME_PREFIX_LEN = 3
+
+
+def _upcoming(games: list, now_iso: str) -> list:
+    """Games not yet started, the same filter the cached_odds query applies."""
+    return [g for g in games
+            if str((g.get("game_data") or {}).get("commence_time") or "") >= now_iso]
+
+
+class _GameMatchIndex:
+    """Inverted index over active games for _fuzzy_match_game.
+
+    Built once per sync. Each game's team names are normalized and split
+    into word sets up front; a title is then scored only against games
+    that share a word with it (word_index) or whose full normalized name
+    occurs somewhere in the title (found via name_prefixes: every
+    substring occurrence starts at some title offset whose next few
+    characters equal the name's prefix).
+    """
+
+    def __init__(self, games: list):
+        # Per game, in cached_odds order: (game, home_norm, away_norm, home_words, away_words)
+        self.entries: list[tuple] = []
+        self.word_index: dict[str, set[int]] = {}
+        self.name_prefixes: dict[str, list[tuple[str, int]]] = {}
+        self.short_names: list[tuple[str, int]] = []
+
+        for game in games:
+            game_data = game.get("game_data", {})
+            if not game_data:
+                continue
+            home = game_data.get("home_team", "")
+            away = game_data.get("away_team", "")
+            if not home or not away:
+                continue
+
+            idx = len(self.entries)
+            home_norm = _normalize_team(home)
+            away_norm = _normalize_team(away)
+            home_words = frozenset(home_norm.split())
+            away_words = frozenset(away_norm.split())
+            self.entries.append((game, home_norm, away_norm, home_words, away_words))
+
+            for word in home_words | away_words:
+                self.word_index.setdefault(word, set()).add(idx)
+            for name in (home_norm, away_norm):
+                if not name:
+                    continue  # empty name never adds to the score
+                if len(name) < _NAME_PREFIX_LEN:
+                    self.short_names.append((name, idx))
+                else:
+                    self.name_prefixes.setdefault(name[:_NAME_PREFIX_LEN], []).append((name, idx))
+
+    def candidates(self, title_lower: str, title_fragments: set) -> list[int]:
+        """Indexes of games that can score above zero, in original order."""
+        found: set[int] = set()
+        for frag in title_fragments:
+            ids = self.word_index.get(frag)
+            if ids:
+                found |= ids
+        for i in range(len(title_lower) - _NAME_PREFIX_LEN + 1):
+            names = self.name_prefixes.get(title_lower[i:i + _NAME_PREFIX_LEN])
+            if names:
+                for name, idx in names:
+                    if idx not in found and title_lower.startswith(name, i):
+                        found.add(idx)
+        for name, idx in self.short_names:
+            if name in title_lower:
+                found.add(idx)
+        return sorted(found)
+
+
+class _VenueClient:
+    """Pooled, rate-limited JSON GETs against one exchange API.
+
+    One keep-alive Session shared by the fetch threads, with transient
+    429/5xx retried by urllib3 and requests spaced to max_rps.
+    """
+
+    def __init__(self, name: str, max_rps: float, pool_size: int):
+        self.name = name
+        self._interval = 1.0 / max_rps if max_rps else 0.0
+        self._next_at = 0.0
+        self._lock = threading.Lock()
+        self._session = requests.Session()
+        retry = Retry(
+            total=2,
+            backoff_factor=0.5,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=frozenset(["GET"]),
+        )
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=retry)
+        self._session.mount("https://", adapter)
+
+    def _wait_turn(self):
+        with self._lock:
+            now = time.monotonic()
+            start_at = max(now, self._next_at)
+            self._next_at = start_at + self._interval
+        if start_at > now:
+            time.sleep(start_at - now)
+
+    def get_json(self, url: str, params: dict, timeout: float = 15):
+        self._wait_turn()
+        resp = self._session.get(url, params=params, timeout=timeout)
+        resp.raise_for_status()
+        return resp.json()
+
+    def close(self):
+        self._session.close()
+
+
+class _PriceMemory:
+    """Last written price per contract, for the whole universe, kept in process.
+
+    Seeded once per exchange from the latest exchange_data row of every open
+    contract (paged, so large universes keep their history), then updated
+    as rows are written. A contract only gets a new row when its price or
+    volume moved past the configured thresholds, its mapping or status
+    changed, or EXCHANGE_HEARTBEAT_MINUTES passed since its last row, so
+    readers still find a recent "latest" row for every contract.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # exchange -> {contract_ticker: written row fields + "written_at"/"seen_at"}
+        self._rows: dict[str, dict[str, dict]] = {}
+        self._metrics: dict[str, dict] = {}
+
+    def _exchange_metrics(self, exchange: str) -> dict:
+        m = self._metrics.get(exchange)
+        if m is None:
+            m = self._metrics[exchange] = {
+                "seen": 0, "written": 0, "suppressed": 0, "seeded_contracts": 0,
+                "reasons": {reason: 0 for reason in _WRITE_REASONS},
+            }
+        return m
+
+    def is_seeded(self, exchange: str) -> bool:
+        with self._lock:
+            return exchange in self._rows
+
+    def seed(self, exchange: str, rows: list[dict]):
+        known = {}
+        for row in rows:
+            ticker = row.get("contract_ticker")
+            if not ticker:
+                continue
+            known[ticker] = {
+                "yes_price": _as_float(row.get("yes_price")),
+                "volume": row.get("volume"),
+                "status": row.get("status"),
+                "mapped_game_id": row.get("mapped_game_id"),
+                "written_at": _parse_ts(row.get("snapshot_time")) or 0.0,
+                "seen_at": time.time(),
+            }
+        with self._lock:
+            self._rows[exchange] = known
+            self._exchange_metrics(exchange)["seeded_contracts"] = len(known)
+
+    def previous_price(self, exchange: str, ticker: str) -> Optional[float]:
+        with self._lock:
+            last = self._rows.get(exchange, {}).get(ticker)
+        return last["yes_price"] if last else None
+
+    def admit(self, row: dict) -> Optional[str]:
+        """Return why row must be written, or None to suppress it.
+
+        Admitted rows become the contract's new baseline, so small moves
+        accumulate until they cross the threshold.
+        """
+        exchange, ticker = row["exchange"], row.get("contract_ticker")
+        now = time.time()
+        with self._lock:
+            m = self._exchange_metrics(exchange)
+            m["seen"] += 1
+            known = self._rows.setdefault(exchange, {})
+            last = known.get(ticker) if ticker else None
+            reason = _write_reason(last, row, now)
+            if last is not None:
+                last["seen_at"] = now
+            if reason is None:
+                m["suppressed"] += 1
+                return None
+            m["written"] += 1
+            m["reasons"][reason] += 1
+            if ticker:
+                known[ticker] = {
+                    "yes_price": row["yes_price"],
+                    "volume": row.get("volume"),
+                    "status": row.get("status"),
+                    "mapped_game_id": row.get("mapped_game_id"),
+                    "written_at": now,
+                    "seen_at": now,
+                }
+            return reason
+
+    def forget(self, exchange: str, tickers: list[str]):
+        """Drop baselines for rows whose insert may have failed, so the next
+        sync writes them again."""
+        with self._lock:
+            known = self._rows.get(exchange, {})
+            for ticker in tickers:
+                known.pop(ticker, None)
+
+    def prune(self, exchange: str):
+        """Drop contracts not seen for _PRICE_MEMORY_TTL (closed markets)."""
+        cutoff = time.time() - _PRICE_MEMORY_TTL
+        with self._lock:
+            known = self._rows.get(exchange)
+            if known:
+                for ticker in [t for t, v in known.items() if v["seen_at"] < cutoff]:
+                    del known[ticker]
+
+    def stats(self) -> dict:
+        with self._lock:
+            out = {}
+            for exchange, m in self._metrics.items():
+                out[exchange] = {
+                    **m,
+                    "reasons": dict(m["reasons"]),
+                    "tracked_contracts": len(self._rows.get(exchange, {})),
+                    "compression_ratio": round(m["seen"] / m["written"], 2) if m["written"] else None,
+                    "suppressed_pct": round(100 * m["suppressed"] / m["seen"], 1) if m["seen"] else None,
+                }
+            return out
+
+
+_WRITE_REASONS = ("new", "price", "volume", "mapping", "status", "heartbeat")
+
+# Contracts not seen by a sync for this long are dropped from the price memory
+_PRICE_MEMORY_TTL = 24 * 3600
+
+
+def _as_float(value) -> Optional[float]:
+    return float(value) if value is not None else None
+
+
+def _parse_ts(value) -> Optional[float]:
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(str(value).replace("Z", "+00:00")).timestamp()
+    except ValueError:
+        return None
+
+
+def _write_reason(last: Optional[dict], row: dict, now: float) -> Optional[str]:
+    if last is None:
+        return "new"
+    price, prev_price = row["yes_price"], last["yes_price"]
+    if (price is None) != (prev_price is None) or (
+        price is not None and abs(price - prev_price) >= EXCHANGE_PRICE_MIN_CHANGE
+    ):
+        return "price"
+    volume, prev_volume = row.get("volume"), last["volume"]
+    if (volume is None) != (prev_volume is None) or (
+        volume is not None
+        and abs(volume - prev_volume) >= max(1, EXCHANGE_VOLUME_MIN_CHANGE_PCT * prev_volume)
+    ):
+        return "volume"
+    if row.get("mapped_game_id") != last["mapped_game_id"]:
+        return "mapping"
+    if row.get("status") != last["status"]:
+        return "status"
+    if now - last["written_at"] >= EXCHANGE_HEARTBEAT_MINUTES * 60:
+        return "heartbeat"
+    return None
+
+
+price_memory = _PriceMemory()
+
+
+class _RowStream:
+    """Filters rows through the price memory, fills price_change from each
+    contract's last written price and inserts admitted rows in chunks as
+    pages are parsed. Mapped contracts that moved RECALC_EXCHANGE_MIN_MOVE
+    cents or more queue a recalc of their game."""
+
+    def __init__(self, tracker: "ExchangeTracker", exchange: str, chunk_size: int = 200):
+        self._tracker = tracker
+        self._exchange = exchange
+        self._chunk_size = chunk_size
+        self._buffer: list[dict] = []
+        self.seen = 0
+        self.suppressed = 0
+        self.inserted = 0
+        self.errors = 0
+
+    def add(self, row: dict):
+        self.seen += 1
+        prev = price_memory.previous_price(self._exchange, row["contract_ticker"])
+        if price_memory.admit(row) is None:
+            self.suppressed += 1
+            return
+        if prev is not None and row["yes_price"] is not None:
+            row["previous_yes_price"] = prev
+            row["price_change"] = round(row["yes_price"] - prev, 2)
+            if row.get("mapped_game_id") and abs(row["price_change"]) >= RECALC_EXCHANGE_MIN_MOVE:
+                recalc_queue.emit(
+                    row["mapped_game_id"], row.get("mapped_sport_key") or "",
+                    f"{row['exchange']}_price_moved",
+                )
+        self._buffer.append(row)
+        if len(self._buffer) >= self._chunk_size:
+            self.flush()
+
+    def flush(self):
+        checkpoint()
+        if not self._buffer:
+            return
+        inserted, errors = self._tracker._batch_insert(self._buffer, self._chunk_size)
+        self.inserted += inserted
+        self.errors += errors
+        if errors:
+            price_memory.forget(self._exchange, [r["contract_ticker"] for r in self._buffer])
+        self._buffer = []
+
+    def summary(self) -> dict:
+        return {
+            "seen": self.seen,
+            "suppressed": self.suppressed,
+            "compression_ratio": round(self.seen / self.inserted, 2) if self.inserted else None,
+        }
+
+
+# The warm-cache copy of active games is only consulted once per process
+# (the first load after boot); later loads always query cached_odds.
+_warm_tried = False
+
+
 class ExchangeTracker:
     """Fetches and stores exchange sports market data."""
 
     def __init__(self):
         self._cached_games: Optional[list] = None
+        self._match_index: Optional[_GameMatchIndex] = None
 
     def _load_active_games(self) -> list:
-        """Load active games from cached_odds for fuzzy matching."""
+        """Load active games from cached_odds for fuzzy matching.
+
+        On the first load after boot, a warm-cache copy younger than
+        WARM_CACHE_ODDS_MAX_AGE (from the run before a restart) is used
+        instead of the query.
+        """
+        global _warm_tried
         if self._cached_games is not None:
             return self._cached_games
 
+        now = datetime.now(timezone.utc).isoformat()
+        if not _warm_tried:
+            _warm_tried = True
+            warm = warm_cache.get("odds", "active_games", WARM_CACHE_ODDS_MAX_AGE)
+            if warm is not None:
+                self._cached_games = _upcoming(warm[0], now)
+                return self._cached_games
+
         if not db._is_connected():
             self._cached_games = []
             return []
 
-        now = datetime.now(timezone.utc).isoformat()
         try:
             result = (
                 db.client.table("cached_odds")
@@ -270,16 +641,23 @@ class ExchangeTracker:
                 .execute()
             )
             self._cached_games = result.data or []
+            warm_cache.put("odds", "active_games", self._cached_games)
         except Exception as e:
             logger.error(f"[ExchangeTracker] Failed to load active games: {e}")
             self._cached_games = []
 
         return self._cached_games
 
+    def _get_match_index(self) -> _GameMatchIndex:
+        """Build the team-token index over active games (once per tracker)."""
+        if self._match_index is None:
+            self._match_index = _GameMatchIndex(self._load_active_games())
+        return self._match_index
+
     def _fuzzy_match_game(self, title: str) -> tuple[Optional[str], Optional[str]]:
         """Try to match an exchange title to one of our sportsbook games."""
-        games = self._load_active_games()
-        if not games:
+        index = self._get_match_index()
+        if not index.entries:
             return None, None
 
         title_lower = title.lower()
@@ -288,22 +666,8 @@ class ExchangeTracker:
         best_match = None
         best_score = 0
 
-        for game in games:
-            game_data = game.get("game_data", {})
-            if not game_data:
-                continue
-
-            home = game_data.get("home_team", "")
-            away = game_data.get("away_team", "")
-            if not home or not away:
-                continue
-
-            home_norm = _normalize_team(home)
-            away_norm = _normalize_team(away)
-
-            # Check if team names appear in the title
-            home_words = set(home_norm.split())
-            away_words = set(away_norm.split())
+        for idx in index.candidates(title_lower, title_fragments):
+            game, home_norm, away_norm, home_words, away_words = index.entries[idx]
 
             # Score: count matching words
             home_matches = len(home_words & title_fragments)
@@ -328,28 +692,30 @@ class ExchangeTracker:
             return best_match["game_id"], best_match["sport_key"]
         return None, None
 
-    def _load_previous_prices(self, exchange: str) -> dict[str, float]:
-        """Load all current prices for an exchange in one query.
-
-        Returns {contract_ticker: yes_price} for price_change calculation.
-        """
-        if not db._is_connected():
-            return {}
+    def _seed_price_memory(self, exchange: str, page_size: int = 1000):
+        """Seed the price memory with the latest row of every open contract
+        (first sync of each exchange in this process)."""
+        if price_memory.is_seeded(exchange) or not db._is_connected():
+            return
+        rows: list[dict] = []
         try:
-            result = db.client.rpc(
-                "get_exchange_markets",
-                {"p_exchange": exchange, "p_search": None, "p_limit": 500},
-            ).execute()
-            prices = {}
-            for row in (result.data or []):
-                ticker = row.get("contract_ticker")
-                price = row.get("yes_price")
-                if ticker and price is not None:
-                    prices[ticker] = float(price)
-            return prices
+            offset = 0
+            while True:
+                page = db.client.rpc(
+                    "get_latest_exchange_markets",
+                    {"p_exchange": exchange, "p_search": None},
+                ).select(
+                    "contract_ticker, yes_price, volume, status, mapped_game_id, snapshot_time"
+                ).range(offset, offset + page_size - 1).execute().data or []
+                rows.extend(page)
+                if len(page) < page_size:
+                    break
+                offset += page_size
         except Exception as e:
+            # Unseeded contracts are written as new on this sync
             logger.warning(f"[ExchangeTracker] Failed to load previous prices for {exchange}: {e}")
-            return {}
+        price_memory.seed(exchange, rows)
+        logger.info(f"[ExchangeTracker] Seeded {exchange} price memory with {len(rows)} contracts")
 
     def _batch_insert(self, rows: list[dict], chunk_size: int = 200) -> tuple[int, int]:
         """Insert rows in batches. Returns (inserted, errors)."""
@@ -369,31 +735,97 @@ class ExchangeTracker:
                     except Exception as e2:
                         logger.error(f"[ExchangeTracker] Individual insert failed: {e2}")
                         errors += 1
+        if inserted:
+            invalidate_responses("exchange")
         return inserted, errors
 
     # =========================================================================
     # KALSHI
     # =========================================================================
 
+    @staticmethod
+    def _kalshi_market_row(event: dict, m: dict, market_type: str, game_id: Optional[str],
+                           sport_key: Optional[str], now: str) -> Optional[dict]:
+        """Build one exchange_data row from a Kalshi nested market (None if closed)."""
+        status = m.get("status", "open")
+        if status not in ("active", "open"):
+            return None
+
+        yes_bid = m.get("yes_bid")
+        yes_ask = m.get("yes_ask")
+        no_bid = m.get("no_bid")
+        no_ask = m.get("no_ask")
+        last_price = m.get("last_price")
+
+        yes_price = None
+        no_price = None
+        if yes_bid is not None and yes_ask is not None:
+            yes_price = round((yes_bid + yes_ask) / 2, 1)
+        elif last_price is not None:
+            yes_price = last_price
+        if no_bid is not None and no_ask is not None:
+            no_price = round((no_bid + no_ask) / 2, 1)
+        elif yes_price is not None:
+            no_price = 100 - yes_price
+
+        close_time = (
+            m.get("close_time")
+            or m.get("expiration_time")
+            or m.get("expected_expiration_time")
+        )
+
+        return {
+            "exchange": "kalshi",
+            "event_id": event.get("event_ticker", ""),
+            "event_title": event.get("title", ""),
+            "contract_ticker": m.get("ticker", ""),
+            "market_type": market_type,
+            "subtitle": m.get("yes_sub_title", ""),
+            "yes_price": yes_price,
+            "no_price": no_price,
+            "yes_bid": yes_bid,
+            "yes_ask": yes_ask,
+            "no_bid": no_bid,
+            "no_ask": no_ask,
+            "volume": m.get("volume"),
+            "open_interest": m.get("open_interest"),
+            "last_price": last_price,
+            "previous_yes_price": None,
+            "price_change": None,
+            "snapshot_time": now,
+            "mapped_game_id": game_id,
+            "mapped_sport_key": sport_key,
+            "expiration_time": close_time,
+            "status": status,
+        }
+
     def sync_kalshi(self) -> dict:
         """Fetch single-game sports markets from Kalshi using the events endpoint.
 
-        Batch approach: pre-loads previous prices in one query, collects all
-        rows without DB calls, then batch-inserts in chunks of 200.
+        Every series in KALSHI_SPORTS_SERIES is paged concurrently (cursor
+        pagination stays sequential within a series) through one pooled,
+        rate-limited session. Pages are matched and streamed into
+        _batch_insert as they arrive. Only contracts that changed since
+        their last row (or are due a heartbeat) are inserted; see _PriceMemory.
         """
         if not db._is_connected():
             return {"markets": 0, "matched": 0, "error": "Database not connected"}
 
-        # 1. Pre-load all existing Kalshi prices in one query
-        prev_prices = self._load_previous_prices("kalshi")
+        # 1. Seed the last-price map once per process
+        self._seed_price_memory("kalshi")
+        price_memory.prune("kalshi")
+        self._get_match_index()  # build before fetch threads start
 
         now = datetime.now(timezone.utc).isoformat()
-        rows: list[dict] = []
+        stream = _RowStream(self, "kalshi")
         sports_matched = 0
-        api_errors = 0
+        series_timing: dict[str, dict] = {}
+        pages: queue.Queue = queue.Queue()
+        client = _VenueClient("kalshi", KALSHI_MAX_REQUESTS_PER_SEC, EXCHANGE_SYNC_MAX_WORKERS)
 
-        # 2. Fetch from Kalshi API, collect rows (no DB calls in loop)
-        for series_ticker, market_type in KALSHI_SPORTS_SERIES:
+        def fetch_series(series_ticker: str, market_type: str):
+            started = time.monotonic()
+            timing = {"pages": 0, "events": 0, "seconds": 0.0, "error": None}
             cursor = None
             try:
                 while True:
@@ -406,119 +838,160 @@ class ExchangeTracker:
                     if cursor:
                         params["cursor"] = cursor
 
-                    resp = requests.get(
-                        f"{KALSHI_API_BASE}/events",
-                        params=params,
-                        timeout=15,
-                    )
-                    resp.raise_for_status()
-                    data = resp.json()
-
+                    data = client.get_json(f"{KALSHI_API_BASE}/events", params)
                     events = data.get("events", [])
                     if not events:
                         break
-
-                    for event in events:
-                        event_ticker = event.get("event_ticker", "")
-                        event_title = event.get("title", "")
-                        game_id, sport_key = self._fuzzy_match_game(event_title)
-
-                        for m in event.get("markets", []):
-                            ticker = m.get("ticker", "")
-                            status = m.get("status", "open")
-                            if status not in ("active", "open"):
-                                continue
-
-                            yes_bid = m.get("yes_bid")
-                            yes_ask = m.get("yes_ask")
-                            no_bid = m.get("no_bid")
-                            no_ask = m.get("no_ask")
-                            last_price = m.get("last_price")
-                            volume = m.get("volume")
-                            open_interest = m.get("open_interest")
-                            subtitle = m.get("yes_sub_title", "")
-
-                            yes_price = None
-                            no_price = None
-                            if yes_bid is not None and yes_ask is not None:
-                                yes_price = round((yes_bid + yes_ask) / 2, 1)
-                            elif last_price is not None:
-                                yes_price = last_price
-                            if no_bid is not None and no_ask is not None:
-                                no_price = round((no_bid + no_ask) / 2, 1)
-                            elif yes_price is not None:
-                                no_price = 100 - yes_price
-
-                            close_time = (
-                                m.get("close_time")
-                                or m.get("expiration_time")
-                                or m.get("expected_expiration_time")
-                            )
-
-                            if game_id:
-                                sports_matched += 1
-
-                            rows.append({
-                                "exchange": "kalshi",
-                                "event_id": event_ticker,
-                                "event_title": event_title,
-                                "contract_ticker": ticker,
-                                "market_type": market_type,
-                                "subtitle": subtitle,
-                                "yes_price": yes_price,
-                                "no_price": no_price,
-                                "yes_bid": yes_bid,
-                                "yes_ask": yes_ask,
-                                "no_bid": no_bid,
-                                "no_ask": no_ask,
-                                "volume": volume,
-                                "open_interest": open_interest,
-                                "last_price": last_price,
-                                "previous_yes_price": None,
-                                "price_change": None,
-                                "snapshot_time": now,
-                                "mapped_game_id": game_id,
-                                "mapped_sport_key": sport_key,
-                                "expiration_time": close_time,
-                                "status": status,
-                            })
+                    timing["pages"] += 1
+                    timing["events"] += len(events)
+                    pages.put((market_type, events))
 
                     cursor = data.get("cursor")
                     if not cursor:
                         break
-
-            except requests.RequestException as e:
+            except (requests.RequestException, ValueError) as e:
                 logger.warning(f"[ExchangeTracker] Kalshi series {series_ticker}: {e}")
-                api_errors += 1
+                timing["error"] = str(e)
+            finally:
+                timing["seconds"] = round(time.monotonic() - started, 2)
+                series_timing[series_ticker] = timing
+                pages.put(None)
 
-        # 3. Calculate price_change from pre-loaded dict
-        for row in rows:
-            prev = prev_prices.get(row["contract_ticker"])
-            if prev is not None and row["yes_price"] is not None:
-                row["previous_yes_price"] = prev
-                row["price_change"] = round(row["yes_price"] - prev, 2)
+        # 2. Fetch series concurrently; match + insert pages as they arrive
+        try:
+            with ThreadPoolExecutor(max_workers=EXCHANGE_SYNC_MAX_WORKERS,
+                                    thread_name_prefix="kalshi") as pool:
+                for series_ticker, market_type in KALSHI_SPORTS_SERIES:
+                    pool.submit(fetch_series, series_ticker, market_type)
+
+                remaining = len(KALSHI_SPORTS_SERIES)
+                while remaining:
+                    item = pages.get()
+                    if item is None:
+                        remaining -= 1
+                        continue
+                    market_type, events = item
+                    for event in events:
+                        game_id, sport_key = self._fuzzy_match_game(event.get("title", ""))
+                        for m in event.get("markets", []):
+                            row = self._kalshi_market_row(event, m, market_type, game_id, sport_key, now)
+                            if row is None:
+                                continue
+                            if game_id:
+                                sports_matched += 1
+                            stream.add(row)
+        finally:
+            client.close()
 
-        # 4. Batch insert (chunks of 200, fallback to individual on failure)
-        inserted, insert_errors = self._batch_insert(rows)
+        # 3. Flush the last partial chunk
+        stream.flush()
+        api_errors = sum(1 for t in series_timing.values() if t["error"])
 
         error_msg = None
-        total_errors = api_errors + insert_errors
+        total_errors = api_errors + stream.errors
         if total_errors:
-            error_msg = f"{api_errors} API + {insert_errors} insert errors"
+            error_msg = f"{api_errors} API + {stream.errors} insert errors"
 
-        summary = {"markets": inserted, "matched": sports_matched, "error": error_msg}
-        logger.info(f"[ExchangeTracker] Kalshi sync: {summary}")
+        summary = {
+            "markets": stream.inserted,
+            "matched": sports_matched,
+            **stream.summary(),
+            "error": error_msg,
+            "series_timing": series_timing,
+        }
+        slowest = max(series_timing.items(), key=lambda kv: kv[1]["seconds"], default=(None, {}))
+        logger.info(
+            f"[ExchangeTracker] Kalshi sync: {stream.inserted} inserted, "
+            f"{stream.suppressed} unchanged, {sports_matched} matched, "
+            f"{len(series_timing)} series, slowest {slowest[0]} {slowest[1].get('seconds')}s, "
+            f"error={error_msg}"
+        )
         return summary
 
     # =========================================================================
     # POLYMARKET
     # =========================================================================
 
+    @staticmethod
+    def _polymarket_market_row(event: dict, m: dict, game_id: Optional[str],
+                               sport_key: Optional[str], now: str) -> dict:
+        """Build one exchange_data row from a Polymarket event market."""
+        event_title = event.get("title", "")
+        question = m.get("question", "") or m.get("groupItemTitle", "") or event_title
+        event_id = m.get("conditionId", m.get("id", ""))
+        slug = m.get("slug", "")
+
+        # Infer market_type from question text
+        q_lower = (question + " " + event_title).lower()
+        if any(kw in q_lower for kw in ["spread", "cover", "margin", "by more"]):
+            market_type = "spread"
+        elif any(kw in q_lower for kw in ["total", "over", "under", "combined"]):
+            market_type = "total"
+        else:
+            market_type = "moneyline"
+
+        yes_price = None
+        no_price = None
+        try:
+            prices_str = m.get("outcomePrices", "")
+            if prices_str:
+                prices = json.loads(prices_str)
+                if len(prices) >= 2:
+                    yes_price = round(float(prices[0]) * 100, 1)
+                    no_price = round(float(prices[1]) * 100, 1)
+        except (json.JSONDecodeError, ValueError, IndexError):
+            pass
+
+        volume = m.get("volume")
+        if volume is not None:
+            try:
+                volume = int(float(volume))
+            except (ValueError, TypeError):
+                volume = None
+
+        open_interest = m.get("liquidity")
+        if open_interest is not None:
+            try:
+                open_interest = int(float(open_interest))
+            except (ValueError, TypeError):
+                open_interest = None
+
+        close_time = m.get("endDate") or m.get("expirationDate") or event.get("endDate")
+        status = "open" if m.get("active") else "closed"
+        display_title = question if question != event_title else event_title
+
+        return {
+            "exchange": "polymarket",
+            "event_id": event_id,
+            "event_title": display_title,
+            "contract_ticker": slug,
+            "market_type": market_type,
+            "yes_price": yes_price,
+            "no_price": no_price,
+            "yes_bid": None,
+            "yes_ask": None,
+            "no_bid": None,
+            "no_ask": None,
+            "volume": volume,
+            "open_interest": open_interest,
+            "last_price": yes_price,
+            "previous_yes_price": None,
+            "price_change": None,
+            "snapshot_time": now,
+            "mapped_game_id": game_id,
+            "mapped_sport_key": sport_key,
+            "expiration_time": close_time,
+            "status": status,
+        }
+
     def sync_polymarket(self) -> dict:
         """Fetch sports markets from Polymarket and store in exchange_data.
 
-        Batch approach: pre-loads previous prices in one query, collects all
-        rows without DB calls, then batch-inserts in chunks of 200.
+        Offset pages are fetched EXCHANGE_SYNC_MAX_WORKERS at a time through
+        one pooled, rate-limited session until a short page marks the end.
+        Each wave is filtered, matched and streamed into _batch_insert in
+        page order. Only contracts that changed since their last row (or are
+        due a heartbeat) are inserted; see _PriceMemory.
 
         Uses strict _is_sports_game_market() filter to reject politics,
         crypto, esports, and other non-sports events.
@@ -526,8 +999,9 @@ class ExchangeTracker:
         if not db._is_connected():
             return {"markets": 0, "matched": 0, "error": "Database not connected"}
 
-        # 1. Pre-load all existing Polymarket prices in one query
-        prev_prices = self._load_previous_prices("polymarket")
+        # 1. Seed the last-price map once per process
+        self._seed_price_memory("polymarket")
+        price_memory.prune("polymarket")
 
         # Build set of active team names from cached_odds for matching
         active_team_names: set[str] = set()
@@ -548,22 +1022,24 @@ class ExchangeTracker:
                     parts = away.lower().split()
                     if len(parts) > 1:
                         active_team_names.add(parts[-1])
+        self._get_match_index()
 
         now = datetime.now(timezone.utc).isoformat()
-        rows: list[dict] = []
+        stream = _RowStream(self, "polymarket")
         sports_matched = 0
         api_errors = 0
         total_events = 0
         rejected_events = 0
-        offset = 0
         page_limit = 200
+        page_seconds: list[float] = []
+        client = _VenueClient("polymarket", POLYMARKET_MAX_REQUESTS_PER_SEC, EXCHANGE_SYNC_MAX_WORKERS)
 
-        # 2. Fetch from Polymarket API, collect rows (no DB calls in loop)
-        try:
-            while True:
-                resp = requests.get(
+        def fetch_page(offset: int):
+            started = time.monotonic()
+            try:
+                return client.get_json(
                     f"{POLYMARKET_API_BASE}/events",
-                    params={
+                    {
                         "active": "true",
                         "closed": "false",
                         "limit": page_limit,
@@ -571,141 +1047,86 @@ class ExchangeTracker:
                         "order": "volume24hr",
                         "ascending": "false",
                     },
-                    timeout=15,
-                )
-                resp.raise_for_status()
-                events = resp.json()
-
-                if not events:
-                    break
-
-                for event in events:
-                    total_events += 1
-                    event_title = event.get("title", "")
-                    tags_raw = event.get("tags", [])
-                    tag_labels = []
-                    if isinstance(tags_raw, list):
-                        for t in tags_raw:
-                            if isinstance(t, dict):
-                                tag_labels.append(t.get("label", ""))
-                            elif isinstance(t, str):
-                                tag_labels.append(t)
-
-                    if not _is_sports_game_market(event_title, tags=tag_labels, active_team_names=active_team_names):
-                        rejected_events += 1
-                        continue
-
-                    game_id, sport_key = self._fuzzy_match_game(event_title)
-
-                    event_markets = event.get("markets", [])
-                    if not event_markets:
-                        continue
-
-                    for m in event_markets:
-                        question = m.get("question", "") or m.get("groupItemTitle", "") or event_title
-                        event_id = m.get("conditionId", m.get("id", ""))
-                        slug = m.get("slug", "")
-
-                        # Infer market_type from question text
-                        q_lower = (question + " " + event_title).lower()
-                        if any(kw in q_lower for kw in ["spread", "cover", "margin", "by more"]):
-                            market_type = "spread"
-                        elif any(kw in q_lower for kw in ["total", "over", "under", "combined"]):
-                            market_type = "total"
-                        else:
-                            market_type = "moneyline"
-
-                        yes_price = None
-                        no_price = None
-                        try:
-                            prices_str = m.get("outcomePrices", "")
-                            if prices_str:
-                                prices = json.loads(prices_str)
-                                if len(prices) >= 2:
-                                    yes_price = round(float(prices[0]) * 100, 1)
-                                    no_price = round(float(prices[1]) * 100, 1)
-                        except (json.JSONDecodeError, ValueError, IndexError):
-                            pass
-
-                        volume = m.get("volume")
-                        if volume is not None:
-                            try:
-                                volume = int(float(volume))
-                            except (ValueError, TypeError):
-                                volume = None
-
-                        open_interest = m.get("liquidity")
-                        if open_interest is not None:
-                            try:
-                                open_interest = int(float(open_interest))
-                            except (ValueError, TypeError):
-                                open_interest = None
-
-                        close_time = m.get("endDate") or m.get("expirationDate") or event.get("endDate")
-                        status = "open" if m.get("active") else "closed"
-
-                        if game_id:
-                            sports_matched += 1
-
-                        display_title = question if question != event_title else event_title
-
-                        rows.append({
-                            "exchange": "polymarket",
-                            "event_id": event_id,
-                            "event_title": display_title,
-                            "contract_ticker": slug,
-                            "market_type": market_type,
-                            "yes_price": yes_price,
-                            "no_price": no_price,
-                            "yes_bid": None,
-                            "yes_ask": None,
-                            "no_bid": None,
-                            "no_ask": None,
-                            "volume": volume,
-                            "open_interest": open_interest,
-                            "last_price": yes_price,
-                            "previous_yes_price": None,
-                            "price_change": None,
-                            "snapshot_time": now,
-                            "mapped_game_id": game_id,
-                            "mapped_sport_key": sport_key,
-                            "expiration_time": close_time,
-                            "status": status,
-                        })
-
-                if len(events) < page_limit:
-                    break
-                offset += page_limit
+                ), None
+            except (requests.RequestException, ValueError) as e:
+                return None, e
+            finally:
+                page_seconds.append(time.monotonic() - started)
+
+        # 2. Fetch pages in concurrent waves; filter, match and insert each wave
+        sync_start = time.monotonic()
+        offset = 0
+        done = False
+        try:
+            with ThreadPoolExecutor(max_workers=EXCHANGE_SYNC_MAX_WORKERS,
+                                    thread_name_prefix="polymarket") as pool:
+                while not done:
+                    offsets = [offset + i * page_limit for i in range(EXCHANGE_SYNC_MAX_WORKERS)]
+                    offset = offsets[-1] + page_limit
+                    for events, error in pool.map(fetch_page, offsets):
+                        if done:
+                            continue
+                        if error is not None:
+                            logger.error(f"[ExchangeTracker] Polymarket API error: {error}")
+                            api_errors += 1
+                            done = True
+                            continue
+                        if not events:
+                            done = True
+                            continue
+
+                        for event in events:
+                            total_events += 1
+                            event_title = event.get("title", "")
+                            tags_raw = event.get("tags", [])
+                            tag_labels = []
+                            if isinstance(tags_raw, list):
+                                for t in tags_raw:
+                                    if isinstance(t, dict):
+                                        tag_labels.append(t.get("label", ""))
+                                    elif isinstance(t, str):
+                                        tag_labels.append(t)
+
+                            if not _is_sports_game_market(event_title, tags=tag_labels, active_team_names=active_team_names):
+                                rejected_events += 1
+                                continue
 
-        except requests.RequestException as e:
-            logger.error(f"[ExchangeTracker] Polymarket API error: {e}")
-            api_errors += 1
+                            game_id, sport_key = self._fuzzy_match_game(event_title)
+                            for m in event.get("markets", []) or []:
+                                if game_id:
+                                    sports_matched += 1
+                                stream.add(self._polymarket_market_row(event, m, game_id, sport_key, now))
 
-        # 3. Calculate price_change from pre-loaded dict
-        for row in rows:
-            prev = prev_prices.get(row["contract_ticker"])
-            if prev is not None and row["yes_price"] is not None:
-                row["previous_yes_price"] = prev
-                row["price_change"] = round(row["yes_price"] - prev, 2)
+                        if len(events) < page_limit:
+                            done = True
+        finally:
+            client.close()
 
-        # 4. Batch insert (chunks of 200, fallback to individual on failure)
-        inserted, insert_errors = self._batch_insert(rows)
+        # 3. Flush the last partial chunk
+        stream.flush()
 
         error_msg = None
-        total_errors = api_errors + insert_errors
+        total_errors = api_errors + stream.errors
         if total_errors:
-            error_msg = f"{api_errors} API + {insert_errors} insert errors"
+            error_msg = f"{api_errors} API + {stream.errors} insert errors"
 
+        fetch_seconds = round(time.monotonic() - sync_start, 2)
         summary = {
-            "markets": inserted,
+            "markets": stream.inserted,
             "matched": sports_matched,
+            **stream.summary(),
             "total_events_scanned": total_events,
             "rejected_events": rejected_events,
             "error": error_msg,
+            "pages": len(page_seconds),
+            "page_seconds_max": round(max(page_seconds, default=0.0), 2),
+            "seconds": fetch_seconds,
         }
         logger.info(
-            f"[ExchangeTracker] Polymarket sync: {inserted} inserted, "
-            f"{sports_matched} matched, {rejected_events}/{total_events} rejected"
+            f"[ExchangeTracker] Polymarket sync: {stream.inserted} inserted, "
+            f"{stream.suppressed} unchanged, "
+            f"{sports_matched} matched, {rejected_events}/{total_events} rejected, "
+            f"{len(page_seconds)} pages in {fetch_seconds}s"
         )
         return summary
 
@@ -13,8 +13,14 @@ from datetime import datetime, timezone, timedelta
 from typing import Optional
 
 from supabase import create_client, Client
+from postgrest.types import CountMethod, ReturnMethod
 from results_tracker import ResultsTracker
 from espn_scores import AutoGrader
+import perf_cache
+from perf_cache import grade_bucket_deltas, summarize_buckets
+from composite_latest import get_latest_composites
+from response_cache import invalidate as invalidate_responses
+from job_executor import checkpoint
 
 SUPABASE_URL = os.getenv("NEXT_PUBLIC_SUPABASE_URL")
 SUPABASE_KEY = os.getenv("NEXT_PUBLIC_SUPABASE_ANON_KEY")
@@ -237,6 +243,7 @@ class InternalGrader:
 
         details = auto_result.get("details", [])
         for detail in details:
+            checkpoint()
             game_id = detail.get("game_id")
             try:
                 count = self._generate_prediction_grades(game_id)
@@ -331,63 +338,108 @@ class InternalGrader:
                 "market_period", "full"
             ).order("snapshot_time", desc=True).execute()
 
-            snapshots = result.data or []
-            books: dict = {}
-            seen: set = set()
-
-            for snap in snapshots:
-                book = snap.get("book_key", "consensus")
-                mtype = snap.get("market_type")
-                outcome = snap.get("outcome_type") or ""  # None → ""
+            return self._parse_book_lines(result.data or [])
+        except Exception as e:
+            logger.error(f"Error getting book lines for {game_id}: {e}")
+            return {}
 
-                if book not in books:
-                    books[book] = {}
+    def _get_book_lines_bulk(self, game_ids: list, chunk_size: int = 25) -> dict:
+        """Batch version of _get_book_lines: {game_id: book_lines}.
 
-                if mtype == "spread":
-                    if "spread" not in books[book]:
-                        books[book]["spread"] = {"line": None, "home_odds": None, "away_odds": None}
-                    key = f"{book}_spread_{outcome}"
-                    if key in seen:
-                        continue
-                    seen.add(key)
-                    if outcome in ("home", ""):
-                        books[book]["spread"]["line"] = snap.get("line", 0)
-                        books[book]["spread"]["home_odds"] = snap.get("odds")
-                    elif outcome == "away":
-                        books[book]["spread"]["away_odds"] = snap.get("odds")
-                        # If no home-perspective line yet, derive from away
-                        if books[book]["spread"]["line"] is None:
-                            books[book]["spread"]["line"] = -snap.get("line", 0)
-
-                elif mtype == "total":
-                    if "total" not in books[book]:
-                        books[book]["total"] = {"line": None, "over_odds": None, "under_odds": None}
-                    key = f"{book}_total_{outcome}"
-                    if key in seen:
-                        continue
-                    seen.add(key)
-                    if outcome in ("over", ""):
-                        books[book]["total"]["line"] = snap.get("line", 0)
-                        books[book]["total"]["over_odds"] = snap.get("odds")
-                    elif outcome == "under":
-                        books[book]["total"]["under_odds"] = snap.get("odds")
+        One paged query per chunk of games instead of one query per game.
+        Rows keep the newest-first order _parse_book_lines relies on. Each
+        chunk is reduced as soon as it is fetched, so only the parsed lines
+        (not the raw snapshot rows) are held across chunks.
+        """
+        lines: dict = {gid: {} for gid in game_ids}
+        for i in range(0, len(game_ids), chunk_size):
+            chunk = game_ids[i:i + chunk_size]
+            try:
+                rows = self._fetch_all(lambda: self.client.table("line_snapshots").select(
+                    "game_id, book_key, market_type, line, odds, outcome_type"
+                ).in_("game_id", chunk).eq(
+                    "market_period", "full"
+                ).order("snapshot_time", desc=True))
+            except Exception as e:
+                logger.error(f"Error bulk-loading book lines for {len(chunk)} games: {e}")
+                continue
+            by_game: dict = {}
+            for row in rows:
+                by_game.setdefault(row.get("game_id"), []).append(row)
+            del rows
+            for gid, snaps in by_game.items():
+                lines[gid] = self._parse_book_lines(snaps)
+        return lines
+
+    def _fetch_all(self, build_query, page_size: int = 1000) -> list:
+        """Run a select built by build_query() page by page until exhausted.
+
+        Avoids PostgREST's max-rows cap silently truncating large reads.
+        """
+        rows: list = []
+        start = 0
+        while True:
+            page = build_query().range(start, start + page_size - 1).execute().data or []
+            rows.extend(page)
+            if len(page) < page_size:
+                return rows
+            start += page_size
 
-                elif mtype == "moneyline":
-                    if "moneyline" not in books[book]:
-                        books[book]["moneyline"] = {"home_odds": None, "away_odds": None}
-                    key = f"{book}_ml_{outcome}"
-                    if key in seen:
-                        continue
-                    seen.add(key)
-                    if outcome == "home":
-                        books[book]["moneyline"]["home_odds"] = snap.get("odds")
-                    elif outcome == "away":
-                        books[book]["moneyline"]["away_odds"] = snap.get("odds")
+    @staticmethod
+    def _parse_book_lines(snapshots: list) -> dict:
+        """Reduce newest-first line_snapshots rows to the latest line per book/market/side."""
+        books: dict = {}
+        seen: set = set()
+        for snap in snapshots:
+            book = snap.get("book_key", "consensus")
+            mtype = snap.get("market_type")
+            outcome = snap.get("outcome_type") or ""  # None → ""
+
+            if book not in books:
+                books[book] = {}
+
+            if mtype == "spread":
+                if "spread" not in books[book]:
+                    books[book]["spread"] = {"line": None, "home_odds": None, "away_odds": None}
+                key = f"{book}_spread_{outcome}"
+                if key in seen:
+                    continue
+                seen.add(key)
+                if outcome in ("home", ""):
+                    books[book]["spread"]["line"] = snap.get("line", 0)
+                    books[book]["spread"]["home_odds"] = snap.get("odds")
+                elif outcome == "away":
+                    books[book]["spread"]["away_odds"] = snap.get("odds")
+                    # If no home-perspective line yet, derive from away
+                    if books[book]["spread"]["line"] is None:
+                        books[book]["spread"]["line"] = -snap.get("line", 0)
+
+            elif mtype == "total":
+                if "total" not in books[book]:
+                    books[book]["total"] = {"line": None, "over_odds": None, "under_odds": None}
+                key = f"{book}_total_{outcome}"
+                if key in seen:
+                    continue
+                seen.add(key)
+                if outcome in ("over", ""):
+                    books[book]["total"]["line"] = snap.get("line", 0)
+                    books[book]["total"]["over_odds"] = snap.get("odds")
+                elif outcome == "under":
+                    books[book]["total"]["under_odds"] = snap.get("odds")
+
+            elif mtype == "moneyline":
+                if "moneyline" not in books[book]:
+                    books[book]["moneyline"] = {"home_odds": None, "away_odds": None}
+                key = f"{book}_ml_{outcome}"
+                if key in seen:
+                    continue
+                seen.add(key)
+                if outcome == "home":
+                    books[book]["moneyline"]["home_odds"] = snap.get("odds")
+                elif outcome == "away":
+                    books[book]["moneyline"]["away_odds"] = snap.get("odds")
 
-            return books
-        except Exception as e:
-            logger.error(f"Error getting book lines for {game_id}: {e}")
-            return {}
+        return books
 
     # ------------------------------------------------------------------
     # Prediction grade generation
@@ -412,6 +464,34 @@ class InternalGrader:
             return 0
 
         game = result.data
+        if not self._is_gradeable(game):
+            return 0
+
+        book_lines = self._get_book_lines(game_id)
+        records, ctx = self._build_prediction_grades(game, book_lines)
+        written = self._insert_prediction_grades(records)
+        rows_created = len(written)
+        if written:
+            self._record_performance_buckets(written, {game_id: self._game_day(game)})
+
+        # Log exchange accuracy comparisons (if exchange data exists for this game)
+        if rows_created > 0:
+            try:
+                ex_logged = self._log_exchange_accuracy(
+                    game_id, ctx["sport_key"], ctx["fair_spread"], ctx["fair_total"],
+                    ctx["final_spread"], ctx["final_total"], book_lines,
+                )
+                if ex_logged > 0:
+                    logger.info(f"[GenGrades] {game_id}: logged {ex_logged} exchange accuracy rows")
+            except Exception as e:
+                logger.warning(f"[GenGrades] Exchange accuracy logging failed for {game_id}: {e}")
+
+        return rows_created
+
+    @staticmethod
+    def _is_gradeable(game: dict) -> bool:
+        """Pre-calibration and score guards shared by live grading and regrade."""
+        gid = game.get("game_id")
 
         # Guard: skip pre-calibration games (model recalibrated Feb 16 2026)
         commence_time = game.get("commence_time")
@@ -420,8 +500,8 @@ class InternalGrader:
                 game_date = datetime.fromisoformat(str(commence_time).replace("Z", "+00:00"))
                 calibration_cutoff = datetime(2026, 2, 16, tzinfo=timezone.utc)
                 if game_date < calibration_cutoff:
-                    logger.info(f"[GenGrades] {game_id}: pre-calibration game ({commence_time}), skipping")
-                    return 0
+                    logger.info(f"[GenGrades] {gid}: pre-calibration game ({commence_time}), skipping")
+                    return False
             except (ValueError, TypeError):
                 pass  # If date parsing fails, proceed with grading
 
@@ -429,8 +509,23 @@ class InternalGrader:
         away_score = game.get("away_score")
 
         if home_score is None or away_score is None:
-            logger.warning(f"[GenGrades] {game_id}: scores missing (home={home_score}, away={away_score})")
-            return 0
+            logger.warning(f"[GenGrades] {gid}: scores missing (home={home_score}, away={away_score})")
+            return False
+
+        return True
+
+    def _build_prediction_grades(self, game: dict, book_lines: dict) -> tuple[list, dict]:
+        """Compute prediction_grades records for one game entirely in memory.
+
+        No database access: callers supply the game_results row and parsed
+        book lines, so regrade_all can batch the reads and writes.
+        Returns (records, context) where context carries the fair/final
+        lines needed for exchange accuracy logging.
+        """
+        game_id = game.get("game_id")
+        home_score = game.get("home_score")
+        away_score = game.get("away_score")
+        graded_at = datetime.now(timezone.utc).isoformat()
 
         sport_key = _normalize_sport(game.get("sport_key", ""))
         raw_composite = game.get("composite_score")
@@ -452,8 +547,6 @@ class InternalGrader:
         closing_ml_home = game.get("closing_ml_home")
         closing_ml_away = game.get("closing_ml_away")
 
-        book_lines = self._get_book_lines(game_id)
-
         # Fallback: if closing lines are missing, derive consensus from
         # the median of available book lines so we can still grade.
         if closing_spread is None or closing_total is None:
@@ -542,7 +635,7 @@ class InternalGrader:
                 f"fair_spread={fair_spread}, fair_total={fair_total}"
             )
 
-        rows_created = 0
+        records: list = []
 
         for book_name, book_data in book_lines.items():
             if book_name not in GRADING_BOOKS:
@@ -597,7 +690,7 @@ class InternalGrader:
                     f"diff={abs(fair_spread - book_spread):.2f} edge_pct={edge_pct}%"
                 )
 
-                if self._upsert_prediction_grade({
+                records.append({
                     "game_id": game_id,
                     "sport_key": sport_key,
                     "market_type": "spread",
@@ -614,9 +707,8 @@ class InternalGrader:
                     "is_correct": is_correct,
                     "pillar_composite": composite,
                     "ceq_score": None,
-                    "graded_at": datetime.now(timezone.utc).isoformat(),
-                }):
-                    rows_created += 1
+                    "graded_at": graded_at,
+                })
 
             # Total
             total_data = book_data.get("total")
@@ -662,7 +754,7 @@ class InternalGrader:
                     f"diff={abs(fair_total - book_total):.2f} edge_pct={edge_pct}%"
                 )
 
-                if self._upsert_prediction_grade({
+                records.append({
                     "game_id": game_id,
                     "sport_key": sport_key,
                     "market_type": "total",
@@ -679,9 +771,8 @@ class InternalGrader:
                     "is_correct": is_correct,
                     "pillar_composite": composite,
                     "ceq_score": None,
-                    "graded_at": datetime.now(timezone.utc).isoformat(),
-                }):
-                    rows_created += 1
+                    "graded_at": graded_at,
+                })
 
             # Moneyline — excluded for basketball/football (35% / -33% ROI across 237 picks).
             # Re-enabled for soccer only (3-way ML is the primary market).
@@ -725,7 +816,7 @@ class InternalGrader:
 
                     gap = fair_hp - book_hp  # positive = home underpriced
 
-                    if self._upsert_prediction_grade({
+                    records.append({
                         "game_id": game_id,
                         "sport_key": sport_key,
                         "market_type": "moneyline",
@@ -742,23 +833,17 @@ class InternalGrader:
                         "is_correct": is_correct,
                         "pillar_composite": composite,
                         "ceq_score": None,
-                        "graded_at": datetime.now(timezone.utc).isoformat(),
-                    }):
-                        rows_created += 1
-
-        # Log exchange accuracy comparisons (if exchange data exists for this game)
-        if rows_created > 0:
-            try:
-                ex_logged = self._log_exchange_accuracy(
-                    game_id, sport_key, fair_spread, fair_total,
-                    final_spread, final_total, book_lines,
-                )
-                if ex_logged > 0:
-                    logger.info(f"[GenGrades] {game_id}: logged {ex_logged} exchange accuracy rows")
-            except Exception as e:
-                logger.warning(f"[GenGrades] Exchange accuracy logging failed for {game_id}: {e}")
+                        "graded_at": graded_at,
+                    })
 
-        return rows_created
+        context = {
+            "sport_key": sport_key,
+            "fair_spread": fair_spread,
+            "fair_total": fair_total,
+            "final_spread": final_spread,
+            "final_total": final_total,
+        }
+        return records, context
 
     def _log_exchange_accuracy(self, game_id: str, sport_key: str,
                                 fair_spread: float, fair_total: float,
@@ -894,6 +979,57 @@ class InternalGrader:
         except Exception as e:
             logger.warning(f"[ExchangeAccuracy] Insert failed: {e}")
 
+    def _insert_prediction_grades(self, records: list, batch_size: int = 500,
+                                  progress: Optional[dict] = None) -> list:
+        """Bulk-insert prediction_grades rows. Returns the records written.
+
+        A failed batch falls back to row-by-row inserts so one bad record
+        doesn't drop its neighbours.
+        """
+        written: list = []
+        for i in range(0, len(records), batch_size):
+            batch = records[i:i + batch_size]
+            try:
+                self.client.table("prediction_grades").insert(batch).execute()
+                written.extend(batch)
+            except Exception as e:
+                logger.warning(f"[GenGrades] Bulk insert of {len(batch)} rows failed ({e}), retrying per row")
+                written.extend(r for r in batch if self._upsert_prediction_grade(r))
+            if progress is not None:
+                progress["grades_created"] = len(written)
+        return written
+
+    @staticmethod
+    def _game_day(game: dict) -> str:
+        """Bucket day for a game: its commence date, else today (UTC)."""
+        commence_time = game.get("commence_time")
+        if commence_time:
+            return str(commence_time)[:10]
+        return datetime.now(timezone.utc).date().isoformat()
+
+    def _record_performance_buckets(self, records: list, day_by_game: dict) -> int:
+        """Increment performance_buckets for newly written grades.
+
+        Keeps the materialized aggregates behind /api/internal/edge/performance
+        in step with prediction_grades. If an increment fails (possibly after
+        earlier batches landed) the buckets are rebuilt from prediction_grades
+        instead. Returns the number of buckets touched.
+        """
+        deltas = grade_bucket_deltas(records, day_by_game)
+        try:
+            for i in range(0, len(deltas), 500):
+                self.client.rpc(
+                    "increment_performance_buckets", {"p_rows": deltas[i:i + 500]}
+                ).execute()
+        except Exception as e:
+            logger.error(f"[PerfBuckets] Failed to increment {len(deltas)} buckets, rebuilding: {e}")
+            perf_cache.rebuild_buckets(self.client)
+            return 0
+        finally:
+            perf_cache.mark_stale()
+            invalidate_responses("grades")
+        return len(deltas)
+
     def _upsert_prediction_grade(self, record: dict) -> bool:
         """Insert a prediction_grades row. Returns True on success."""
         try:
@@ -922,10 +1058,12 @@ class InternalGrader:
         from_date: Optional[str] = None,
         to_date: Optional[str] = None,
     ) -> dict:
-        """Query prediction_grades and aggregate performance metrics.
+        """Aggregate pick-based performance from the performance_buckets store.
 
-        Tries SQL RPC first (get_performance_summary) for speed, falls back
-        to the Python aggregation path if the function doesn't exist yet.
+        Buckets are pre-aggregated per (day, sport, market, tier, signal) as
+        prediction_grades are written (deduplicated per game×market, FanDuel
+        preferred), so any filter combination is a sum over a few hundred
+        rows with no cap on history. Day filters apply to the game date.
         """
         filters = {
             "sport": sport,
@@ -936,210 +1074,9 @@ class InternalGrader:
             "from_date": from_date,
             "to_date": to_date,
         }
-
-        return self._get_performance_python(sport, days, market, confidence_tier, signal, since, filters,
-                                            from_date=from_date, to_date=to_date)
-
-    def _get_performance_python(
-        self,
-        sport: Optional[str],
-        days: int,
-        market: Optional[str],
-        confidence_tier: Optional[int],
-        signal: Optional[str],
-        since: Optional[str],
-        filters: dict,
-        from_date: Optional[str] = None,
-        to_date: Optional[str] = None,
-    ) -> dict:
-        """Aggregate pick-based performance from prediction_grades.
-
-        Uses prediction_grades (pick correctness: did OMI-favored side cover?)
-        NOT prediction_accuracy_log (accuracy: was OMI line closer to result?).
-        Deduplicates per game×market: prefer fanduel, fallback to draftkings.
-        ROI uses actual book_odds for proper payout calculation.
-        """
-        cutoff = (datetime.now(timezone.utc) - timedelta(days=days)).isoformat()
-
-        # Build valid_game_ids from game_results when date filters are active
-        valid_game_ids: Optional[set] = None
-        if since or from_date or to_date:
-            gr_query = self.client.table("game_results").select("game_id").limit(5000)
-            if since:
-                gr_query = gr_query.gte("commence_time", since)
-            if from_date:
-                gr_query = gr_query.gte("commence_time", f"{from_date}T00:00:00+00:00")
-            if to_date:
-                gr_query = gr_query.lte("commence_time", f"{to_date}T23:59:59+00:00")
-            gr_result = gr_query.execute()
-            valid_game_ids = {r["game_id"] for r in (gr_result.data or [])}
-            logger.info(f"[Performance] valid_game_ids (since={since}, from={from_date}, to={to_date}): {len(valid_game_ids)}")
-
-        # Read from prediction_grades — pick correctness source of truth
-        query = self.client.table("prediction_grades").select(
-            "game_id, sport_key, signal, is_correct, "
-            "pillar_composite, market_type, book_name, book_odds, "
-            "confidence_tier, created_at"
-        ).not_.is_("graded_at", "null").gte(
-            "created_at", cutoff
-        ).in_(
-            "book_name", list(GRADING_BOOKS)
-        ).order("created_at", desc=True).limit(5000)
-
-        if sport:
-            query = query.eq("sport_key", sport)
-        if market:
-            query = query.eq("market_type", market)
-        if signal:
-            query = query.eq("signal", signal)
-
-        result = query.execute()
-        raw_rows = result.data or []
-        logger.info(f"[Performance] prediction_grades raw: {len(raw_rows)} rows")
-
-        if valid_game_ids is not None:
-            raw_rows = [r for r in raw_rows if r.get("game_id") in valid_game_ids]
-
-        # Deduplicate per game×market: prefer fanduel, fallback to draftkings.
-        # This prevents double-counting when both FD and DK are graded.
-        dedup: dict = {}  # key: (game_id, market_type)
-        for r in raw_rows:
-            key = (r.get("game_id"), r.get("market_type"))
-            existing = dedup.get(key)
-            if existing is None:
-                dedup[key] = r
-            elif r.get("book_name") == "fanduel" and existing.get("book_name") != "fanduel":
-                dedup[key] = r
-            # else keep existing (already fanduel, or first-seen draftkings)
-
-        rows = list(dedup.values())
-        logger.info(f"[Performance] after dedup: {len(rows)} rows (from {len(raw_rows)} raw)")
-
-        # Normalize sport keys for aggregation
-        for r in rows:
-            r["sport_key"] = _normalize_sport(r.get("sport_key", ""))
-
-        return {
-            "total_predictions": len(rows),
-            "days": days,
-            "filters": filters,
-            "by_confidence_tier": self._aggregate_by_field(rows, "confidence_tier"),
-            "by_market": self._aggregate_by_field(rows, "market_type"),
-            "by_sport": self._aggregate_by_field(rows, "sport_key"),
-            "by_signal": self._aggregate_by_field(rows, "signal"),
-            "by_pillar": self._pillar_performance(rows),
-            "calibration": self._calibration_by_signal(rows),
-        }
-
-    def _aggregate_by_field(self, rows: list, field: str) -> dict:
-        """Aggregate hit rate and ROI by a grouping field.
-
-        ROI uses actual book_odds when available:
-          Win at -110 → profit = 100/110 = +$0.909 per $1 risked
-          Win at +150 → profit = 150/100 = +$1.50 per $1 risked
-          Loss → -$1.00 per $1 risked
-          Push → $0
-        Falls back to flat -110 assumption (0.909 payout) when book_odds missing.
-        """
-        groups: dict = {}
-        for row in rows:
-            key = row.get(field)
-            if key is None:
-                continue
-            key = str(key)
-            if key not in groups:
-                groups[key] = {"total": 0, "correct": 0, "wrong": 0, "push": 0, "profit": 0.0}
-
-            groups[key]["total"] += 1
-            if row.get("is_correct") is True:
-                groups[key]["correct"] += 1
-                # Calculate actual payout from book_odds
-                odds = row.get("book_odds")
-                if odds is not None and odds != 0:
-                    odds = int(odds)
-                    if odds < 0:
-                        payout = 100 / abs(odds)  # e.g. -110 → 0.909
-                    else:
-                        payout = odds / 100  # e.g. +150 → 1.50
-                else:
-                    payout = 100 / 110  # default -110
-                groups[key]["profit"] += payout
-            elif row.get("is_correct") is False:
-                groups[key]["wrong"] += 1
-                groups[key]["profit"] -= 1.0
-            else:
-                groups[key]["push"] += 1
-
-        result = {}
-        for key, data in groups.items():
-            decided = data["correct"] + data["wrong"]
-            hit_rate = data["correct"] / decided if decided > 0 else 0
-            roi = data["profit"] / data["total"] if data["total"] > 0 else 0
-            result[key] = {
-                "total": data["total"],
-                "correct": data["correct"],
-                "wrong": data["wrong"],
-                "push": data["push"],
-                "hit_rate": round(hit_rate, 4),
-                "roi": round(roi, 4),
-            }
-
-        return result
-
-    def _pillar_performance(self, rows: list) -> dict:
-        """Compare average pillar composite for correct vs wrong predictions."""
-        correct_composites = []
-        wrong_composites = []
-
-        for row in rows:
-            comp = row.get("pillar_composite")
-            if comp is None:
-                continue
-            if row.get("is_correct") is True:
-                correct_composites.append(comp)
-            elif row.get("is_correct") is False:
-                wrong_composites.append(comp)
-
-        avg_correct = sum(correct_composites) / len(correct_composites) if correct_composites else 0
-        avg_wrong = sum(wrong_composites) / len(wrong_composites) if wrong_composites else 0
-
-        return {
-            "composite": {
-                "avg_correct": round(avg_correct * 100, 1),
-                "avg_wrong": round(avg_wrong * 100, 1),
-                "correct_count": len(correct_composites),
-                "wrong_count": len(wrong_composites),
-            }
-        }
-
-    def _calibration_by_signal(self, rows: list) -> list:
-        """Calculate calibration: edge signal tier vs actual hit rate.
-        Higher edge tiers should produce higher hit rates if calibrated.
-        """
-        # Map each tier to its expected confidence midpoint
-        tier_order = [
-            ("NO EDGE", 52),    # 50-54% midpoint
-            ("LOW EDGE", 57),   # 55-59% midpoint
-            ("MID EDGE", 63),   # 60-65% midpoint
-            ("HIGH EDGE", 68),  # 66-70% midpoint
-            ("MAX EDGE", 73),   # 71-75% midpoint
-        ]
-        calibration = []
-
-        for tier_name, predicted in tier_order:
-            tier_rows = [r for r in rows if r.get("signal") == tier_name]
-            decided = [r for r in tier_rows if r.get("is_correct") is not None]
-            correct = sum(1 for r in decided if r.get("is_correct") is True)
-            actual_rate = correct / len(decided) * 100 if decided else 0
-
-            calibration.append({
-                "predicted": predicted,
-                "actual": round(actual_rate, 1),
-                "sample_size": len(decided),
-                "tier": tier_name,
-            })
-
-        return calibration
+        buckets = perf_cache.fetch_buckets(self.client, days=days, **filters)
+        logger.info(f"[Performance] {len(buckets)} buckets for filters {filters}")
+        return summarize_buckets(buckets, days, filters)
 
     # ------------------------------------------------------------------
     # Regrade — purge + regenerate all prediction_grades
@@ -1148,6 +1085,13 @@ class InternalGrader:
     def regrade_all(self, progress: Optional[dict] = None) -> dict:
         """Delete all prediction_grades and regenerate from graded game_results.
 
+        Set-based: one bulk delete, game_results and line_snapshots loaded in
+        a few paged/chunked queries, grades computed in memory with the same
+        _build_prediction_grades used by live grading, then bulk inserts.
+        performance_buckets is cleared and rebuilt from the new grades.
+        exchange_accuracy_log is append-only and not purged here, so it is
+        not re-logged (that would duplicate every row per regrade).
+
         If progress dict is provided, updates it in-place for status polling:
           phase, deleted, total_games, games_processed, grades_created, errors
         """
@@ -1156,71 +1100,71 @@ class InternalGrader:
                 progress[key] = val
 
         _update("phase", "purging")
-        deleted = 0
-        while True:
-            batch = self.client.table("prediction_grades").select("id").limit(500).execute()
-            ids = [r["id"] for r in (batch.data or [])]
-            if not ids:
-                break
-            self.client.table("prediction_grades").delete().in_("id", ids).execute()
-            deleted += len(ids)
-            _update("deleted", deleted)
-
-        _update("phase", "regenerating")
-        graded = self.client.table("game_results").select("game_id").not_.is_(
+        deleted = self.client.table("prediction_grades").delete(
+            count=CountMethod.exact, returning=ReturnMethod.minimal
+        ).not_.is_("id", "null").execute().count or 0
+        self.client.table("performance_buckets").delete().gte("day", "0001-01-01").execute()
+        _update("deleted", deleted)
+
+        _update("phase", "loading")
+        games = self._fetch_all(lambda: self.client.table("game_results").select("*").not_.is_(
             "home_score", "null"
-        ).limit(5000).execute()
-        game_ids = [r["game_id"] for r in (graded.data or [])]
+        ).order("game_id"))
+        game_ids = [g["game_id"] for g in games]
         logger.info(f"[Regrade] Found {len(game_ids)} graded game_results to regenerate")
         _update("total_games", len(game_ids))
+        book_lines_by_game = self._get_book_lines_bulk(game_ids)
 
-        created = 0
+        _update("phase", "regenerating")
+        records: list = []
         errors = 0
         zero_count = 0
-        for i, gid in enumerate(game_ids):
+        for i, game in enumerate(games):
+            gid = game["game_id"]
             try:
-                count = self._generate_prediction_grades(gid)
-                created += count
-                if count == 0:
+                built = []
+                if self._is_gradeable(game):
+                    built, _ = self._build_prediction_grades(game, book_lines_by_game.get(gid, {}))
+                records.extend(built)
+                if not built:
                     zero_count += 1
             except Exception as e:
                 logger.error(f"[Regrade] Error for {gid}: {e}")
                 errors += 1
             _update("games_processed", i + 1)
-            _update("grades_created", created)
+            _update("errors", errors)
+
+        _update("phase", "writing")
+        written = self._insert_prediction_grades(records, progress=progress)
+        created = len(written)
+        self._record_performance_buckets(
+            written, {g["game_id"]: self._game_day(g) for g in games}
+        )
+        if created < len(records):
+            errors += len(records) - created
             _update("errors", errors)
 
         # Diagnostic probe: sample first few games to explain why 0 grades
         sample_diagnostics = []
-        if created == 0 and game_ids:
-            for gid in game_ids[:3]:
-                try:
-                    gr = self.client.table("game_results").select(
-                        "game_id, sport_key, home_team, away_team, home_score, away_score, "
-                        "composite_score, closing_spread_home, closing_total_line, "
-                        "closing_ml_home, closing_ml_away"
-                    ).eq("game_id", gid).single().execute()
-                    g = gr.data or {}
-                    raw_comp = g.get("composite_score")
-                    comp = raw_comp if raw_comp is not None and raw_comp > 0 else 0.5
-                    tier = composite_to_confidence_tier(comp)
-                    bl = self._get_book_lines(gid)
-                    sample_diagnostics.append({
-                        "game_id": gid,
-                        "sport": g.get("sport_key"),
-                        "matchup": f"{g.get('away_team')} @ {g.get('home_team')}",
-                        "scores": f"{g.get('home_score')}-{g.get('away_score')}",
-                        "composite_raw": raw_comp,
-                        "composite_used": comp,
-                        "tier": tier,
-                        "closing_spread": g.get("closing_spread_home"),
-                        "closing_total": g.get("closing_total_line"),
-                        "closing_ml": f"{g.get('closing_ml_home')}/{g.get('closing_ml_away')}",
-                        "book_lines_keys": list(bl.keys()) if bl else [],
-                        "grading_books_found": [b for b in bl if b in GRADING_BOOKS] if bl else [],
-                    })
-                except Exception as e:
-                    sample_diagnostics.append({"game_id": gid, "error": str(e)})
+        if created == 0 and games:
+            for g in games[:3]:
+                raw_comp = g.get("composite_score")
+                comp = raw_comp if raw_comp is not None and raw_comp > 0 else 0.5
+                bl = book_lines_by_game.get(g["game_id"], {})
+                sample_diagnostics.append({
+                    "game_id": g["game_id"],
+                    "sport": g.get("sport_key"),
+                    "matchup": f"{g.get('away_team')} @ {g.get('home_team')}",
+                    "scores": f"{g.get('home_score')}-{g.get('away_score')}",
+                    "composite_raw": raw_comp,
+                    "composite_used": comp,
+                    "tier": composite_to_confidence_tier(comp),
+                    "closing_spread": g.get("closing_spread_home"),
+                    "closing_total": g.get("closing_total_line"),
+                    "closing_ml": f"{g.get('closing_ml_home')}/{g.get('closing_ml_away')}",
+                    "book_lines_keys": list(bl.keys()),
+                    "grading_books_found": [b for b in bl if b in GRADING_BOOKS],
+                })
 
         _update("phase", "done")
         logger.info(
@@ -1625,16 +1569,7 @@ class InternalGrader:
         try:
             # 2. Get latest composite_history snapshot per game
             game_ids = list({g["game_id"] for g in games})
-            ch_map: dict = {}
-            for i in range(0, len(game_ids), 50):
-                batch = game_ids[i:i+50]
-                ch = self.client.table("composite_history").select(
-                    "*"
-                ).in_("game_id", batch).order("timestamp", desc=True).execute()
-                for row in (ch.data or []):
-                    gid = row["game_id"]
-                    if gid not in ch_map:
-                        ch_map[gid] = row
+            ch_map: dict = get_latest_composites(game_ids, self.client)
         except Exception as e:
             logger.error(f"[LiveMarkets] Failed to query composite_history: {e}\n{traceback.format_exc()}")
             ch_map = {}
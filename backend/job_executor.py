@@ -0,0 +1,302 @@
+"""
+Scheduler Job Executor
+
+Every scheduled job (and the manual-refresh endpoints that call the same
+run_* functions) executes on one bounded pool of worker threads instead of
+a new thread per run:
+
+- Lanes: each job name maps to a lane (config.JOB_LANES). Queued runs start
+  in lane priority order, live > pregame > analytics, and a lane never
+  holds more than its JOB_LANE_LIMITS share of the JOB_EXECUTOR_WORKERS
+  threads.
+- Skip-if-running: a job that is still queued or running (including one
+  that timed out and is winding down) is not started a second time.
+- Cancellation: when a run exceeds its timeout the caller gets control
+  back and the run is flagged; the job stops with JobCancelled at its next
+  checkpoint(). Long loops (per sport, per game, per page) call
+  checkpoint(), so a timed-out job stops instead of running on in the
+  background next to its successor.
+- Metrics: per-job duration and queue-delay histograms plus p50/p99,
+  reported by stats() for /api/internal/system-health.
+"""
+import itertools
+import logging
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Optional
+
+from config import JOB_DEFAULT_LANE, JOB_EXECUTOR_WORKERS, JOB_LANE_LIMITS, JOB_LANES
+
+logger = logging.getLogger(__name__)
+
+LANE_PRIORITY = {"live": 0, "pregame": 1, "analytics": 2}
+
+# Histogram bucket upper bounds (seconds); anything slower lands in "+Inf"
+_BUCKETS = (0.1, 0.5, 1, 2, 5, 10, 30, 60, 120, 300)
+
+# Rolling window of per-job samples used for percentiles
+_SAMPLE_WINDOW = 500
+
+_local = threading.local()
+
+
+class JobCancelled(BaseException):
+    """Raised by checkpoint() once the running job has been cancelled.
+
+    A BaseException (like asyncio.CancelledError) so the per-sport / per-game
+    `except Exception` handlers inside jobs do not swallow it.
+    """
+
+
+def checkpoint():
+    """Stop the current job here if it has been cancelled (no-op outside jobs)."""
+    run = getattr(_local, "run", None)
+    if run is not None and run.cancel.is_set():
+        raise JobCancelled(run.job_name)
+
+
+class _Run:
+    __slots__ = ("job_name", "lane", "fn", "seq", "submitted_at", "started_at",
+                 "cancel", "started", "done", "result", "error", "status")
+
+    def __init__(self, job_name: str, lane: str, fn: Callable, seq: int):
+        self.job_name = job_name
+        self.lane = lane
+        self.fn = fn
+        self.seq = seq
+        self.submitted_at = time.monotonic()
+        self.started_at: Optional[float] = None
+        self.cancel = threading.Event()
+        self.started = threading.Event()
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.status = "queued"
+
+
+class _Histogram:
+    def __init__(self):
+        self.counts = [0] * (len(_BUCKETS) + 1)
+        self.samples: deque = deque(maxlen=_SAMPLE_WINDOW)
+        self.max = 0.0
+
+    def add(self, seconds: float):
+        i = 0
+        while i < len(_BUCKETS) and seconds > _BUCKETS[i]:
+            i += 1
+        self.counts[i] += 1
+        self.samples.append(seconds)
+        self.max = max(self.max, seconds)
+
+    def _percentile(self, ordered: list, pct: float) -> Optional[float]:
+        if not ordered:
+            return None
+        idx = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+        return round(ordered[idx], 3)
+
+    def snapshot(self) -> dict:
+        ordered = sorted(self.samples)
+        buckets = {f"le_{b}": c for b, c in zip(_BUCKETS, self.counts)}
+        buckets["+Inf"] = self.counts[-1]
+        return {
+            "buckets": buckets,
+            "p50": self._percentile(ordered, 50),
+            "p99": self._percentile(ordered, 99),
+            "max": round(self.max, 3),
+        }
+
+
+def _new_job_metrics() -> dict:
+    return {
+        "counts": {"ok": 0, "error": 0, "cancelled": 0, "timeouts": 0,
+                   "skipped_running": 0, "expired": 0},
+        "duration": _Histogram(),
+        "queue_delay": _Histogram(),
+        "lane": None,
+        "last_status": None,
+        "last_finished_at": None,
+    }
+
+
+class JobExecutor:
+    """Bounded, lane-prioritised pool that runs scheduler jobs."""
+
+    def __init__(self, workers: int = JOB_EXECUTOR_WORKERS, lane_limits: dict = None):
+        self.workers = workers
+        self.lane_limits = dict(lane_limits or JOB_LANE_LIMITS)
+        self._cond = threading.Condition()
+        self._queue: list[_Run] = []
+        self._active: dict[str, _Run] = {}  # job_name -> queued or running run
+        self._lane_running = {lane: 0 for lane in self.lane_limits}
+        self._seq = itertools.count()
+        self._metrics: dict[str, dict] = {}
+        self._threads: list[threading.Thread] = []
+
+    # -----------------------------------------------------------------
+    # Internals (call with self._cond held unless noted)
+    # -----------------------------------------------------------------
+    def _job_metrics(self, job_name: str) -> dict:
+        m = self._metrics.get(job_name)
+        if m is None:
+            m = self._metrics[job_name] = _new_job_metrics()
+        return m
+
+    def _ensure_workers(self):
+        while len(self._threads) < self.workers:
+            t = threading.Thread(target=self._worker, name=f"job-worker-{len(self._threads)}",
+                                 daemon=True)
+            self._threads.append(t)
+            t.start()
+
+    def _next_runnable(self) -> Optional[_Run]:
+        """Highest-priority queued run whose lane has a free slot."""
+        best = None
+        for run in self._queue:
+            if self._lane_running.get(run.lane, 0) >= self.lane_limits.get(run.lane, 1):
+                continue
+            key = (LANE_PRIORITY.get(run.lane, len(LANE_PRIORITY)), run.seq)
+            if best is None or key < best[0]:
+                best = (key, run)
+        if best is None:
+            return None
+        run = best[1]
+        self._queue.remove(run)
+        return run
+
+    def _worker(self):
+        while True:
+            with self._cond:
+                run = self._next_runnable()
+                while run is None:
+                    self._cond.wait()
+                    run = self._next_runnable()
+                self._lane_running[run.lane] = self._lane_running.get(run.lane, 0) + 1
+                run.started_at = time.monotonic()
+                run.status = "running"
+                self._job_metrics(run.job_name)["queue_delay"].add(
+                    run.started_at - run.submitted_at)
+            run.started.set()
+
+            _local.run = run
+            fatal = None
+            try:
+                run.result = run.fn()
+                status = "ok"
+            except JobCancelled:
+                status = "cancelled"
+                logger.warning(f"[JobExecutor] {run.job_name} cancelled after timeout")
+            except Exception as e:
+                run.error = e
+                status = "error"
+            except BaseException as e:
+                # SystemExit / KeyboardInterrupt etc.: finish the bookkeeping
+                # below, then let it end this worker (a new one replaces it)
+                run.error = fatal = e
+                status = "error"
+            finally:
+                _local.run = None
+
+            with self._cond:
+                self._lane_running[run.lane] -= 1
+                if self._active.get(run.job_name) is run:
+                    del self._active[run.job_name]
+                m = self._job_metrics(run.job_name)
+                m["duration"].add(time.monotonic() - run.started_at)
+                m["counts"][status] += 1
+                m["last_status"] = status
+                m["last_finished_at"] = time.time()
+                run.status = status
+                if fatal is not None:
+                    self._threads.remove(threading.current_thread())
+                    self._ensure_workers()
+                self._cond.notify_all()
+            run.done.set()
+            if fatal is not None:
+                logger.error(f"[JobExecutor] {run.job_name} raised {fatal!r}, worker exiting")
+                raise fatal
+
+    # -----------------------------------------------------------------
+    # Public API
+    # -----------------------------------------------------------------
+    def run(self, job_name: str, fn: Callable[[], Any], timeout: float,
+            lane: str = None) -> tuple[str, Any]:
+        """Run fn as job_name and wait for it. Returns (status, result):
+
+        - ("ok", result) when it finished within timeout (errors re-raise)
+        - ("skipped", None) if a run of job_name is still queued or running
+        - ("timeout", None) if it ran past timeout; it is cancelled and
+          stops at its next checkpoint()
+        - ("expired", None) if it could not start within timeout
+
+        Called from inside a running job (nested run_* calls) fn runs
+        inline on the current worker under the parent's cancellation.
+        """
+        if getattr(_local, "run", None) is not None:
+            return "ok", fn()
+
+        lane = lane or JOB_LANES.get(job_name, JOB_DEFAULT_LANE)
+        with self._cond:
+            self._job_metrics(job_name)["lane"] = lane
+            if job_name in self._active:
+                self._job_metrics(job_name)["counts"]["skipped_running"] += 1
+                return "skipped", None
+            run = _Run(job_name, lane, fn, next(self._seq))
+            self._active[job_name] = run
+            self._queue.append(run)
+            self._ensure_workers()
+            self._cond.notify_all()
+
+        if not run.started.wait(timeout):
+            with self._cond:
+                if run.status == "queued":
+                    self._queue.remove(run)
+                    del self._active[job_name]
+                    m = self._job_metrics(job_name)
+                    m["counts"]["expired"] += 1
+                    m["last_status"] = "expired"
+                    return "expired", None
+            # Started just as the wait ran out — fall through and time the run
+
+        if not run.done.wait(max(0.0, timeout - (time.monotonic() - run.started_at))):
+            run.cancel.set()
+            with self._cond:
+                self._job_metrics(job_name)["counts"]["timeouts"] += 1
+            return "timeout", None
+
+        if run.error is not None:
+            raise run.error
+        return "ok", run.result
+
+    def stats(self) -> dict:
+        with self._cond:
+            lanes = {
+                lane: {
+                    "running": self._lane_running.get(lane, 0),
+                    "limit": limit,
+                    "queued": sum(1 for r in self._queue if r.lane == lane),
+                }
+                for lane, limit in self.lane_limits.items()
+            }
+            jobs = {}
+            for name, m in self._metrics.items():
+                active = self._active.get(name)
+                if active is None:
+                    state = "idle"
+                elif active.cancel.is_set():
+                    state = "cancelling"
+                else:
+                    state = active.status
+                jobs[name] = {
+                    "lane": m["lane"],
+                    "state": state,
+                    **m["counts"],
+                    "last_status": m["last_status"],
+                    "last_finished_at": m["last_finished_at"],
+                    "duration_s": m["duration"].snapshot(),
+                    "queue_delay_s": m["queue_delay"].snapshot(),
+                }
+        return {"workers": self.workers, "lanes": lanes, "jobs": jobs}
+
+
+job_executor = JobExecutor()
@@ -0,0 +1,164 @@
+"""
+OMI Edge API Load Test
+
+Simulates N dashboard clients polling the API concurrently and reports
+p50/p95/p99 latency per endpoint. Run it against a server before and after
+a change, save both runs, then compare.
+
+Usage:
+    python load_test.py --base-url http://localhost:8000 --clients 25 --duration 60 --out before.json
+    python load_test.py --base-url http://localhost:8000 --clients 25 --duration 60 --out after.json
+    python load_test.py --compare before.json after.json
+
+Each client loops over the dashboard endpoints with a small random think
+time. Pass --etag to have clients send If-None-Match like a browser would.
+"""
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+
+import httpx
+
+# What the Edge dashboard and arb desk poll
+DEFAULT_ENDPOINTS = [
+    "/api/edges/NBA",
+    "/api/edges/NHL",
+    "/api/active-edges",
+    "/api/internal/edge/live-markets",
+    "/api/internal/edge/live-markets?sport=NBA",
+    "/api/internal/edge/performance?days=30",
+    "/api/internal/edge/graded-games?days=7",
+    "/api/internal/system-health",
+]
+
+
+def _percentile(samples: list, pct: float) -> float | None:
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    idx = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return round(ordered[idx], 1)
+
+
+async def _client_loop(client: httpx.AsyncClient, endpoints: list, deadline: float,
+                       think_ms: int, use_etag: bool, results: dict):
+    etags: dict = {}
+    while time.monotonic() < deadline:
+        path = random.choice(endpoints)
+        headers = {"If-None-Match": etags[path]} if use_etag and path in etags else {}
+        start = time.perf_counter()
+        try:
+            resp = await client.get(path, headers=headers)
+            status = resp.status_code
+            if resp.headers.get("etag"):
+                etags[path] = resp.headers["etag"]
+        except httpx.HTTPError:
+            status = "error"
+        elapsed_ms = (time.perf_counter() - start) * 1000
+
+        r = results.setdefault(path, {"latencies": [], "statuses": {}})
+        r["latencies"].append(elapsed_ms)
+        r["statuses"][str(status)] = r["statuses"].get(str(status), 0) + 1
+
+        if think_ms:
+            await asyncio.sleep(random.uniform(0, think_ms) / 1000)
+
+
+def summarize(results: dict, duration: float) -> dict:
+    """Collapse raw samples into per-endpoint and overall percentiles."""
+    summary = {"endpoints": {}, "duration_seconds": duration}
+    all_latencies = []
+    for path, r in sorted(results.items()):
+        lat = r["latencies"]
+        all_latencies.extend(lat)
+        summary["endpoints"][path] = {
+            "requests": len(lat),
+            "p50_ms": _percentile(lat, 50),
+            "p95_ms": _percentile(lat, 95),
+            "p99_ms": _percentile(lat, 99),
+            "statuses": r["statuses"],
+        }
+    summary["overall"] = {
+        "requests": len(all_latencies),
+        "rps": round(len(all_latencies) / duration, 1) if duration else None,
+        "p50_ms": _percentile(all_latencies, 50),
+        "p95_ms": _percentile(all_latencies, 95),
+        "p99_ms": _percentile(all_latencies, 99),
+    }
+    return summary
+
+
+async def run(base_url: str, clients: int, duration: float, endpoints: list,
+              think_ms: int, use_etag: bool, timeout: float) -> dict:
+    results: dict = {}
+    limits = httpx.Limits(max_connections=clients, max_keepalive_connections=clients)
+    async with httpx.AsyncClient(base_url=base_url, timeout=timeout, limits=limits) as client:
+        deadline = time.monotonic() + duration
+        started = time.monotonic()
+        await asyncio.gather(*[
+            _client_loop(client, endpoints, deadline, think_ms, use_etag, results)
+            for _ in range(clients)
+        ])
+        elapsed = time.monotonic() - started
+    return summarize(results, elapsed)
+
+
+def print_summary(summary: dict, label: str = ""):
+    if label:
+        print(f"=== {label} ===")
+    print(f"{'endpoint':<48} {'n':>6} {'p50':>8} {'p95':>8} {'p99':>8}  statuses")
+    for path, e in summary["endpoints"].items():
+        print(f"{path:<48} {e['requests']:>6} {e['p50_ms']:>8} {e['p95_ms']:>8} {e['p99_ms']:>8}  {e['statuses']}")
+    o = summary["overall"]
+    print(f"{'OVERALL':<48} {o['requests']:>6} {o['p50_ms']:>8} {o['p95_ms']:>8} {o['p99_ms']:>8}  {o['rps']} req/s")
+
+
+def compare(before_path: str, after_path: str):
+    with open(before_path) as f:
+        before = json.load(f)
+    with open(after_path) as f:
+        after = json.load(f)
+    print(f"{'endpoint':<48} {'p50 before':>11} {'p50 after':>10} {'p99 before':>11} {'p99 after':>10}")
+    rows = list(before["endpoints"].keys() | after["endpoints"].keys())
+    for path in sorted(rows) + ["OVERALL"]:
+        b = before["overall"] if path == "OVERALL" else before["endpoints"].get(path, {})
+        a = after["overall"] if path == "OVERALL" else after["endpoints"].get(path, {})
+        print(f"{path:<48} {str(b.get('p50_ms')):>11} {str(a.get('p50_ms')):>10} "
+              f"{str(b.get('p99_ms')):>11} {str(a.get('p99_ms')):>10}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent dashboard load test for the OMI Edge API")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--clients", type=int, default=25)
+    parser.add_argument("--duration", type=float, default=60.0, help="seconds")
+    parser.add_argument("--think-ms", type=int, default=250, help="max random pause between requests")
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--endpoint", action="append", dest="endpoints",
+                        help="path to poll (repeatable); defaults to the dashboard set")
+    parser.add_argument("--etag", action="store_true", help="send If-None-Match on repeat requests")
+    parser.add_argument("--out", help="write the summary JSON here")
+    parser.add_argument("--compare", nargs=2, metavar=("BEFORE", "AFTER"))
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    summary = asyncio.run(run(
+        args.base_url, args.clients, args.duration,
+        args.endpoints or DEFAULT_ENDPOINTS, args.think_ms, args.etag, args.timeout,
+    ))
+    summary["config"] = {"clients": args.clients, "base_url": args.base_url, "etag": args.etag}
+    print_summary(summary, f"{args.clients} clients x {args.duration:.0f}s")
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(summary, f, indent=2)
+        print(f"Saved {args.out}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
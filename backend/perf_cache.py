@@ -1,30 +1,290 @@
 """
 Shared performance cache — populated by scheduler, read by server.py.
 
+Performance is served from the performance_buckets table: pre-aggregated
+pick counts keyed by (day, sport_key, market_type, confidence_tier, signal),
+incremented by InternalGrader as prediction_grades are written. Any filter
+combination on /api/internal/edge/performance is answered by summing the
+matching buckets, so no request ever scans raw prediction_grades rows.
+
 The scheduler calls refresh_performance_cache() every 5 minutes using a
-dedicated Supabase connection, so the /api/internal/edge/performance
-endpoint never needs to touch Supabase at request time.
+dedicated Supabase connection to hold a full in-memory copy of the buckets
+(a few thousand rows), so the endpoint normally never touches Supabase.
+
+Whenever increments can no longer be trusted (grades deleted outside
+regrade_all, an increment RPC failed) the buckets are recomputed from
+prediction_grades with the rebuild_performance_buckets RPC. A rebuild that
+fails is left pending and retried by the next scheduled refresh.
+
+Each refresh also writes the buckets to the warm cache. After a restart the
+first lookup loads that copy if it is younger than WARM_CACHE_PERF_MAX_AGE,
+so the endpoint is served from memory before the first scheduled refresh.
 """
 import os
 import time
 import logging
+from datetime import datetime, timezone, timedelta
+from typing import Optional
+
+from config import WARM_CACHE_PERF_MAX_AGE
+from warm_cache import warm_cache
 
 logger = logging.getLogger(__name__)
 
-# Cache storage: keyed by params tuple string → {"data": dict, "ts": float}
-_perf_cache: dict = {}
+BUCKET_KEY_FIELDS = ("day", "sport_key", "market_type", "confidence_tier", "signal")
+BUCKET_SUM_FIELDS = (
+    "total", "correct", "wrong", "push", "profit",
+    "composite_correct_sum", "composite_correct_n",
+    "composite_wrong_sum", "composite_wrong_n",
+)
+
+# Edge signal tiers and their expected confidence midpoints (calibration)
+CALIBRATION_TIERS = [
+    ("NO EDGE", 52),    # 50-54% midpoint
+    ("LOW EDGE", 57),   # 55-59% midpoint
+    ("MID EDGE", 63),   # 60-65% midpoint
+    ("HIGH EDGE", 68),  # 66-70% midpoint
+    ("MAX EDGE", 73),   # 71-75% midpoint
+]
+
+# In-memory copy of performance_buckets
+_buckets: list = []
+_loaded_at: Optional[float] = None
+_stale = True
+_warm_tried = False
+_rebuild_pending = False
+
+
+def _payout(book_odds) -> float:
+    """Profit per $1 risked on a win at the given American odds.
+
+    Win at -110 → +$0.909, win at +150 → +$1.50.
+    Falls back to flat -110 when book_odds missing.
+    """
+    if book_odds is not None and book_odds != 0:
+        odds = int(book_odds)
+        return 100 / abs(odds) if odds < 0 else odds / 100
+    return 100 / 110
+
+
+def grade_bucket_deltas(records: list, day_by_game: dict) -> list:
+    """Aggregate freshly written prediction_grades rows into bucket increments.
+
+    Deduplicates per game×market first: prefer fanduel, fallback to
+    draftkings, so FD and DK grades of the same pick count once.
+    day_by_game maps game_id → 'YYYY-MM-DD' (game date).
+    """
+    preferred: dict = {}
+    for r in records:
+        key = (r.get("game_id"), r.get("market_type"))
+        existing = preferred.get(key)
+        if existing is None or (
+            r.get("book_name") == "fanduel" and existing.get("book_name") != "fanduel"
+        ):
+            preferred[key] = r
+
+    buckets: dict = {}
+    for r in preferred.values():
+        day = day_by_game.get(r.get("game_id"))
+        if not day:
+            continue
+        bkey = (day, r.get("sport_key") or "", r.get("market_type") or "",
+                int(r.get("confidence_tier") or 0), r.get("signal") or "")
+        b = buckets.get(bkey)
+        if b is None:
+            b = buckets[bkey] = {f: 0 for f in BUCKET_SUM_FIELDS}
+            b.update(zip(BUCKET_KEY_FIELDS, bkey))
+
+        b["total"] += 1
+        comp = r.get("pillar_composite")
+        if r.get("is_correct") is True:
+            b["correct"] += 1
+            b["profit"] += _payout(r.get("book_odds"))
+            if comp is not None:
+                b["composite_correct_sum"] += comp
+                b["composite_correct_n"] += 1
+        elif r.get("is_correct") is False:
+            b["wrong"] += 1
+            b["profit"] -= 1.0
+            if comp is not None:
+                b["composite_wrong_sum"] += comp
+                b["composite_wrong_n"] += 1
+        else:
+            b["push"] += 1
+
+    return list(buckets.values())
+
+
+def filter_buckets(
+    buckets: list,
+    sport: Optional[str] = None,
+    days: int = 30,
+    market: Optional[str] = None,
+    confidence_tier: Optional[int] = None,
+    signal: Optional[str] = None,
+    since: Optional[str] = None,
+    from_date: Optional[str] = None,
+    to_date: Optional[str] = None,
+) -> list:
+    """Select buckets matching the performance endpoint's filters."""
+    start_day, end_day = day_range(days, since, from_date, to_date)
+    out = []
+    for b in buckets:
+        if sport and b["sport_key"] != sport:
+            continue
+        if market and b["market_type"] != market:
+            continue
+        if confidence_tier is not None and int(b["confidence_tier"]) != int(confidence_tier):
+            continue
+        if signal and b["signal"] != signal:
+            continue
+        day = str(b["day"])
+        if day < start_day or (end_day and day > end_day):
+            continue
+        out.append(b)
+    return out
+
+
+def day_range(days: int = 30, since: Optional[str] = None,
+              from_date: Optional[str] = None, to_date: Optional[str] = None) -> tuple:
+    """Resolve filters to an inclusive (start_day, end_day) on the game date."""
+    start_day = (datetime.now(timezone.utc) - timedelta(days=days)).date().isoformat()
+    if since:
+        start_day = max(start_day, since[:10])
+    if from_date:
+        start_day = max(start_day, from_date[:10])
+    return start_day, (to_date[:10] if to_date else None)
+
+
+def summarize_buckets(buckets: list, days: int, filters: dict) -> dict:
+    """Sum buckets into the /api/internal/edge/performance response shape.
+
+    Grades without a signal or confidence tier are bucketed under "" and 0;
+    they count toward every total but get no by_signal / by_confidence_tier
+    group of their own.
+    """
+    def by_field(field: str, missing: str = None) -> dict:
+        groups: dict = {}
+        for b in buckets:
+            key = str(b[field])
+            if key == missing:
+                continue
+            g = groups.setdefault(key, {"total": 0, "correct": 0, "wrong": 0, "push": 0, "profit": 0.0})
+            for f in ("total", "correct", "wrong", "push", "profit"):
+                g[f] += b[f]
+        result = {}
+        for key, g in groups.items():
+            decided = g["correct"] + g["wrong"]
+            result[key] = {
+                "total": g["total"],
+                "correct": g["correct"],
+                "wrong": g["wrong"],
+                "push": g["push"],
+                "hit_rate": round(g["correct"] / decided if decided > 0 else 0, 4),
+                "roi": round(g["profit"] / g["total"] if g["total"] > 0 else 0, 4),
+            }
+        return result
+
+    correct_sum = sum(b["composite_correct_sum"] for b in buckets)
+    correct_n = sum(b["composite_correct_n"] for b in buckets)
+    wrong_sum = sum(b["composite_wrong_sum"] for b in buckets)
+    wrong_n = sum(b["composite_wrong_n"] for b in buckets)
+
+    by_signal = by_field("signal", missing="")
+    calibration = []
+    for tier_name, predicted in CALIBRATION_TIERS:
+        s = by_signal.get(tier_name, {})
+        decided = s.get("correct", 0) + s.get("wrong", 0)
+        calibration.append({
+            "predicted": predicted,
+            "actual": round(s.get("correct", 0) / decided * 100 if decided else 0, 1),
+            "sample_size": decided,
+            "tier": tier_name,
+        })
+
+    return {
+        "total_predictions": sum(b["total"] for b in buckets),
+        "days": days,
+        "filters": filters,
+        "by_confidence_tier": by_field("confidence_tier", missing="0"),
+        "by_market": by_field("market_type"),
+        "by_sport": by_field("sport_key"),
+        "by_signal": by_signal,
+        "by_pillar": {
+            "composite": {
+                "avg_correct": round((correct_sum / correct_n if correct_n else 0) * 100, 1),
+                "avg_wrong": round((wrong_sum / wrong_n if wrong_n else 0) * 100, 1),
+                "correct_count": correct_n,
+                "wrong_count": wrong_n,
+            }
+        },
+        "calibration": calibration,
+    }
 
 
-def get_cached_performance(key: str) -> dict | None:
-    """Return cached performance data if it exists."""
-    entry = _perf_cache.get(key)
-    if entry is not None:
-        return entry["data"]
-    return None
+def fetch_buckets(client, page_size: int = 1000, **filters) -> list:
+    """Read performance_buckets rows (optionally pre-filtered) page by page."""
+    start_day, end_day = day_range(
+        filters.get("days", 30), filters.get("since"),
+        filters.get("from_date"), filters.get("to_date"),
+    ) if filters else ("0001-01-01", None)
+
+    def build():
+        q = client.table("performance_buckets").select(
+            ", ".join(BUCKET_KEY_FIELDS + BUCKET_SUM_FIELDS)
+        ).gte("day", start_day).order("day")
+        if end_day:
+            q = q.lte("day", end_day)
+        if filters.get("sport"):
+            q = q.eq("sport_key", filters["sport"])
+        if filters.get("market"):
+            q = q.eq("market_type", filters["market"])
+        if filters.get("confidence_tier") is not None:
+            q = q.eq("confidence_tier", filters["confidence_tier"])
+        if filters.get("signal"):
+            q = q.eq("signal", filters["signal"])
+        return q
+
+    rows: list = []
+    offset = 0
+    while True:
+        page = build().range(offset, offset + page_size - 1).execute().data or []
+        rows.extend(page)
+        if len(page) < page_size:
+            return rows
+        offset += page_size
+
+
+def mark_stale():
+    """Called after grades are written; lookups fall through until next refresh."""
+    global _stale
+    _stale = True
+    warm_cache.delete("perf")
+
+
+def rebuild_buckets(client) -> bool:
+    """Recompute performance_buckets from prediction_grades.
+
+    On failure the rebuild stays pending for the next scheduled refresh.
+    Returns True if the rebuild ran.
+    """
+    global _rebuild_pending
+    _rebuild_pending = True
+    mark_stale()
+    try:
+        n = client.rpc("rebuild_performance_buckets", {}).execute().data
+    except Exception as e:
+        logger.error(f"[PerfCache] Bucket rebuild failed, retrying on next refresh: {e}")
+        return False
+    _rebuild_pending = False
+    logger.info(f"[PerfCache] Rebuilt performance_buckets ({n} buckets)")
+    return True
 
 
 def refresh_performance_cache():
-    """Called by scheduler every 5 min. Fetches aggregated performance via RPC."""
+    """Called by scheduler every 5 min. Loads every performance bucket,
+    running a pending bucket rebuild first."""
+    global _buckets, _loaded_at, _stale
     try:
         from supabase import create_client
         url = os.getenv("NEXT_PUBLIC_SUPABASE_URL")
@@ -34,59 +294,50 @@ def refresh_performance_cache():
             return
         client = create_client(url, key)
 
-        # Default view: last 30 days, no filters
-        _fetch_and_store(client, "default", {"p_days": 30})
-
-        # Clean data view: since 2026-02-10
-        _fetch_and_store(client, "clean", {
-            "p_days": 30,
-            "p_since": "2026-02-10T00:00:00+00:00",
-        })
-
-        logger.info(f"[PerfCache] Refreshed {len(_perf_cache)} cache entries")
+        if _rebuild_pending and not rebuild_buckets(client):
+            return  # serving drifted buckets would hide the failure
+        _buckets = fetch_buckets(client)
+        _loaded_at = time.time()
+        _stale = False
+        warm_cache.put("perf", "buckets", _buckets)
+        logger.info(f"[PerfCache] Refreshed {len(_buckets)} performance buckets")
     except Exception as e:
         logger.error(f"[PerfCache] Refresh failed: {e}")
 
 
-def _fetch_and_store(client, label: str, params: dict):
-    """Call the RPC and store result."""
-    try:
-        result = client.rpc("get_performance_summary", params).execute()
-        data = result.data
-        if isinstance(data, list) and len(data) == 1:
-            data = data[0]
-        if isinstance(data, dict) and "get_performance_summary" in data:
-            data = data["get_performance_summary"]
-        if isinstance(data, dict) and "total_predictions" in data:
-            data["days"] = params.get("p_days", 30)
-            data["filters"] = {
-                "sport": params.get("p_sport"),
-                "market": params.get("p_market"),
-                "confidence_tier": params.get("p_confidence_tier"),
-                "signal": params.get("p_signal"),
-                "since": params.get("p_since"),
-            }
-            cache_key = _make_key(
-                params.get("p_sport"),
-                params.get("p_days", 30),
-                params.get("p_market"),
-                params.get("p_confidence_tier"),
-                params.get("p_signal"),
-                params.get("p_since"),
-            )
-            _perf_cache[cache_key] = {"data": data, "ts": time.time()}
-            logger.info(f"[PerfCache] {label}: {data['total_predictions']} predictions cached")
-        else:
-            logger.warning(f"[PerfCache] {label}: RPC returned unexpected shape")
-    except Exception as e:
-        logger.warning(f"[PerfCache] {label} fetch failed: {e}")
-
+def _load_warm():
+    """Adopt the warm-cache copy of the buckets once, before the first refresh."""
+    global _buckets, _loaded_at, _stale, _warm_tried
+    _warm_tried = True
+    hit = warm_cache.get("perf", "buckets", WARM_CACHE_PERF_MAX_AGE)
+    if hit is None:
+        return
+    buckets, age = hit
+    _buckets = buckets
+    _loaded_at = time.time() - age
+    _stale = False
+    logger.info(f"[PerfCache] Loaded {len(buckets)} buckets from warm cache ({age:.0f}s old)")
 
-def _make_key(sport=None, days=30, market=None, confidence_tier=None, signal=None, since=None) -> str:
-    return f"perf:{sport}:{days}:{market}:{confidence_tier}:{signal}:{since}"
 
+def lookup(sport=None, days=30, market=None, confidence_tier=None, signal=None, since=None,
+           from_date=None, to_date=None) -> dict | None:
+    """Answer a performance query from the in-memory buckets.
 
-def lookup(sport=None, days=30, market=None, confidence_tier=None, signal=None, since=None) -> dict | None:
-    """Look up cached performance data by filter params."""
-    key = _make_key(sport, days, market, confidence_tier, signal, since)
-    return get_cached_performance(key)
+    Returns None when the buckets haven't been loaded or grades were written
+    since the last refresh, so the caller falls back to InternalGrader.
+    """
+    if _loaded_at is None and not _warm_tried:
+        _load_warm()
+    if _stale or _loaded_at is None:
+        return None
+    filters = {
+        "sport": sport,
+        "market": market,
+        "confidence_tier": confidence_tier,
+        "signal": signal,
+        "since": since,
+        "from_date": from_date,
+        "to_date": to_date,
+    }
+    selected = filter_buckets(_buckets, days=days, **filters)
+    return summarize_buckets(selected, days, filters)
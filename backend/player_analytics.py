@@ -16,6 +16,7 @@ from datetime import datetime, timezone
 
 from player_stats import bdl_client
 from database import db
+from job_executor import checkpoint
 
 logger = logging.getLogger(__name__)
 
@@ -360,6 +361,7 @@ def refresh_active_players(sport_key: str = "basketball_nba") -> dict:
     errors = 0
 
     for row in rows:
+        checkpoint()
         name = row.get("player_name")
         bdl_id = row.get("bdl_player_id")
         expires_at = row.get("expires_at")
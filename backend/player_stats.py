@@ -9,6 +9,8 @@ Fetches NBA player stats for prop analytics:
 - Injury reports
 
 Rate limited to 550 req/min (soft cap under 600/min API limit).
+Responses go through the shared data_sources cache, so repeat lookups for the
+same player within the TTL don't spend rate-limit tokens.
 All errors return None — never crashes the caller.
 """
 import time
@@ -18,6 +20,8 @@ from typing import Optional
 
 import requests
 
+from data_sources.cache import source_cache
+
 logger = logging.getLogger(__name__)
 
 
@@ -56,8 +60,13 @@ class BDLClient:
         self.session = requests.Session()
         self.limiter = _RateLimiter(550)
 
-    def _get(self, path: str, params: Optional[dict] = None) -> Optional[dict]:
-        """Make a rate-limited GET request. Returns JSON or None on failure."""
+    def _get(self, path: str, params: Optional[dict] = None, source: str = "bdl") -> Optional[dict]:
+        """Make a cached, rate-limited GET request. Returns JSON or None on failure."""
+        params = params or {}
+        key = (path, tuple(sorted(params.items())))
+        return source_cache.get_or_fetch(source, key, lambda: self._fetch(path, params))
+
+    def _fetch(self, path: str, params: dict) -> Optional[dict]:
         api_key = _get_api_key()
         if not api_key:
             logger.warning("[BDL] API key not set — skipping request")
@@ -65,7 +74,7 @@ class BDLClient:
         self.limiter.wait()
         url = f"{BDL_BASE}{path}"
         try:
-            resp = self.session.get(url, params=params or {}, timeout=10, headers={"Authorization": api_key})
+            resp = self.session.get(url, params=params, timeout=10, headers={"Authorization": api_key})
             logger.info(f"[BDL] GET {resp.url} -> {resp.status_code}")
             resp.raise_for_status()
             return resp.json()
@@ -187,7 +196,7 @@ class BDLClient:
     # -----------------------------------------------------------------
     def get_injuries(self) -> Optional[list]:
         """Get current injury report."""
-        data = self._get("/player_injuries")
+        data = self._get("/player_injuries", source="bdl_injuries")
         if not data or not data.get("data"):
             return None
         return data["data"]
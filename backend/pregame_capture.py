@@ -18,6 +18,8 @@ from typing import Optional, Dict, List
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from internal_grader import calc_edge_pct, determine_signal
+from composite_latest import get_latest_composites
+from job_executor import checkpoint
 
 logger = logging.getLogger(__name__)
 
@@ -148,6 +150,7 @@ class PregameCapture:
         rows_to_insert = []
 
         for row, game_dt in upcoming:
+            checkpoint()
             gid = row["game_id"]
             sport = row.get("sport_key", "")
             gd = row.get("game_data", {})
@@ -251,25 +254,11 @@ class PregameCapture:
 
     def _fetch_latest_fair_lines(self, game_ids: list) -> dict:
         """Get latest composite_history row per game."""
-        fair_map = {}
-        for i in range(0, len(game_ids), 50):
-            batch = game_ids[i:i + 50]
-            try:
-                result = self.client.table("composite_history").select(
-                    "game_id, fair_spread, fair_total, fair_ml_home, "
-                    "composite_spread, composite_total"
-                ).in_("game_id", batch).order(
-                    "timestamp", desc=True
-                ).limit(len(batch) * 3).execute()
-
-                # Dedup to latest per game_id
-                for row in (result.data or []):
-                    gid = row["game_id"]
-                    if gid not in fair_map:
-                        fair_map[gid] = row
-            except Exception as e:
-                logger.warning(f"[PregameCapture] Fetch composite_history batch failed: {e}")
-        return fair_map
+        try:
+            return get_latest_composites(game_ids, self.client)
+        except Exception as e:
+            logger.warning(f"[PregameCapture] Fetch latest composites failed: {e}")
+            return {}
 
     def _fetch_latest_snapshots(self, game_ids: list) -> dict:
         """Get latest pregame_snapshot per game for dedup."""
@@ -0,0 +1,253 @@
+"""
+Change-Driven Recalculation Queue
+
+Ingestion calls emit() (or observe(), which emits when a value changed)
+whenever something a game's analysis depends on moves:
+- live odds polling: spread line moved
+- pregame odds polling: a team's injury report changed
+- exchange sync: a mapped contract price moved
+
+Events are coalesced per game and handed in batches to one worker thread
+once the game has been quiet for RECALC_DEBOUNCE_SECONDS, or once its
+first pending event is RECALC_MAX_DELAY_SECONDS old. Only affected games
+are recalculated, and a burst of moves costs one recalculation.
+
+Whoever recalculates a game (a queued batch or the scheduled pass) holds
+it with begin()/end() for the duration, so the two never work on the same
+game at once while different games proceed in parallel.
+
+The queue also remembers the book lines each game's last fresh composite
+was computed from (last_inputs), so _should_recalculate can compare
+against them in memory instead of against the newest composite_history
+row (which carry-forward rows keep overwriting with current book lines).
+"""
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Optional
+
+from config import (
+    RECALC_DEBOUNCE_SECONDS, RECALC_MAX_DELAY_SECONDS, RECALC_STATE_TTL_HOURS,
+)
+
+logger = logging.getLogger(__name__)
+
+# How often the worker drops state for games not seen within the TTL
+_PRUNE_INTERVAL = 600
+
+_MISSING = object()
+
+
+@dataclass
+class RecalcEvent:
+    """Pending change events for one game, coalesced."""
+    game_id: str
+    sport_key: str
+    reasons: list = field(default_factory=list)
+    game: Optional[dict] = None  # newest odds payload, if the emitter had one
+    first_at: float = 0.0
+    last_at: float = 0.0
+
+    @property
+    def reason(self) -> str:
+        return ",".join(self.reasons)
+
+
+class RecalcQueue:
+    """Per-game change events, last-seen inputs and the debounced worker."""
+
+    def __init__(self, debounce: float = RECALC_DEBOUNCE_SECONDS,
+                 max_delay: float = RECALC_MAX_DELAY_SECONDS):
+        self.debounce = debounce
+        self.max_delay = max_delay
+        self._pending: dict[str, RecalcEvent] = {}
+        # (game_id, kind) -> (value, seen_at monotonic)
+        self._observed: dict[tuple, tuple] = {}
+        # game_id -> (inputs dict, recorded_at monotonic)
+        self._inputs: dict[str, tuple] = {}
+        # game_ids being recalculated right now (begin/end)
+        self._busy: set = set()
+        self._cond = threading.Condition()
+        self._handler: Optional[Callable[[list], Any]] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = False
+        self._last_prune = time.monotonic()
+        self._metrics = {"emitted": 0, "coalesced": 0, "dispatched": 0,
+                         "claimed": 0, "batches": 0, "handler_errors": 0,
+                         "busy_skips": 0}
+        self._last_batch: Optional[dict] = None
+
+    # -----------------------------------------------------------------
+    # Producers
+    # -----------------------------------------------------------------
+    def emit(self, game_id: str, sport_key: str, reason: str, game: dict = None):
+        """Queue a recalculation of game_id (coalesced with pending events)."""
+        now = time.monotonic()
+        with self._cond:
+            event = self._pending.get(game_id)
+            if event is None:
+                event = self._pending[game_id] = RecalcEvent(
+                    game_id, sport_key, first_at=now,
+                )
+            else:
+                self._metrics["coalesced"] += 1
+            if reason not in event.reasons:
+                event.reasons.append(reason)
+            if game is not None:
+                event.game = game
+            event.last_at = now
+            self._metrics["emitted"] += 1
+            self._cond.notify()
+
+    def observe(self, game_id: str, sport_key: str, kind: str, value,
+                threshold: float = 0.0, game: dict = None):
+        """Record the latest value of one input and emit "<kind>_changed"
+        when it differs from the previous observation (numbers: by more
+        than threshold). Returns the previous value on a change, else None.
+
+        The first observation of a (game, kind), or one where either side is
+        None, only updates the map.
+        """
+        key = (game_id, kind)
+        with self._cond:
+            prev = self._observed.get(key, (_MISSING,))[0]
+            self._observed[key] = (value, time.monotonic())
+        if prev is _MISSING or prev is None or value is None:
+            return None
+        if isinstance(value, (int, float)) and isinstance(prev, (int, float)):
+            changed = abs(value - prev) > threshold
+        else:
+            changed = value != prev
+        if not changed:
+            return None
+        self.emit(game_id, sport_key, f"{kind}_changed", game=game)
+        return prev
+
+    def has_observed(self, game_id: str, kind: str) -> bool:
+        with self._cond:
+            return (game_id, kind) in self._observed
+
+    # -----------------------------------------------------------------
+    # Consumers
+    # -----------------------------------------------------------------
+    def take(self, game_id: str) -> Optional[RecalcEvent]:
+        """Claim a game's pending event for a caller recalculating it now."""
+        with self._cond:
+            event = self._pending.pop(game_id, None)
+            if event is not None:
+                self._metrics["claimed"] += 1
+            return event
+
+    def begin(self, game_id: str) -> bool:
+        """Hold game_id for a recalculation. False if another pass holds it."""
+        with self._cond:
+            if game_id in self._busy:
+                self._metrics["busy_skips"] += 1
+                return False
+            self._busy.add(game_id)
+            return True
+
+    def end(self, game_id: str):
+        """Release a game held with begin()."""
+        with self._cond:
+            self._busy.discard(game_id)
+
+    def record_inputs(self, game_id: str, **inputs):
+        """Remember the inputs a fresh composite for game_id was computed from."""
+        with self._cond:
+            self._inputs[game_id] = (inputs, time.monotonic())
+
+    def last_inputs(self, game_id: str) -> Optional[dict]:
+        with self._cond:
+            entry = self._inputs.get(game_id)
+        return entry[0] if entry is not None else None
+
+    def _take_due(self, now: float) -> tuple[list, Optional[float]]:
+        """Pop events whose game is due; return (due, seconds until next due)."""
+        due, wait = [], None
+        for game_id, event in list(self._pending.items()):
+            ready_at = min(event.last_at + self.debounce, event.first_at + self.max_delay)
+            if ready_at <= now:
+                due.append(self._pending.pop(game_id))
+            else:
+                wait = ready_at - now if wait is None else min(wait, ready_at - now)
+        return due, wait
+
+    def _prune(self, now: float):
+        cutoff = now - RECALC_STATE_TTL_HOURS * 3600
+        self._observed = {k: v for k, v in self._observed.items() if v[1] >= cutoff}
+        self._inputs = {k: v for k, v in self._inputs.items() if v[1] >= cutoff}
+        self._last_prune = now
+
+    # -----------------------------------------------------------------
+    # Worker
+    # -----------------------------------------------------------------
+    def start(self, handler: Callable[[list], Any]):
+        """Run handler(list[RecalcEvent]) on a worker thread as games come due."""
+        with self._cond:
+            self._handler = handler
+            self._stopping = False
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._run, name="recalc-queue", daemon=True)
+            self._thread.start()
+        logger.info(
+            f"[RecalcQueue] Worker started (debounce={self.debounce}s, "
+            f"max_delay={self.max_delay}s)"
+        )
+
+    def stop(self):
+        with self._cond:
+            self._stopping = True
+            self._cond.notify()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while True:
+                    if self._stopping:
+                        return
+                    now = time.monotonic()
+                    if now - self._last_prune >= _PRUNE_INTERVAL:
+                        self._prune(now)
+                    due, wait = self._take_due(now)
+                    if due:
+                        break
+                    self._cond.wait(min(wait, _PRUNE_INTERVAL) if wait is not None else _PRUNE_INTERVAL)
+                handler = self._handler
+
+            start = time.monotonic()
+            ok = True
+            try:
+                handler(due)
+            except Exception as e:
+                ok = False
+                logger.error(f"[RecalcQueue] Handler failed for {len(due)} games: {e}")
+            elapsed = time.monotonic() - start
+            with self._cond:
+                self._metrics["batches"] += 1
+                self._metrics["dispatched"] += len(due)
+                if not ok:
+                    self._metrics["handler_errors"] += 1
+                self._last_batch = {
+                    "games": len(due),
+                    "duration_seconds": round(elapsed, 2),
+                    "max_queue_delay_seconds": round(
+                        max(start - e.first_at for e in due), 1),
+                }
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {
+                **self._metrics,
+                "pending": len(self._pending),
+                "observed_inputs": len(self._observed),
+                "tracked_composites": len(self._inputs),
+                "in_progress": len(self._busy),
+                "worker_alive": self._thread is not None and self._thread.is_alive(),
+                "last_batch": self._last_batch,
+            }
+
+
+recalc_queue = RecalcQueue()
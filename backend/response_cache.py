@@ -0,0 +1,357 @@
+"""
+API Response Cache
+
+One in-process cache for the FastAPI endpoints that dashboards poll, so N
+open tabs cost one Supabase read per TTL instead of N.
+
+- Per-endpoint TTLs from config.RESPONSE_CACHE_TTLS
+- Keyed on endpoint + path + sorted query params
+- Bounded LRU by entry count and total serialized body size
+- Single-flight: concurrent misses for the same key share one computation
+- Bodies are serialized once; each entry carries an ETag and requests with
+  a matching If-None-Match get a 304. Responses are sent with
+  Cache-Control: no-cache, so browsers revalidate every poll instead of
+  reusing a body the server has since invalidated
+- Entries are tagged with the data they depend on ("predictions",
+  "composites", "odds", "grades", "exchange"). The write paths call
+  invalidate(...) (db.save_predictions_batch, db.save_game_snapshots,
+  composite_latest.record_composite, the exchange_data insert, grading),
+  so polling never waits out a full TTL whoever triggered the write.
+  Each tag has a generation counter: a computation that was already running
+  when its tag was invalidated returns its result but does not store it
+
+Responses that are dicts with an "error" key (the server.py convention for
+a soft failure) are returned but never stored.
+"""
+import asyncio
+import functools
+import hashlib
+import inspect
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Iterable, Optional
+
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+
+from config import (
+    RESPONSE_CACHE_TTLS,
+    RESPONSE_CACHE_DEFAULT_TTL,
+    RESPONSE_CACHE_MAX_ENTRIES,
+    RESPONSE_CACHE_MAX_BYTES,
+)
+
+logger = logging.getLogger(__name__)
+
+# How long a coalesced follower waits on the leader's computation
+_INFLIGHT_WAIT_SECONDS = 120.0
+
+_METRIC_FIELDS = ("hits", "misses", "coalesced", "not_modified", "invalidated", "evictions")
+
+
+class CachedResponse:
+    """A computed endpoint result plus its serialized body and ETag."""
+    __slots__ = ("data", "body", "etag", "stored_at", "ttl", "tags")
+
+    def __init__(self, data: Any, ttl: float, tags: frozenset):
+        self.data = data
+        self.body = json.dumps(
+            jsonable_encoder(data), separators=(",", ":"), ensure_ascii=False,
+        ).encode("utf-8")
+        self.etag = '"' + hashlib.sha1(self.body).hexdigest()[:20] + '"'
+        self.stored_at = time.monotonic()
+        self.ttl = ttl
+        self.tags = tags
+
+    def age(self) -> float:
+        return time.monotonic() - self.stored_at
+
+    def cacheable(self) -> bool:
+        return not (isinstance(self.data, dict) and "error" in self.data)
+
+
+class _InFlight:
+    __slots__ = ("done", "entry", "error", "generations")
+
+    def __init__(self, generations: dict):
+        self.done = threading.Event()
+        self.entry: Optional[CachedResponse] = None
+        self.error: Optional[BaseException] = None
+        # {tag: generation} when the computation started
+        self.generations = generations
+
+
+class ResponseCache:
+    """Thread-safe TTL + LRU response cache with single-flight and tags."""
+
+    def __init__(self, max_entries: int = RESPONSE_CACHE_MAX_ENTRIES,
+                 max_bytes: int = RESPONSE_CACHE_MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[tuple, CachedResponse]" = OrderedDict()
+        self._bytes = 0
+        self._inflight: dict[tuple, _InFlight] = {}
+        self._lock = threading.Lock()
+        self._metrics: dict[str, dict[str, int]] = {}
+        # Bumped by invalidate(); one counter per tag name
+        self._generations: dict[str, int] = {}
+
+    # -----------------------------------------------------------------
+    # Internals (call with self._lock held)
+    # -----------------------------------------------------------------
+    def _count(self, endpoint: str, field: str, n: int = 1):
+        m = self._metrics.get(endpoint)
+        if m is None:
+            m = self._metrics[endpoint] = {f: 0 for f in _METRIC_FIELDS}
+        m[field] += n
+
+    def _drop(self, full_key: tuple):
+        entry = self._entries.pop(full_key, None)
+        if entry is not None:
+            self._bytes -= len(entry.body)
+
+    def _store(self, full_key: tuple, entry: CachedResponse):
+        if len(entry.body) > self.max_bytes:
+            return
+        self._drop(full_key)
+        self._entries[full_key] = entry
+        self._bytes += len(entry.body)
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            evicted_key, evicted = self._entries.popitem(last=False)
+            self._bytes -= len(evicted.body)
+            self._count(evicted_key[0], "evictions")
+
+    def _claim(self, full_key: tuple,
+               tags: frozenset) -> tuple[Optional[CachedResponse], Optional[_InFlight], bool]:
+        """Return (fresh_entry, flight, is_leader)."""
+        with self._lock:
+            endpoint = full_key[0]
+            entry = self._entries.get(full_key)
+            if entry is not None:
+                if entry.age() < entry.ttl:
+                    self._entries.move_to_end(full_key)
+                    self._count(endpoint, "hits")
+                    return entry, None, False
+                self._drop(full_key)
+
+            flight = self._inflight.get(full_key)
+            if flight is not None:
+                self._count(endpoint, "coalesced")
+                return None, flight, False
+            flight = self._inflight[full_key] = _InFlight(
+                {t: self._generations.get(t, 0) for t in tags}
+            )
+            self._count(endpoint, "misses")
+            return None, flight, True
+
+    def _finish(self, full_key: tuple, flight: _InFlight,
+                entry: Optional[CachedResponse], error: Optional[BaseException]):
+        with self._lock:
+            if entry is not None and entry.cacheable():
+                if all(self._generations.get(t, 0) == g for t, g in flight.generations.items()):
+                    self._store(full_key, entry)
+                else:
+                    # A write invalidated a tag mid-computation: result predates it
+                    self._count(full_key[0], "invalidated")
+            self._inflight.pop(full_key, None)
+        flight.entry = entry
+        flight.error = error
+        flight.done.set()
+
+    def _ttl_for(self, endpoint: str, ttl: Optional[float]) -> float:
+        if ttl is not None:
+            return ttl
+        return RESPONSE_CACHE_TTLS.get(endpoint, RESPONSE_CACHE_DEFAULT_TTL)
+
+    def _follow(self, full_key: tuple, flight: _InFlight) -> CachedResponse:
+        if flight.error is not None:
+            raise flight.error
+        if flight.entry is None:
+            raise TimeoutError(f"Timed out waiting on in-flight response for {full_key}")
+        return flight.entry
+
+    # -----------------------------------------------------------------
+    # Public API
+    # -----------------------------------------------------------------
+    def get_or_compute(self, endpoint: str, key: Hashable, compute: Callable[[], Any],
+                       ttl: Optional[float] = None, tags: Iterable[str] = ()) -> CachedResponse:
+        """Return the cached response for (endpoint, key), computing it on miss."""
+        full_key = (endpoint, key)
+        tags = frozenset(tags)
+        entry, flight, is_leader = self._claim(full_key, tags)
+        if entry is not None:
+            return entry
+
+        if is_leader:
+            entry, error = None, None
+            try:
+                entry = CachedResponse(compute(), self._ttl_for(endpoint, ttl), tags)
+            except BaseException as e:
+                error = e
+            self._finish(full_key, flight, entry, error)
+        else:
+            flight.done.wait(_INFLIGHT_WAIT_SECONDS)
+        return self._follow(full_key, flight)
+
+    async def get_or_compute_async(self, endpoint: str, key: Hashable,
+                                   compute: Callable[[], Any],
+                                   ttl: Optional[float] = None,
+                                   tags: Iterable[str] = ()) -> CachedResponse:
+        """Async variant: `compute` returns an awaitable."""
+        full_key = (endpoint, key)
+        tags = frozenset(tags)
+        entry, flight, is_leader = self._claim(full_key, tags)
+        if entry is not None:
+            return entry
+
+        if is_leader:
+            entry, error = None, None
+            try:
+                entry = CachedResponse(await compute(), self._ttl_for(endpoint, ttl), tags)
+            except BaseException as e:
+                error = e
+            self._finish(full_key, flight, entry, error)
+        else:
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(None, flight.done.wait, _INFLIGHT_WAIT_SECONDS)
+        return self._follow(full_key, flight)
+
+    def put(self, endpoint: str, key: Hashable, data: Any,
+            ttl: Optional[float] = None, tags: Iterable[str] = ()) -> CachedResponse:
+        """Store a freshly computed value (e.g. after a forced refresh)."""
+        entry = CachedResponse(data, self._ttl_for(endpoint, ttl), frozenset(tags))
+        if entry.cacheable():
+            with self._lock:
+                self._store((endpoint, key), entry)
+        return entry
+
+    def record_not_modified(self, endpoint: str):
+        with self._lock:
+            self._count(endpoint, "not_modified")
+
+    def invalidate(self, *tags: str) -> int:
+        """Drop every entry tagged with any of `tags` and bump their
+        generations, so in-flight computations for them are not stored.
+        Returns entries dropped."""
+        wanted = set(tags)
+        with self._lock:
+            for tag in wanted:
+                self._generations[tag] = self._generations.get(tag, 0) + 1
+            doomed = [k for k, e in self._entries.items() if e.tags & wanted]
+            for full_key in doomed:
+                self._drop(full_key)
+                self._count(full_key[0], "invalidated")
+        if doomed:
+            logger.info(f"[ResponseCache] Invalidated {len(doomed)} entries for {sorted(wanted)}")
+        return len(doomed)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict:
+        """Per-endpoint counters plus overall size and hit rate."""
+        with self._lock:
+            sizes: dict[str, int] = {}
+            for endpoint, _ in self._entries:
+                sizes[endpoint] = sizes.get(endpoint, 0) + 1
+            endpoints = {}
+            total_served = total_lookups = 0
+            for endpoint, m in sorted(self._metrics.items()):
+                served = m["hits"] + m["coalesced"]
+                lookups = served + m["misses"]
+                total_served += served
+                total_lookups += lookups
+                endpoints[endpoint] = {
+                    **m,
+                    "entries": sizes.get(endpoint, 0),
+                    "ttl_seconds": self._ttl_for(endpoint, None),
+                    "hit_rate": round(served / lookups, 3) if lookups else None,
+                }
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "inflight": len(self._inflight),
+                "hit_rate": round(total_served / total_lookups, 3) if total_lookups else None,
+                "endpoints": endpoints,
+            }
+
+
+response_cache = ResponseCache()
+
+
+def invalidate(*tags: str) -> int:
+    """Write-path hook: drop cached responses that depend on `tags`."""
+    return response_cache.invalidate(*tags)
+
+
+def _request_key(request: Request) -> tuple:
+    return (request.url.path, tuple(sorted(request.query_params.multi_items())))
+
+
+def _to_response(entry: CachedResponse, request: Request, endpoint: str) -> Response:
+    headers = {
+        "ETag": entry.etag,
+        "Cache-Control": "private, no-cache",
+    }
+    inm = request.headers.get("if-none-match")
+    if inm and entry.etag in {t.strip() for t in inm.split(",")}:
+        response_cache.record_not_modified(endpoint)
+        return Response(status_code=304, headers=headers)
+    return Response(content=entry.body, media_type="application/json", headers=headers)
+
+
+def cache_response(endpoint: str, ttl: Optional[float] = None, tags: Iterable[str] = ()):
+    """Decorator for FastAPI endpoints: cache the JSON response.
+
+    Place it below @app.get. The wrapped endpoint keeps its signature (plus
+    an injected Request), so query/path params and Depends() still resolve
+    before the cache is consulted. HTTPExceptions propagate uncached.
+    """
+    tags = frozenset(tags)
+
+    def decorator(func):
+        sig = inspect.signature(func)
+        request_param = next(
+            (p.name for p in sig.parameters.values() if p.annotation is Request), None
+        )
+        injected = request_param is None
+        if injected:
+            request_param = "_cache_request"
+            sig = sig.replace(parameters=[
+                *sig.parameters.values(),
+                inspect.Parameter(request_param, inspect.Parameter.KEYWORD_ONLY, annotation=Request),
+            ])
+
+        def split(kwargs: dict) -> Request:
+            return kwargs.pop(request_param) if injected else kwargs[request_param]
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                request = split(kwargs)
+                entry = await response_cache.get_or_compute_async(
+                    endpoint, _request_key(request),
+                    lambda: func(*args, **kwargs), ttl, tags,
+                )
+                return _to_response(entry, request, endpoint)
+            async_wrapper.__signature__ = sig
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            request = split(kwargs)
+            entry = response_cache.get_or_compute(
+                endpoint, _request_key(request),
+                lambda: func(*args, **kwargs), ttl, tags,
+            )
+            return _to_response(entry, request, endpoint)
+        wrapper.__signature__ = sig
+        return wrapper
+    return decorator
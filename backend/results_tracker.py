@@ -21,6 +21,12 @@ ODDS_API_SPORTS = {
     "NCAAB": "basketball_ncaab",
 }
 
+# Columns grade_record() fills in
+_GRADE_FIELDS = (
+    "home_score", "away_score", "final_spread", "final_total", "winner",
+    "spread_result", "ml_result", "total_result", "best_bet_result", "graded_at",
+)
+
 class ResultsTracker:
     def __init__(self):
         if not SUPABASE_URL or not SUPABASE_KEY:
@@ -151,7 +157,55 @@ class ResultsTracker:
             return None
         
         record = result.data
+        update = self.grade_record(record, home_score, away_score)
+        self.client.table("game_results").update(update).eq("game_id", game_id).execute()
+        print(f"[Results] Graded {game_id}: spread={update['spread_result']}, ml={update['ml_result']}, total={update['total_result']}, best={update['best_bet_result']}")
         
+        return {**record, **update}
+
+    def grade_games_bulk(self, graded: list[tuple], chunk_size: int = 200) -> tuple[list[dict], list[str]]:
+        """
+        Grade many game_results records in a few writes.
+
+        Args:
+            graded: (game_results record, home_score, away_score) tuples, with
+                    the records as read from game_results (select "*")
+
+        Returns:
+            (graded rows, game_ids that failed to write)
+        """
+        rows = []
+        for record, home_score, away_score in graded:
+            rows.append({**record, **self.grade_record(record, home_score, away_score)})
+
+        written, failed = [], []
+        for i in range(0, len(rows), chunk_size):
+            chunk = rows[i:i + chunk_size]
+            # Only the graded columns are sent, so the upsert updates exactly
+            # what grade_game's update() would and leaves the rest untouched
+            payload = [
+                {"game_id": row["game_id"], "sport_key": row["sport_key"],
+                 **{k: row[k] for k in _GRADE_FIELDS}}
+                for row in chunk
+            ]
+            try:
+                self.client.table("game_results").upsert(payload, on_conflict="game_id").execute()
+                written.extend(chunk)
+            except Exception as e:
+                print(f"[Results] Bulk grade write failed ({len(chunk)} rows), falling back to individual: {e}")
+                for row in chunk:
+                    update = {k: row[k] for k in _GRADE_FIELDS}
+                    try:
+                        self.client.table("game_results").update(update).eq("game_id", row["game_id"]).execute()
+                        written.append(row)
+                    except Exception as e2:
+                        print(f"[Results] Grade write failed for {row['game_id']}: {e2}")
+                        failed.append(row["game_id"])
+        print(f"[Results] Bulk graded {len(written)} games ({len(failed)} failed)")
+        return written, failed
+
+    def grade_record(self, record: dict, home_score: int, away_score: int) -> dict:
+        """Compute the grading update for one game_results record (no writes)."""
         # Calculate actuals
         final_spread = home_score - away_score  # positive = home won by X
         final_total = home_score + away_score
@@ -243,11 +297,7 @@ class ResultsTracker:
             "best_bet_result": best_bet_result,
             "graded_at": datetime.now(timezone.utc).isoformat(),
         }
-        
-        self.client.table("game_results").update(update).eq("game_id", game_id).execute()
-        print(f"[Results] Graded {game_id}: spread={spread_result}, ml={ml_result}, total={total_result}, best={best_bet_result}")
-        
-        return {**record, **update}
+        return update
     
     def get_recent_results(self, limit: int = 50, sport: Optional[str] = None) -> list:
         """Get recent graded games."""
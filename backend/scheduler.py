@@ -22,12 +22,17 @@ from apscheduler.triggers.cron import CronTrigger
 from config import (
     ODDS_API_SPORTS, OUTDOOR_SPORTS, NFL_STADIUMS,
     PREGAME_POLL_INTERVAL_MINUTES, LIVE_POLL_INTERVAL_MINUTES,
-    LIVE_PROPS_PER_QUARTER, OPEN_METEO_BASE, PROPS_ENABLED, PROP_MARKETS
+    LIVE_PROPS_PER_QUARTER, OPEN_METEO_BASE, PROPS_ENABLED, PROP_MARKETS,
+    RECALC_JOB_TIMEOUT_SECONDS,
 )
 from data_sources.odds_api import odds_client
+from data_sources.cache import pillar_memo
 from engine import analyze_all_games
 from database import db
 from internal_grader import InternalGrader
+from response_cache import invalidate as invalidate_responses
+from recalc_queue import recalc_queue
+from job_executor import job_executor, checkpoint
 from accuracy_tracker import AccuracyTracker
 
 logger = logging.getLogger(__name__)
@@ -89,30 +94,23 @@ def _check_paused(job_name: str) -> bool:
 
 
 def _run_with_timeout(fn, job_name: str, timeout: int = 30):
-    """Run fn in a thread with a timeout. If it exceeds timeout, log and move on.
+    """Run fn as job_name on the job executor (lane from config.JOB_LANES).
+    Returns {"skipped": "already_running"} while a previous run is still
+    queued or running. On timeout the run is cancelled at its next
+    checkpoint() and the caller moves on with None.
     Always sleeps 1s after completion to give API endpoints a window for Supabase calls."""
-    import threading
-    result = [None]
-    error = [None]
-
-    def _target():
-        try:
-            result[0] = fn()
-        except Exception as e:
-            error[0] = e
-
-    t = threading.Thread(target=_target, daemon=True)
-    t.start()
-    t.join(timeout=timeout)
-    if t.is_alive():
-        logger.warning(f"[Scheduler] {job_name} TIMED OUT after {timeout}s — moving on")
+    status, result = job_executor.run(job_name, fn, timeout)
+    if status == "skipped":
+        logger.info(f"[Scheduler] {job_name} skipped — previous run still active")
+        return {"skipped": "already_running"}
+    if status in ("timeout", "expired"):
+        verb = "TIMED OUT" if status == "timeout" else "could not start"
+        logger.warning(f"[Scheduler] {job_name} {verb} within {timeout}s — cancelling, moving on")
         time.sleep(1)
         return None
     # 1s gap between jobs — lets API endpoint threads grab a Supabase connection
     time.sleep(1)
-    if error[0] is not None:
-        raise error[0]
-    return result[0]
+    return result
 
 
 # =============================================================================
@@ -304,12 +302,14 @@ def _pregame_cycle_inner() -> dict:
         "total_snapshots": 0,
         "total_props": 0,
         "weather_fetched": 0,
+        "injury_recalcs_queued": 0,
         "errors": []
     }
     
     for sport in ODDS_API_SPORTS.keys():
         if sport not in ACTIVE_SPORTS:
             continue
+        checkpoint()
         try:
             logger.info(f"[PREGAME] Processing {sport}...")
 
@@ -324,8 +324,15 @@ def _pregame_cycle_inner() -> dict:
             # Save line snapshots
             snapshots_saved = 0
             for game in games:
+                checkpoint()
                 snapshots_saved += db.save_game_snapshots(game, sport)
             results["total_snapshots"] += snapshots_saved
+
+            # Queue recalcs for games whose injury reports changed since the last poll
+            try:
+                results["injury_recalcs_queued"] += _observe_injuries(games, sport)
+            except Exception as e:
+                logger.warning(f"[PREGAME] Injury change check failed for {sport}: {e}")
             
             # Fetch and save props
             props_saved = 0
@@ -407,39 +414,164 @@ def run_pregame_cycle() -> dict:
 # =============================================================================
 
 def _detect_line_movement(game: dict, sport: str) -> list[dict]:
-    """Detect significant line movements (>0.5 pts spread/total, >10 ML) for a game.
-    Returns list of movements with game_id, market_type, old_line, new_line, diff."""
-    from engine.analyzer import fetch_line_context
+    """Detect significant line movements (>0.5 pts spread) for a game against
+    the last line seen for it, and queue a recalc for each one.
+    Returns list of movements with game_id, market_type, old_line, new_line, diff.
+
+    The last line lives in recalc_queue's observed inputs; the database
+    (fetch_line_context) is only read the first time this process sees a game.
+    """
     parsed = odds_client.parse_game_odds(game)
     game_id = parsed["game_id"]
     movements = []
 
-    line_ctx = fetch_line_context(game_id, sport)
-    prev_line = line_ctx.get("current_line")
+    if not recalc_queue.has_observed(game_id, "spread"):
+        from engine.analyzer import fetch_line_context
+        line_ctx = fetch_line_context(game_id, sport)
+        recalc_queue.observe(game_id, sport, "spread", line_ctx.get("current_line"))
 
     # Check spread movement
     for book_key, markets in parsed.get("bookmakers", {}).items():
         spread = markets.get("spreads", {}).get("home", {})
-        if spread and prev_line is not None:
+        if spread:
             new_line = spread.get("line")
             if new_line is not None:
-                diff = abs(new_line - prev_line)
-                if diff > 0.5:
+                prev_line = recalc_queue.observe(
+                    game_id, sport, "spread", new_line, threshold=0.5, game=game,
+                )
+                if prev_line is not None:
                     movements.append({
                         "game_id": game_id, "market": "spread", "book": book_key,
-                        "old": prev_line, "new": new_line, "diff": diff
+                        "old": prev_line, "new": new_line, "diff": abs(new_line - prev_line)
                     })
                 break  # Only check one book for movement trigger
     return movements
 
 
-def _live_cycle_inner() -> dict:
-    """Inner live cycle logic."""
-    from engine import analyze_all_games
+def _recalc_live_game(game: dict, sport: str) -> bool:
+    """Fresh analysis + prediction for one live game whose line moved."""
     from engine.analyzer import analyze_game, fetch_line_context
 
+    game_id = odds_client.parse_game_odds(game)["game_id"]
+    try:
+        line_ctx = fetch_line_context(game_id, sport)
+        old_pred = db.get_prediction(game_id, sport)
+        old_composite = old_pred.get("composite", 0) if old_pred else 0
+
+        analysis = analyze_game(
+            game, sport,
+            opening_line=line_ctx.get("opening_line"),
+            line_snapshots=line_ctx.get("line_snapshots")
+        )
+        db.save_predictions_batch([analysis])
+        new_composite = analysis.get("composite", 0)
+        logger.info(
+            f"RECALC COMPLETE for game {game_id}: "
+            f"new composite = {new_composite:.3f}, old = {old_composite:.3f}"
+        )
+        return True
+    except Exception as e:
+        logger.error(f"[LIVE] Recalc failed for game {game_id}: {e}")
+        return False
+
+
+def _process_recalc_events(events: list) -> dict:
+    """recalc_queue handler: recalculate only the games that changed.
+
+    Events carrying an odds payload came from live polling and get a fresh
+    live analysis (job "recalc_queue_live", live lane); the rest (injury /
+    exchange changes) go through CompositeTracker for just those games (job
+    "recalc_queue", pregame lane). Games are held per game with
+    recalc_queue.begin(), so a batch never waits on a whole scheduled pass.
+    """
+    live = [e for e in events if e.game is not None]
+    queued = [e for e in events if e.game is None]
+    result = {"live_recalcs": 0, "composites": 0}
+
+    if live:
+        result["live_recalcs"] = _run_recalc_batch("recalc_queue_live", _recalc_live_events, live)
+    if queued:
+        result["composites"] = _run_recalc_batch("recalc_queue", _recalc_composites, queued)
+
+    if result["live_recalcs"] or result["composites"]:
+        invalidate_responses("predictions", "composites")
+    logger.info(f"[RecalcQueue] Processed {len(events)} changed games: {result}")
+    return result
+
+
+def _run_recalc_batch(job_name: str, fn, events: list) -> int:
+    """Run fn(events) as job_name on the job executor. Events of a batch
+    that times out, is skipped or never starts are queued again."""
+    status, result = job_executor.run(job_name, lambda: fn(events), RECALC_JOB_TIMEOUT_SECONDS)
+    if status == "ok":
+        return result
+    logger.warning(f"[RecalcQueue] {job_name} batch of {len(events)} games {status} — re-queueing")
+    for e in events:
+        for reason in e.reasons:
+            recalc_queue.emit(e.game_id, e.sport_key, reason, e.game)
+    return 0
+
+
+def _recalc_live_events(events: list) -> int:
+    done = 0
+    for event in events:
+        checkpoint()
+        if not recalc_queue.begin(event.game_id):
+            # Being recalculated by another pass — run again after it
+            recalc_queue.emit(event.game_id, event.sport_key, event.reason, event.game)
+            continue
+        try:
+            logger.info(f"RECALC TRIGGERED for game {event.game_id}: {event.reason}")
+            if _recalc_live_game(event.game, event.sport_key):
+                done += 1
+        finally:
+            recalc_queue.end(event.game_id)
+    return done
+
+
+def _recalc_composites(events: list) -> int:
+    from composite_tracker import CompositeTracker
+    reasons = {e.game_id: e.reason for e in events}
+    summary = CompositeTracker().recalculate_all(game_ids=list(reasons), reasons=reasons)
+    return summary.get("recalculated", 0)
+
+
+def _observe_injuries(games: list[dict], sport: str) -> int:
+    """Queue a recalc for games whose teams' injury reports changed.
+    Returns the number of games queued."""
+    from data_sources.espn import espn_client
+    from espn_scores import teams_match
+
+    by_team: dict[str, set] = {}
+    for inj in espn_client.get_injuries(sport):
+        if inj.get("team_name"):
+            by_team.setdefault(inj["team_name"], set()).add(
+                (inj.get("player_name"), inj.get("status"))
+            )
+
+    queued = 0
+    for game in games:
+        game_id = game.get("id")
+        if not game_id:
+            continue
+        report = []
+        for team in (game.get("home_team", ""), game.get("away_team", "")):
+            entries = set()
+            for espn_team, players in by_team.items():
+                if teams_match(espn_team, team):
+                    entries |= players
+            report.append(frozenset(entries))
+        if recalc_queue.observe(game_id, sport, "injuries", tuple(report)) is not None:
+            queued += 1
+    return queued
+
+
+def _live_cycle_inner() -> dict:
+    """Inner live cycle logic. Line moves are queued on recalc_queue; its
+    worker runs the recalculation once the game's line settles."""
     start_time = datetime.now(timezone.utc)
     logger.info(f"Starting LIVE cycle at {start_time.isoformat()}")
+    memo_before = pillar_memo.counters()
 
     results = {
         "type": "live",
@@ -447,7 +579,7 @@ def _live_cycle_inner() -> dict:
         "sports": {},
         "total_live_games": 0,
         "total_snapshots": 0,
-        "recalcs_triggered": 0,
+        "recalcs_queued": 0,
         "errors": []
     }
 
@@ -462,51 +594,32 @@ def _live_cycle_inner() -> dict:
             logger.info(f"[LIVE] Found {len(live_games)} live games for {sport}")
 
             snapshots_saved = 0
-            recalcs = 0
+            queued = 0
             for game in live_games:
+                checkpoint()
                 # Detect line movement BEFORE saving new snapshots
                 movements = _detect_line_movement(game, sport)
 
                 # Save snapshots
                 snapshots_saved += db.save_game_snapshots(game, sport)
 
-                # If significant movement detected, trigger recalculation
+                for mv in movements:
+                    logger.info(
+                        f"RECALC QUEUED for game {mv['game_id']}: "
+                        f"{mv['market']} line moved from {mv['old']} to {mv['new']} "
+                        f"(diff={mv['diff']:.1f}, book={mv['book']})"
+                    )
                 if movements:
-                    for mv in movements:
-                        logger.info(
-                            f"RECALC TRIGGERED for game {mv['game_id']}: "
-                            f"{mv['market']} line moved from {mv['old']} to {mv['new']} "
-                            f"(diff={mv['diff']:.1f}, book={mv['book']})"
-                        )
-                    try:
-                        game_id = movements[0]["game_id"]
-                        line_ctx = fetch_line_context(game_id, sport)
-                        old_pred = db.get_prediction(game_id, sport)
-                        old_composite = old_pred.get("composite", 0) if old_pred else 0
-
-                        analysis = analyze_game(
-                            game, sport,
-                            opening_line=line_ctx.get("opening_line"),
-                            line_snapshots=line_ctx.get("line_snapshots")
-                        )
-                        db.save_predictions_batch([analysis])
-                        new_composite = analysis.get("composite", 0)
-                        logger.info(
-                            f"RECALC COMPLETE for game {game_id}: "
-                            f"new composite = {new_composite:.3f}, old = {old_composite:.3f}"
-                        )
-                        recalcs += 1
-                    except Exception as e:
-                        logger.error(f"[LIVE] Recalc failed for game {movements[0]['game_id']}: {e}")
+                    queued += 1
 
             results["sports"][sport] = {
                 "live_games": len(live_games),
                 "snapshots_saved": snapshots_saved,
-                "recalcs_triggered": recalcs
+                "recalcs_queued": queued
             }
             results["total_live_games"] += len(live_games)
             results["total_snapshots"] += snapshots_saved
-            results["recalcs_triggered"] += recalcs
+            results["recalcs_queued"] += queued
 
         except Exception as e:
             error_msg = f"[LIVE] Error processing {sport}: {str(e)}"
@@ -516,11 +629,15 @@ def _live_cycle_inner() -> dict:
     end_time = datetime.now(timezone.utc)
     results["completed_at"] = end_time.isoformat()
     results["duration_seconds"] = (end_time - start_time).total_seconds()
+    results["pillar_memo"] = pillar_memo.skipped_since(memo_before)
 
     if results["total_live_games"] > 0:
+        invalidate_responses("predictions", "odds", "composites")
+        memo = results["pillar_memo"]
         logger.info(
             f"[LIVE] Cycle completed: {results['total_live_games']} games, "
-            f"{results['total_snapshots']} snapshots, {results['recalcs_triggered']} recalcs"
+            f"{results['total_snapshots']} snapshots, {results['recalcs_queued']} recalcs queued, "
+            f"{memo['skipped']}/{memo['evaluations']} pillar evaluations skipped"
         )
 
     return results
@@ -575,6 +692,7 @@ def _live_props_cycle_inner() -> dict:
             
             props_saved = 0
             for game in live_games:
+                checkpoint()
                 game_id = game.get("id")
                 props_data = odds_client.get_single_game_props(sport, game_id)
                 
@@ -638,6 +756,8 @@ def _grading_cycle_inner() -> dict:
         f"{auto.get('graded', 0)} games scored via ESPN, "
         f"{result.get('prediction_grades_created', 0)} prediction_grades created"
     )
+    if result.get("prediction_grades_created", 0) or auto.get("graded", 0):
+        invalidate_responses("grades")
 
     if result.get("errors"):
         for err in result["errors"]:
@@ -688,6 +808,7 @@ def _daily_feedback_inner():
     results = {}
 
     for sport in sports:
+        checkpoint()
         try:
             result = fb.run_and_apply_feedback(sport, min_games=50)
             sp_result = result.get("results", {}).get(sport, {})
@@ -760,6 +881,7 @@ def start_scheduler():
             logger.error(f"[PregameFullCycle] Poll step failed: {e}")
 
         # Step 2: Recalculate composites from fresh cached_odds → composite_history
+        checkpoint()
         try:
             from composite_tracker import CompositeTracker
             tracker = CompositeTracker()
@@ -775,11 +897,13 @@ def start_scheduler():
             logger.error(f"[PregameFullCycle] Recalc step failed: {e}")
 
         # Step 3: Capture closing lines for games near tipoff
+        checkpoint()
         try:
             _run_closing_line_capture_fn()
         except Exception as e:
             logger.error(f"[PregameFullCycle] Closing capture step failed: {e}")
 
+        invalidate_responses("predictions", "odds", "composites")
         elapsed = time.time() - start
         logger.info(f"[PregameFullCycle] Complete in {elapsed:.1f}s")
 
@@ -829,6 +953,8 @@ def start_scheduler():
             result = tracker.fast_refresh_live()
             refreshed = result.get("refreshed", 0)
             live = result.get("live_games", 0)
+            if refreshed > 0:
+                invalidate_responses("composites", "predictions")
             if refreshed > 0 or live > 0:
                 logger.info(
                     f"[FastRefresh] Done: {refreshed} refreshed out of {live} live games"
@@ -871,6 +997,7 @@ def start_scheduler():
             from exchange_tracker import ExchangeTracker
             tracker = ExchangeTracker()
             result = tracker.sync_all()
+            invalidate_responses("exchange")
             logger.info(f"[ExchangeSync] {result}")
         try: _run_with_timeout(_inner, "exchange_sync", timeout=30)
         except Exception as e: logger.error(f"[ExchangeSync] Failed: {e}")
@@ -985,16 +1112,23 @@ def start_scheduler():
     #     replace_existing=True, max_instances=1, misfire_grace_time=30,
     # )
 
-    # # Performance cache: Every 5 minutes
-    # from perf_cache import refresh_performance_cache
-    # scheduler.add_job(
-    #     func=refresh_performance_cache,
-    #     trigger=IntervalTrigger(minutes=5),
-    #     id="perf_cache_refresh",
-    #     name="Pre-fetch performance dashboard data via RPC",
-    #     replace_existing=True, max_instances=1, misfire_grace_time=30,
-    #     next_run_time=_delayed(60),
-    # )
+    # Performance cache: Every 5 minutes (loads the small performance_buckets table)
+    from perf_cache import refresh_performance_cache
+
+    def run_perf_cache_refresh():
+        try:
+            _run_with_timeout(refresh_performance_cache, "perf_cache_refresh", timeout=60)
+        except Exception as e:
+            logger.error(f"[PerfCache] Refresh failed: {e}")
+
+    scheduler.add_job(
+        func=run_perf_cache_refresh,
+        trigger=IntervalTrigger(minutes=5),
+        id="perf_cache_refresh",
+        name="Load performance_buckets aggregates into memory",
+        replace_existing=True, max_instances=1, misfire_grace_time=30,
+        next_run_time=_delayed(60),
+    )
 
     # # Daily feedback: 6 AM UTC
     # scheduler.add_job(
@@ -1006,6 +1140,8 @@ def start_scheduler():
     # )
 
     scheduler.start()
+    # Debounced recalcs for games whose odds, injuries or exchange prices changed
+    recalc_queue.start(_process_recalc_events)
     logger.info("Scheduler started:")
     logger.info(f"  PREGAME_POLLING_ENABLED={PREGAME_POLLING_ENABLED}, LIVE_POLLING_ENABLED={LIVE_POLLING_ENABLED}")
     if PREGAME_POLLING_ENABLED:
@@ -1022,6 +1158,8 @@ def start_scheduler():
     logger.info("  5. Pregame capture: every 15 min (always on)")
     logger.info("  6. Grading: every 60 min (always on)")
     logger.info("  7. Player stats refresh: every 2h (first at +300s)")
+    logger.info("  8. Performance buckets cache: every 5 min (first at +60s)")
+    logger.info("  Change-driven recalcs: recalc_queue worker (debounced per game)")
     logger.info("  Manual refresh: POST /api/internal/manual-refresh")
 
     return scheduler
@@ -9,13 +9,20 @@ Checks the health of all OMI backend subsystems:
 - pregame_capture: pregame_snapshots freshness
 - composite_recalc: composite_history freshness
 - closing_line_capture: closing_lines freshness
+- data_source_cache: shared ESPN/BDL/API-Football/team_stats cache hit rates
+  and pillar memo skip rates
+- recalc_queue: change-driven recalc backlog and worker health
+- scheduler_jobs: job executor lanes plus per-job duration / queue-delay
+  histograms, timeouts and overlap skips
 
 Status levels: OK, WARNING, CRITICAL
 """
 
 import logging
+import time
 from datetime import datetime, timezone, timedelta
 
+from config import EXCHANGE_HEARTBEAT_MINUTES
 from database import db
 
 logger = logging.getLogger(__name__)
@@ -30,6 +37,18 @@ THRESHOLDS = {
     "grading_pipeline": {"warning": 120, "critical": 360},
 }
 
+# Source cache: warn when this share of upstream fetches for a source fail
+SOURCE_CACHE_ERROR_WARNING = 0.50
+
+# API database executor: warn when p99 queue wait exceeds this (ms)
+API_DB_WAIT_WARNING_MS = 1000
+
+# Recalc queue: warn when this many games are waiting for recalculation
+RECALC_PENDING_WARNING = 200
+
+# Scheduler jobs: warn when a job's p99 wait for a worker exceeds this (s)
+JOB_QUEUE_DELAY_WARNING_S = 30
+
 # Pillar neutrality threshold: if this % of scores are 0.50, it's a problem
 PILLAR_NEUTRAL_WARNING = 0.50
 PILLAR_NEUTRAL_CRITICAL = 0.70
@@ -43,9 +62,7 @@ class SystemHealth:
         now = datetime.now(timezone.utc)
         checks = {}
 
-        checks["exchange_sync"] = self._check_table_freshness(
-            "exchange_data", "snapshot_time", THRESHOLDS["exchange_sync"], now
-        )
+        checks["exchange_sync"] = self._check_exchange_sync(now)
         checks["odds_polling"] = self._check_table_freshness(
             "cached_odds", "updated_at", THRESHOLDS["odds_polling"], now
         )
@@ -62,6 +79,11 @@ class SystemHealth:
             "prediction_grades", "graded_at", THRESHOLDS["grading_pipeline"], now
         )
         checks["pillar_health"] = self._check_pillar_health(now)
+        checks["data_source_cache"] = self._check_source_cache()
+        checks["api_db_executor"] = self._check_api_db_executor()
+        checks["recalc_queue"] = self._check_recalc_queue()
+        checks["exchange_ingestion"] = self._check_exchange_ingestion()
+        checks["scheduler_jobs"] = self._check_scheduler_jobs()
 
         # Overall status = worst of all checks
         statuses = [c["status"] for c in checks.values()]
@@ -128,6 +150,43 @@ class SystemHealth:
         except Exception as e:
             return {"status": "CRITICAL", "message": f"Error checking {table}: {e}"}
 
+    def _check_exchange_sync(self, now: datetime) -> dict:
+        """Check exchange sync freshness.
+
+        Unchanged prices are only re-written as a heartbeat every
+        EXCHANGE_HEARTBEAT_MINUTES, so a quiet market leaves exchange_data
+        untouched for longer than the thresholds while sync is working.
+        When this process runs the scheduler, judge the sync job's last run
+        instead; otherwise allow the heartbeat interval on exchange_data.
+        """
+        thresholds = THRESHOLDS["exchange_sync"]
+        try:
+            from job_executor import job_executor
+            job = job_executor.stats()["jobs"].get("exchange_sync")
+        except Exception:
+            job = None
+
+        if not job or not job.get("last_finished_at"):
+            return self._check_table_freshness(
+                "exchange_data", "snapshot_time",
+                {k: v + EXCHANGE_HEARTBEAT_MINUTES for k, v in thresholds.items()}, now,
+            )
+
+        age_minutes = (time.time() - job["last_finished_at"]) / 60
+        if age_minutes > thresholds["critical"]:
+            status = "CRITICAL"
+        elif age_minutes > thresholds["warning"] or job["last_status"] != "ok":
+            status = "WARNING"
+        else:
+            status = "OK"
+        return {
+            "status": status,
+            "last_run_status": job["last_status"],
+            "age_minutes": round(age_minutes, 1),
+            "threshold_warning": thresholds["warning"],
+            "threshold_critical": thresholds["critical"],
+        }
+
     def _check_pillar_health(self, now: datetime) -> dict:
         """Check if pillars are producing non-neutral scores (not all 0.50)."""
         try:
@@ -193,6 +252,99 @@ class SystemHealth:
             return {"status": "CRITICAL", "message": f"Error checking pillars: {e}"}
 
 
+    def _check_source_cache(self) -> dict:
+        """Report hit/miss metrics for the shared data_sources cache."""
+        try:
+            from data_sources.cache import source_cache, pillar_memo
+            from warm_cache import warm_cache
+
+            stats = source_cache.stats()
+            failing = []
+            for source, m in stats["sources"].items():
+                fetches = m["misses"] + m["refreshes"]
+                if fetches and m["errors"] / fetches >= SOURCE_CACHE_ERROR_WARNING:
+                    failing.append(source)
+
+            result = {"status": "WARNING" if failing else "OK", **stats,
+                      "pillar_memo": pillar_memo.stats(), "warm_cache": warm_cache.stats()}
+            if failing:
+                result["message"] = f"Upstream fetches failing for: {', '.join(failing)}"
+            return result
+
+        except Exception as e:
+            return {"status": "WARNING", "message": f"Error reading source cache stats: {e}"}
+
+    def _check_recalc_queue(self) -> dict:
+        """Report the change-driven recalc queue: backlog, batches, worker."""
+        try:
+            from recalc_queue import recalc_queue
+
+            stats = recalc_queue.stats()
+            result = {"status": "OK", **stats}
+            if not stats["worker_alive"]:
+                result["status"] = "WARNING"
+                result["message"] = "Recalc worker not running (scheduler not started?)"
+            elif stats["pending"] >= RECALC_PENDING_WARNING:
+                result["status"] = "WARNING"
+                result["message"] = f"{stats['pending']} games waiting for recalculation"
+            return result
+
+        except Exception as e:
+            return {"status": "WARNING", "message": f"Error reading recalc queue stats: {e}"}
+
+    def _check_exchange_ingestion(self) -> dict:
+        """Report exchange price delta-encoding: rows seen vs written per venue."""
+        try:
+            from exchange_tracker import price_memory
+
+            return {"status": "OK", "exchanges": price_memory.stats()}
+
+        except Exception as e:
+            return {"status": "WARNING", "message": f"Error reading exchange ingestion stats: {e}"}
+
+    def _check_scheduler_jobs(self) -> dict:
+        """Report the scheduler job executor: lanes, per-job timings, failures."""
+        try:
+            from job_executor import job_executor
+
+            stats = job_executor.stats()
+            problems = []
+            for name, job in stats["jobs"].items():
+                if job["last_status"] in ("error", "cancelled", "expired"):
+                    problems.append(f"{name} last run {job['last_status']}")
+                elif job["state"] == "cancelling":
+                    problems.append(f"{name} timed out, still stopping")
+                p99 = job["queue_delay_s"]["p99"]
+                if p99 is not None and p99 >= JOB_QUEUE_DELAY_WARNING_S:
+                    problems.append(f"{name} waits {p99:.0f}s (p99) for a worker")
+
+            result = {"status": "WARNING" if problems else "OK", **stats}
+            if problems:
+                result["message"] = "; ".join(problems)
+            return result
+
+        except Exception as e:
+            return {"status": "WARNING", "message": f"Error reading job executor stats: {e}"}
+
+    def _check_api_db_executor(self) -> dict:
+        """Report queue depth and latency of the API's database executor."""
+        try:
+            import async_db
+
+            stats = async_db.stats()
+            p99_wait = stats["wait_ms"]["p99"]
+            saturated = p99_wait is not None and p99_wait >= API_DB_WAIT_WARNING_MS
+            result = {"status": "WARNING" if saturated else "OK", **stats}
+            if saturated:
+                result["message"] = (
+                    f"API requests waiting {p99_wait:.0f}ms (p99) for a database worker"
+                )
+            return result
+
+        except Exception as e:
+            return {"status": "WARNING", "message": f"Error reading API executor stats: {e}"}
+
+
 def run_health_check() -> dict:
     """Entry point for scheduler. Logs results, returns report."""
     health = SystemHealth()
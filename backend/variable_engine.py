@@ -7,6 +7,7 @@ Phase 1: Architecture + variables implementable with existing data.
 Includes official catalog variables (FDR, SRI, LSI, TSM, WXS, SLD, EWE, EDL, JFI, PTI, HCA)
 with specific market-inefficiency theses.
 Importable by composite_tracker and analyzer.
+evaluate_batch() runs the same pipeline for a whole slate with NumPy.
 """
 
 from dataclasses import dataclass, field
@@ -15,6 +16,8 @@ from datetime import datetime, timezone, timedelta
 import logging
 import math
 
+import numpy as np
+
 logger = logging.getLogger(__name__)
 
 
@@ -1164,6 +1167,559 @@ def calculate_variable_composite(pillar_scores: List[PillarScore]) -> float:
     return weighted_sum / weight_total if weight_total > 0 else 0.5
 
 
+# ═══════════════════════════════════════════════════════════════════════
+# BATCH EVALUATION — whole slate in one NumPy pass
+# ═══════════════════════════════════════════════════════════════════════
+#
+# Same variables, weights and composites as calculate_all_variables →
+# aggregate_pillar_scores → calculate_variable_composite, for many games at
+# once. Per-game raw inputs are pulled out of the pillar dicts with the
+# same expressions the scalar calculators use, stacked into arrays, then
+# normalized, weighted and aggregated column by column. Sums run in the
+# scalar loop order so every float matches the scalar path exactly.
+
+PILLAR_ORDER = ["EXECUTION", "INCENTIVES", "SHOCKS", "TIME_DECAY", "FLOW", "GAME_ENV"]
+
+VARIABLE_CODES = [v["code"] for v in VARIABLE_REGISTRY]
+_VAR_INDEX = {code: i for i, code in enumerate(VARIABLE_CODES)}
+_PILLAR_COLUMNS = {
+    pillar: [i for i, v in enumerate(VARIABLE_REGISTRY) if v["pillar"] == pillar]
+    for pillar in PILLAR_ORDER
+}
+# Registry source differs from what the calculator reports
+_SOURCE_OVERRIDES = {"FRM": "execution_pillar"}
+_PILLAR_META = {
+    pillar: [
+        (j, VARIABLE_REGISTRY[j]["code"], VARIABLE_REGISTRY[j]["name"],
+         _SOURCE_OVERRIDES.get(VARIABLE_REGISTRY[j]["code"], VARIABLE_REGISTRY[j]["source"]))
+        for j in cols
+    ]
+    for pillar, cols in _PILLAR_COLUMNS.items()
+}
+
+_LINE_MOVE_CAPS = {"NBA": 3.0, "NCAAB": 4.0, "NFL": 3.0, "NCAAF": 3.5, "NHL": 1.0, "EPL": 0.5}
+_PACE_AVG = {"NBA": 100.0, "NCAAB": 68.0}
+_RATING_AVG = {"NBA": 112.0, "NCAAB": 100.0}
+_PPG_AVG = {"NBA": 114.0, "NCAAB": 74.0, "NFL": 22.0, "NCAAF": 28.0, "NHL": 3.1, "EPL": 1.4}
+_PPG_RANGE = {"NBA": 20.0, "NCAAB": 15.0, "NFL": 10.0, "NCAAF": 12.0, "NHL": 1.5, "EPL": 0.8}
+_HCA_BASELINE = {"NBA": 0.58, "NCAAB": 0.60, "NFL": 0.57, "NHL": 0.55, "EPL": 0.46}
+_SHOCK_DIRECTION = {"home": 0.8, "away": 0.2, "neutral": 0.5}
+
+_NAN = float("nan")
+
+
+def _num(value) -> float:
+    """Numeric pillar field as float; non-numbers raise like the scalar
+    arithmetic on them would."""
+    if isinstance(value, (int, float)):
+        return float(value)
+    raise TypeError(f"expected a number, got {type(value).__name__}")
+
+
+def _opt_float(value) -> float:
+    return _NAN if value is None else float(value)
+
+
+def extract_raw_inputs(
+    pillar_results: dict,
+    sport: str,
+    team_stats: Optional[dict] = None,
+    opening_line: Optional[float] = None,
+    current_line: Optional[float] = None,
+) -> Dict[str, float]:
+    """Flatten one game's pillar results into the raw inputs the batch
+    kernel needs. NaN marks a missing value (scalar path: None → stub).
+    Raises on malformed input wherever the scalar calculators would."""
+    execution = pillar_results.get("execution", {})
+    incentives = pillar_results.get("incentives", {})
+    shocks = pillar_results.get("shocks", {})
+    time_decay = pillar_results.get("time_decay", {})
+    flow = pillar_results.get("flow", {})
+    game_env = pillar_results.get("game_environment", {})
+    home_stats = (team_stats or {}).get("home", {})
+    away_stats = (team_stats or {}).get("away", {})
+    raw: Dict[str, float] = {}
+
+    # EXECUTION
+    raw["home_injury"] = _num(execution.get("home_injury_impact", 0.0))
+    raw["away_injury"] = _num(execution.get("away_injury_impact", 0.0))
+    if sport in ("NFL", "NCAAF"):
+        exec_breakdown = execution.get("breakdown", {})
+        raw["qb_impact"] = _num(exec_breakdown.get("qb_impact", 0.0) if exec_breakdown else 0.0)
+    else:
+        raw["qb_impact"] = _NAN
+    raw["home_win_pct"] = _opt_float(home_stats.get("win_pct"))
+    raw["away_win_pct"] = _opt_float(away_stats.get("win_pct"))
+    home_streak = home_stats.get("streak")
+    away_streak = away_stats.get("streak")
+    raw["home_streak"] = _NAN if home_streak is None else float(int(home_streak))
+    raw["away_streak"] = _NAN if away_streak is None else float(int(away_streak))
+    raw["exec_score"] = _num(execution.get("score", 0.5))
+
+    # INCENTIVES
+    inc_breakdown = incentives.get("breakdown", {}) or {}
+    raw["home_motivation"] = _num(incentives.get("home_motivation", 0.5))
+    raw["away_motivation"] = _num(incentives.get("away_motivation", 0.5))
+    raw["is_rivalry"] = 1.0 if incentives.get("is_rivalry", False) else 0.0
+    raw["is_championship"] = 1.0 if incentives.get("is_championship", False) else 0.0
+    raw["playoff_bonus"] = _num(inc_breakdown.get("playoff_bonus", 0.0))
+    raw["tank_alert"] = _num(inc_breakdown.get("tank_rest_alert", 0.0))
+    raw["season_stage"] = _num(inc_breakdown.get("season_stage_boost", 0.0))
+    raw["underdog_boost"] = _num(inc_breakdown.get("underdog_boost", 0.0))
+    raw["divisional_rivalry"] = _num(inc_breakdown.get("divisional_rivalry", 0.0))
+    td = time_decay or {}
+    home_rest, away_rest = td.get("home_rest_days"), td.get("away_rest_days")
+    if home_rest is not None and away_rest is not None:
+        raw["rest_inequity"] = float(home_rest) - float(away_rest)
+    else:
+        raw["rest_inequity"] = _NAN
+    raw["opening_line"] = _NAN if opening_line is None else _num(opening_line)
+    raw["current_line"] = _NAN if current_line is None else _num(current_line)
+
+    # SHOCKS
+    shk_breakdown = shocks.get("breakdown", {}) or {}
+    raw["shocks_has_data"] = 1.0 if (
+        shocks.get("line_movement", 0.0) != 0.0 or shocks.get("shock_detected", False)
+    ) else 0.0
+    raw["line_movement"] = abs(_num(shocks.get("line_movement", 0.0)))
+    raw["shock_velocity"] = _num(shk_breakdown.get("velocity", 0.0))
+    raw["is_steam"] = 1.0 if shocks.get("shock_detected", False) else 0.0
+    raw["time_factor"] = _num(shk_breakdown.get("time_factor", 0.5))
+    raw["volatility"] = _num(shk_breakdown.get("volatility", 0.0))
+    raw["shock_direction"] = _SHOCK_DIRECTION.get(shocks.get("shock_direction", "neutral"), 0.5)
+
+    # TIME_DECAY
+    td_breakdown = time_decay.get("breakdown", {}) or {}
+    raw["home_rest"] = _num(time_decay.get("home_rest_days", 3))
+    raw["away_rest"] = _num(time_decay.get("away_rest_days", 3))
+    raw["fatigue"] = max(_num(time_decay.get("home_fatigue", 0.5)), _num(time_decay.get("away_fatigue", 0.5)))
+    raw["third_in_four"] = _num(td_breakdown.get("third_in_four", 0.0))
+    raw["travel"] = _num(td_breakdown.get("travel_distance", 0.0))
+    raw["home_field"] = _num(td_breakdown.get("home_field_advantage", 0.0))
+    raw["midweek"] = _num(td_breakdown.get("midweek_factor", 0.0)) if sport == "EPL" else _NAN
+    raw["momentum"] = _num(td_breakdown.get("momentum", 0.0))
+    sld_breakdown = (shocks or {}).get("breakdown", {}) or {}
+    sld_velocity = sld_breakdown.get("velocity", 0.0)
+    sld_time_factor = sld_breakdown.get("time_factor", 0.5)
+    if sld_velocity is not None and sld_time_factor is not None:
+        raw["sld_velocity"] = _num(sld_velocity)
+        raw["sld_time_factor"] = _num(sld_time_factor)
+    else:
+        raw["sld_velocity"] = raw["sld_time_factor"] = _NAN
+
+    # FLOW
+    flow_breakdown = flow.get("breakdown", {}) or {}
+    raw["book_agreement"] = _num(flow.get("book_agreement", 0.0))
+    raw["pinnacle_divergence"] = _num(flow_breakdown.get("pinnacle_divergence", 0.0))
+    raw["retail_consensus"] = _num(flow_breakdown.get("retail_consensus", 0.5))
+    raw["rlm_signal"] = _num(flow_breakdown.get("rlm_signal", 0.0))
+    raw["flow_line_movement"] = _num(flow_breakdown.get("line_movement", 0.0))
+    raw["price_divergence"] = _num(flow_breakdown.get("price_divergence", 0.0))
+    raw["flow_velocity"] = _num(flow_breakdown.get("velocity", 0.0))
+    raw["exchange_signal"] = _num(flow_breakdown.get("exchange_signal", 0.0))
+
+    # GAME_ENV
+    env_breakdown = game_env.get("breakdown", {}) or {}
+    raw["expected_total"] = _opt_float(game_env.get("expected_total"))
+    for field_name in ("pace", "offensive_rating", "defensive_rating", "points_per_game"):
+        raw[f"home_{field_name}"] = _opt_float(home_stats.get(field_name))
+        raw[f"away_{field_name}"] = _opt_float(away_stats.get(field_name))
+    raw["special_teams"] = _num(env_breakdown.get("special_teams_score", 0.0)) if sport == "NHL" else _NAN
+    raw["weather_impact"] = (
+        _num(env_breakdown.get("weather_impact", 0.0)) if sport in ("NFL", "NCAAF") else _NAN
+    )
+    raw["goals_per_game"] = (
+        _num(env_breakdown.get("goals_per_game", 0.0)) if sport in ("NHL", "EPL") else _NAN
+    )
+    has_record = (
+        home_stats.get("win_pct") is not None
+        and home_stats.get("wins") is not None
+        and home_stats.get("losses") is not None
+    )
+    raw["hca_win_pct"] = float(home_stats.get("win_pct")) if has_record else _NAN
+
+    return raw
+
+
+def build_slate(raw_inputs: List[Dict[str, float]]) -> Dict[str, np.ndarray]:
+    """Stack per-game extract_raw_inputs() dicts into {field: (games,) array}."""
+    if not raw_inputs:
+        return {}
+    return {k: np.array([r[k] for r in raw_inputs], dtype=np.float64) for k in raw_inputs[0]}
+
+
+@dataclass
+class VariableBatch:
+    """All 63 variables for a slate; columns follow VARIABLE_REGISTRY."""
+    sports: List[str]
+    raw: np.ndarray         # (games, 63)
+    normalized: np.ndarray  # (games, 63)
+    confidence: np.ndarray  # (games, 63)
+    available: np.ndarray   # (games, 63) bool
+
+    def variables(self, i: int) -> Dict[str, List[VariableResult]]:
+        """Game i as calculate_all_variables() would return it."""
+        raw = self.raw[i].tolist()
+        norm = self.normalized[i].tolist()
+        conf = self.confidence[i].tolist()
+        avail = self.available[i].tolist()
+        return {
+            pillar: [
+                VariableResult(code, name, pillar, raw[j], norm[j], conf[j], avail[j], source)
+                for j, code, name, source in _PILLAR_META[pillar]
+            ]
+            for pillar in PILLAR_ORDER
+        }
+
+
+def _clip(x):
+    return np.maximum(0.0, np.minimum(1.0, x))
+
+
+def _lookup(sports: np.ndarray, table: dict, default: float) -> np.ndarray:
+    return np.array([table.get(s, default) for s in sports], dtype=np.float64)
+
+
+def calculate_all_variables_batch(slate: Dict[str, np.ndarray], sports: List[str]) -> VariableBatch:
+    """Normalize every variable for every game in the slate at once."""
+    n = len(sports)
+    sp = np.array(sports, dtype=object)
+    raw = np.zeros((n, len(VARIABLE_CODES)))
+    norm = np.full((n, len(VARIABLE_CODES)), 0.5)
+    conf = np.zeros((n, len(VARIABLE_CODES)))
+    avail = np.zeros((n, len(VARIABLE_CODES)), dtype=bool)
+    everywhere = np.ones(n, dtype=bool)
+
+    def put(code, mask, raw_v, norm_v, conf_v, avail_v=True):
+        """Fill rows where mask holds; the rest keep the neutral stub."""
+        j = _VAR_INDEX[code]
+        raw[mask, j] = np.broadcast_to(raw_v, (n,))[mask]
+        norm[mask, j] = np.broadcast_to(norm_v, (n,))[mask]
+        conf[mask, j] = np.broadcast_to(conf_v, (n,))[mask]
+        avail[mask, j] = np.broadcast_to(avail_v, (n,))[mask]
+
+    def present(*fields):
+        mask = everywhere.copy()
+        for f in fields:
+            mask &= ~np.isnan(slate[f])
+        return mask
+
+    football = np.isin(sp, ["NFL", "NCAAF"])
+    short_rest = np.isin(sp, ["NBA", "NCAAB", "NHL"])
+    line_cap = _lookup(sp, _LINE_MOVE_CAPS, 3.0)
+    pace_avg = _lookup(sp, _PACE_AVG, 100.0)
+    rating_avg = _lookup(sp, _RATING_AVG, 110.0)
+    ppg_avg = _lookup(sp, _PPG_AVG, 22.0)
+    ppg_range = _lookup(sp, _PPG_RANGE, 10.0)
+
+    def rest_norm(days):
+        return np.where(short_rest, _clip(days / 5.0), _clip((days - 3) / 10.0))
+
+    def ppg_norm(ppg):
+        return _clip(0.5 + (ppg - ppg_avg) / (2 * ppg_range))
+
+    def rating_norm(rating):
+        return _clip(0.5 + (rating - rating_avg) / 20.0)
+
+    with np.errstate(invalid="ignore"):
+        # ─── EXECUTION ───
+        for code, f in (("HIJ", "home_injury"), ("AIJ", "away_injury")):
+            put(code, everywhere, slate[f], _clip(1.0 - slate[f]), 0.7)
+        qb = slate["qb_impact"]
+        put("QBS", football, qb, _clip(0.5 + qb), np.where(qb != 0.0, 0.8, 0.3), qb != 0.0)
+        for code, f in (("TSH", "home_win_pct"), ("TSA", "away_win_pct")):
+            put(code, present(f), slate[f], _clip(slate[f]), 0.8)
+        for code, f in (("SKH", "home_streak"), ("SKA", "away_streak")):
+            put(code, present(f), slate[f], _clip(0.5 + slate[f] / 20.0), 0.6)
+        put("FRM", everywhere, slate["exec_score"], _clip(slate["exec_score"]), 0.6)
+
+        # ─── INCENTIVES ───
+        for code, f in (("MTH", "home_motivation"), ("MTA", "away_motivation")):
+            put(code, everywhere, slate[f], _clip(slate[f]), 0.6)
+        rivalry = slate["is_rivalry"] == 1.0
+        put("RIV", everywhere, slate["is_rivalry"], np.where(rivalry, 0.8, 0.5), 0.9)
+        put("CHP", everywhere, slate["is_championship"],
+            np.where(slate["is_championship"] == 1.0, 0.9, 0.5), 0.9)
+        plf = slate["playoff_bonus"]
+        put("PLF", everywhere, plf, _clip(0.5 + plf), np.where(plf != 0.0, 0.7, 0.3), plf != 0.0)
+        tnk = slate["tank_alert"]
+        put("TNK", everywhere, tnk, _clip(0.5 - tnk * 0.3), 0.6)
+        sst = slate["season_stage"]
+        put("SST", everywhere, sst, _clip(0.5 + sst), 0.8)
+        udg = slate["underdog_boost"]
+        put("UDG", everywhere, udg, _clip(0.5 + udg), 0.5, udg != 0.0)
+        dvr = slate["divisional_rivalry"]
+        put("DVR", everywhere, dvr, _clip(0.5 + dvr * 0.3), 0.7)
+        sri = slate["rest_inequity"]
+        put("SRI", present("rest_inequity"), sri, _clip(0.5 + sri / 6.0), 0.8)
+        spread = slate["current_line"]
+        spread_abs = np.abs(spread)
+        trap = np.zeros(n)
+        trap = np.where(spread_abs > 7.0, trap + 0.3, trap)
+        trap = np.where(spread_abs > 10.0, trap + 0.2, trap)
+        trap = np.where(rivalry, trap + 0.15, trap)
+        trap = np.where(spread > 7.0, trap + 0.15, trap)
+        put("TSM", present("current_line"), trap, _clip(0.5 - trap),
+            np.where(spread_abs > 7.0, 0.5, 0.2))
+
+        # ─── SHOCKS ───
+        has_shock = slate["shocks_has_data"] == 1.0
+        steam = slate["is_steam"] == 1.0
+        lmm = slate["line_movement"]
+        put("LMM", everywhere, lmm, _clip(lmm / line_cap), np.where(has_shock, 0.8, 0.1), has_shock)
+        lmv = slate["shock_velocity"]
+        put("LMV", everywhere, lmv, _clip(lmv / 2.0), np.where(has_shock, 0.7, 0.1), has_shock)
+        put("STM", everywhere, slate["is_steam"], np.where(steam, 0.9, 0.5),
+            np.where(has_shock, 0.8, 0.1), has_shock)
+        tmf = slate["time_factor"]
+        put("TMF", everywhere, tmf, _clip(tmf), np.where(has_shock, 0.6, 0.1), has_shock)
+        vol = slate["volatility"]
+        put("VOL", everywhere, vol, _clip(vol / 3.0), np.where(has_shock, 0.6, 0.1), has_shock)
+        shd = slate["shock_direction"]
+        put("SHD", everywhere, shd, shd, np.where(steam, 0.7, 0.3), has_shock)
+        oln = slate["current_line"] - slate["opening_line"]
+        lines = present("opening_line", "current_line")
+        put("OLN", lines, oln, _clip(0.5 + oln / 6.0), 0.8)
+
+        # ─── TIME_DECAY ───
+        for code, f in (("HRD", "home_rest"), ("ARD", "away_rest")):
+            put(code, everywhere, slate[f], rest_norm(slate[f]), 0.8)
+        put("B2B", everywhere, slate["fatigue"], _clip(1.0 - slate["fatigue"]), 0.8)
+        t3f = slate["third_in_four"]
+        put("T3F", everywhere, t3f, _clip(1.0 - t3f * 0.5), 0.5, t3f != 0.0)
+        trv = slate["travel"]
+        put("TRV", everywhere, trv, _clip(1.0 - trv / 3000.0), np.where(trv > 0, 0.7, 0.3), trv > 0)
+        hfa = slate["home_field"]
+        put("HFA", everywhere, hfa, _clip(0.5 + hfa), 0.7)
+        mwk = slate["midweek"]
+        put("MWK", sp == "EPL", mwk, _clip(0.5 - mwk * 0.3), 0.6)
+        mom = slate["momentum"]
+        put("MOM", everywhere, mom, _clip(0.5 + mom), 0.5, mom != 0.0)
+        sld_v, sld_t = slate["sld_velocity"], slate["sld_time_factor"]
+        staleness = (1.0 - np.minimum(sld_v / 0.5, 1.0)) * sld_t
+        put("SLD", present("sld_velocity", "sld_time_factor"), staleness, _clip(staleness), 0.5,
+            (sld_v != 0.0) | (sld_t != 0.5))
+        ewe = np.abs(oln)
+        put("EWE", lines, ewe, _clip(ewe / line_cap), 0.7)
+
+        # ─── FLOW ───
+        bag = slate["book_agreement"]
+        has_flow = bag > 0
+        pnd = slate["pinnacle_divergence"]
+        put("PND", everywhere, pnd, _clip(0.5 + pnd / 4.0), np.where(pnd != 0.0, 0.8, 0.2), pnd != 0.0)
+        rtc = slate["retail_consensus"]
+        put("RTC", everywhere, rtc, _clip(rtc), 0.6, has_flow)
+        put("BAG", everywhere, bag, _clip(bag), 0.8, has_flow)
+        rlm = slate["rlm_signal"]
+        put("RLM", everywhere, rlm, _clip(0.5 + rlm), np.where(rlm != 0.0, 0.7, 0.2), rlm != 0.0)
+        flm = slate["flow_line_movement"]
+        put("FLM", everywhere, flm, _clip(np.abs(flm) / line_cap), np.where(has_flow, 0.7, 0.2), has_flow)
+        pdv = slate["price_divergence"]
+        put("PDV", everywhere, pdv, _clip(pdv / 2.0), np.where(has_flow, 0.6, 0.2), has_flow)
+        fvl = slate["flow_velocity"]
+        put("FVL", everywhere, fvl, _clip(fvl / 2.0), np.where(has_flow, 0.6, 0.2), has_flow)
+        exs = slate["exchange_signal"]
+        put("EXS", everywhere, exs, _clip(0.5 + exs), np.where(exs != 0.0, 0.7, 0.1), exs != 0.0)
+        shp = (pnd * 0.4 + rlm * 0.4 + (bag - 0.5) * 0.2)
+        put("SHP", everywhere, shp, _clip(0.5 + shp), np.where(has_flow, 0.6, 0.1), has_flow)
+
+        # ─── GAME_ENV ───
+        ext = slate["expected_total"]
+        put("EXT", present("expected_total"), ext, ppg_norm(ext), 0.7)
+        pace = present("home_pace", "away_pace")
+        avg_pace = (slate["home_pace"] + slate["away_pace"]) / 2
+        put("PAC", pace, avg_pace, _clip(0.5 + (avg_pace - pace_avg) / 30.0), 0.8)
+        avg_ort = (slate["home_offensive_rating"] + slate["away_offensive_rating"]) / 2
+        put("ORT", present("home_offensive_rating", "away_offensive_rating"), avg_ort, rating_norm(avg_ort), 0.8)
+        avg_drt = (slate["home_defensive_rating"] + slate["away_defensive_rating"]) / 2
+        put("DRT", present("home_defensive_rating", "away_defensive_rating"), avg_drt,
+            _clip(1.0 - rating_norm(avg_drt)), 0.8)
+        spt = slate["special_teams"]
+        put("SPT", sp == "NHL", spt, _clip(spt), np.where(spt > 0, 0.7, 0.2), spt > 0)
+        wth = slate["weather_impact"]
+        put("WTH", football, wth, _clip(0.5 + wth), np.where(wth != 0.0, 0.7, 0.2), wth != 0.0)
+        avg_ppg = (slate["home_points_per_game"] + slate["away_points_per_game"]) / 2
+        put("PPG", present("home_points_per_game", "away_points_per_game"), avg_ppg, ppg_norm(avg_ppg), 0.8)
+        gls = slate["goals_per_game"]
+        put("GLS", np.isin(sp, ["NHL", "EPL"]), gls, ppg_norm(gls), np.where(gls > 0, 0.7, 0.2), gls > 0)
+        pti = avg_pace - pace_avg
+        put("PTI", pace & np.isin(sp, ["NBA", "NCAAB"]), pti, _clip(0.5 + pti / 20.0), 0.8)
+        hca = slate["hca_win_pct"] - _lookup(sp, _HCA_BASELINE, 0.55)
+        put("HCA", present("hca_win_pct"), hca, _clip(0.5 + hca * 2.0), 0.6)
+
+    return VariableBatch(sports=list(sports), raw=raw, normalized=norm, confidence=conf, available=avail)
+
+
+def calculate_dynamic_weights_batch(contexts: List[GameContext]) -> List[Dict[str, float]]:
+    """calculate_dynamic_weights for many contexts; base weights are loaded
+    once per sport and the multipliers applied as column operations."""
+    n = len(contexts)
+    bases: Dict[str, Dict[str, float]] = {}
+    for ctx in contexts:
+        if ctx.sport not in bases:
+            db_weights = _load_db_weights(ctx.sport)
+            bases[ctx.sport] = db_weights if db_weights else SPORT_BASE_WEIGHTS.get(ctx.sport, SPORT_BASE_WEIGHTS["NBA"])
+
+    keys: List[str] = list(PILLAR_ORDER)
+    for base in bases.values():
+        keys.extend(k for k in base if k not in keys)
+    col = {k: i for i, k in enumerate(keys)}
+    w = np.zeros((n, len(keys)))
+    for i, ctx in enumerate(contexts):
+        for k, v in bases[ctx.sport].items():
+            w[i, col[k]] = v
+
+    def scale(mask, pillar, factor):
+        j = col[pillar]
+        w[:, j] = np.where(mask, w[:, j] * factor, w[:, j])
+
+    market = np.array([c.market for c in contexts], dtype=object)
+    significance = np.array([c.significance for c in contexts], dtype=object)
+    hours = np.array([c.time_to_game_hours for c in contexts], dtype=np.float64)
+    exchange = np.array([c.has_exchange_data for c in contexts], dtype=bool)
+    weather = np.array([c.has_weather_data for c in contexts], dtype=bool)
+    mid_major = np.array([c.sport == "NCAAB" and c.conference_tier == "mid_major" for c in contexts], dtype=bool)
+
+    # Same multipliers, in the same order, as calculate_dynamic_weights
+    scale(market == "total", "GAME_ENV", 1.5)
+    scale(market == "total", "FLOW", 0.8)
+    scale(market == "ml", "EXECUTION", 1.3)
+    scale(significance == "playoff", "INCENTIVES", 2.0)
+    scale(significance == "playoff", "TIME_DECAY", 0.5)
+    scale(significance == "rivalry", "INCENTIVES", 1.5)
+    scale(significance == "elimination", "INCENTIVES", 2.5)
+    scale(significance == "elimination", "EXECUTION", 1.3)
+    scale(hours < 3, "SHOCKS", 1.5)
+    scale(hours < 3, "TIME_DECAY", 0.3)
+    scale(hours > 72, "TIME_DECAY", 2.0)
+    scale(exchange, "FLOW", 1.2)
+    scale(~exchange, "FLOW", 0.7)
+    scale(weather, "GAME_ENV", 1.3)
+    scale(mid_major, "SHOCKS", 1.3)
+    scale(mid_major, "FLOW", 0.5)
+
+    # Normalize, summing in each sport's own key order like sum(dict.values())
+    out: List[Optional[Dict[str, float]]] = [None] * n
+    sports = np.array([c.sport for c in contexts], dtype=object)
+    for sport, base in bases.items():
+        rows = np.flatnonzero(sports == sport)
+        order = [col[k] for k in base]
+        total = np.zeros(len(rows))
+        for j in order:
+            total = total + w[rows, j]
+        normalized = w[rows][:, order] / total[:, None]
+        names = list(base)
+        for r, values in zip(rows, normalized.tolist()):
+            out[r] = dict(zip(names, values))
+    return out
+
+
+def evaluate_batch(games: List[dict], contexts: List[GameContext]) -> List[Optional[dict]]:
+    """Variable engine for a whole slate in one vectorized pass.
+
+    Args:
+        games: per game {pillar_results, team_stats, opening_line, current_line}
+               (the calculate_all_variables arguments)
+        contexts: matching GameContext per game (context.sport is the sport)
+
+    Returns per game {enhanced_composite, avg_confidence, pillar_scores,
+    all_variables, dynamic_weights, summary} — the values the scalar path
+    produces — or None for a game whose inputs the scalar path would
+    also have failed on.
+    """
+    results: List[Optional[dict]] = [None] * len(games)
+    raw_inputs, ok = [], []
+    for i, (game, ctx) in enumerate(zip(games, contexts)):
+        try:
+            raw_inputs.append(extract_raw_inputs(
+                game.get("pillar_results", {}), ctx.sport,
+                team_stats=game.get("team_stats"),
+                opening_line=game.get("opening_line"),
+                current_line=game.get("current_line"),
+            ))
+            ok.append(i)
+        except (TypeError, ValueError, AttributeError) as e:
+            logger.warning(f"[VarEngine] Batch input rejected for game {i}: {e}")
+    if not ok:
+        return results
+
+    ok_contexts = [contexts[i] for i in ok]
+    batch = calculate_all_variables_batch(build_slate(raw_inputs), [c.sport for c in ok_contexts])
+    weights = calculate_dynamic_weights_batch(ok_contexts)
+    n = len(ok)
+
+    # Pillar scores: confidence-weighted mean of available variables,
+    # accumulated in variable order like aggregate_pillar_scores
+    contrib = np.where(batch.available, batch.normalized * batch.confidence, 0.0)
+    conf_avail = np.where(batch.available, batch.confidence, 0.0)
+    pillar_score = np.zeros((n, len(PILLAR_ORDER)))
+    with np.errstate(invalid="ignore", divide="ignore"):
+        for p, pillar in enumerate(PILLAR_ORDER):
+            ws = np.zeros(n)
+            wt = np.zeros(n)
+            for j in _PILLAR_COLUMNS[pillar]:
+                ws = ws + contrib[:, j]
+                wt = wt + conf_avail[:, j]
+            pillar_score[:, p] = np.where(wt > 0, ws / wt, 0.5)
+
+        pillar_weight = np.array([[w.get(p, 0.1) for p in PILLAR_ORDER] for w in weights])
+        comp_sum = np.zeros(n)
+        comp_wt = np.zeros(n)
+        for p in range(len(PILLAR_ORDER)):
+            comp_sum = comp_sum + pillar_score[:, p] * pillar_weight[:, p]
+            comp_wt = comp_wt + pillar_weight[:, p]
+        composite = np.where(comp_wt > 0, comp_sum / comp_wt, 0.5)
+
+        conf_total = np.zeros(n)
+        for j in range(len(VARIABLE_CODES)):
+            conf_total = conf_total + conf_avail[:, j]
+        n_avail = batch.available.sum(axis=1)
+        avg_confidence = np.where(n_avail > 0, conf_total / n_avail, 0.0)
+
+        # get_variable_summary, per pillar
+        summary_by_pillar = {}
+        for pillar in PILLAR_ORDER:
+            cols = _PILLAR_COLUMNS[pillar]
+            p_conf = np.zeros(n)
+            for j in cols:
+                p_conf = p_conf + conf_avail[:, j]
+            p_avail = batch.available[:, cols].sum(axis=1)
+            summary_by_pillar[pillar] = (
+                p_avail.tolist(),
+                np.where(p_avail > 0, p_conf / p_avail, 0.0).tolist(),
+            )
+
+    composite_l, avg_confidence_l = composite.tolist(), avg_confidence.tolist()
+    n_avail_l = n_avail.tolist()
+    pillar_score_l, pillar_weight_l = pillar_score.tolist(), pillar_weight.tolist()
+    for k, i in enumerate(ok):
+        all_variables = batch.variables(k)
+        results[i] = {
+            "enhanced_composite": composite_l[k],
+            "avg_confidence": avg_confidence_l[k],
+            "pillar_scores": [
+                PillarScore(pillar, pillar_score_l[k][p], pillar_weight_l[k][p], all_variables[pillar])
+                for p, pillar in enumerate(PILLAR_ORDER)
+            ],
+            "all_variables": all_variables,
+            "dynamic_weights": weights[k],
+            "summary": {
+                "total_variables": len(VARIABLE_CODES),
+                "available_variables": n_avail_l[k],
+                "coverage_pct": round(n_avail_l[k] / len(VARIABLE_CODES) * 100, 1),
+                "by_pillar": {
+                    pillar: {
+                        "total": len(_PILLAR_COLUMNS[pillar]),
+                        "available": summary_by_pillar[pillar][0][k],
+                        "avg_confidence": summary_by_pillar[pillar][1][k],
+                    }
+                    for pillar in PILLAR_ORDER
+                },
+            },
+        }
+    return results
+
+
 # ═══════════════════════════════════════════════════════════════════════
 # DIAGNOSTICS
 # ═══════════════════════════════════════════════════════════════════════
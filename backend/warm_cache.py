@@ -0,0 +1,232 @@
+"""
+Warm Cache (disk-backed)
+
+A small SQLite file holding the last good copy of data the backend would
+otherwise refetch after every deploy or crash restart:
+- "source":    data_sources cache entries for config.WARM_CACHE_SOURCES
+               (ESPN standings / injuries / scoreboards, team stats)
+- "perf":      perf_cache performance buckets
+- "odds":      the cached_odds active-game list exchange matching uses
+- "composite": composite_latest rows
+
+Callers keep their in-memory caches; this only answers their first miss
+after boot. Each read returns the value with its age, and the caller applies
+the same freshness rule it uses in memory, so a warm value is never served
+where a fresh in-memory one would not have been.
+
+Values are stored as JSON. Every row carries its namespace's version
+(config.WARM_CACHE_VERSIONS). Rows written under another version are
+skipped, so a deploy that changes a value's shape never loads old data.
+
+Writes and deletes are queued and flushed by a background thread every
+WARM_CACHE_FLUSH_SECONDS in one transaction, so no request or job waits on
+disk. Deleting a namespace queues a tombstone that the flush applies after
+the upserts, dropping only rows stored before the delete. The file is opened lazily on first use, and rows older than
+WARM_CACHE_RETENTION_HOURS are dropped at that point.
+
+If WARM_CACHE_PATH is empty or the file can't be opened, every call is a
+no-op and callers behave as they did without a warm cache.
+"""
+import json
+import logging
+import sqlite3
+import threading
+import time
+from typing import Any, Optional
+
+from config import (
+    WARM_CACHE_PATH, WARM_CACHE_FLUSH_SECONDS, WARM_CACHE_RETENTION_HOURS,
+    WARM_CACHE_VERSIONS,
+)
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS warm_entries (
+    namespace TEXT NOT NULL,
+    key       TEXT NOT NULL,
+    version   INTEGER NOT NULL,
+    stored_at REAL NOT NULL,
+    value     TEXT NOT NULL,
+    PRIMARY KEY (namespace, key)
+)
+"""
+
+_METRIC_FIELDS = ("hits", "misses", "expired", "version_skips", "writes", "write_errors")
+
+_DELETED = object()
+
+
+class WarmCache:
+    """Versioned JSON key/value store in SQLite with write-behind."""
+
+    def __init__(self, path: str = WARM_CACHE_PATH):
+        self.path = path
+        self._conn: Optional[sqlite3.Connection] = None
+        self._opened = False
+        self._lock = threading.Lock()          # guards the connection
+        self._pending_lock = threading.Lock()  # guards _pending
+        # (namespace, key) -> (json text | _DELETED, stored_at); key None is a
+        # namespace tombstone
+        self._pending: dict[tuple, tuple] = {}
+        self._flusher: Optional[threading.Thread] = None
+        self._metrics = {f: 0 for f in _METRIC_FIELDS}
+
+    # -----------------------------------------------------------------
+    # Internals
+    # -----------------------------------------------------------------
+    def _connection(self) -> Optional[sqlite3.Connection]:
+        """Open the file on first use (call with self._lock held)."""
+        if self._opened:
+            return self._conn
+        self._opened = True
+        if not self.path:
+            return None
+        try:
+            conn = sqlite3.connect(self.path, check_same_thread=False, timeout=5)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(_SCHEMA)
+            cutoff = time.time() - WARM_CACHE_RETENTION_HOURS * 3600
+            dropped = conn.execute(
+                "DELETE FROM warm_entries WHERE stored_at < ?", (cutoff,)
+            ).rowcount
+            conn.commit()
+            self._conn = conn
+            logger.info(f"[WarmCache] Opened {self.path} (dropped {dropped} expired rows)")
+        except sqlite3.Error as e:
+            logger.warning(f"[WarmCache] Disabled, cannot open {self.path}: {e}")
+            self._conn = None
+        return self._conn
+
+    def _ensure_flusher(self):
+        if self._flusher is None or not self._flusher.is_alive():
+            self._flusher = threading.Thread(target=self._flush_loop, name="warm-cache-flush",
+                                             daemon=True)
+            self._flusher.start()
+
+    def _flush_loop(self):
+        while True:
+            time.sleep(WARM_CACHE_FLUSH_SECONDS)
+            self.flush()
+
+    # -----------------------------------------------------------------
+    # Public API
+    # -----------------------------------------------------------------
+    def get(self, namespace: str, key: str, max_age: float) -> Optional[tuple[Any, float]]:
+        """Return (value, age_seconds) if a current-version row for key is
+        younger than max_age, else None."""
+        with self._pending_lock:
+            pending = self._pending.get((namespace, key))
+            tombstone = self._pending.get((namespace, None))
+        if pending is not None:
+            text, stored_at = pending
+        else:
+            with self._lock:
+                conn = self._connection()
+                if conn is None:
+                    return None
+                try:
+                    row = conn.execute(
+                        "SELECT version, stored_at, value FROM warm_entries "
+                        "WHERE namespace = ? AND key = ?", (namespace, key),
+                    ).fetchone()
+                except sqlite3.Error as e:
+                    logger.warning(f"[WarmCache] Read failed for {namespace}/{key}: {e}")
+                    return None
+            if row is None:
+                self._metrics["misses"] += 1
+                return None
+            version, stored_at, text = row
+            if tombstone is not None and stored_at <= tombstone[1]:
+                self._metrics["misses"] += 1
+                return None
+            if version != WARM_CACHE_VERSIONS.get(namespace, 1):
+                self._metrics["version_skips"] += 1
+                return None
+
+        if text is _DELETED:
+            self._metrics["misses"] += 1
+            return None
+        age = max(0.0, time.time() - stored_at)
+        if age >= max_age:
+            self._metrics["expired"] += 1
+            return None
+        self._metrics["hits"] += 1
+        return json.loads(text), age
+
+    def put(self, namespace: str, key: str, value: Any):
+        """Queue value (JSON-serializable) to be written on the next flush."""
+        if not self.path:
+            return
+        try:
+            text = json.dumps(value, separators=(",", ":"))
+        except (TypeError, ValueError) as e:
+            logger.debug(f"[WarmCache] Not persisting {namespace}/{key}: {e}")
+            return
+        with self._pending_lock:
+            self._pending[(namespace, key)] = (text, time.time())
+            self._ensure_flusher()
+
+    def delete(self, namespace: str, key: str = None):
+        """Queue dropping one key, or a whole namespace when key is None."""
+        if not self.path:
+            return
+        with self._pending_lock:
+            if key is None:
+                for pk in [pk for pk in self._pending if pk[0] == namespace]:
+                    del self._pending[pk]
+            self._pending[(namespace, key)] = (_DELETED, time.time())
+            self._ensure_flusher()
+
+    def flush(self):
+        """Write every queued change in one transaction."""
+        with self._pending_lock:
+            if not self._pending:
+                return
+            batch, self._pending = self._pending, {}
+        upserts, deletes, namespace_deletes = [], [], []
+        for (namespace, key), (text, stored_at) in batch.items():
+            if key is None:
+                namespace_deletes.append((namespace, stored_at))
+            elif text is _DELETED:
+                deletes.append((namespace, key))
+            else:
+                upserts.append((namespace, key, WARM_CACHE_VERSIONS.get(namespace, 1),
+                                stored_at, text))
+        with self._lock:
+            conn = self._connection()
+            if conn is None:
+                return
+            try:
+                with conn:
+                    conn.executemany(
+                        "INSERT OR REPLACE INTO warm_entries "
+                        "(namespace, key, version, stored_at, value) VALUES (?, ?, ?, ?, ?)",
+                        upserts,
+                    )
+                    conn.executemany(
+                        "DELETE FROM warm_entries WHERE namespace = ? AND key = ?", deletes,
+                    )
+                    # rows put after the namespace delete carry a later stored_at
+                    conn.executemany(
+                        "DELETE FROM warm_entries WHERE namespace = ? AND stored_at <= ?",
+                        namespace_deletes,
+                    )
+                self._metrics["writes"] += len(upserts) + len(deletes) + len(namespace_deletes)
+            except sqlite3.Error as e:
+                self._metrics["write_errors"] += len(batch)
+                logger.warning(f"[WarmCache] Flush of {len(batch)} rows failed: {e}")
+
+    def stats(self) -> dict:
+        with self._pending_lock:
+            pending = len(self._pending)
+        return {
+            "enabled": bool(self.path) and (not self._opened or self._conn is not None),
+            "path": self.path,
+            "pending_writes": pending,
+            **self._metrics,
+        }
+
+
+warm_cache = WarmCache()
@@ -0,0 +1,132 @@
+-- Migration 023: Materialized performance aggregates
+-- One row per (game day, sport, market, confidence tier, signal) holding
+-- summed pick outcomes. InternalGrader increments these as prediction_grades
+-- are written, so /api/internal/edge/performance sums a few hundred buckets
+-- instead of scanning (and capping at 5000) raw prediction_grades rows.
+--
+-- Picks are deduplicated per game × market before counting: FanDuel
+-- preferred, DraftKings as fallback (same rule as the old Python path).
+
+CREATE TABLE IF NOT EXISTS performance_buckets (
+    day date NOT NULL,
+    sport_key text NOT NULL,
+    market_type text NOT NULL,
+    confidence_tier int NOT NULL,
+    signal text NOT NULL DEFAULT '',
+    total int NOT NULL DEFAULT 0,
+    correct int NOT NULL DEFAULT 0,
+    wrong int NOT NULL DEFAULT 0,
+    push int NOT NULL DEFAULT 0,
+    profit double precision NOT NULL DEFAULT 0,
+    composite_correct_sum double precision NOT NULL DEFAULT 0,
+    composite_correct_n int NOT NULL DEFAULT 0,
+    composite_wrong_sum double precision NOT NULL DEFAULT 0,
+    composite_wrong_n int NOT NULL DEFAULT 0,
+    updated_at timestamptz DEFAULT now(),
+    PRIMARY KEY (day, sport_key, market_type, confidence_tier, signal)
+);
+
+CREATE INDEX IF NOT EXISTS idx_perf_buckets_sport_day ON performance_buckets (sport_key, day);
+
+-- Atomically add a batch of bucket deltas (keys must be unique per call;
+-- the backend pre-aggregates them).
+CREATE OR REPLACE FUNCTION increment_performance_buckets(p_rows jsonb)
+RETURNS void
+LANGUAGE plpgsql
+SECURITY DEFINER
+AS $$
+BEGIN
+    INSERT INTO performance_buckets AS b (
+        day, sport_key, market_type, confidence_tier, signal,
+        total, correct, wrong, push, profit,
+        composite_correct_sum, composite_correct_n,
+        composite_wrong_sum, composite_wrong_n, updated_at
+    )
+    SELECT
+        (r->>'day')::date,
+        r->>'sport_key',
+        r->>'market_type',
+        (r->>'confidence_tier')::int,
+        coalesce(r->>'signal', ''),
+        (r->>'total')::int,
+        (r->>'correct')::int,
+        (r->>'wrong')::int,
+        (r->>'push')::int,
+        (r->>'profit')::double precision,
+        (r->>'composite_correct_sum')::double precision,
+        (r->>'composite_correct_n')::int,
+        (r->>'composite_wrong_sum')::double precision,
+        (r->>'composite_wrong_n')::int,
+        now()
+    FROM jsonb_array_elements(p_rows) AS r
+    ON CONFLICT (day, sport_key, market_type, confidence_tier, signal) DO UPDATE SET
+        total = b.total + EXCLUDED.total,
+        correct = b.correct + EXCLUDED.correct,
+        wrong = b.wrong + EXCLUDED.wrong,
+        push = b.push + EXCLUDED.push,
+        profit = b.profit + EXCLUDED.profit,
+        composite_correct_sum = b.composite_correct_sum + EXCLUDED.composite_correct_sum,
+        composite_correct_n = b.composite_correct_n + EXCLUDED.composite_correct_n,
+        composite_wrong_sum = b.composite_wrong_sum + EXCLUDED.composite_wrong_sum,
+        composite_wrong_n = b.composite_wrong_n + EXCLUDED.composite_wrong_n,
+        updated_at = now();
+END;
+$$;
+
+-- Backfill from existing prediction_grades
+INSERT INTO performance_buckets (
+    day, sport_key, market_type, confidence_tier, signal,
+    total, correct, wrong, push, profit,
+    composite_correct_sum, composite_correct_n,
+    composite_wrong_sum, composite_wrong_n
+)
+SELECT
+    day,
+    sport_key,
+    market_type,
+    confidence_tier,
+    signal,
+    count(*)::int,
+    count(*) FILTER (WHERE is_correct = true)::int,
+    count(*) FILTER (WHERE is_correct = false)::int,
+    count(*) FILTER (WHERE is_correct IS NULL)::int,
+    coalesce(sum(CASE
+        WHEN is_correct = true THEN
+            CASE
+                WHEN book_odds IS NULL OR book_odds = 0 THEN 100.0 / 110
+                WHEN book_odds < 0 THEN 100.0 / abs(book_odds)
+                ELSE book_odds / 100.0
+            END
+        WHEN is_correct = false THEN -1.0
+        ELSE 0
+    END), 0),
+    coalesce(sum(pillar_composite) FILTER (WHERE is_correct = true), 0),
+    count(pillar_composite) FILTER (WHERE is_correct = true)::int,
+    coalesce(sum(pillar_composite) FILTER (WHERE is_correct = false), 0),
+    count(pillar_composite) FILTER (WHERE is_correct = false)::int
+FROM (
+    SELECT DISTINCT ON (pg.game_id, pg.market_type)
+        coalesce(gr.commence_time::date, pg.created_at::date) AS day,
+        CASE
+            WHEN pg.sport_key IN ('basketball_nba', 'BASKETBALL_NBA', 'NBA') THEN 'NBA'
+            WHEN pg.sport_key IN ('americanfootball_nfl', 'AMERICANFOOTBALL_NFL', 'NFL') THEN 'NFL'
+            WHEN pg.sport_key IN ('icehockey_nhl', 'ICEHOCKEY_NHL', 'NHL') THEN 'NHL'
+            WHEN pg.sport_key IN ('americanfootball_ncaaf', 'AMERICANFOOTBALL_NCAAF', 'NCAAF') THEN 'NCAAF'
+            WHEN pg.sport_key IN ('basketball_ncaab', 'BASKETBALL_NCAAB', 'NCAAB') THEN 'NCAAB'
+            WHEN pg.sport_key IN ('soccer_epl', 'SOCCER_EPL', 'EPL') THEN 'EPL'
+            ELSE pg.sport_key
+        END AS sport_key,
+        pg.market_type,
+        coalesce(pg.confidence_tier, 0) AS confidence_tier,
+        coalesce(pg.signal, '') AS signal,
+        pg.is_correct,
+        pg.book_odds,
+        pg.pillar_composite
+    FROM prediction_grades pg
+    LEFT JOIN game_results gr ON gr.game_id = pg.game_id
+    WHERE pg.graded_at IS NOT NULL
+      AND pg.book_name IN ('fanduel', 'draftkings')
+    ORDER BY pg.game_id, pg.market_type, (pg.book_name = 'fanduel') DESC, pg.created_at DESC
+) picks
+GROUP BY day, sport_key, market_type, confidence_tier, signal
+ON CONFLICT (day, sport_key, market_type, confidence_tier, signal) DO NOTHING;
@@ -0,0 +1,32 @@
+-- Migration 024: Latest composite per game
+-- composite_history is append-only (one row per recalc / fast refresh), so
+-- "latest fair lines for these games" used to pull every historical row and
+-- dedupe in Python. composite_latest keeps exactly one row per game: the
+-- full history row as jsonb, upserted by the backend right after each
+-- composite_history insert (backend/composite_latest.py).
+--
+-- The row is stored as jsonb rather than mirrored columns so live-only
+-- columns (live_ceq, hold_signal, score_*) never need a schema change here.
+
+CREATE TABLE IF NOT EXISTS composite_latest (
+    game_id text PRIMARY KEY,
+    sport_key text NOT NULL,
+    timestamp timestamptz NOT NULL,
+    data jsonb NOT NULL,
+    updated_at timestamptz DEFAULT now()
+);
+
+CREATE INDEX IF NOT EXISTS idx_composite_latest_sport ON composite_latest (sport_key, timestamp);
+
+ALTER TABLE composite_latest DISABLE ROW LEVEL SECURITY;
+
+-- Backfill from existing history
+INSERT INTO composite_latest (game_id, sport_key, timestamp, data)
+SELECT DISTINCT ON (ch.game_id)
+    ch.game_id,
+    ch.sport_key,
+    ch.timestamp,
+    to_jsonb(ch) - 'id'
+FROM composite_history ch
+ORDER BY ch.game_id, ch.timestamp DESC
+ON CONFLICT (game_id) DO NOTHING;
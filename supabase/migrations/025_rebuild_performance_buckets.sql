@@ -0,0 +1,82 @@
+-- Migration 025: Rebuild performance_buckets from prediction_grades
+-- performance_buckets is maintained by increments as grades are written, so
+-- it drifts whenever grades are deleted outside regrade_all (backfill purge)
+-- or an increment RPC fails. rebuild_performance_buckets() recomputes every
+-- bucket from prediction_grades with the same query as the 023 backfill, in
+-- one transaction; the backend calls it after grade deletes and when an
+-- increment fails (retried by the perf_cache refresh job until it succeeds).
+
+CREATE OR REPLACE FUNCTION rebuild_performance_buckets()
+RETURNS int
+LANGUAGE plpgsql
+SECURITY DEFINER
+AS $$
+DECLARE
+    n int;
+BEGIN
+    -- Hold off concurrent increments until the rebuilt set is committed
+    LOCK TABLE performance_buckets IN EXCLUSIVE MODE;
+    -- WHERE true: pg-safeupdate rejects an unqualified DELETE. (DELETE rather
+    -- than TRUNCATE so readers keep seeing the old buckets until commit.)
+    DELETE FROM performance_buckets WHERE true;
+
+    INSERT INTO performance_buckets (
+        day, sport_key, market_type, confidence_tier, signal,
+        total, correct, wrong, push, profit,
+        composite_correct_sum, composite_correct_n,
+        composite_wrong_sum, composite_wrong_n
+    )
+    SELECT
+        day,
+        sport_key,
+        market_type,
+        confidence_tier,
+        signal,
+        count(*)::int,
+        count(*) FILTER (WHERE is_correct = true)::int,
+        count(*) FILTER (WHERE is_correct = false)::int,
+        count(*) FILTER (WHERE is_correct IS NULL)::int,
+        coalesce(sum(CASE
+            WHEN is_correct = true THEN
+                CASE
+                    WHEN book_odds IS NULL OR book_odds = 0 THEN 100.0 / 110
+                    WHEN book_odds < 0 THEN 100.0 / abs(book_odds)
+                    ELSE book_odds / 100.0
+                END
+            WHEN is_correct = false THEN -1.0
+            ELSE 0
+        END), 0),
+        coalesce(sum(pillar_composite) FILTER (WHERE is_correct = true), 0),
+        count(pillar_composite) FILTER (WHERE is_correct = true)::int,
+        coalesce(sum(pillar_composite) FILTER (WHERE is_correct = false), 0),
+        count(pillar_composite) FILTER (WHERE is_correct = false)::int
+    FROM (
+        SELECT DISTINCT ON (pg.game_id, pg.market_type)
+            coalesce(gr.commence_time::date, pg.created_at::date) AS day,
+            CASE
+                WHEN pg.sport_key IN ('basketball_nba', 'BASKETBALL_NBA', 'NBA') THEN 'NBA'
+                WHEN pg.sport_key IN ('americanfootball_nfl', 'AMERICANFOOTBALL_NFL', 'NFL') THEN 'NFL'
+                WHEN pg.sport_key IN ('icehockey_nhl', 'ICEHOCKEY_NHL', 'NHL') THEN 'NHL'
+                WHEN pg.sport_key IN ('americanfootball_ncaaf', 'AMERICANFOOTBALL_NCAAF', 'NCAAF') THEN 'NCAAF'
+                WHEN pg.sport_key IN ('basketball_ncaab', 'BASKETBALL_NCAAB', 'NCAAB') THEN 'NCAAB'
+                WHEN pg.sport_key IN ('soccer_epl', 'SOCCER_EPL', 'EPL') THEN 'EPL'
+                ELSE pg.sport_key
+            END AS sport_key,
+            pg.market_type,
+            coalesce(pg.confidence_tier, 0) AS confidence_tier,
+            coalesce(pg.signal, '') AS signal,
+            pg.is_correct,
+            pg.book_odds,
+            pg.pillar_composite
+        FROM prediction_grades pg
+        LEFT JOIN game_results gr ON gr.game_id = pg.game_id
+        WHERE pg.graded_at IS NOT NULL
+          AND pg.book_name IN ('fanduel', 'draftkings')
+        ORDER BY pg.game_id, pg.market_type, (pg.book_name = 'fanduel') DESC, pg.created_at DESC
+    ) picks
+    GROUP BY day, sport_key, market_type, confidence_tier, signal;
+
+    GET DIAGNOSTICS n = ROW_COUNT;
+    RETURN n;
+END;
+$$;
@@ -1,9 +1,12 @@
-import sqlite3, csv, random
+import sqlite3, csv
 from collections import defaultdict
 from statistics import mean
-from math import sqrt
 
-random.seed(42)
+import numpy as np
+
+from bootstrap_vec import bootstrap, bootstrap_cells, order_ci
+
+SEED = 42
 
 # Load bias corrections
 bias_map = {}
@@ -109,12 +112,50 @@ def compute_ev_from_events(events):
     avg_pnl = mean(pnls)
     return {"roi": roi, "avg_pnl": avg_pnl, "n": n_total, "Sw": Sw, "Sl": Sl, "total_pnl": total_pnl}
 
+def event_cols(events):
+    """Column arrays of an event list for the vectorized bootstrap."""
+    entry = np.array([e["entry"] for e in events], dtype=float)
+    max_p = np.array([np.nan if e["max_price"] is None else e["max_price"] for e in events],
+                     dtype=float)
+    return {"is_w": np.array([e["side"] == "winner" for e in events]),
+            "entry": entry,
+            "scalp": max_p >= np.minimum(99, entry + EXIT_C)}
+
+def _ev_parts(cols, idx):
+    """(total_pnl, total_cost) per resample row of idx, as compute_ev_from_events()."""
+    is_w, scalp, entry = cols["is_w"][idx], cols["scalp"][idx], cols["entry"][idx]
+    n_w = is_w.sum(1)
+    n_l = idx.shape[1] - n_w
+    Sw = np.where(n_w > 0, (scalp & is_w).sum(1) / np.maximum(n_w, 1), 0)
+    Sl = np.where(n_l > 0, (scalp & ~is_w).sum(1) / np.maximum(n_l, 1), 0)
+    scalp_pnl = EXIT_C * QTY / 100
+    settle_w = np.where(is_w, (99 - entry) * QTY / 100, 0).sum(1)
+    settle_l = np.where(is_w, 0, -(entry - 1) * QTY / 100).sum(1)
+    total_pnl = (n_w * Sw * scalp_pnl + (1 - Sw) * settle_w
+                 + n_l * Sl * scalp_pnl + (1 - Sl) * settle_l)
+    total_cost = (entry * QTY / 100).sum(1)
+    return total_pnl, total_cost
+
+def roi_stat(cols, idx):
+    total_pnl, total_cost = _ev_parts(cols, idx)
+    roi = np.where(total_cost > 0, total_pnl / np.where(total_cost > 0, total_cost, 1) * 100, 0)
+    return np.where(idx.shape[1] < 10, np.nan, roi)
+
+def total_pnl_stat(cols, idx):
+    total_pnl, _ = _ev_parts(cols, idx)
+    return np.where(idx.shape[1] < 10, np.nan, total_pnl)
+
 print("Bootstrap CI (N=%d iterations) for %d SCALPER_EDGE cells" % (N_BOOT, len(scalper_edge_cells)))
 print("=" * 120)
 print("%-30s %5s %8s %8s %8s %8s %8s %8s %8s %5s" % (
     "Cell", "N", "Point", "Boot_m", "Boot_s", "CI_2.5%", "CI_97.5%", "Anal_lo", "Anal_hi", "Match"))
 print("-" * 120)
 
+# Bootstrap every eligible cell at once (all resamples per cell in one pass)
+boot = bootstrap_cells({cell: event_cols(cell_events[cell]) for cell in scalper_edge_cells
+                        if len(cell_events.get(cell, [])) >= 20},
+                       roi_stat, B=N_BOOT, seed=SEED)
+
 results = []
 for cell in scalper_edge_cells:
     events = cell_events.get(cell, [])
@@ -125,19 +166,10 @@ for cell in scalper_edge_cells:
     # Point estimate
     point = compute_ev_from_events(events)
 
-    # Bootstrap
-    boot_rois = []
-    for _ in range(N_BOOT):
-        sample = random.choices(events, k=len(events))
-        result = compute_ev_from_events(sample)
-        if result:
-            boot_rois.append(result["roi"])
-
-    boot_rois.sort()
-    boot_mean = mean(boot_rois)
-    boot_std = sqrt(sum((x - boot_mean)**2 for x in boot_rois) / (len(boot_rois) - 1))
-    ci_lo = boot_rois[int(0.025 * len(boot_rois))]
-    ci_hi = boot_rois[int(0.975 * len(boot_rois))]
+    boot_rois = boot[cell]["boots"]
+    boot_mean = boot[cell]["mean"]
+    boot_std = boot[cell]["std"]
+    ci_lo, ci_hi = order_ci(boot_rois)
 
     # Analytical CI from scorecard
     anal_lo = None
@@ -184,18 +216,11 @@ all_events = []
 for cell in scalper_edge_cells:
     all_events.extend(cell_events.get(cell, []))
 
-port_boots = []
-for _ in range(N_BOOT):
-    sample = random.choices(all_events, k=len(all_events))
-    r = compute_ev_from_events(sample)
-    if r:
-        port_boots.append(r["total_pnl"])
-
-port_boots.sort()
-port_mean = mean(port_boots)
-port_std = sqrt(sum((x - port_mean)**2 for x in port_boots) / (len(port_boots) - 1))
-port_lo = port_boots[int(0.025 * len(port_boots))]
-port_hi = port_boots[int(0.975 * len(port_boots))]
+port = bootstrap(event_cols(all_events), total_pnl_stat, B=N_BOOT,
+                 rng=np.random.default_rng(SEED))
+port_mean = port["mean"]
+port_std = port["std"]
+port_lo, port_hi = order_ci(port["boots"])
 n_days = 99  # Jan-Apr ~99 trading days
 print("  Total events: %d over ~%d days" % (len(all_events), n_days))
 print("  Portfolio PnL: $%.2f [95%% CI: $%.2f to $%.2f]" % (port_mean, port_lo, port_hi))
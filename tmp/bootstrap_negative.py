@@ -1,7 +1,12 @@
-import sqlite3, csv, random
+import sqlite3, csv
 from collections import defaultdict
 
-random.seed(42)
+import numpy as np
+
+from bootstrap_vec import bootstrap, bootstrap_cells
+
+SEED = 42
+N_BOOT = 1000
 
 bias_map = {}
 with open("/tmp/per_cell_verification/entry_price_bias_by_cell.csv") as f:
@@ -64,6 +69,18 @@ def compute_roi(events):
     total_pnl = sum(event_pnl(e[0], e[1], e[2], e[3]) for e in events)
     return total_pnl / total_cost * 100 if total_cost > 0 else 0
 
+def event_cols(events):
+    """Per-event pnl / cost arrays, in day order so block resampling keeps
+    same-day fills together."""
+    events = sorted(events, key=lambda e: e[4])
+    return {"pnl": np.array([event_pnl(e[0], e[1], e[2], e[3]) for e in events]),
+            "cost": np.array([e[1] * QTY / 100 for e in events])}
+
+def roi_stat(cols, idx):
+    total_cost = cols["cost"][idx].sum(1)
+    total_pnl = cols["pnl"][idx].sum(1)
+    return np.where(total_cost > 0, total_pnl / np.where(total_cost > 0, total_cost, 1) * 100, 0)
+
 target_cells = [
     # SCALPER_NEGATIVE
     "ATP_CHALL_leader_65-69", "WTA_MAIN_leader_65-69", "ATP_MAIN_leader_60-64",
@@ -73,9 +90,16 @@ target_cells = [
 ]
 
 print("Bootstrap CI for SCALPER_NEGATIVE + SETTLEMENT_RIDE_CONTAMINATED cells")
-print("=" * 95)
-print("%-32s %-5s %-8s %-8s %-8s %-8s %s" % ("cell", "N", "point", "boot_m", "2.5%", "97.5%", "verdict"))
-print("-" * 95)
+print("(blk = moving-block bootstrap over day-ordered fills, for same-day clustering)")
+print("=" * 113)
+print("%-32s %-5s %-8s %-8s %-8s %-8s %-8s %-8s %s" % (
+    "cell", "N", "point", "boot_m", "2.5%", "97.5%", "blk2.5%", "blk97.5%", "verdict"))
+print("-" * 113)
+
+eligible = {cell: event_cols(cell_events[cell]) for cell in target_cells
+            if len(cell_events.get(cell, [])) >= 10}
+boot = bootstrap_cells(eligible, roi_stat, B=N_BOOT, seed=SEED)
+boot_blk = bootstrap_cells(eligible, roi_stat, B=N_BOOT, seed=SEED, method="block")
 
 portfolio_events = []
 results = []
@@ -87,15 +111,11 @@ for cell in target_cells:
 
     point = compute_roi(events)
 
-    bootstrap_rois = []
-    for _ in range(1000):
-        sample = [random.choice(events) for _ in range(len(events))]
-        bootstrap_rois.append(compute_roi(sample))
-
-    bootstrap_rois.sort()
-    boot_mean = sum(bootstrap_rois) / len(bootstrap_rois)
+    bootstrap_rois = boot[cell]["boots"]
+    boot_mean = boot[cell]["mean"]
     p025 = bootstrap_rois[25]
     p975 = bootstrap_rois[974]
+    blk_lo, blk_hi = boot_blk[cell]["boots"][25], boot_blk[cell]["boots"][974]
 
     if p975 < 0:
         verdict = "CONFIRMED BLEED"
@@ -105,9 +125,11 @@ for cell in target_cells:
         verdict = "UNCERTAIN (crosses zero)"
 
     portfolio_events.extend(events)
-    results.append({"cell": cell, "n": len(events), "point": point, "boot_mean": boot_mean, "lo": p025, "hi": p975, "verdict": verdict})
+    results.append({"cell": cell, "n": len(events), "point": point, "boot_mean": boot_mean, "lo": p025, "hi": p975,
+                    "blk_lo": blk_lo, "blk_hi": blk_hi, "verdict": verdict})
 
-    print("  %-30s %-5d %+7.1f%% %+7.1f%% %+7.1f%% %+7.1f%% %s" % (cell, len(events), point, boot_mean, p025, p975, verdict))
+    print("  %-30s %-5d %+7.1f%% %+7.1f%% %+7.1f%% %+7.1f%% %+7.1f%% %+7.1f%% %s" % (
+        cell, len(events), point, boot_mean, p025, p975, blk_lo, blk_hi, verdict))
 
 # Summary
 print()
@@ -141,12 +163,10 @@ print("Daily ROI on capital cycled: %+.2f%%" % ((total_pnl/len(days))/(total_cos
 # Portfolio bootstrap
 print()
 print("=== PORTFOLIO BOOTSTRAP ===")
-port_boots = []
-for _ in range(1000):
-    sample = [random.choice(portfolio_events) for _ in range(len(portfolio_events))]
-    total_c = sum(e[1] * QTY / 100 for e in sample)
-    total_p = sum(event_pnl(e[0], e[1], e[2], e[3]) for e in sample)
-    port_boots.append(total_p / total_c * 100 if total_c > 0 else 0)
-port_boots.sort()
+port_cols = event_cols(portfolio_events)
+port_boots = bootstrap(port_cols, roi_stat, B=N_BOOT, rng=np.random.default_rng(SEED))["boots"]
 print("Portfolio ROI 95%% CI: [%+.2f%%, %+.2f%%]" % (port_boots[25], port_boots[974]))
 print("Portfolio PnL 95%% CI: [$%+.2f, $%+.2f]" % (port_boots[25]*total_cost/100, port_boots[974]*total_cost/100))
+blk_boots = bootstrap(port_cols, roi_stat, B=N_BOOT, rng=np.random.default_rng(SEED),
+                      method="block")["boots"]
+print("Portfolio ROI 95%% CI (block): [%+.2f%%, %+.2f%%]" % (blk_boots[25], blk_boots[974]))
@@ -0,0 +1,130 @@
+"""Vectorized bootstrap for per-cell economics.
+
+The bootstrap scripts used to resample event lists with random.choice in
+Python loops and recompute each statistic event by event. Here a cell is a
+dict of equal-length numpy columns, all B resamples' indices are drawn at once
+as a (B, n) array, and the statistic is written against that index array so
+every resample is computed in one pass:
+
+    def roi(cols, idx):                     # idx: (B, n) int array
+        return cols['pnl'][idx].sum(1) / cols['cost'][idx].sum(1) * 100
+
+    res = bootstrap(cols, roi, B=1000, rng=np.random.default_rng(42))
+    res['point'], res['boots']              # point estimate, sorted (B,) draws
+
+Resampling schemes (method=):
+  'iid'         plain case resampling, rng.integers(0, n, size=(B, n))
+  'stratified'  resample within each stratum (strata=labels), keeping every
+                stratum's count fixed, e.g. winner / loser sides of a cell
+  'block'       circular moving-block bootstrap over the column order (sort
+                events by time first), block_len consecutive events per draw,
+                for fills that cluster in time
+
+bootstrap_cells() runs a dict of cells over a process pool. Each cell's seed
+is derived from (seed, cell name), so results don't depend on cell order or
+worker count.
+"""
+import math
+import os
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+# resamples per index block; bounds the (chunk, n) index array for big cells
+CHUNK_ELEMS = 20_000_000
+
+
+def iid_indices(rng, n, B):
+    return rng.integers(0, n, size=(B, n))
+
+
+def stratified_indices(rng, strata, B):
+    """(B, n) indices resampling within each stratum of labels `strata`."""
+    strata = np.asarray(strata)
+    parts = []
+    for s in np.unique(strata):
+        pos = np.flatnonzero(strata == s)
+        parts.append(pos[rng.integers(0, len(pos), size=(B, len(pos)))])
+    return np.concatenate(parts, axis=1)
+
+
+def block_indices(rng, n, B, block_len):
+    """(B, n) circular moving-block indices: ceil(n / block_len) random starts,
+    each followed by block_len consecutive positions (wrapping), cut to n."""
+    block_len = max(1, min(int(block_len), n))
+    k = math.ceil(n / block_len)
+    starts = rng.integers(0, n, size=(B, k))
+    idx = (starts[:, :, None] + np.arange(block_len)) % n
+    return idx.reshape(B, k * block_len)[:, :n]
+
+
+def default_block_len(n):
+    return max(1, round(n ** (1 / 3)))
+
+
+def resample_indices(rng, n, B, method='iid', strata=None, block_len=None):
+    if method == 'iid':
+        return iid_indices(rng, n, B)
+    if method == 'stratified':
+        if strata is None:
+            raise ValueError('stratified bootstrap needs strata')
+        return stratified_indices(rng, strata, B)
+    if method == 'block':
+        return block_indices(rng, n, B, block_len or default_block_len(n))
+    raise ValueError(f'unknown bootstrap method {method!r}')
+
+
+def bootstrap(cols, stat, B=1000, rng=None, method='iid', strata=None, block_len=None):
+    """Point estimate and B bootstrap draws of stat(cols, idx) for one cell.
+
+    cols: dict of equal-length 1-D arrays. stat(cols, idx) maps a (b, n) index
+    array to b values (NaN for a resample where the stat is undefined; those
+    are dropped). Returns {'n', 'point', 'boots' (sorted), 'mean', 'std'}.
+    """
+    rng = rng if rng is not None else np.random.default_rng()
+    n = len(next(iter(cols.values())))
+    point = float(stat(cols, np.arange(n)[None, :])[0])
+    chunk = max(1, CHUNK_ELEMS // max(n, 1))
+    draws = []
+    for start in range(0, B, chunk):
+        b = min(chunk, B - start)
+        draws.append(np.asarray(stat(cols, resample_indices(rng, n, b, method, strata,
+                                                            block_len)), dtype=float))
+    boots = np.sort(np.concatenate(draws)) if draws else np.zeros(0)
+    boots = boots[~np.isnan(boots)]
+    mean = float(boots.mean()) if len(boots) else float('nan')
+    std = float(boots.std(ddof=1)) if len(boots) > 1 else float('nan')
+    return {'n': n, 'point': point, 'boots': boots, 'mean': mean, 'std': std}
+
+
+def order_ci(boots, lo=0.025, hi=0.975):
+    """(boots[int(lo*B)], boots[int(hi*B)]) from sorted draws (the scripts' convention)."""
+    B = len(boots)
+    return float(boots[int(lo * B)]), float(boots[min(int(hi * B), B - 1)])
+
+
+def cell_rng(seed, cell):
+    return np.random.default_rng([seed, zlib.crc32(str(cell).encode())])
+
+
+def _cell_job(args):
+    cell, cols, stat, B, seed, method, strata_col, block_len = args
+    strata = cols[strata_col] if strata_col else None
+    return cell, bootstrap(cols, stat, B, cell_rng(seed, cell), method, strata, block_len)
+
+
+def bootstrap_cells(cells, stat, B=1000, seed=42, method='iid', strata_col=None,
+                    block_len=None, workers=None):
+    """{cell: bootstrap(...)} for every {cell: cols} on a process pool.
+
+    stat must be a module-level function (it's pickled to the workers).
+    strata_col names the column holding stratum labels for method='stratified'.
+    workers=1 runs in-process.
+    """
+    jobs = [(cell, cols, stat, B, seed, method, strata_col, block_len)
+            for cell, cols in cells.items()]
+    if workers == 1 or len(jobs) <= 1:
+        return dict(map(_cell_job, jobs))
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+        return dict(pool.map(_cell_job, jobs))
@@ -0,0 +1,209 @@
+"""Vectorized step6 replay: maker entry + whole DCA x exit x strategy grids per ticker.
+
+Same trade model as replay_v5.maker_fill() / simulate(), but instead of walking
+the ticks once per (offset, dca, exit, strategy) it answers every config with
+first-crossing searches on running extremes of the post-entry ticks:
+
+- entry:  candidate maker price per tick, vectorized over the pregame prefix;
+          the first tick where the ask crosses the previous or current
+          candidate is the fill (argmax over a boolean mask)
+- exit:   first bid >= target  = searchsorted(cummax(bid), target)
+- DCA:    first ask <= trigger = searchsorted(-cummin(ask), -trigger)
+- strategy B re-targets after the DCA fill, so it searches a cummax that
+  starts after that fill (one per DCA trigger, shared by every exit)
+
+Per ticker the cost is O(ticks * (offsets + dca levels)) instead of
+O(ticks * configs). Tickers are spread over a process pool; each worker opens
+its ticks through tick_store (memmap + cached sort index), so only ticker
+names go in and small result arrays come back.
+
+Results per ticker (TickerGrid) hold pnl / capital / valid arrays shaped
+(offsets, configs), so the aggregation in replay_v5 reads them directly.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from tick_store import TICKS_DIR, TickStore
+
+ES = 10
+DS = 5
+MIN_TICKS = 10
+
+
+def grid_configs(dcas, exits, strategies=('A', 'B')):
+    """(dca, exit, strategy) configs in replay_v5.sweep() order."""
+    out = []
+    for dca in dcas:
+        for ext in exits:
+            for strat in (strategies if dca is not None else ('NA',)):
+                out.append((dca, ext, strat))
+    return out
+
+
+def maker_fills(t, entry_lo, entry_hi, offsets, pregame_ratio=0.8):
+    """{offset: (fill_idx, fill_price)} for each offset, as replay_v5.maker_fill()."""
+    out = {off: (None, None) for off in offsets}
+    n = len(t)
+    if n == 0:
+        return out
+    first_ts = int(t.ts[0])
+    cutoff = first_ts + int((int(t.ts[-1]) - first_ts) * pregame_ratio)
+    m = int(np.searchsorted(t.ts, cutoff, side='right'))
+    if m == 0:
+        return out
+    ts, bid, ask = t.ts[:m], t.bid[:m].astype(np.int32), t.ask[:m].astype(np.int32)
+    base = bid + np.where(ts - first_ts > 1800, 2, 1)
+    cap = ask - 1
+    for off in offsets:
+        cand = np.maximum(1, np.minimum(base + off, cap))
+        in_range = (cand >= entry_lo) & (cand <= entry_hi)
+        fill_cur = in_range & (ask <= cand)
+        fill_prev = np.zeros(m, dtype=bool)
+        fill_prev[1:] = in_range[:-1] & (ask[1:] <= cand[:-1])
+        hit = fill_prev | fill_cur
+        if not hit.any():
+            continue
+        i = int(np.argmax(hit))
+        out[off] = (i, int(cand[i - 1]) if fill_prev[i] else int(cand[i]))
+    return out
+
+
+class _PostEntry:
+    """First-crossing searches over the ticks after one entry."""
+
+    def __init__(self, t, entry_idx):
+        self.bid = t.bid[entry_idx + 1:]
+        ask = t.ask[entry_idx + 1:]
+        self.n = len(self.bid)
+        self.cummax = np.maximum.accumulate(self.bid) if self.n else self.bid
+        self.neg_cummin = -np.minimum.accumulate(ask) if self.n else ask
+        self._cummax_after = {}
+
+    def peak(self):
+        return int(self.cummax[-1]) if self.n else 0
+
+    def first_bid_ge(self, target):
+        k = int(np.searchsorted(self.cummax, target, side='left'))
+        return k if k < self.n else None
+
+    def first_ask_le(self, trigger):
+        k = int(np.searchsorted(self.neg_cummin, -trigger, side='left'))
+        return k if k < self.n else None
+
+    def first_bid_ge_after(self, start, target):
+        cm = self._cummax_after.get(start)
+        if cm is None:
+            seg = self.bid[start + 1:]
+            cm = self._cummax_after[start] = np.maximum.accumulate(seg) if len(seg) else seg
+        k = int(np.searchsorted(cm, target, side='left'))
+        return start + 1 + k if k < len(cm) else None
+
+
+def _settle(settle_bid):
+    if settle_bid >= 80:
+        return 100
+    if settle_bid <= 20:
+        return 0
+    return settle_bid
+
+
+def simulate_configs(post, entry_px, configs, settle_bid):
+    """(pnl, capital, valid) per config, as replay_v5.simulate() for one entry."""
+    k = len(configs)
+    pnl = np.zeros(k, dtype=np.int64)
+    cap = np.zeros(k, dtype=np.int64)
+    valid = np.zeros(k, dtype=bool)
+    settle = None if settle_bid is None else _settle(settle_bid)
+    for c, (dca, ext, strat) in enumerate(configs):
+        target = 99 if ext is None else min(99, entry_px + ext)
+        trigger = entry_px - dca if (dca is not None and entry_px - dca >= 1) else None
+        k_sell = post.first_bid_ge(target)
+        k_dca = post.first_ask_le(trigger) if trigger is not None else None
+
+        if k_sell is not None and (k_dca is None or k_sell <= k_dca):
+            pnl[c] = ES * (target - entry_px)
+            cap[c] = ES * entry_px
+            valid[c] = True
+            continue
+
+        if k_dca is None:
+            if settle is not None:
+                pnl[c] = ES * (settle - entry_px)
+                cap[c] = ES * entry_px
+                valid[c] = True
+            continue
+
+        cost = ES * entry_px + DS * trigger
+        if ext is not None and strat == 'B':
+            avg = cost / (ES + DS)
+            target = min(99, max(1, int(round(avg)) + ext))
+            k_sell = post.first_bid_ge_after(k_dca, target)
+        if k_sell is not None:
+            pnl[c] = ES * (target - entry_px) + DS * (target - trigger)
+        elif settle is not None:
+            pnl[c] = ES * (settle - entry_px) + DS * (settle - trigger)
+        else:
+            continue
+        cap[c] = cost
+        valid[c] = True
+    return pnl, cap, valid
+
+
+class TickerGrid:
+    """Replay results of one ticker over offsets x configs."""
+    __slots__ = ('ticker', 'offsets', 'entry_idx', 'entry_px', 'peak', 'pnl', 'cap', 'valid')
+
+    def __init__(self, ticker, offsets, n_configs):
+        self.ticker = ticker
+        self.offsets = list(offsets)
+        n_off = len(self.offsets)
+        self.entry_idx = np.full(n_off, -1, dtype=np.int64)
+        self.entry_px = np.full(n_off, -1, dtype=np.int64)
+        self.peak = np.zeros(n_off, dtype=np.int64)
+        self.pnl = np.zeros((n_off, n_configs), dtype=np.int64)
+        self.cap = np.zeros((n_off, n_configs), dtype=np.int64)
+        self.valid = np.zeros((n_off, n_configs), dtype=bool)
+
+    def entry(self, offset):
+        """(fill_idx, fill_price) at offset, or (None, None)."""
+        i = self.offsets.index(offset)
+        if self.entry_idx[i] < 0:
+            return None, None
+        return int(self.entry_idx[i]), int(self.entry_px[i])
+
+
+def replay_ticks(ticker, t, settle_bid, entry_lo, entry_hi, offsets, configs):
+    grid = TickerGrid(ticker, offsets, len(configs))
+    for i, (off, (e_idx, e_px)) in enumerate(maker_fills(t, entry_lo, entry_hi, offsets).items()):
+        if e_idx is None:
+            continue
+        post = _PostEntry(t, e_idx)
+        grid.entry_idx[i], grid.entry_px[i], grid.peak[i] = e_idx, e_px, post.peak()
+        grid.pnl[i], grid.cap[i], grid.valid[i] = simulate_configs(post, e_px, configs, settle_bid)
+    return grid
+
+
+def _replay_job(args):
+    ticks_dir, ticker, settle_bid, entry_lo, entry_hi, offsets, configs = args
+    t = TickStore(ticks_dir).load(ticker)
+    if len(t) < MIN_TICKS:
+        return None
+    return replay_ticks(ticker, t, settle_bid, entry_lo, entry_hi, offsets, configs)
+
+
+def replay_cell(tickers, ticker_meta, entry_lo, entry_hi, offsets, configs,
+                pool=None, ticks_dir=TICKS_DIR):
+    """{ticker: TickerGrid} for every ticker of a cell with a tick file and
+    at least MIN_TICKS ticks, in input order."""
+    store = TickStore(ticks_dir)
+    jobs = [(ticks_dir, tk, ticker_meta.get(tk, {}).get('settle_bid'), entry_lo, entry_hi,
+             list(offsets), configs)
+            for tk in tickers if store.exists(tk)]
+    results = pool.map(_replay_job, jobs, chunksize=8) if pool else map(_replay_job, jobs)
+    return {g.ticker: g for g in results if g is not None}
+
+
+def make_pool(workers=None):
+    return ProcessPoolExecutor(max_workers=workers or os.cpu_count())
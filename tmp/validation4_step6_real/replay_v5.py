@@ -9,6 +9,11 @@ All ROI / PnL computed from ACTUAL maker fill price (bid + bump + offset, clippe
 
 Fill rate is reported for every recommendation. Cells with low fill rates are NOT
 excluded — they are flagged.
+
+Ticks are read through tick_store (memmap + cached sort/dedup index) and each
+cell's grid is evaluated by replay_engine, vectorized per ticker and spread
+over a process pool. load_ticks / maker_fill / simulate below are the scalar
+reference the engine is checked against (replay_engine matches them exactly).
 """
 import os
 import csv
@@ -22,6 +27,8 @@ from collections import defaultdict
 sys.path.insert(0, '/root/Omi-Workspace/arb-executor')
 from version_b_blueprint import DEPLOYMENT
 
+import replay_engine as engine
+
 REAL = '/tmp/validation4/step6_real'
 TICKS_DIR = f'{REAL}/ticks'
 OUT = f'{REAL}/out_v5'
@@ -140,28 +147,22 @@ def simulate(ticks, entry_idx, entry_px, dca_drop, exit_target, strategy, settle
                 cap=cost, avg=avg, roi=100.0 * pnl / cost if cost else 0)
 
 
-def cell_stats(cell_data, offset, dca, exit_target, strategy):
-    """Aggregate stats for one (offset, dca, exit, strat). Uses pre-cached entry per offset."""
-    results = []
-    n_attempts = 0
-    for tk, (ticks, settle_bid, entry_cache) in cell_data.items():
-        n_attempts += 1
-        e = entry_cache.get(offset)
-        if e is None:
+def cell_stats(cell_grids, offset, config_idx):
+    """Aggregate stats for one (offset, config) from the replay_engine grids."""
+    pnls, rois, fills = [], [], []
+    n_attempts = len(cell_grids)
+    for g in cell_grids.values():
+        oi = g.offsets.index(offset)
+        if not g.valid[oi, config_idx] or g.cap[oi, config_idx] <= 0:
             continue
-        e_idx, e_px = e
-        if e_idx is None:
-            continue
-        r = simulate(ticks, e_idx, e_px, dca, exit_target, strategy, settle_bid)
-        if r is not None and r['cap'] > 0:
-            results.append(r)
-    if not results:
+        pnl, cap = int(g.pnl[oi, config_idx]), int(g.cap[oi, config_idx])
+        pnls.append(pnl)
+        rois.append(100.0 * pnl / cap)
+        fills.append(int(g.entry_px[oi]))
+    if not pnls:
         return None
-    pnls = [r['pnl'] for r in results]
-    rois = [r['roi'] for r in results]
-    fills = [r['entry_px'] for r in results]
     wins = sum(1 for p in pnls if p > 0)
-    n = len(results)
+    n = len(pnls)
     return dict(
         n=n,
         n_attempts=n_attempts,
@@ -179,18 +180,14 @@ def cell_stats(cell_data, offset, dca, exit_target, strategy):
     )
 
 
-def sweep(cell_data, offsets, dcas, exits, strategies=('A', 'B')):
+def sweep(cell_grids, offsets, configs):
     out = []
     for off in offsets:
-        for dca in dcas:
-            for ext in exits:
-                strats = strategies if dca is not None else ('NA',)
-                for strat in strats:
-                    s = cell_stats(cell_data, off, dca, ext, strat)
-                    if s is None:
-                        # still record so we can see fill_rate=0
-                        continue
-                    out.append(dict(offset=off, dca_drop=dca, exit_target=ext, strategy=strat, **s))
+        for ci, (dca, ext, strat) in enumerate(configs):
+            s = cell_stats(cell_grids, off, ci)
+            if s is None:
+                continue
+            out.append(dict(offset=off, dca_drop=dca, exit_target=ext, strategy=strat, **s))
     return out
 
 
@@ -204,7 +201,7 @@ def parse_name(name):
     return (cat, direction, int(lo), int(hi))
 
 
-def main():
+def main(pool=None):
     t0 = time.time()
     with open(f'{REAL}/cell_tickers.json') as f:
         cell_tickers = json.load(f)
@@ -230,28 +227,20 @@ def main():
         entry_lo = cfg['entry_lo']; entry_hi = cfg['entry_hi']
         deployed_offset = cfg.get('maker_bid_offset', 0) or 0
 
-        # Load ticks + cache entry for each offset
-        cell_data = {}
-        peak_at_off0 = []  # peak bid after entry at offset=0 (envelope proxy)
+        # Replay every ticker over the coarse grid (entry per offset included)
+        coarse_configs = engine.grid_configs(COARSE_DCA, COARSE_EXIT)
+        cell_grids = engine.replay_cell(cell_tickers[name], ticker_meta, entry_lo, entry_hi,
+                                        COARSE_OFFSETS, coarse_configs, pool=pool)
         avg_fill_per_offset = defaultdict(list)
-        for tk in cell_tickers[name]:
-            p = f'{TICKS_DIR}/{tk.replace("/","_")}.bin'
-            if not os.path.exists(p): continue
-            ticks = load_ticks(p)
-            if len(ticks) < 10: continue
-            m = ticker_meta.get(tk, {})
-            sb = m.get('settle_bid')
-            entry_cache = {}
-            for off in COARSE_OFFSETS:
-                e_idx, e_px = maker_fill(ticks, entry_lo, entry_hi, off)
-                entry_cache[off] = (e_idx, e_px)
-                if e_idx is not None:
-                    avg_fill_per_offset[off].append(e_px)
+        peak_at_off0 = []  # peak bid after entry at offset=0 (envelope proxy)
+        for g in cell_grids.values():
+            for oi, off in enumerate(COARSE_OFFSETS):
+                if g.entry_idx[oi] >= 0:
+                    avg_fill_per_offset[off].append(int(g.entry_px[oi]))
                     if off == 0:
-                        peak_at_off0.append((e_px, peak_bid_after(ticks, e_idx)))
-            cell_data[tk] = (ticks, sb, entry_cache)
+                        peak_at_off0.append((int(g.entry_px[oi]), int(g.peak[oi])))
 
-        n_trajs = len(cell_data)
+        n_trajs = len(cell_grids)
         if n_trajs == 0:
             print(f'  [{name}] NO_TRAJECTORIES', flush=True)
             continue
@@ -278,7 +267,7 @@ def main():
         ))
 
         # Coarse sweep (offset × dca × exit × strat)
-        rows = sweep(cell_data, COARSE_OFFSETS, COARSE_DCA, COARSE_EXIT)
+        rows = sweep(cell_grids, COARSE_OFFSETS, coarse_configs)
         for r in rows:
             r['cell'] = name
         all_rows.extend(rows)
@@ -308,16 +297,10 @@ def main():
         else:
             fine_exit = list(range(max(1, coarse_top['exit_target'] - 5), coarse_top['exit_target'] + 6))
 
-        # Need to extend entry_cache for new offsets not yet computed
-        for tk, (ticks, sb, ec) in cell_data.items():
-            for off in fine_offsets:
-                if off not in ec:
-                    e_idx, e_px = maker_fill(ticks, entry_lo, entry_hi, off)
-                    ec[off] = (e_idx, e_px)
-                    if e_idx is not None:
-                        avg_fill_per_offset[off].append(e_px)
-
-        fine_rows = sweep(cell_data, fine_offsets, fine_dca, fine_exit)
+        fine_configs = engine.grid_configs(fine_dca, fine_exit)
+        fine_grids = engine.replay_cell(cell_tickers[name], ticker_meta, entry_lo, entry_hi,
+                                        fine_offsets, fine_configs, pool=pool)
+        fine_rows = sweep(fine_grids, fine_offsets, fine_configs)
         for r in fine_rows: r['cell'] = name
         all_rows.extend(fine_rows)
 
@@ -486,4 +469,5 @@ def main():
 
 
 if __name__ == '__main__':
-    main()
+    with engine.make_pool() as pool:
+        main(pool)
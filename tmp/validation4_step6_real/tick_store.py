@@ -0,0 +1,139 @@
+"""Memory-mapped tick store for the step6 `<IBB` .bin tick files.
+
+Each .bin file is a packed array of (ts uint32, bid uint8, ask uint8) records,
+6 bytes each, in arrival order. The replay scripts used to f.read() every file,
+struct.unpack it tick by tick, sort and dedup in Python. Here a file is opened
+with np.memmap under a structured dtype (no copy, no parse), and the sort/dedup
+is done once with numpy and cached next to the ticks as an index:
+
+    ticks/<ticker>.bin          raw ticks (written by binary_splitter.py)
+    ticks/.index/<ticker>.npy   int64 positions of the sorted, deduped ticks,
+                                or an empty array when the file already is
+
+Ordering and dedup match load_ticks() in replay_v4/v5 exactly: stable sort on
+ts (equal timestamps keep file order), then drop a tick only when it equals
+the one before it in all three fields.
+
+    store = TickStore()
+    t = store.load('KXATPMATCH-...')   # Ticks(ts, bid, ask) int64 / int16 arrays
+"""
+import os
+
+import numpy as np
+
+REAL = '/tmp/validation4/step6_real'
+TICKS_DIR = f'{REAL}/ticks'
+
+TICK_DTYPE = np.dtype([('ts', '<u4'), ('bid', 'u1'), ('ask', 'u1')])
+assert TICK_DTYPE.itemsize == 6
+
+
+class Ticks:
+    """Sorted, deduped ticks of one ticker as parallel arrays.
+
+    ts is int64 and bid/ask int16 so offsets, bumps and differences can be
+    computed without uint8 wrap-around.
+    """
+    __slots__ = ('ts', 'bid', 'ask')
+
+    def __init__(self, ts, bid, ask):
+        self.ts = ts
+        self.bid = bid
+        self.ask = ask
+
+    def __len__(self):
+        return len(self.ts)
+
+    def as_tuples(self):
+        """[(ts, bid, ask), ...] like the old load_ticks(), for parity checks."""
+        return list(zip(self.ts.tolist(), self.bid.tolist(), self.ask.tolist()))
+
+
+def ticker_filename(ticker):
+    return ticker.replace('/', '_')
+
+
+def open_raw(path):
+    """Memory-map a .bin file as TICK_DTYPE records (a trailing partial record is ignored)."""
+    n = os.path.getsize(path) // TICK_DTYPE.itemsize
+    if n == 0:
+        return np.zeros(0, dtype=TICK_DTYPE)
+    return np.memmap(path, dtype=TICK_DTYPE, mode='r', shape=(n,))
+
+
+def build_index(raw):
+    """Positions of the sorted, consecutive-deduped ticks in raw.
+
+    Returns an empty array when raw is already sorted with no duplicates, so
+    callers can use the mapping directly.
+    """
+    n = len(raw)
+    if n == 0:
+        return np.zeros(0, dtype=np.int64)
+    ts = raw['ts']
+    if n > 1 and np.all(ts[1:] >= ts[:-1]):
+        order = None
+        s_ts, s_bid, s_ask = ts, raw['bid'], raw['ask']
+    else:
+        order = np.argsort(ts, kind='stable')
+        s_ts, s_bid, s_ask = ts[order], raw['bid'][order], raw['ask'][order]
+    keep = np.ones(n, dtype=bool)
+    keep[1:] = (s_ts[1:] != s_ts[:-1]) | (s_bid[1:] != s_bid[:-1]) | (s_ask[1:] != s_ask[:-1])
+    if order is None:
+        if keep.all():
+            return np.zeros(0, dtype=np.int64)
+        return np.flatnonzero(keep).astype(np.int64)
+    return order[keep].astype(np.int64)
+
+
+class TickStore:
+    """Opens tick files by ticker, with the sort/dedup index cached on disk."""
+
+    def __init__(self, ticks_dir=TICKS_DIR, index_dir=None):
+        self.ticks_dir = ticks_dir
+        self.index_dir = index_dir or os.path.join(ticks_dir, '.index')
+
+    def path(self, ticker):
+        return os.path.join(self.ticks_dir, f'{ticker_filename(ticker)}.bin')
+
+    def exists(self, ticker):
+        return os.path.exists(self.path(ticker))
+
+    def _index(self, ticker, raw):
+        bin_path = self.path(ticker)
+        idx_path = os.path.join(self.index_dir, f'{ticker_filename(ticker)}.npy')
+        try:
+            if os.path.getmtime(idx_path) >= os.path.getmtime(bin_path):
+                return np.load(idx_path)
+        except (OSError, ValueError):
+            pass
+        index = build_index(raw)
+        try:
+            os.makedirs(self.index_dir, exist_ok=True)
+            tmp = f'{idx_path}.{os.getpid()}.tmp.npy'
+            np.save(tmp, index)
+            os.replace(tmp, idx_path)
+        except OSError:
+            pass  # read-only tick dir: index is rebuilt next time
+        return index
+
+    def load(self, ticker):
+        """Sorted, deduped Ticks for ticker (raises FileNotFoundError if absent).
+
+        The file is read through the mapping without parsing; only the
+        widened ts/bid/ask columns handed back are materialized.
+        """
+        raw = open_raw(self.path(ticker))
+        index = self._index(ticker, raw)
+        if len(index):
+            raw = raw[index]
+        return Ticks(raw['ts'].astype(np.int64), raw['bid'].astype(np.int16),
+                     raw['ask'].astype(np.int16))
+
+    def build_all(self, tickers):
+        """Build (or refresh) the cached index of every ticker; returns tick counts."""
+        counts = {}
+        for tk in tickers:
+            if self.exists(tk):
+                counts[tk] = len(self.load(tk))
+        return counts